@@ -0,0 +1,129 @@
+// Chunked upload of the experiment and structure files, see the upload routes of main_app.py.
+// A click on an element with a data-chunked-upload attribute opens a file dialog, a file can also be dropped
+// on it. The selected file is sent in chunks, an interrupted chunk is sent again from the offset the server has.
+// The progress is shown in the element named by data-upload-info and once the file is uploaded the Dash store
+// named by data-chunked-upload is set to {upload_id, filename}, or to {filename, error} if the upload failed.
+// The files are sent to the URL in data-upload-url, which includes the URL prefix of the app.
+(function () {
+  const chunkSize = 4 * 1024 * 1024;
+  const maxRetries = 5;
+
+  function setProps(componentId, props) {
+    window.dash_clientside.set_props(componentId, props);
+  }
+
+  function sleep(milliseconds) {
+    return new Promise((resolve) => setTimeout(resolve, milliseconds));
+  }
+
+  async function readJson(response) {
+    try {
+      return await response.json();
+    } catch (error) {
+      return {};
+    }
+  }
+
+  async function startUpload(uploadsPath, file) {
+    const response = await fetch(uploadsPath, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ filename: file.name, size: file.size }),
+    });
+    const result = await readJson(response);
+    if (!response.ok) {
+      throw new Error(result.error || `The upload could not be started (${response.status}).`);
+    }
+    return result.upload_id;
+  }
+
+  async function sendChunk(uploadsPath, file, uploadId, offset) {
+    const response = await fetch(`${uploadsPath}/${uploadId}`, {
+      method: "PATCH",
+      headers: { "Upload-Offset": String(offset), "Content-Type": "application/octet-stream" },
+      body: file.slice(offset, offset + chunkSize),
+    });
+    const result = await readJson(response);
+    // 409: the server has another offset, e.g. a chunk that was received although its response was lost
+    if (response.ok || response.status === 409) {
+      return result.offset;
+    }
+    const error = new Error(result.error || `The upload failed (${response.status}).`);
+    // only the errors of the server are retried, the request itself is not going to change
+    error.retry = response.status >= 500;
+    throw error;
+  }
+
+  async function getOffset(uploadsPath, uploadId) {
+    const response = await fetch(`${uploadsPath}/${uploadId}`);
+    if (!response.ok) {
+      throw new Error("The upload could not be resumed, please upload the file again.");
+    }
+    return (await response.json()).offset;
+  }
+
+  async function uploadFile(uploadsPath, file, storeId, infoId) {
+    const uploadId = await startUpload(uploadsPath, file);
+    let offset = 0;
+    let retries = 0;
+    while (offset < file.size) {
+      if (infoId) {
+        setProps(infoId, { children: `Uploading ${file.name}: ${Math.floor((100 * offset) / file.size)}%` });
+      }
+      try {
+        offset = await sendChunk(uploadsPath, file, uploadId, offset);
+        retries = 0;
+      } catch (error) {
+        // a network error has no retry property
+        if (error.retry === false || ++retries > maxRetries) {
+          throw error;
+        }
+        await sleep(1000 * retries);
+        offset = await getOffset(uploadsPath, uploadId);
+      }
+    }
+    setProps(storeId, { data: { upload_id: uploadId, filename: file.name } });
+  }
+
+  function uploadSelectedFile(target, file) {
+    const storeId = target.dataset.chunkedUpload;
+    uploadFile(target.dataset.uploadUrl, file, storeId, target.dataset.uploadInfo).catch((error) => {
+      setProps(storeId, { data: { filename: file.name, error: error.message } });
+    });
+  }
+
+  document.addEventListener("click", (event) => {
+    const target = event.target.closest("[data-chunked-upload]");
+    if (!target) {
+      return;
+    }
+
+    const input = document.createElement("input");
+    input.type = "file";
+    input.accept = target.dataset.uploadAccept || "";
+    input.addEventListener("change", () => {
+      if (input.files.length > 0) {
+        uploadSelectedFile(target, input.files[0]);
+      }
+    });
+    input.click();
+  });
+
+  // a file can also be dropped on the element
+  document.addEventListener("dragover", (event) => {
+    if (event.target.closest("[data-chunked-upload]")) {
+      event.preventDefault();
+    }
+  });
+
+  document.addEventListener("drop", (event) => {
+    const target = event.target.closest("[data-chunked-upload]");
+    if (!target) {
+      return;
+    }
+    event.preventDefault();
+    if (event.dataTransfer.files.length > 0) {
+      uploadSelectedFile(target, event.dataTransfer.files[0]);
+    }
+  });
+})();
@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 import plotly_express as px
 
 from levseq_dash.app import global_strings as gs
+from levseq_dash.app.utils.utils import filter_single_site_mutations, get_single_site_mutation_pattern
 
 
 def format_mutation_annotation(text):
@@ -55,7 +56,8 @@ def creat_heatmap(df, plate_number, property, smiles):
     # https://pandas.pydata.org/pandas-docs/stable/user_guide/indexing.html#returning-a-view-versus-a-copy
 
     filtered_df = df[(df[gs.c_smiles] == smiles) & (df[gs.c_plate] == plate_number)].copy()
-    filtered_df = filtered_df.fillna(0)
+    # the smiles, plate and well columns are categories without missing values, 0 is not one of their categories
+    filtered_df = filtered_df.fillna(dict.fromkeys(filtered_df.select_dtypes(exclude="category").columns, 0))
 
     # set up the well indices for the grid
     # well numbers on the X  , letters on the Y
@@ -203,96 +205,6 @@ def creat_rank_plot(df, plate_number, smiles):
 AA_LIST = ["A", "C", "D", "E", "F", "G", "H", "I", "K", "L", "M", "N", "P", "Q", "R", "S", "T", "V", "W", "Y", "*"]
 
 
-def get_single_site_mutation_pattern(residue_number=None):
-    """
-    Generate regex pattern for matching single-site mutations.
-
-    Args:
-        residue_number: Specific residue position (e.g., 45). If None, matches any position.
-
-    Returns:
-        str: Regex pattern for single-site mutation matching.
-    """
-    if residue_number is not None:
-        # Pattern for specific residue: A45S, A45*, etc.
-        return rf"^[A-Z*]\s*{residue_number}\s*[A-Z*]$"
-    else:
-        # Pattern for any single-site mutation: A45S, D123F, etc.
-        return r"^[A-Z*]\s*\d+\s*[A-Z*]$"
-
-
-def filter_single_site_mutations(df, smiles_string=None, residue_number=None, include_parent=False):
-    """
-    Filter dataframe for single-site mutations with optional filters.
-
-    Args:
-        df: DataFrame containing mutation data.
-        smiles_string: Optional SMILES filter.
-        residue_number: Optional specific residue position filter.
-        include_parent: Whether to include parent entries (default: False).
-
-    Returns:
-        pd.DataFrame: Filtered dataframe with single-site mutations.
-    """
-    # Filter by smiles string if provided
-    if smiles_string is not None:
-        filtered_df = df[df[gs.c_smiles] == smiles_string].copy()
-    else:
-        filtered_df = df.copy()
-
-    # Get the appropriate mutation pattern
-    mutation_pattern = get_single_site_mutation_pattern(residue_number)
-
-    # Filter for single-site mutations
-    single_site_mask = filtered_df[gs.c_substitutions].str.match(mutation_pattern, na=False)
-
-    if include_parent:
-        # Include parent entries
-        parent_mask = filtered_df[gs.c_substitutions] == gs.hashtag_parent
-        final_mask = single_site_mask | parent_mask
-    else:
-        final_mask = single_site_mask
-
-    final = filtered_df[final_mask]
-    return final
-
-
-def extract_single_site_mutations(df, smiles_string=None):
-    """
-    Extract all single-site mutation positions from a dataframe.
-
-    Args:
-        df: DataFrame containing mutation data.
-        smiles_string: Optional SMILES string filter. If None, processes all data.
-
-    Returns:
-        list: Sorted list of unique residue positions (e.g., [45, 67, 123]).
-    """
-
-    # Use shared filtering function for single-site mutations (any residue number, no parent entries)
-    filtered_df = filter_single_site_mutations(df, smiles_string=smiles_string, include_parent=False)
-
-    if filtered_df.empty:
-        return []
-
-    # Extract residue numbers from mutation strings using the shared pattern
-    residue_numbers = set()
-    single_mutations = filtered_df[gs.c_substitutions].dropna()
-
-    # Use the same pattern as filtering, but add capture group for residue number
-    base_pattern = get_single_site_mutation_pattern()  # Gets pattern for any residue
-    residue_capture_pattern = base_pattern.replace(r"\d+", r"(\d+)")  # Capture the residue number
-
-    for mutation in single_mutations:
-        # Extract residue number using the shared pattern logic
-        match = re.search(residue_capture_pattern, str(mutation))
-        if match:
-            residue_numbers.add(int(match.group(1)))
-
-    # Return sorted list of unique residue positions
-    return sorted(list(residue_numbers))
-
-
 def create_ssm_plot(df, smiles_string, residue_number):
     """
     Create a single-site mutagenesis (SSM) plot for a specific residue.
@@ -5,6 +5,7 @@ from levseq_dash.app import global_strings as gs
 from levseq_dash.app import global_strings_html as gsh
 from levseq_dash.app.components import vis, widgets
 from levseq_dash.app.components.widgets import generate_label_with_info
+from levseq_dash.app.config import settings
 
 
 def get_slider_area_layout():
@@ -750,8 +751,17 @@ def get_tab_experiment_related_variants():
                 id="id-alert-exp-related-variants",
                 className="d-flex justify-content-center",
             ),
+            widgets.get_search_progress_bar("id-div-progress-exp-related-variants", "id-progress-exp-related-variants"),
+            # with background jobs the progress bar shows the search and the variants appear while they are
+            # gathered, so the results are not covered by a spinner
+            html.Div(
+                id="id-div-exp-related-variants",
+                style=vis.display_none,
+                children=[get_card_experiment_related_variants_result()],
+            )
+            if settings.is_background_jobs_enabled()
             # putting all this in a Div because it needs to appear after results are in
-            dcc.Loading(
+            else dcc.Loading(
                 overlay_style={"visibility": "visible", "filter": "blur(2px)"},
                 type="circle",
                 color="var(--bs-secondary)",
@@ -1,5 +1,5 @@
 import dash_bootstrap_components as dbc
-from dash import dcc, html
+from dash import dcc, get_relative_path, html
 
 from levseq_dash.app import global_strings as gs
 from levseq_dash.app.components import vis, widgets
@@ -49,17 +49,36 @@ def get_layout():
                                             dbc.Col(
                                                 html.Div(
                                                     [
-                                                        dbc.Button(
-                                                            children=[
-                                                                get_download_text_icon_combo(
-                                                                    "Download Selected Experiment(s)"
-                                                                )
+                                                        # the button posts the selected experiment IDs to the
+                                                        # streaming ZIP export endpoint, the browser downloads
+                                                        # the archive while it is written
+                                                        html.Form(
+                                                            [
+                                                                dcc.Input(
+                                                                    id="id-input-download-experiment-ids",
+                                                                    type="hidden",
+                                                                    name="experiment_ids",
+                                                                    value="",
+                                                                ),
+                                                                dbc.Button(
+                                                                    children=[
+                                                                        get_download_text_icon_combo(
+                                                                            "Download Selected Experiment(s)"
+                                                                        )
+                                                                    ],
+                                                                    id="id-button-download-all-experiments",
+                                                                    type="submit",
+                                                                    n_clicks=0,
+                                                                    disabled=True,
+                                                                    # me-2 will add a little space between the buttons
+                                                                    className="col-4 shadow-sm me-2",
+                                                                ),
                                                             ],
-                                                            id="id-button-download-all-experiments",
-                                                            n_clicks=0,
-                                                            disabled=True,
-                                                            # me-2 will add a little space between the buttons
-                                                            className="col-4 shadow-sm me-2",
+                                                            # under the URL prefix of the app
+                                                            action=get_relative_path(gs.experiments_zip_export_path),
+                                                            method="POST",
+                                                            # keeps the button a flex item of the button row
+                                                            style={"display": "contents"},
                                                         ),
                                                         dbc.Button(
                                                             children=html.Span(
@@ -130,8 +149,6 @@ def get_layout():
                 is_open=False,
                 centered=True,
             ),
-            # Download component for ZIP files
-            dcc.Download(id="id-download-all-experiments-zip"),
         ],
         className=vis.main_page_class,
     )
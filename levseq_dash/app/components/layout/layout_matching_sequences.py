@@ -5,6 +5,7 @@ from levseq_dash.app import global_strings as gs
 from levseq_dash.app import global_strings_html as gsh
 from levseq_dash.app.components import vis, widgets
 from levseq_dash.app.components.widgets import generate_label_with_info
+from levseq_dash.app.config import settings
 
 
 def get_seq_align_form():
@@ -341,8 +342,13 @@ def get_layout():
                 id="id-alert-seq-alignment",
                 className="d-flex justify-content-center",
             ),
+            widgets.get_search_progress_bar("id-div-progress-seq-matching", "id-progress-seq-matching"),
+            # with background jobs the progress bar shows the search and the matches appear while they are
+            # gathered, so the results are not covered by a spinner
+            get_similar_sequences_results_layout()
+            if settings.is_background_jobs_enabled()
             # these results will appear/clear
-            dcc.Loading(
+            else dcc.Loading(
                 overlay_style={"visibility": "visible", "filter": "blur(2px)"},
                 # overlay_style={  # "display": "block",
                 #     "alignItems": "flex-start",
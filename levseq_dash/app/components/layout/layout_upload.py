@@ -1,5 +1,5 @@
 import dash_bootstrap_components as dbc
-from dash import dcc, html
+from dash import dcc, get_relative_path, html
 
 from levseq_dash.app import global_strings as gs
 from levseq_dash.app.components import vis, widgets
@@ -151,22 +151,39 @@ def get_form():
             html.Br(),
             dbc.Row(
                 [
+                    # the files are uploaded in chunks by assets/chunkedUpload.js, which sets the stores
                     dbc.Col(
-                        dcc.Upload(
-                            id="id-button-upload-data",
-                            children=dbc.Button(gs.button_upload_csv, color="secondary", outline=True),
-                            multiple=False,
-                            style=vis.upload_default,
-                        ),
+                        [
+                            html.Div(
+                                id="id-button-upload-data",
+                                children=dbc.Button(gs.button_upload_csv, color="secondary", outline=True),
+                                style=vis.upload_default,
+                                **{
+                                    "data-chunked-upload": "id-upload-data-file",
+                                    "data-upload-url": get_relative_path(gs.file_uploads_path),
+                                    "data-upload-accept": ".csv",
+                                    "data-upload-info": "id-button-upload-data-info",
+                                },
+                            ),
+                            dcc.Store(id="id-upload-data-file"),
+                        ],
                         width=6,
                     ),
                     dbc.Col(
-                        dcc.Upload(
-                            id="id-button-upload-structure",
-                            children=dbc.Button(gs.button_upload_pdb, color="secondary", outline=True),
-                            multiple=False,
-                            style=vis.upload_default,
-                        ),
+                        [
+                            html.Div(
+                                id="id-button-upload-structure",
+                                children=dbc.Button(gs.button_upload_pdb, color="secondary", outline=True),
+                                style=vis.upload_default,
+                                **{
+                                    "data-chunked-upload": "id-upload-structure-file",
+                                    "data-upload-url": get_relative_path(gs.file_uploads_path),
+                                    "data-upload-accept": ".cif,.pdb",
+                                    "data-upload-info": "id-button-upload-structure-info",
+                                },
+                            ),
+                            dcc.Store(id="id-upload-structure-file"),
+                        ],
                         width=6,
                     ),
                 ],
@@ -44,17 +44,27 @@ def get_table_experiment_top_variants():
             #     'padding': '5px',
             #     'verticalAlign': 'middle',
             # }
-            # we  NEED to add this line or the cells won't adjust per columns
-            # row height to fit wrapped text
-            "autoHeight": True,
+            # the rows of the infinite row model have a fixed height, "autoHeight" is not supported.
+            # Long values wrap onto a second line instead, the rowHeight below fits two lines of
+            # text, see .top-variants-cell in ag_grid_table.css. The tooltips show the full SMILES and substitutions.
+            "wrapText": True,
+            "cellClass": "top-variants-cell",
         },
         style={"height": "755px", "width": "100%"},
+        # the rows are requested in blocks from the server, filtered and sorted there,
+        # see on_request_top_variants_rows
+        rowModelType="infinite",
+        getRowId=f"params.data.{gs.cc_row_id}",
         dashGridOptions={
+            # one block per page
+            "cacheBlockSize": 100,
+            "paginationPageSize": 100,
             # row selection for the protein viewer
             "rowSelection": "single",
             # https://ag-grid.com/javascript-data-grid/selection-overview/#cell-text-selection
             "enableCellTextSelection": True,
-            "rowHeight": 30,  # creating a more compact look for the table
+            # two lines of wrapped text, as compact as the table can be without autoHeight
+            "rowHeight": 48,
             "headerHeight": 50,
             "pagination": True,
             # https://dash.plotly.com/dash-ag-grid/tooltips
@@ -70,7 +80,8 @@ def get_table_experiment_top_variants():
         rowClassRules={
             # "bg-secondary": "params.data.well == 'A2'",
             # "text-info fw-bold fs-5": "params.data.well == 'A1'",
-            "fw-bold": "params.data.amino_acid_substitutions == '#PARENT#'",
+            # the rows of a block that is still loading have no data
+            "fw-bold": "params.data && params.data.amino_acid_substitutions == '#PARENT#'",
             # "text-warning fw-bold fs-5": "['#PARENT#'].includes(
             # params.data.amino_acid_substitutions)",
         },
@@ -599,3 +610,23 @@ def get_alert(alert_message, error=True, is_markdown=False):
         dismissable=True,
         className=class_name,
     )
+
+
+def get_search_progress_bar(progress_div_id, progress_bar_id):
+    """
+    Create the progress bar of a sequence search that runs as a background job.
+
+    The bar is hidden until a search runs, see search_callback in main_app.
+
+    Args:
+        progress_div_id: ID of the div that is shown while the search runs.
+        progress_bar_id: ID of the progress bar.
+
+    Returns:
+        html.Div: Hidden div with the progress bar.
+    """
+    return html.Div(
+        id=progress_div_id,
+        style=vis.display_none,
+        children=dbc.Progress(id=progress_bar_id, value=0, max=1, striped=True, animated=True, className="mb-3"),
+    )
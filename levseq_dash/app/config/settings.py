@@ -15,7 +15,7 @@ assay_file_path = assay_directory / assay_file_name
 
 
 class StorageMode(Enum):
-    db = "db"  # not implemeted
+    db = "db"
     disk = "disk"
 
 
@@ -24,6 +24,11 @@ class DeploymentMode(Enum):
     local_instance = "local-instance"
 
 
+class CoreDataFormat(Enum):
+    csv = "csv"
+    arrow = "arrow"
+
+
 def load_config():
     with open(config_path, "r") as file:
         config_file = yaml.safe_load(file)
@@ -68,6 +73,11 @@ def get_db_settings():
     return config.get("db", {})
 
 
+def get_sequence_alignment_settings():
+    config = load_config()
+    return config.get("sequence-alignment", {})
+
+
 def get_logging_settings():
     config = load_config()
     return config.get("logging", {})
@@ -102,6 +112,50 @@ def get_data_path():
     return data_path
 
 
+def get_database_path():
+    """
+    Returns the path of the SQLite database of the db storage mode.
+    The DATABASE_PATH environment variable takes precedence over database-path of the db settings,
+    relative paths are resolved from the app directory.
+    """
+    database_path_env = os.environ.get("DATABASE_PATH")
+    if database_path_env:
+        return Path(database_path_env).resolve()
+
+    database_path = get_db_settings().get("database-path", "")
+    if not database_path:
+        raise ValueError(
+            "db MODE ERROR: No database path configured!\n"
+            "Options:\n"
+            "1. Using Docker? Set DATABASE_PATH environment variable: "
+            " docker run -e DATABASE_PATH=/data/levseq.sqlite3 -v /host/path:/data  <image-name>\n"
+            "2. OR set database-path in the db section of config.yaml\n"
+        )
+
+    database_path = Path(database_path)
+    if database_path.is_absolute():
+        return database_path.resolve()
+    return (package_app_path / database_path).resolve()
+
+
+def _get_hidden_data_directory(dir_name):
+    """
+    Returns a hidden directory next to the data: in the data path, or in the directory of the database in db mode.
+    The disk data manager skips hidden directories when it lists the experiments, see list_experiment_dirs.
+    """
+    if is_db_mode():
+        return get_database_path().parent / dir_name
+    return get_data_path() / dir_name
+
+
+def get_upload_staging_path():
+    """
+    Returns the directory the uploaded files are staged in until their experiment is submitted, see upload_staging.
+    The .upload_staging directory of the data path, or of the directory of the database in db mode.
+    """
+    return _get_hidden_data_directory(".upload_staging")
+
+
 def is_data_modification_enabled():
     disk_settings = get_disk_settings()
     modification_enabled = disk_settings.get("enable-data-modification", False)
@@ -109,6 +163,71 @@ def is_data_modification_enabled():
     return modification_enabled
 
 
+def get_core_data_format():
+    """
+    Returns the format the core data of the experiments is loaded from, default "csv".
+    With "arrow" the core columns are also stored in a memory-mappable Arrow file next to the CSV file.
+    """
+    disk_settings = get_disk_settings()
+    core_data_format = disk_settings.get("core-data-format", CoreDataFormat.csv.value)
+
+    if core_data_format not in [f.value for f in CoreDataFormat]:
+        raise ValueError(
+            f"core-data-format must be one of {[f.value for f in CoreDataFormat]}, got: '{core_data_format}'"
+        )
+
+    return core_data_format
+
+
+def is_arrow_core_data_format():
+    return get_core_data_format() == CoreDataFormat.arrow.value
+
+
+def _get_disk_megabytes(key, default):
+    disk_settings = get_disk_settings()
+    megabytes = disk_settings.get(key, default)
+
+    if not isinstance(megabytes, (int, float)) or isinstance(megabytes, bool) or megabytes <= 0:
+        raise ValueError(f"{key} must be a positive number, got: '{megabytes}'")
+
+    return megabytes
+
+
+def get_experiment_cache_tabular_mb():
+    """
+    Returns the memory budget in megabytes of the data frames of the experiments cached by each worker, default 128.
+    """
+    return _get_disk_megabytes("experiment-cache-tabular-mb", 128)
+
+
+def get_experiment_cache_structure_mb():
+    """
+    Returns the memory budget in megabytes of the geometry files of the experiments cached by each worker, default 128.
+    """
+    return _get_disk_megabytes("experiment-cache-structure-mb", 128)
+
+
+def get_max_upload_size_mb():
+    """
+    Returns the maximum size in megabytes of an uploaded experiment or structure file, default 256.
+    """
+    return _get_disk_megabytes("max-upload-size-mb", 256)
+
+
+def get_metadata_refresh_interval_seconds():
+    """
+    Returns the minimum number of seconds between two checks of a worker for experiments added or removed
+    by the other workers, default 2. 0 checks on every read of the experiments metadata.
+    """
+    disk_settings = get_disk_settings()
+    interval = disk_settings.get("metadata-refresh-interval-seconds", 2)
+
+    if not isinstance(interval, (int, float)) or isinstance(interval, bool) or interval < 0:
+        raise ValueError(f"metadata-refresh-interval-seconds must be a non-negative number, got: '{interval}'")
+
+    return interval
+
+
 def is_sequence_alignment_profiling_enabled():
     log_settings = get_logging_settings()
     return log_settings.get("sequence-alignment-profiling", False)
@@ -124,6 +243,115 @@ def is_pairwise_aligner_logging_enabled():
     return log_settings.get("pairwise-aligner", False)
 
 
+def get_aligner_pool_size():
+    """
+    Returns the number of worker processes of the persistent aligner pool.
+    0 (or a missing value) means the ProcessPoolExecutor default is used, which is one process per CPU core.
+    """
+    alignment_settings = get_sequence_alignment_settings()
+    pool_size = alignment_settings.get("aligner-pool-size", 0) or 0
+
+    if not isinstance(pool_size, int) or isinstance(pool_size, bool) or pool_size < 0:
+        raise ValueError(f"aligner-pool-size must be a non-negative integer, got: '{pool_size}'")
+
+    return pool_size
+
+
+def get_max_concurrent_alignments():
+    """
+    Returns the maximum number of chunks aligned at the same time on the host, by the aligner pools of all the
+    gunicorn workers. 0 (or a missing value) means one per CPU core.
+    """
+    alignment_settings = get_sequence_alignment_settings()
+    max_concurrent = alignment_settings.get("max-concurrent-alignments", 0) or 0
+
+    if not isinstance(max_concurrent, int) or isinstance(max_concurrent, bool) or max_concurrent < 0:
+        raise ValueError(f"max-concurrent-alignments must be a non-negative integer, got: '{max_concurrent}'")
+
+    return max_concurrent or os.cpu_count() or 1
+
+
+def get_alignment_admission_path():
+    """
+    Returns the directory of the host-wide queue of the alignment tasks, see alignment_admission.
+    admission-path of the sequence alignment settings, relative paths are resolved from the app directory.
+    Defaults to the .alignment_admission directory of the data path, or of the directory of the database in db mode,
+    so the slots are only shared by the workers serving the same data.
+    """
+    alignment_settings = get_sequence_alignment_settings()
+    admission_path = alignment_settings.get("admission-path", "")
+    if admission_path:
+        admission_path = Path(admission_path)
+        if admission_path.is_absolute():
+            return admission_path.resolve()
+        return (package_app_path / admission_path).resolve()
+
+    return _get_hidden_data_directory(".alignment_admission")
+
+
+def is_alignment_queue_metrics_enabled():
+    alignment_settings = get_sequence_alignment_settings()
+    return alignment_settings.get("alignment-queue-metrics", False)
+
+
+def get_max_alignments_per_target():
+    """
+    Returns the maximum number of co-optimal alignments reported per target sequence, default 1.
+    """
+    alignment_settings = get_sequence_alignment_settings()
+    max_alignments = alignment_settings.get("max-alignments-per-target", 1)
+
+    if not isinstance(max_alignments, int) or isinstance(max_alignments, bool) or max_alignments < 1:
+        raise ValueError(f"max-alignments-per-target must be a positive integer, got: '{max_alignments}'")
+
+    return max_alignments
+
+
+def is_alignment_cache_enabled():
+    alignment_settings = get_sequence_alignment_settings()
+    return alignment_settings.get("alignment-cache", False)
+
+
+def is_background_jobs_enabled():
+    alignment_settings = get_sequence_alignment_settings()
+    return alignment_settings.get("background-jobs", False)
+
+
+def is_exhaustive_sequence_search_enabled():
+    alignment_settings = get_sequence_alignment_settings()
+    return alignment_settings.get("exhaustive-search", True)
+
+
+def get_kmer_size():
+    """
+    Returns the k-mer length of the index used to prune the lab sequences of a search, default 3.
+    """
+    alignment_settings = get_sequence_alignment_settings()
+    kmer_size = alignment_settings.get("kmer-size", 3)
+
+    if not isinstance(kmer_size, int) or isinstance(kmer_size, bool) or kmer_size < 1:
+        raise ValueError(f"kmer-size must be a positive integer, got: '{kmer_size}'")
+
+    return kmer_size
+
+
+def get_kmer_min_shared_fraction():
+    """
+    Returns the minimum fraction of the query k-mers a lab sequence must share to be aligned, default 0.2.
+    """
+    alignment_settings = get_sequence_alignment_settings()
+    min_shared_fraction = alignment_settings.get("kmer-min-shared-fraction", 0.2)
+
+    if (
+        not isinstance(min_shared_fraction, (int, float))
+        or isinstance(min_shared_fraction, bool)
+        or not 0 <= min_shared_fraction <= 1
+    ):
+        raise ValueError(f"kmer-min-shared-fraction must be a number between 0 and 1, got: '{min_shared_fraction}'")
+
+    return min_shared_fraction
+
+
 def get_five_letter_id_prefix():
     """
     Returns the 5-letter ID prefix from environment variable or config.
@@ -19,12 +19,20 @@ Usage:
 """
 
 import hashlib
+import io
 import random
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from functools import partial
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
 
+import pandas as pd
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager import upload_staging, zip_stream
 from levseq_dash.app.data_manager.experiment import Experiment, MutagenesisMethod
+from levseq_dash.app.utils import u_seq_alignment, utils
 
 
 class BaseDataManager(ABC):
@@ -120,17 +128,56 @@ class BaseDataManager(ABC):
         pass
 
     @abstractmethod
-    def check_for_duplicate_experiment(self, new_csv_checksum: str) -> bool:
+    def _add_prepared_experiment(
+        self,
+        experiment_name: str,
+        experiment_date: str,
+        substrate: str,
+        product: str,
+        assay: str,
+        mutagenesis_method: MutagenesisMethod,
+        experiment_doi: str,
+        experiment_additional_info: str,
+        file_info: Dict[str, Any],
+        csv_bytes: bytes,
+        core_data_df: pd.DataFrame,
+        open_geometry_file: Optional[Callable[[], BinaryIO]],
+    ) -> str:
+        """
+        Store a new experiment from an experiment file that was already parsed and checked,
+        see prepare_experiment_file. Used by add_experiment_from_ui and add_staged_experiment_from_ui.
+
+        Args:
+            experiment_name ... experiment_additional_info: See add_experiment_from_ui.
+            file_info (Dict[str, Any]): Metadata of the experiment file, see prepare_experiment_file.
+            csv_bytes (bytes): CSV file to store, see prepare_experiment_file.
+            core_data_df (pd.DataFrame): Core data of the CSV file, see prepare_experiment_file.
+            open_geometry_file (Optional[Callable[[], BinaryIO]]): Callable returning the CIF/structure file
+                                                                   opened for reading, which is copied in
+                                                                   chunks. None without a structure file.
+
+        Returns:
+            str: UUID of the newly created experiment.
+        """
+        pass
+
+    @abstractmethod
+    def check_for_duplicate_experiment(self, new_csv_checksum: str, new_content_hash: Optional[str] = None) -> bool:
         """
         Check if an experiment with the given CSV checksum already exists.
 
         Args:
             new_csv_checksum (str): Checksum of the CSV data to check for duplicates
+            new_content_hash (Optional[str]): Normalized content hash of the CSV data to check for
+                                              near-duplicates, see calculate_content_hash
 
         Returns:
             bool: True if an experiment with this checksum already exists,
                   False if the experiment is unique
 
+        Raises:
+            ValueError: If a duplicate or near-duplicate experiment is detected.
+
         Note:
             The checksum comparison should be case-insensitive and use the same
             hashing algorithm across all implementations.
@@ -329,6 +376,292 @@ class BaseDataManager(ABC):
     # These methods provide common functionality that can be shared across
     # all data manager implementations. They can be overridden if needed.
 
+    def get_alignment_cache(self):
+        """
+        Get the alignment result cache of this data manager.
+
+        Implementations that can persist alignment results next to their data return an
+        AlignmentCache here, and invalidate the entries of an experiment when it is deleted.
+
+        Returns:
+            Optional[AlignmentCache]: The cache, or None if alignment results are not cached.
+        """
+        return None
+
+    def get_experiment_cache_stats(self) -> Dict:
+        """
+        Get the metrics of the loaded experiments cache of this data manager.
+
+        Implementations that cache loaded experiments report the hits, misses and evictions of the cache
+        and the memory it uses here.
+
+        Returns:
+            Dict: Cache metrics, empty if loaded experiments are not cached.
+        """
+        return {}
+
+    def get_experiment_cache_residency(self) -> Dict[str, List[Dict]]:
+        """
+        Get the experiments and structures in the loaded experiments cache of this data manager
+        and the memory they use.
+
+        Returns:
+            Dict[str, List[Dict]]: "tabular" and "structure" lists with one dictionary per cached entry,
+                                   empty if loaded experiments are not cached.
+        """
+        return {"tabular": [], "structure": []}
+
+    def get_candidate_lab_sequences(self, query_sequence: str) -> Dict[str, str]:
+        """
+        Get the lab sequences worth aligning against a query sequence.
+
+        Implementations that keep a sequence index can prune the lab sequences that can't
+        plausibly match the query. The default returns all lab sequences, i.e. an exhaustive search.
+
+        Args:
+            query_sequence (str): The query protein sequence
+
+        Returns:
+            Dict[str, str]: Dictionary mapping experiment UUIDs to their primary sequence strings.
+        """
+        return self.get_all_lab_sequences()
+
+    def get_experiment_variants_at_residues(self, experiment_uuid: str, residues: List[str]) -> pd.DataFrame:
+        """
+        Get the variants of an experiment with a substitution at any of the residues, e.g. for the related variants
+        of a sequence search.
+
+        Implementations that keep a residue index can look the variants up instead of scanning the data of the
+        experiment. The default scans the valid mutations of the experiment,
+        see Experiment.exp_get_processed_core_data_for_valid_mutation_extractions.
+
+        Args:
+            experiment_uuid (str): The unique identifier of the experiment
+            residues (List[str]): Residue numbers, e.g. ["45", "67"]
+
+        Returns:
+            pd.DataFrame: The valid mutation rows with a substitution at each residue, in the order of the
+                          residues and then of the rows in the experiment. A row with substitutions at several
+                          of the residues is returned once per residue. Empty if the experiment doesn't exist.
+        """
+        exp = self.get_experiment(experiment_uuid)
+        if exp is None:
+            return pd.DataFrame()
+
+        return u_seq_alignment.lookup_residues_in_experiment_data(
+            df_experiment_data=exp.exp_get_processed_core_data_for_valid_mutation_extractions(),
+            lookup_residues_list=residues,
+        )
+
+    def add_staged_experiment_from_ui(
+        self,
+        experiment_name: str,
+        experiment_date: str,
+        substrate: str,
+        product: str,
+        assay: str,
+        mutagenesis_method: MutagenesisMethod,
+        experiment_doi: str,
+        experiment_additional_info: str,
+        experiment_staging_token: str,
+        geometry_file_path: Optional[Path],
+    ) -> str:
+        """
+        Add a new experiment from UI input with an experiment file that was staged by the upload,
+        see upload_staging. The staged CSV file is stored as it is and the derived data and variant rows
+        are built from the staged core data frame, the file is not decoded or parsed again.
+        The staged file is removed once the experiment is added.
+
+        Args:
+            experiment_name ... experiment_additional_info: See add_experiment_from_ui.
+            experiment_staging_token (str): Token of the staged experiment file.
+            geometry_file_path (Optional[Path]): CIF/structure file, e.g. the file assembled by its chunked
+                                                 upload, see upload_staging.get_completed_file_upload. It is
+                                                 copied in chunks and is left in place.
+
+        Returns:
+            str: UUID of the newly created experiment.
+
+        Raises:
+            ValueError: If the staged file doesn't exist, e.g. because it expired.
+        """
+        file_info, csv_bytes, core_data_df = upload_staging.load_staged_experiment_file(experiment_staging_token)
+
+        experiment_uuid = self._add_prepared_experiment(
+            experiment_name=experiment_name,
+            experiment_date=experiment_date,
+            substrate=substrate,
+            product=product,
+            assay=assay,
+            mutagenesis_method=mutagenesis_method,
+            experiment_doi=experiment_doi,
+            experiment_additional_info=experiment_additional_info,
+            file_info=file_info,
+            csv_bytes=csv_bytes,
+            core_data_df=core_data_df,
+            open_geometry_file=partial(open, geometry_file_path, "rb") if geometry_file_path else None,
+        )
+
+        upload_staging.discard_staged_experiment_file(experiment_staging_token)
+        return experiment_uuid
+
+    def get_experiment_top_variants(self, experiment_uuid: str) -> Optional[pd.DataFrame]:
+        """
+        Get the data of the top variants table of an experiment, see Experiment.exp_get_top_variants_data.
+
+        The callbacks of the experiment page use this with the experiment ID instead of posting the table
+        data back from the browser. Implementations that cache loaded experiments keep the data with them.
+
+        Args:
+            experiment_uuid (str): The unique identifier of the experiment
+
+        Returns:
+            Optional[pd.DataFrame]: The data, or None if the experiment doesn't exist.
+        """
+        exp = self.get_experiment(experiment_uuid)
+        if exp is None:
+            return None
+        return exp.exp_get_top_variants_data()
+
+    def get_experiment_files_size(self, experiment_uuid: str) -> int:
+        """
+        Get the total size of the JSON, CSV and CIF files of an experiment, e.g. to report the size of a download.
+
+        Args:
+            experiment_uuid (str): The unique identifier of the experiment
+
+        Returns:
+            int: Size in bytes, 0 if the experiment doesn't exist.
+        """
+        return sum(self._get_experiment_file_sizes(experiment_uuid).values())
+
+    def get_experiments_zip_size(self, experiments_to_zip: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Get the size of the ZIP archive iter_experiments_zipped writes, without writing it.
+        Used as the Content-Length of streamed downloads, so the browser can show their progress.
+
+        Args:
+            experiments_to_zip (List[Dict[str, Any]]): List of experiment metadata dictionaries to include
+
+        Returns:
+            Optional[int]: Size in bytes, or None if the input list is empty or the archive is too large
+                           to compute its size, see zip_stream.zip_size.
+        """
+        if not experiments_to_zip:
+            return None
+
+        def entries():
+            yield self._experiments_zip_metadata_file_name, len(self._experiments_zip_metadata(experiments_to_zip))
+
+            for exp_data in experiments_to_zip:
+                experiment_id = exp_data.get("experiment_id")
+                if experiment_id:
+                    file_sizes = self._get_experiment_file_sizes(experiment_id)
+                    for file_type in ["json", "csv", "cif"]:
+                        if file_type in file_sizes:
+                            yield self._experiment_zip_file_name(experiment_id, file_type), file_sizes[file_type]
+
+        return zip_stream.zip_size(entries())
+
+    def iter_experiments_zipped(self, experiments_to_zip: List[Dict[str, Any]]) -> Iterator[bytes]:
+        """
+        Create the ZIP archive of get_experiments_zipped in chunks while it is written.
+
+        The files of the experiments are read in chunks too, so the memory used doesn't depend on the
+        number or the size of the experiments. Used to stream downloads of many experiments.
+
+        Args:
+            experiments_to_zip (List[Dict[str, Any]]): List of experiment metadata dictionaries to include
+
+        Returns:
+            Iterator[bytes]: The chunks of the ZIP file, nothing if the input list is empty.
+
+        Raises:
+            Exception: While iterating, if the files of an experiment can't be read.
+        """
+        if not experiments_to_zip:
+            return iter(())
+
+        def entries():
+            # Add metadata CSV to root of zip
+            yield self._experiments_zip_metadata_file_name, self._experiments_zip_metadata(experiments_to_zip)
+
+            # Add experiment files from the storage
+            for exp_data in experiments_to_zip:
+                experiment_id = exp_data.get("experiment_id")
+                if experiment_id:
+                    try:
+                        file_openers = self._open_experiment_files(experiment_id)
+                    except Exception as e:
+                        raise Exception(f"Error adding files for experiment {experiment_id}: {e}")
+
+                    for file_type in ["json", "csv", "cif"]:
+                        if file_type in file_openers:
+                            yield self._experiment_zip_file_name(experiment_id, file_type), file_openers[file_type]
+
+        return zip_stream.iter_zip(entries())
+
+    # name of the metadata CSV file at the root of the ZIP archives of experiments
+    _experiments_zip_metadata_file_name = "EnzEngDB_Experiments.csv"
+
+    @staticmethod
+    def _experiments_zip_metadata(experiments_to_zip: List[Dict[str, Any]]) -> bytes:
+        """Get the metadata CSV file of the ZIP archive of experiments."""
+        # Use pandas to properly handle CSV escaping (commas, quotes, newlines in fields)
+        metadata_df = pd.DataFrame(experiments_to_zip)
+        return metadata_df.to_csv(index=False).encode("utf-8")
+
+    @staticmethod
+    def _experiment_zip_file_name(experiment_id: str, file_type: str) -> str:
+        """Get the name of a file of an experiment in the ZIP archive of experiments."""
+        return f"experiments/{experiment_id}/{experiment_id}.{file_type}"
+
+    def _zip_experiments(self, experiments_to_zip: List[Dict[str, Any]]) -> Optional[bytes]:
+        """
+        Create the ZIP archive of get_experiments_zipped in memory, see iter_experiments_zipped.
+
+        Args:
+            experiments_to_zip (List[Dict[str, Any]]): List of experiment metadata dictionaries to include
+
+        Returns:
+            Optional[bytes]: ZIP file content, or None if the input list is empty.
+        """
+        if not experiments_to_zip:
+            return None
+
+        return b"".join(self.iter_experiments_zipped(experiments_to_zip))
+
+    def _get_experiment_file_sizes(self, experiment_uuid: str) -> Dict[str, int]:
+        """
+        Get the sizes of the files of an experiment, the files _open_experiment_files opens.
+        The default reads the files with get_experiment_file_content, implementations can override this
+        to avoid reading them.
+
+        Args:
+            experiment_uuid (str): The unique identifier of the experiment
+
+        Returns:
+            Dict[str, int]: File types ('json', 'csv', 'cif') -> size in bytes. Empty if the files are not found.
+        """
+        files_content = self.get_experiment_file_content(experiment_uuid)
+        return {file_type: len(content) for file_type, content in files_content.items()}
+
+    def _open_experiment_files(self, experiment_uuid: str) -> Dict[str, Callable[[], BinaryIO]]:
+        """
+        Get the files of an experiment as callables that open them for reading, for iter_experiments_zipped.
+        The default reads the files with get_experiment_file_content, implementations can override this
+        to read them in chunks from their storage.
+
+        Args:
+            experiment_uuid (str): The unique identifier of the experiment
+
+        Returns:
+            Dict[str, Callable[[], BinaryIO]]: File types ('json', 'csv', 'cif') -> callable returning a binary
+                                               file object. Empty if the files are not found.
+        """
+        files_content = self.get_experiment_file_content(experiment_uuid)
+        return {file_type: partial(io.BytesIO, content) for file_type, content in files_content.items()}
+
     @staticmethod
     def generate_experiment_id(id_prefix: str) -> str:
         """
@@ -376,3 +709,68 @@ class BaseDataManager(ABC):
         sha256.update(file_bytes)
 
         return sha256.hexdigest()
+
+    @staticmethod
+    def calculate_content_hash(file_bytes) -> str:
+        """
+        Calculate the SHA256 hash of the normalized content of a CSV file.
+
+        The hash ignores the order of the columns and all whitespace in the column names and values,
+        so it detects near-duplicates of an experiment that the file checksum misses, e.g. a file
+        that was re-saved by a spreadsheet application with reordered columns. The values are compared
+        as they are parsed, so an uploaded file and the CSV file the data manager stores have the same hash.
+        """
+        if not file_bytes:
+            raise ValueError("file_bytes cannot be empty")
+
+        return BaseDataManager.calculate_dataframe_content_hash(pd.read_csv(io.BytesIO(file_bytes)))
+
+    @staticmethod
+    def calculate_dataframe_content_hash(df: pd.DataFrame) -> str:
+        """
+        Calculate the content hash of a CSV file from its parsed data, see calculate_content_hash.
+        The upload uses this so the file isn't parsed again. The data frame is not modified.
+        """
+        df = df.copy()
+        df.columns = ["".join(str(column).split()) for column in df.columns]
+        df = df[sorted(df.columns)]
+
+        # whitespace around numbers is already ignored by the parser
+        string_columns = df.select_dtypes(include="object").columns
+        df[string_columns] = df[string_columns].replace(r"\s+", "", regex=True)
+
+        return hashlib.sha256(df.to_csv(index=False).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def prepare_experiment_file(
+        df: pd.DataFrame, csv_checksum: str, csv_content_hash: str
+    ) -> Tuple[Dict[str, Any], bytes, pd.DataFrame]:
+        """
+        Get what the data managers store for an experiment file that was parsed and passed the sanity checks.
+
+        Args:
+            df (pd.DataFrame): The parsed experiment file.
+            csv_checksum (str): Checksum of the uploaded file, see calculate_file_checksum.
+            csv_content_hash (str): Content hash of the uploaded file, see calculate_content_hash.
+
+        Returns:
+            Tuple[Dict[str, Any], bytes, pd.DataFrame]: (metadata of the file: "parent_sequence", "plates_count",
+                                                         "csv_checksum" and "csv_content_hash",
+                                                         CSV file written from the parsed data, which is stored,
+                                                         core data of the parsed data with the columns and dtypes
+                                                         of utils.read_experiment_core_data, from which the
+                                                         derived data and the variant rows are stored)
+        """
+        file_info = {
+            # sanity check already checks that a parent row exists, note at this point the aa_sequence column
+            # exists. It is not read when an experiment is loaded because it uses up memory
+            "parent_sequence": Experiment.extract_parent_sequence(df),
+            "plates_count": len(Experiment.extract_plates_list(df)),
+            "csv_checksum": csv_checksum,
+            "csv_content_hash": csv_content_hash,
+        }
+        # the core columns in the order of the CSV file, as they are read from it
+        core_data_df = df[[column for column in df.columns if column in gs.experiment_core_data_list]].copy()
+        utils.set_core_data_categories(core_data_df)
+
+        return file_info, df.to_csv(index=False).encode("utf-8"), core_data_df
@@ -0,0 +1,169 @@
+"""
+Columnar storage of the experiment core data.
+
+With the "arrow" core data format of the disk data manager, the core columns of an experiment CSV file
+(gs.experiment_core_data_list) are also stored in an uncompressed Arrow IPC file next to it. Loading an
+experiment then memory maps that file instead of parsing the CSV file, which also has to tokenize the long
+sequence columns of every row. The smiles, plate and well columns are dictionary encoded in the file and are
+loaded as categories, with the same dtypes as utils.read_experiment_core_data reads from the CSV file.
+
+The CSV file stays the source of truth and is still used for downloads. Like the derived data sidecars,
+an Arrow file records the size and modification time of the CSV file it was written from and a stale file
+is ignored until it is regenerated, e.g. with the backfill command:
+
+    python -m levseq_dash.app.data_manager.core_data --data-path /path/to/data
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager.derived_data import is_derived_from_csv, source_csv_metadata
+from levseq_dash.app.utils import utils
+
+# bump this version when the layout of the file changes, existing files then become stale
+CORE_DATA_VERSION = 1
+
+core_data_file_suffix = ".core.arrow"
+
+# repeated values, stored dictionary encoded
+categorical_columns = gs.experiment_core_data_categorical_list
+
+
+def get_core_data_file_path(csv_file_path) -> Path:
+    """Returns the path of the core data file of an experiment CSV file, e.g. {uuid}.core.arrow"""
+    return Path(csv_file_path).with_suffix(core_data_file_suffix)
+
+
+def write_core_data_file(csv_file_path, data_df: pd.DataFrame | None = None):
+    """
+    Write the core data file of an experiment CSV file.
+
+    The file is written to a temporary file first so a reader never sees a partially written file.
+
+    Args:
+        csv_file_path: Path of the experiment CSV file.
+        data_df: Core data of the CSV file, e.g. of an upload that was already parsed, see
+                 BaseDataManager.prepare_experiment_file. Read from the CSV file if None.
+
+    Returns:
+        Path: Path of the core data file.
+    """
+    csv_file_path = Path(csv_file_path)
+    file_path = get_core_data_file_path(csv_file_path)
+
+    if data_df is None:
+        data_df = utils.read_experiment_core_data(csv_file_path)
+    table = pa.Table.from_pandas(data_df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), **source_csv_metadata(csv_file_path, CORE_DATA_VERSION)}
+    )
+
+    temp_file_path = file_path.with_name(f"{file_path.name}.tmp")
+    # uncompressed, so the file can be memory mapped without copying the columns
+    with pa.OSFile(str(temp_file_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=None)) as writer:
+            writer.write_table(table)
+    os.replace(temp_file_path, file_path)
+    return file_path
+
+
+def is_core_data_file_current(csv_file_path) -> bool:
+    """
+    Check whether the core data file of an experiment CSV file exists and was written from this CSV file
+    with the current version of the layout.
+    """
+    try:
+        with pa.memory_map(str(get_core_data_file_path(csv_file_path))) as source:
+            schema_metadata = pa.ipc.open_file(source).schema.metadata
+    except (OSError, pa.ArrowException):
+        return False
+
+    return is_derived_from_csv(schema_metadata, csv_file_path, CORE_DATA_VERSION)
+
+
+def read_core_data_file(csv_file_path) -> pd.DataFrame | None:
+    """
+    Read the core data of an experiment from its memory-mapped core data file.
+
+    Returns:
+        pd.DataFrame | None: The core data with the dtypes of utils.read_experiment_core_data(csv_file_path),
+                             or None if the file is missing, stale or unreadable.
+    """
+    try:
+        with pa.memory_map(str(get_core_data_file_path(csv_file_path))) as source:
+            reader = pa.ipc.open_file(source)
+            if not is_derived_from_csv(reader.schema.metadata, csv_file_path, CORE_DATA_VERSION):
+                return None
+            table = reader.read_all()
+
+            # the dictionary encoded columns are loaded as categories, so each distinct value is a single Python
+            # string instead of one per row. split_blocks keeps numeric columns without nulls as read-only views
+            # of the memory map, so their pages are shared with the other workers that load the same experiment
+            data_df = table.to_pandas(split_blocks=True)
+    except (OSError, pa.ArrowException):
+        return None
+
+    # Arrow nulls of string columns are converted to None, the CSV reader uses NaN
+    for column in data_df.select_dtypes(include="object").columns:
+        missing = data_df[column].isna()
+        if missing.any():
+            data_df.loc[missing, column] = np.nan
+
+    return data_df
+
+
+def backfill_core_data(data_path, force=False) -> dict:
+    """
+    Write the missing and stale core data files of all experiments in a data directory.
+
+    Args:
+        data_path: Data directory with the UUID layout of DiskDataManager.
+        force: Regenerate all core data files, including the current ones.
+
+    Returns:
+        dict: Number of "written", "current" and "failed" experiments.
+    """
+    counts = {"written": 0, "current": 0, "failed": 0}
+
+    for json_file in sorted(Path(data_path).rglob("*.json")):
+        csv_file_path = json_file.with_suffix(".csv")
+        # directories without experiment data, e.g. the DELETED_EXP folder, are skipped
+        if not csv_file_path.exists() or json_file.parent.name != json_file.stem:
+            continue
+
+        if not force and is_core_data_file_current(csv_file_path):
+            counts["current"] += 1
+            continue
+
+        try:
+            write_core_data_file(csv_file_path)
+            counts["written"] += 1
+        except Exception as e:
+            print(f"Experiment {json_file.stem}: {e}")
+            counts["failed"] += 1
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the missing and stale core data files of experiments.")
+    parser.add_argument("--data-path", required=True, type=Path, help="data directory of the disk data manager")
+    parser.add_argument("--force", action="store_true", help="regenerate all files, including the current ones")
+    args = parser.parse_args()
+
+    if not args.data_path.is_dir():
+        parser.error(f"Data directory not found at {args.data_path}")
+
+    counts = backfill_core_data(args.data_path, force=args.force)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
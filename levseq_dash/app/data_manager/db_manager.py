@@ -0,0 +1,971 @@
+"""
+SQLite-based data manager implementation.
+
+This module provides the DatabaseDataManager class of the db storage mode, which stores the experiments
+in an embedded SQLite database file instead of the UUID directories of the disk data manager:
+
+    experiments        experiment ID, CSV checksum and content hash, parent sequence and the metadata as JSON
+    experiment_files   the CSV and CIF files of the experiment, for downloads and the structure viewer
+    variants           the core data rows of the experiments (gs.experiment_core_data_list)
+    variant_residues   residue number -> variant rows with a substitution at that residue
+
+The checksums, the content hashes and the residues are indexed, so the duplicate checks and the residue
+lookups are indexed queries instead of scans of every experiment. Every worker reads the database directly,
+so the experiments uploaded or deleted by another worker are seen without a refresh.
+
+An existing data directory of the disk data manager is migrated with:
+
+    python -m levseq_dash.app.data_manager.db_manager --data-path /path/to/data --database-path /path/to/db
+"""
+
+import argparse
+import base64
+import functools
+import io
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.config import settings
+from levseq_dash.app.data_manager import derived_data, metadata_manifest
+from levseq_dash.app.data_manager.base import BaseDataManager
+from levseq_dash.app.data_manager.experiment import Experiment, MutagenesisMethod, valid_mutation_columns
+from levseq_dash.app.data_manager.experiment_cache import ExperimentCache
+from levseq_dash.app.sequence_aligner.alignment_cache import AlignmentCache
+from levseq_dash.app.sequence_aligner.kmer_index import KmerIndex
+from levseq_dash.app.utils import utils
+from levseq_dash.app.utils.u_protein_viewer import substitution_indices_pattern
+
+# bump this version when the schema changes, databases with another version are rejected
+SCHEMA_VERSION = 1
+
+_variant_columns = ", ".join(gs.experiment_core_data_list)
+
+# size of the chunks the geometry file of an uploaded experiment is written into its blob in
+_blob_chunk_size = 1024 * 1024
+
+_schema = [
+    """
+    CREATE TABLE IF NOT EXISTS experiments (
+        experiment_id TEXT PRIMARY KEY,
+        csv_checksum TEXT NOT NULL,
+        content_hash TEXT,
+        parent_sequence TEXT NOT NULL,
+        metadata TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_experiments_csv_checksum ON experiments (csv_checksum)",
+    "CREATE INDEX IF NOT EXISTS idx_experiments_content_hash ON experiments (content_hash)",
+    """
+    CREATE TABLE IF NOT EXISTS experiment_files (
+        experiment_id TEXT PRIMARY KEY,
+        csv BLOB NOT NULL,
+        cif BLOB NOT NULL
+    )
+    """,
+    # the rows of an experiment are stored together, ordered by their row number in the CSV file
+    f"""
+    CREATE TABLE IF NOT EXISTS variants (
+        experiment_id TEXT NOT NULL,
+        row_number INTEGER NOT NULL,
+        {_variant_columns},
+        PRIMARY KEY (experiment_id, row_number)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS variant_residues (
+        residue INTEGER NOT NULL,
+        experiment_id TEXT NOT NULL,
+        row_number INTEGER NOT NULL,
+        PRIMARY KEY (residue, experiment_id, row_number)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_variant_residues_experiment ON variant_residues (experiment_id)",
+    # incremented by every added or deleted experiment, the workers compare it to keep their k-mer index
+    # and their loaded experiments cache current
+    "CREATE TABLE IF NOT EXISTS experiments_generation (id INTEGER PRIMARY KEY CHECK (id = 0), generation INTEGER)",
+    "INSERT OR IGNORE INTO experiments_generation VALUES (0, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_inserted AFTER INSERT ON experiments
+    BEGIN UPDATE experiments_generation SET generation = generation + 1; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS experiments_deleted AFTER DELETE ON experiments
+    BEGIN UPDATE experiments_generation SET generation = generation + 1; END
+    """,
+]
+
+
+def connect(database_path):
+    """Open a connection to the database, waiting for the write lock of another worker instead of failing."""
+    return sqlite3.connect(database_path, timeout=10)
+
+
+def create_schema(connection):
+    """
+    Create the tables of an empty database.
+
+    Raises:
+        ValueError: If the database has another schema version.
+    """
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version == SCHEMA_VERSION:
+        return
+    if version != 0:
+        raise ValueError(f"Database schema version {version} is not supported, expected {SCHEMA_VERSION}")
+
+    # WAL lets readers in other workers proceed while one worker writes
+    connection.execute("PRAGMA journal_mode=WAL")
+    with connection:
+        for statement in _schema:
+            connection.execute(statement)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def insert_experiment(
+    connection,
+    experiment_uuid: str,
+    metadata: dict,
+    csv_bytes: bytes,
+    cif_bytes: bytes,
+    data_df: pd.DataFrame | None = None,
+):
+    """
+    Insert an experiment, its files, its core data rows and its residue index. The caller commits.
+    The content hash of experiments that were uploaded before it was stored in their metadata is calculated.
+
+    Args:
+        connection: Database connection.
+        experiment_uuid: UUID of the experiment.
+        metadata: Metadata of the experiment, see DiskDataManager.add_experiment_from_ui.
+        csv_bytes: Content of the experiment CSV file.
+        cif_bytes: Content of the geometry file.
+        data_df: Core data of the CSV file, e.g. of an upload that was already parsed, see
+                 BaseDataManager.prepare_experiment_file. Read from the CSV file if None.
+    """
+    if data_df is None:
+        data_df = pd.read_csv(io.BytesIO(csv_bytes), usecols=gs.experiment_core_data_list)
+    data_df = data_df[gs.experiment_core_data_list].reset_index(drop=True)
+
+    connection.execute(
+        "INSERT INTO experiments VALUES (?, ?, ?, ?, ?)",
+        (
+            experiment_uuid,
+            metadata.get("csv_checksum", ""),
+            metadata.get("csv_content_hash") or BaseDataManager.calculate_content_hash(csv_bytes),
+            metadata.get("parent_sequence", ""),
+            json.dumps(metadata),
+        ),
+    )
+    connection.execute("INSERT INTO experiment_files VALUES (?, ?, ?)", (experiment_uuid, csv_bytes, cif_bytes))
+
+    # numpy values can't be bound, NaN is stored as NULL
+    rows = data_df.astype(object).where(data_df.notna(), None)
+    placeholders = ", ".join("?" * len(gs.experiment_core_data_list))
+    connection.executemany(
+        f"INSERT INTO variants VALUES (?, ?, {placeholders})",
+        ((experiment_uuid, row_number, *row) for row_number, row in enumerate(rows.itertuples(index=False))),
+    )
+
+    # residue indices of each substitution string, e.g. "A45S_D67F" -> 45, 67
+    residues = data_df[gs.c_substitutions].str.findall(substitution_indices_pattern).explode().dropna()
+    connection.executemany(
+        "INSERT INTO variant_residues VALUES (?, ?, ?)",
+        sorted({(int(residue), experiment_uuid, int(row_number)) for row_number, residue in residues.items()}),
+    )
+
+
+def _write_cif_blob(connection, experiment_uuid: str, geometry_file: BinaryIO):
+    """Write the geometry file of an inserted experiment into its cif blob in chunks. The caller commits."""
+    size = geometry_file.seek(0, os.SEEK_END)
+    geometry_file.seek(0)
+
+    connection.execute("UPDATE experiment_files SET cif = zeroblob(?) WHERE experiment_id = ?", (size, experiment_uuid))
+    (rowid,) = connection.execute(
+        "SELECT rowid FROM experiment_files WHERE experiment_id = ?", (experiment_uuid,)
+    ).fetchone()
+    with connection.blobopen("experiment_files", "cif", rowid) as blob:
+        while chunk := geometry_file.read(_blob_chunk_size):
+            blob.write(chunk)
+
+
+def read_experiments_generation(connection) -> int:
+    """Returns the counter incremented by every experiment added to or deleted from the database."""
+    return connection.execute("SELECT generation FROM experiments_generation").fetchone()[0]
+
+
+def read_variants(connection, experiment_uuid: str) -> pd.DataFrame:
+    """
+    Read the core data rows of an experiment.
+
+    Returns:
+        pd.DataFrame: The core data with the dtypes of utils.read_experiment_core_data(csv_file),
+                      empty if the experiment doesn't exist.
+    """
+    return _read_core_data_rows(
+        connection, "FROM variants WHERE variants.experiment_id = ? ORDER BY variants.row_number", (experiment_uuid,)
+    )
+
+
+def _read_core_data_rows(connection, query: str, params: tuple) -> pd.DataFrame:
+    """Read the core data columns of the variants selected by a query from its FROM clause on."""
+    data_df = pd.read_sql_query(
+        "SELECT " + ", ".join(f"variants.{column}" for column in gs.experiment_core_data_list) + f" {query}",
+        connection,
+        params=params,
+    )
+
+    # NULLs of string columns are read as None, the CSV reader uses NaN
+    for column in data_df.select_dtypes(include="object").columns:
+        missing = data_df[column].isna()
+        if missing.any():
+            data_df.loc[missing, column] = np.nan
+
+    return utils.set_core_data_categories(data_df)
+
+
+def migrate_disk_data(data_path, database_path) -> dict:
+    """
+    Copy the experiments of a data directory of the disk data manager into a database.
+    Experiments that are already in the database are skipped, so an interrupted migration can be run again.
+
+    Args:
+        data_path: Data directory with the UUID layout of DiskDataManager.
+        database_path: Path of the SQLite database, created if it doesn't exist.
+
+    Returns:
+        dict: Number of "migrated", "existing" and "failed" experiments, and the "errors" of the failed
+              experiments, experiment UUID -> error message.
+    """
+    counts = {"migrated": 0, "existing": 0, "failed": 0, "errors": {}}
+
+    with closing(connect(database_path)) as connection:
+        create_schema(connection)
+        existing = {row[0] for row in connection.execute("SELECT experiment_id FROM experiments")}
+
+        for experiment_dir in metadata_manifest.list_experiment_dirs(data_path):
+            experiment_dir = Path(experiment_dir)
+            experiment_uuid = experiment_dir.name
+            try:
+                # directories without experiment data, e.g. the DELETED_EXP folder, are skipped
+                metadata = metadata_manifest.load_experiment_metadata(experiment_dir)
+                if metadata is None:
+                    continue
+
+                if experiment_uuid in existing:
+                    counts["existing"] += 1
+                    continue
+
+                with connection:
+                    insert_experiment(
+                        connection,
+                        experiment_uuid,
+                        metadata,
+                        csv_bytes=(experiment_dir / f"{experiment_uuid}.csv").read_bytes(),
+                        cif_bytes=(experiment_dir / f"{experiment_uuid}.cif").read_bytes(),
+                    )
+                counts["migrated"] += 1
+            except Exception as e:
+                counts["failed"] += 1
+                counts["errors"][experiment_uuid] = str(e)
+
+    return counts
+
+
+def _metadata_file_bytes(metadata: str) -> bytes:
+    # same layout as the metadata files of the disk data manager
+    return json.dumps(json.loads(metadata), indent=4).encode("utf-8")
+
+
+class _BlobFile:
+    """Read-only file object of a blob of the experiment_files table, with its own connection."""
+
+    def __init__(self, database_path, column: str, rowid: int):
+        self._connection = connect(database_path)
+        try:
+            self._blob = self._connection.blobopen("experiment_files", column, rowid, readonly=True)
+        except Exception:
+            self._connection.close()
+            raise
+
+    def read(self, size: int = -1) -> bytes:
+        return self._blob.read(size)
+
+    def close(self):
+        self._blob.close()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DatabaseDataManager(BaseDataManager):
+    """
+    SQLite-based data manager for storing experiment data in a single database file.
+
+    Every method opens its own short-lived connection so the manager is safe to use from forked
+    gunicorn workers. Loaded experiments are cached per worker like in the disk data manager.
+    """
+
+    def __init__(self):
+        """
+        Initialize the database data manager.
+        """
+        super().__init__()
+
+        # Set up the database
+        self._setup_database()
+
+        # Cache for loaded experiment objects (UUID -> Experiment object), bounded by their memory
+        # it is cleared when the experiments generation of the database changed, see get_experiment
+        self._experiments_core_data_cache = ExperimentCache(
+            max_tabular_bytes=int(settings.get_experiment_cache_tabular_mb() * 1024 * 1024),
+            max_structure_bytes=int(settings.get_experiment_cache_structure_mb() * 1024 * 1024),
+        )
+        self._experiments_cache_generation = None
+
+        # alignment results shared by all workers, stored in the database file
+        self._setup_alignment_cache()
+
+        # k-mer index of the parent sequences, used to prune the targets of a sequence search
+        # it is brought up to date when the experiments generation of the database changed
+        self._kmer_index = KmerIndex(k=settings.get_kmer_size())
+        self._kmer_index_sequences = {}
+        self._kmer_index_generation = None
+
+        self.five_letter_id_prefix = settings.get_five_letter_id_prefix()
+
+        # read the assay file and set up the assay list
+        self._load_assay_list()
+
+    # -----------------------
+    #       ADD DATA
+    # -----------------------
+
+    def add_experiment_from_ui(
+        self,
+        experiment_name,
+        experiment_date,
+        substrate,
+        product,
+        assay,
+        mutagenesis_method: MutagenesisMethod,  # epPCR or SSM
+        experiment_doi: str,
+        experiment_additional_info: str,
+        experiment_content_base64_string,
+        geometry_content_base64_string,
+    ) -> str:
+        """
+        Add a new experiment from UI upload and return its UUID.
+
+        Args:
+            experiment_name: Name of the experiment.
+            experiment_date: Date the experiment was conducted.
+            substrate: Substrate used in the experiment.
+            product: Product of the experiment.
+            assay: Assay technique used.
+            mutagenesis_method: Method used (epPCR or SSM).
+            experiment_doi: DOI reference for the experiment.
+            experiment_additional_info: Additional notes or information.
+            experiment_content_base64_string: Base64-encoded CSV file content.
+            geometry_content_base64_string: Base64-encoded geometry file content.
+
+        Returns:
+            str: UUID of the newly created experiment.
+        """
+        # Duplicate data check has already passed in upload by check_for_duplicate_experiment
+        # Sanity check has already passed in upload by run_sanity_checks_on_experiment_file
+
+        df, experiment_bytes = utils.decode_csv_file_base64_string_to_dataframe(experiment_content_base64_string)
+        file_info, csv_bytes, core_data_df = self.prepare_experiment_file(
+            df, self.calculate_file_checksum(experiment_bytes), self.calculate_dataframe_content_hash(df)
+        )
+
+        return self._add_prepared_experiment(
+            experiment_name=experiment_name,
+            experiment_date=experiment_date,
+            substrate=substrate,
+            product=product,
+            assay=assay,
+            mutagenesis_method=mutagenesis_method,
+            experiment_doi=experiment_doi,
+            experiment_additional_info=experiment_additional_info,
+            file_info=file_info,
+            csv_bytes=csv_bytes,
+            core_data_df=core_data_df,
+            open_geometry_file=(
+                functools.partial(io.BytesIO, base64.b64decode(geometry_content_base64_string))
+                if geometry_content_base64_string
+                else None
+            ),
+        )
+
+    def _add_prepared_experiment(
+        self,
+        experiment_name,
+        experiment_date,
+        substrate,
+        product,
+        assay,
+        mutagenesis_method: MutagenesisMethod,
+        experiment_doi: str,
+        experiment_additional_info: str,
+        file_info: dict,
+        csv_bytes: bytes,
+        core_data_df: pd.DataFrame,
+        open_geometry_file,
+    ) -> str:
+        """
+        Add a new experiment from an experiment file that was already parsed and checked and return its UUID,
+        see BaseDataManager.prepare_experiment_file.
+        """
+        experiment_uuid = self.generate_experiment_id(id_prefix=self.five_letter_id_prefix)
+        upload_time_stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        metadata = {
+            "experiment_id": experiment_uuid,
+            "experiment_name": experiment_name,
+            "doi": experiment_doi,
+            "experiment_date": experiment_date,
+            "substrate": substrate,
+            "product": product,
+            "assay": assay,
+            "mutagenesis_method": mutagenesis_method,
+            "parent_sequence": file_info["parent_sequence"],
+            "plates_count": file_info["plates_count"],
+            "csv_checksum": file_info["csv_checksum"],
+            "csv_content_hash": file_info["csv_content_hash"],
+            "additional_information": experiment_additional_info,
+            "upload_time_stamp": upload_time_stamp,
+        }
+
+        # the CSV file is written from the parsed data, as the disk data manager stores it
+        with closing(self._connect()) as connection, connection:
+            insert_experiment(connection, experiment_uuid, metadata, csv_bytes, b"", core_data_df)
+            if open_geometry_file:
+                with open_geometry_file() as geometry_file:
+                    _write_cif_blob(connection, experiment_uuid, geometry_file)
+
+        return experiment_uuid
+
+    def check_for_duplicate_experiment(self, new_csv_checksum: str, new_content_hash: str | None = None):
+        """
+        Check if an experiment with the same checksum, or the same normalized content, already exists.
+
+        Args:
+            new_csv_checksum: Checksum of the new experiment CSV file.
+            new_content_hash: Normalized content hash of the new experiment CSV file, see calculate_content_hash.
+
+        Returns:
+            bool: False if no duplicate found.
+
+        Raises:
+            ValueError: If a duplicate or near-duplicate experiment is detected.
+        """
+        with closing(self._connect()) as connection:
+            duplicate = connection.execute(
+                "SELECT experiment_id, metadata FROM experiments WHERE csv_checksum = ? ORDER BY experiment_id LIMIT 1",
+                (new_csv_checksum,),
+            ).fetchone()
+            near_duplicate = None
+            if duplicate is None and new_content_hash:
+                near_duplicate = connection.execute(
+                    "SELECT experiment_id, metadata FROM experiments WHERE content_hash = ? "
+                    "ORDER BY experiment_id LIMIT 1",
+                    (new_content_hash,),
+                ).fetchone()
+
+        if duplicate is not None:
+            experiment_uuid, metadata = duplicate
+            existing_name = json.loads(metadata).get("experiment_name", "Unknown")
+            raise ValueError(
+                f"DUPLICATE experiment data detected! "
+                f"An experiment with identical CSV data already exists with UUID: {experiment_uuid}"
+                f" and Name: {existing_name}."
+            )
+
+        if near_duplicate is not None:
+            experiment_uuid, metadata = near_duplicate
+            existing_name = json.loads(metadata).get("experiment_name", "Unknown")
+            raise ValueError(
+                f"NEAR-DUPLICATE experiment data detected! "
+                f"An experiment with the same CSV data, ignoring the column order and whitespace, already exists "
+                f"with UUID: {experiment_uuid} and Name: {existing_name}."
+            )
+        return False
+
+    # ---------------------------
+    #    Delete
+    # ---------------------------
+    def delete_experiment(self, experiment_uuid: str) -> bool:
+        """
+        Delete an experiment by UUID.
+
+        Returns:
+            bool: True if deleted successfully.
+        """
+        try:
+            with closing(self._connect()) as connection, connection:
+                deleted = connection.execute(
+                    "DELETE FROM experiments WHERE experiment_id = ?", (experiment_uuid,)
+                ).rowcount
+                for table in ["experiment_files", "variants", "variant_residues"]:
+                    connection.execute(f"DELETE FROM {table} WHERE experiment_id = ?", (experiment_uuid,))
+        except Exception as e:
+            raise RuntimeError(f"Error deleting experiment {experiment_uuid} from the database: {e}") from e
+
+        if not deleted:
+            return False
+
+        # Remove from cache if it exists
+        self._experiments_core_data_cache.remove(experiment_uuid)
+
+        # Remove the cached alignment results of this experiment
+        if self._alignment_cache is not None:
+            self._alignment_cache.invalidate_experiment(experiment_uuid)
+
+        return True
+
+    # ---------------------------
+    #    DATA RETRIEVAL: ALL
+    # ---------------------------
+    def get_all_lab_experiments_with_meta_data(self):
+        """
+        Get metadata for all experiments.
+
+        Returns:
+            list: List of experiment metadata dictionaries, ordered by UUID.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT metadata FROM experiments ORDER BY experiment_id").fetchall()
+        return [json.loads(metadata) for (metadata,) in rows]
+
+    def get_all_lab_sequences(self):
+        """
+        Get parent sequences for all experiments.
+
+        Returns:
+            dict: Dictionary mapping experiment UUIDs to parent sequences.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT experiment_id, parent_sequence FROM experiments ORDER BY experiment_id"
+            ).fetchall()
+        return dict(rows)
+
+    def get_candidate_lab_sequences(self, query_sequence: str):
+        """
+        Get the parent sequences that share enough k-mers with the query to be worth aligning.
+
+        Args:
+            query_sequence: The query protein sequence.
+
+        Returns:
+            dict: Dictionary mapping experiment UUIDs to parent sequences, ordered by shared k-mers.
+        """
+        self._update_kmer_index()
+        candidates = self._kmer_index.rank_candidates(
+            query_sequence, min_shared_fraction=settings.get_kmer_min_shared_fraction()
+        )
+
+        utils.log_with_context(
+            f"[LOG] k-mer index kept {len(candidates)}/{len(self._kmer_index_sequences)} lab sequences",
+            log_flag=settings.is_data_manager_logging_enabled(),
+        )
+
+        return {experiment_uuid: self._kmer_index_sequences[experiment_uuid] for experiment_uuid, _ in candidates}
+
+    def get_experiment_variants_at_residues(self, experiment_uuid: str, residues: list[str]) -> pd.DataFrame:
+        """
+        Get the variants of an experiment with a substitution at any of the residues, looked up in the residue
+        index. Only the rows at the residues and the parent rows, for the fitness ratios, are read.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+            residues: Residue numbers, e.g. ["45", "67"].
+
+        Returns:
+            pd.DataFrame: See BaseDataManager.get_experiment_variants_at_residues.
+        """
+        # the residues are compared to the digits of the substitutions, like lookup_residues_in_experiment_data
+        residue_numbers = [int(residue) for residue in map(str, residues) if residue.isdigit()]
+
+        with closing(self._connect()) as connection:
+            variants_dfs = [
+                _read_core_data_rows(
+                    connection,
+                    "FROM variant_residues JOIN variants USING (experiment_id, row_number) "
+                    "WHERE variant_residues.residue = ? AND variant_residues.experiment_id = ? "
+                    "ORDER BY variant_residues.row_number",
+                    (residue, experiment_uuid),
+                )
+                for residue in residue_numbers
+            ]
+            parent_df = _read_core_data_rows(
+                connection,
+                f"FROM variants WHERE variants.experiment_id = ? AND variants.{gs.c_substitutions} = ?",
+                (experiment_uuid, gs.hashtag_parent),
+            )
+
+        variants_df = pd.concat(variants_dfs, ignore_index=True) if variants_dfs else parent_df.iloc[:0]
+        if variants_df.empty:
+            return pd.DataFrame()
+
+        # the ratios only depend on the parent rows of each smiles and plate, the merges keep the row order
+        df = utils.calculate_group_mean_ratios_per_smiles_and_plate(
+            pd.concat([variants_df, parent_df], ignore_index=True)
+        ).iloc[: len(variants_df)]
+        df = df[derived_data.valid_mutation_mask(df)]
+        return df[[col for col in df.columns if col in valid_mutation_columns]].reset_index(drop=True)
+
+    # ---------------------------
+    #    DATA RETRIEVAL: PER EXPERIMENT
+    # ---------------------------
+    def get_experiment_metadata(self, experiment_uuid: str) -> dict | None:
+        """
+        Get metadata for a specific experiment.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            dict | None: Metadata dictionary, or None if not found.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT metadata FROM experiments WHERE experiment_id = ?", (experiment_uuid,)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def get_experiment(self, experiment_uuid: str) -> Experiment | None:
+        """
+        Get the Experiment object for a specific UUID.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            Experiment | None: Loaded experiment object with cached support, or None if not found.
+
+        Raises:
+            Exception: If loading from the database fails.
+        """
+        try:
+            with closing(self._connect()) as connection:
+                # Check cache first, unless another worker deleted or replaced an experiment since it was filled
+                self._check_experiments_cache_generation(connection)
+                exp = self._experiments_core_data_cache.get(experiment_uuid)
+                if exp is not None:
+                    return exp
+
+                # Load from the database
+                data_df = read_variants(connection, experiment_uuid)
+            if data_df.empty:
+                return None
+
+            exp = Experiment.from_core_data(
+                data_df, geometry_loader=functools.partial(self._load_geometry, experiment_uuid)
+            )
+            # Cache the loaded experiment
+            if not self._experiments_core_data_cache.put(experiment_uuid, exp):
+                utils.log_with_context(
+                    f"[LOG] Experiment {experiment_uuid} is larger than the experiment cache budgets and is not cached",
+                    log_flag=settings.is_data_manager_logging_enabled(),
+                )
+
+            return exp
+        except Exception as e:
+            raise Exception(f"Error loading experiment {experiment_uuid} from the database: {e}")
+
+    def get_experiment_top_variants(self, experiment_uuid: str) -> pd.DataFrame | None:
+        """
+        Get the data of the top variants table of an experiment. The data is computed once and kept
+        by the cached experiment, within the tabular budget of the experiment cache.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            pd.DataFrame | None: The data, or None if the experiment doesn't exist.
+        """
+        exp = self.get_experiment(experiment_uuid)
+        if exp is None:
+            return None
+
+        if exp.top_variants_df is None:
+            exp.exp_get_top_variants_data()
+            self._experiments_core_data_cache.update_size(experiment_uuid)
+        return exp.top_variants_df
+
+    def get_experiment_file_content(self, experiment_uuid: str) -> dict[str, bytes]:
+        """
+        Get experiment files content as bytes for a specific experiment.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            dict[str, bytes]: Dictionary with keys 'json', 'csv', 'cif' mapping to file contents.
+
+        Raises:
+            Exception: If reading from the database fails.
+        """
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(
+                    "SELECT experiments.metadata, experiment_files.csv, experiment_files.cif "
+                    "FROM experiments JOIN experiment_files USING (experiment_id) WHERE experiment_id = ?",
+                    (experiment_uuid,),
+                ).fetchone()
+        except Exception as e:
+            raise Exception(f"Error reading files for experiment: {experiment_uuid}: {e}")
+
+        if row is None:
+            return {}
+
+        metadata, csv_bytes, cif_bytes = row
+        return {
+            "json": _metadata_file_bytes(metadata),
+            "csv": csv_bytes,
+            "cif": cif_bytes,
+        }
+
+    # ---------------------------
+    #    DATA RETRIEVAL: MISC
+    # ---------------------------
+    def get_alignment_cache(self):
+        """
+        Get the alignment result cache stored in the database file.
+
+        Returns:
+            AlignmentCache | None: The cache, or None if it is disabled in the config.
+        """
+        return self._alignment_cache
+
+    def get_experiment_cache_stats(self):
+        """
+        Get the metrics of the loaded experiments cache of this worker.
+
+        Returns:
+            dict: See ExperimentCache.get_stats.
+        """
+        return self._experiments_core_data_cache.get_stats()
+
+    def get_experiment_cache_residency(self):
+        """
+        Get the experiments and structures in the loaded experiments cache of this worker and the memory they use.
+
+        Returns:
+            dict: See ExperimentCache.get_residency.
+        """
+        return self._experiments_core_data_cache.get_residency()
+
+    def get_assays(self):
+        """
+        Get the list of available assays.
+
+        Returns:
+            list: List of assay names.
+        """
+        return self.assay_list
+
+    def get_experiments_zipped(self, experiments_to_zip: list[dict[str]]) -> bytes | None:
+        """
+        Create a ZIP archive containing experiment data and metadata.
+
+        Args:
+            experiments_to_zip: List of experiment metadata dictionaries to include.
+
+        Returns:
+            bytes: ZIP file content, or None if input list is empty.
+        """
+        return self._zip_experiments(experiments_to_zip)
+
+    # ----------------------------
+    #    PRIVATE METHODS
+    # ---------------------------
+
+    def _setup_database(self):
+        """
+        Set up and validate the database, creating its tables if it is empty.
+
+        Raises:
+            FileNotFoundError: If the database doesn't exist and data modification is disabled.
+            ValueError: If the database has another schema version.
+        """
+        self.database_path = settings.get_database_path()
+
+        utils.log_with_context(
+            f"[LOG] Using database: {self.database_path}",
+            log_flag=settings.is_data_manager_logging_enabled(),
+        )
+
+        # a read-only instance doesn't create an empty database
+        if not self.database_path.exists() and not settings.is_data_modification_enabled():
+            raise FileNotFoundError(f"Database not found at {self.database_path}\n")
+
+        with closing(self._connect()) as connection:
+            create_schema(connection)
+
+    def _setup_alignment_cache(self):
+        """
+        Set up the alignment result cache in the database file if it is enabled in the config.
+        The cache is optional, if it can't be created the searches run without it.
+        """
+        self._alignment_cache = None
+        if settings.is_alignment_cache_enabled():
+            try:
+                self._alignment_cache = AlignmentCache(self.database_path)
+            except Exception as e:
+                utils.log_with_context(
+                    f"[LOG] Alignment cache disabled, could not open {self.database_path}: {e}",
+                    log_flag=settings.is_data_manager_logging_enabled(),
+                )
+
+    def _load_assay_list(self):
+        """
+        Load the list of assays from the assay file.
+        """
+        if settings.assay_file_path.exists():
+            assays = pd.read_csv(settings.assay_file_path, encoding="utf-8", usecols=["Technique"])
+            self.assay_list = assays["Technique"].tolist()
+
+    def _update_kmer_index(self):
+        """
+        Add the experiments added and remove the experiments deleted since the k-mer index was last updated,
+        by any worker.
+        """
+        with closing(self._connect()) as connection:
+            generation = read_experiments_generation(connection)
+            if generation == self._kmer_index_generation:
+                return
+            lab_sequences = dict(connection.execute("SELECT experiment_id, parent_sequence FROM experiments"))
+
+        for experiment_uuid in self._kmer_index_sequences.keys() - lab_sequences.keys():
+            self._kmer_index.remove(experiment_uuid)
+        for experiment_uuid in lab_sequences.keys() - self._kmer_index_sequences.keys():
+            self._kmer_index.add(experiment_uuid, lab_sequences[experiment_uuid])
+
+        self._kmer_index_sequences = lab_sequences
+        self._kmer_index_generation = generation
+
+    def _check_experiments_cache_generation(self, connection):
+        """
+        Clear the loaded experiments cache if an experiment was added or deleted, by any worker, since it was
+        last checked. A deleted experiment, or one that was deleted and stored again, is then loaded again.
+
+        Args:
+            connection: Database connection.
+        """
+        generation = read_experiments_generation(connection)
+        if generation != self._experiments_cache_generation:
+            self._experiments_core_data_cache.clear()
+            self._experiments_cache_generation = generation
+
+    def _load_geometry(self, experiment_uuid: str) -> bytes:
+        """
+        Load the geometry bytes of an experiment through the structure cache.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+        """
+        return self._experiments_core_data_cache.get_geometry(
+            experiment_uuid, functools.partial(self._read_geometry, experiment_uuid)
+        )
+
+    def _read_geometry(self, experiment_uuid: str) -> bytes:
+        """
+        Read the geometry bytes of an experiment from the database.
+
+        Raises:
+            ValueError: If the experiment has no geometry.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT cif FROM experiment_files WHERE experiment_id = ?", (experiment_uuid,)
+            ).fetchone()
+        if row is None or len(row[0]) == 0:
+            raise ValueError("Geometry file is empty.")
+        return row[0]
+
+    def _get_experiment_file_sizes(self, experiment_uuid: str) -> dict:
+        """
+        Get the sizes of the files of an experiment without reading the CSV and CIF blobs.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            dict: File types ('json', 'csv', 'cif') -> size in bytes. Empty if the experiment doesn't exist.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT experiments.metadata, length(experiment_files.csv), length(experiment_files.cif) "
+                "FROM experiments JOIN experiment_files USING (experiment_id) WHERE experiment_id = ?",
+                (experiment_uuid,),
+            ).fetchone()
+
+        if row is None:
+            return {}
+
+        metadata, csv_size, cif_size = row
+        return {"json": len(_metadata_file_bytes(metadata)), "csv": csv_size, "cif": cif_size}
+
+    def _open_experiment_files(self, experiment_uuid: str) -> dict:
+        """
+        Get the files of an experiment as callables that open them, so the CSV and CIF blobs are streamed
+        into a ZIP archive in chunks.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            dict: File types ('json', 'csv', 'cif') -> callable returning a binary file object.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT experiments.metadata, experiment_files.rowid "
+                "FROM experiments JOIN experiment_files USING (experiment_id) WHERE experiment_id = ?",
+                (experiment_uuid,),
+            ).fetchone()
+
+        if row is None:
+            return {}
+
+        metadata, rowid = row
+        return {
+            "json": functools.partial(io.BytesIO, _metadata_file_bytes(metadata)),
+            "csv": functools.partial(_BlobFile, self.database_path, "csv", rowid),
+            "cif": functools.partial(_BlobFile, self.database_path, "cif", rowid),
+        }
+
+    def _connect(self):
+        return connect(self.database_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy the experiments of a data directory into a database.")
+    parser.add_argument("--data-path", required=True, type=Path, help="data directory of the disk data manager")
+    parser.add_argument("--database-path", required=True, type=Path, help="SQLite database, created if missing")
+    args = parser.parse_args()
+
+    if not args.data_path.is_dir():
+        parser.error(f"Data directory not found at {args.data_path}")
+
+    counts = migrate_disk_data(args.data_path, args.database_path)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Derived experiment data sidecars.
+
+This module computes the per-row data that the experiment page and the sequence searches derive from the
+core experiment data (fitness ratios, valid mutation rows, residue indices and single-site positions) and
+stores it in a Parquet file next to the experiment CSV, so it isn't recomputed every time an experiment is loaded.
+
+A sidecar records the version of the derivation and the size and modification time of the CSV it was computed
+from. A sidecar with another version, or computed from another CSV, is stale and is ignored until it is
+regenerated, e.g. with the backfill command:
+
+    python -m levseq_dash.app.data_manager.derived_data --data-path /path/to/data
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.utils import utils
+from levseq_dash.app.utils.u_protein_viewer import substitution_indices_pattern
+
+# bump this version when compute_derived_data changes, existing sidecars then become stale
+DERIVED_DATA_VERSION = 1
+
+derived_data_file_suffix = ".derived.parquet"
+
+# columns of the sidecar that are not returned by calculate_group_mean_ratios_per_smiles_and_plate
+derived_only_columns = [gs.cc_valid_mutation, gs.cc_substitution_indices, gs.cc_single_site_position]
+
+_version_key = b"levseq_dash.version"
+_csv_size_key = b"levseq_dash.csv_size"
+_csv_mtime_key = b"levseq_dash.csv_mtime_ns"
+
+
+def get_derived_data_file_path(csv_file_path) -> Path:
+    """Returns the path of the sidecar of an experiment CSV file, e.g. {uuid}.derived.parquet"""
+    return Path(csv_file_path).with_suffix(derived_data_file_suffix)
+
+
+def source_csv_metadata(csv_file_path, version: int) -> dict:
+    """
+    Returns the schema metadata that ties a file derived from an experiment CSV file to that CSV file.
+
+    Args:
+        csv_file_path: Path of the experiment CSV file.
+        version: Version of the format of the derived file.
+    """
+    csv_stat = Path(csv_file_path).stat()
+    return {
+        _version_key: str(version).encode(),
+        _csv_size_key: str(csv_stat.st_size).encode(),
+        _csv_mtime_key: str(csv_stat.st_mtime_ns).encode(),
+    }
+
+
+def is_derived_from_csv(schema_metadata, csv_file_path, version: int) -> bool:
+    """
+    Check the schema metadata of a derived file against the experiment CSV file it was derived from.
+
+    Args:
+        schema_metadata: Schema metadata of the derived file, see source_csv_metadata.
+        csv_file_path: Path of the experiment CSV file.
+        version: Current version of the format of the derived file.
+
+    Returns:
+        bool: False if the version differs or the CSV file changed (or is missing).
+    """
+    try:
+        expected = source_csv_metadata(csv_file_path, version)
+    except OSError:
+        return False
+
+    schema_metadata = schema_metadata or {}
+    return all(schema_metadata.get(key) == value for key, value in expected.items())
+
+
+def valid_mutation_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Returns the mask of the rows with a valid mutation and fitness value, used for sequence alignments
+    and hot/cold spots.
+
+    Args:
+        df: Core data with numeric fitness values, see calculate_group_mean_ratios_per_smiles_and_plate.
+    """
+    # remove anything from the mutations column with # or - and drop rows where column has NaN values
+    # Notes: square brackets [] mean "match either # or -"
+    # na=True ensures missing values are also considered invalid
+    # ~ (bitwise NOT) negates the condition
+    # and drop rows where the fitness column has NaN values
+    return ~df[gs.c_substitutions].str.contains(r"[#-]", na=True) & df[gs.c_fitness_value].notna()
+
+
+def compute_derived_data(data_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the derived data of an experiment.
+
+    Args:
+        data_df: Core data of the experiment as read by Experiment.
+
+    Returns:
+        pd.DataFrame: One row per core data row with the columns of calculate_group_mean_ratios_per_smiles_and_plate
+                      and the derived_only_columns.
+    """
+    # the ratio calculation converts the fitness column in place, keep the core data as it was read
+    df = utils.calculate_group_mean_ratios_per_smiles_and_plate(data_df.copy())
+
+    df[gs.cc_valid_mutation] = valid_mutation_mask(df)
+
+    # residue indices of each substitution string, e.g. "A45S_D67F" -> ["45", "67"]
+    df[gs.cc_substitution_indices] = df[gs.c_substitutions].str.findall(substitution_indices_pattern)
+
+    # residue number of the single-site mutations, same pattern as the SSM plot
+    residue_capture_pattern = utils.get_single_site_mutation_pattern().replace(r"\d+", r"(\d+)")
+    single_site_residue = df[gs.c_substitutions].str.extract(residue_capture_pattern, expand=False)
+    df[gs.cc_single_site_position] = pd.to_numeric(single_site_residue).astype("Int64")
+
+    return df
+
+
+def write_derived_data_file(csv_file_path, data_df: pd.DataFrame | None = None):
+    """
+    Compute the derived data of an experiment CSV file and write its sidecar.
+
+    The sidecar is written to a temporary file first so a reader never sees a partially written file.
+
+    Args:
+        csv_file_path: Path of the experiment CSV file.
+        data_df: Core data of the CSV file, e.g. of an upload that was already parsed, see
+                 BaseDataManager.prepare_experiment_file. Read from the CSV file if None.
+
+    Returns:
+        Path: Path of the sidecar.
+    """
+    csv_file_path = Path(csv_file_path)
+    file_path = get_derived_data_file_path(csv_file_path)
+
+    if data_df is None:
+        data_df = utils.read_experiment_core_data(csv_file_path)
+    table = pa.Table.from_pandas(compute_derived_data(data_df))
+
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), **source_csv_metadata(csv_file_path, DERIVED_DATA_VERSION)}
+    )
+
+    temp_file_path = file_path.with_name(f"{file_path.name}.tmp")
+    pq.write_table(table, temp_file_path)
+    os.replace(temp_file_path, file_path)
+    return file_path
+
+
+def is_derived_data_file_current(csv_file_path) -> bool:
+    """
+    Check whether the sidecar of an experiment CSV file exists and was computed from this CSV file
+    with the current version of the derivation.
+    """
+    try:
+        schema_metadata = pq.read_schema(get_derived_data_file_path(csv_file_path)).metadata
+    except (OSError, pa.ArrowException):
+        return False
+
+    return is_derived_from_csv(schema_metadata, csv_file_path, DERIVED_DATA_VERSION)
+
+
+def read_derived_data_file(csv_file_path) -> pd.DataFrame | None:
+    """
+    Read the sidecar of an experiment CSV file.
+
+    Returns:
+        pd.DataFrame | None: The derived data, or None if the sidecar is missing, stale or unreadable.
+    """
+    if not is_derived_data_file_current(csv_file_path):
+        return None
+
+    try:
+        derived_df = pq.read_table(get_derived_data_file_path(csv_file_path)).to_pandas()
+    except (OSError, pa.ArrowException):
+        return None
+
+    # the sidecars written before the core data was read as categories have object columns
+    return utils.set_core_data_categories(derived_df)
+
+
+def backfill_derived_data(data_path, force=False) -> dict:
+    """
+    Write the missing and stale sidecars of all experiments in a data directory.
+
+    Args:
+        data_path: Data directory with the UUID layout of DiskDataManager.
+        force: Regenerate all sidecars, including the current ones.
+
+    Returns:
+        dict: Number of "written", "current" and "failed" experiments.
+    """
+    counts = {"written": 0, "current": 0, "failed": 0}
+
+    for json_file in sorted(Path(data_path).rglob("*.json")):
+        csv_file_path = json_file.with_suffix(".csv")
+        # directories without experiment data, e.g. the DELETED_EXP folder, are skipped
+        if not csv_file_path.exists() or json_file.parent.name != json_file.stem:
+            continue
+
+        if not force and is_derived_data_file_current(csv_file_path):
+            counts["current"] += 1
+            continue
+
+        try:
+            write_derived_data_file(csv_file_path)
+            counts["written"] += 1
+        except Exception as e:
+            print(f"Experiment {json_file.stem}: {e}")
+            counts["failed"] += 1
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the missing and stale derived data sidecars of experiments.")
+    parser.add_argument("--data-path", required=True, type=Path, help="data directory of the disk data manager")
+    parser.add_argument("--force", action="store_true", help="regenerate all sidecars, including the current ones")
+    args = parser.parse_args()
+
+    if not args.data_path.is_dir():
+        parser.error(f"Data directory not found at {args.data_path}")
+
+    counts = backfill_derived_data(args.data_path, force=args.force)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,25 @@ including metadata management, file operations, and caching.
 """
 
 import base64
-import datetime
+import functools
 import io
 import json
 import os
-import zipfile
+import shutil
+import time
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
-from cachetools import LRUCache
 
 from levseq_dash.app.config import settings
+from levseq_dash.app.data_manager import core_data, derived_data, metadata_manifest
 from levseq_dash.app.data_manager.base import BaseDataManager
 from levseq_dash.app.data_manager.experiment import Experiment, MutagenesisMethod
+from levseq_dash.app.data_manager.experiment_cache import ExperimentCache
+from levseq_dash.app.sequence_aligner.alignment_cache import AlignmentCache
+from levseq_dash.app.sequence_aligner.kmer_index import KmerIndex
 from levseq_dash.app.utils import utils
 
 
@@ -28,6 +33,12 @@ class DiskDataManager(BaseDataManager):
     Disk-based data manager for storing experiment data locally.
     """
 
+    # SQLite file with the alignment results cache, shared by all workers. It is in a hidden directory of the data
+    # path, as its -wal and -shm files come and go with every search and would change the modification time
+    # of the data path, which the metadata manifest and the metadata refresh check rely on
+    alignment_cache_dir_name = ".alignment_cache"
+    alignment_cache_file_name = "alignment_cache.sqlite3"
+
     def __init__(self):
         """
         Initialize the disk-based data manager.
@@ -40,12 +51,29 @@ class DiskDataManager(BaseDataManager):
         # Store experiment metadata index (UUID -> metadata dict)
         self._experiments_metadata = {}
 
-        # Cache for loaded experiment objects (UUID -> Experiment object)
-        # self.experiments_cache = {}
-        self._experiments_core_data_cache = LRUCache(maxsize=20)
+        # Cache for loaded experiment objects (UUID -> Experiment object), bounded by their memory
+        self._experiments_core_data_cache = ExperimentCache(
+            max_tabular_bytes=int(settings.get_experiment_cache_tabular_mb() * 1024 * 1024),
+            max_structure_bytes=int(settings.get_experiment_cache_structure_mb() * 1024 * 1024),
+        )
+
+        # alignment results shared by all workers, stored under the data path
+        self._setup_alignment_cache()
+
+        # k-mer index of the parent sequences, used to prune the targets of a sequence search
+        self._kmer_index = KmerIndex(k=settings.get_kmer_size())
+
+        # CSV checksum and normalized content hash -> UUIDs of the experiments, used by the duplicate checks
+        # they are built from the metadata, which has both hashes, so no experiment file is read for them
+        self._experiments_by_checksum = defaultdict(set)
+        self._experiments_by_content_hash = defaultdict(set)
 
         self.five_letter_id_prefix = settings.get_five_letter_id_prefix()
 
+        # experiments added or removed by the other workers are picked up by refresh_experiments_metadata
+        self._metadata_refresh_interval = settings.get_metadata_refresh_interval_seconds()
+        self._next_metadata_refresh_check = 0.0
+
         # read the assay file and set up the assay list
         self._load_assay_list()
 
@@ -89,24 +117,57 @@ class DiskDataManager(BaseDataManager):
         # Duplicate data check has already passed in upload by check_for_duplicate_experiment
         # Sanity check has already passed in upload by run_sanity_checks_on_experiment_file
 
-        # Generate a UUID for the experiment
-        experiment_uuid = self.generate_experiment_id(id_prefix=self.five_letter_id_prefix)
-
-        # assign a timestamp for the upload
-        upload_time_stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
         # convert to dataframe for processing
         df, experiment_bytes = utils.decode_csv_file_base64_string_to_dataframe(experiment_content_base64_string)
 
-        # calculate a checksum for the CSV file
-        csv_checksum = self.calculate_file_checksum(experiment_bytes)
+        # calculate a checksum for the CSV file, and the hash of its content for the near-duplicate check
+        file_info, csv_bytes, core_data_df = self.prepare_experiment_file(
+            df, self.calculate_file_checksum(experiment_bytes), self.calculate_dataframe_content_hash(df)
+        )
 
-        # calculate the number of plates in the experiment
-        plates_count = len(Experiment.extract_plates_list(df))
+        return self._add_prepared_experiment(
+            experiment_name=experiment_name,
+            experiment_date=experiment_date,
+            substrate=substrate,
+            product=product,
+            assay=assay,
+            mutagenesis_method=mutagenesis_method,
+            experiment_doi=experiment_doi,
+            experiment_additional_info=experiment_additional_info,
+            file_info=file_info,
+            csv_bytes=csv_bytes,
+            core_data_df=core_data_df,
+            open_geometry_file=(
+                functools.partial(io.BytesIO, base64.b64decode(geometry_content_base64_string))
+                if geometry_content_base64_string
+                else None
+            ),
+        )
 
-        # extract parent sequence from the CSV - sanity check already checks that such a row exists
-        # note at this point the aa_sequence column exists. We don't read this column anymore because it uses up memory
-        parent_sequence = Experiment.extract_parent_sequence(df)
+    def _add_prepared_experiment(
+        self,
+        experiment_name,
+        experiment_date,
+        substrate,
+        product,
+        assay,
+        mutagenesis_method: MutagenesisMethod,
+        experiment_doi: str,
+        experiment_additional_info: str,
+        file_info: dict,
+        csv_bytes: bytes,
+        core_data_df: pd.DataFrame,
+        open_geometry_file,
+    ) -> str:
+        """
+        Add a new experiment from an experiment file that was already parsed and checked and return its UUID,
+        see BaseDataManager.prepare_experiment_file.
+        """
+        # Generate a UUID for the experiment
+        experiment_uuid = self.generate_experiment_id(id_prefix=self.five_letter_id_prefix)
+
+        # assign a timestamp for the upload
+        upload_time_stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         metadata = {
             "experiment_id": experiment_uuid,
@@ -117,57 +178,92 @@ class DiskDataManager(BaseDataManager):
             "product": product,
             "assay": assay,
             "mutagenesis_method": mutagenesis_method,
-            "parent_sequence": parent_sequence,
-            "plates_count": plates_count,
-            "csv_checksum": csv_checksum,
+            "parent_sequence": file_info["parent_sequence"],
+            "plates_count": file_info["plates_count"],
+            "csv_checksum": file_info["csv_checksum"],
+            "csv_content_hash": file_info["csv_content_hash"],
             "additional_information": experiment_additional_info,
             "upload_time_stamp": upload_time_stamp,
         }
 
         # Save metadata as a JSON file
+        data_path_mtime_ns = metadata_manifest.get_data_path_mtime_ns(self.data_path)
         self._create_experiment_directory(experiment_uuid)
         json_file_path, csv_file_path, cif_file_path = self._generate_file_paths_for_experiment(experiment_uuid)
 
         with open(json_file_path, "w", encoding="utf-8") as json_file:
             json.dump(metadata, json_file, indent=4)
 
-        # save experiment data as CSV
-        df.to_csv(csv_file_path, index=False)
+        # save experiment data as CSV, written from the parsed data. The sidecars below are written from
+        # the parsed core data, so the file isn't read again
+        with open(csv_file_path, "wb") as csv_file:
+            csv_file.write(csv_bytes)
 
-        # Save geometry content if provided
-        if geometry_content_base64_string:
-            # decode to text (assuming it's UTF-8 encoded)
-            decoded_text = base64.b64decode(geometry_content_base64_string).decode("utf-8")
-            with open(cif_file_path, "w", encoding="utf-8") as f:
-                f.write(decoded_text)
+        # precompute the derived data of the experiment, without it the data is derived on every load
+        try:
+            derived_data.write_derived_data_file(csv_file_path, core_data_df)
+        except Exception as e:
+            utils.log_with_context(
+                f"[LOG] Could not write the derived data of {experiment_uuid}: {e}",
+                log_flag=settings.is_data_manager_logging_enabled(),
+            )
+
+        # store the core columns in the columnar format, the CSV file is kept for downloads
+        if settings.is_arrow_core_data_format():
+            try:
+                core_data.write_core_data_file(csv_file_path, core_data_df)
+            except Exception as e:
+                utils.log_with_context(
+                    f"[LOG] Could not write the core data file of {experiment_uuid}: {e}",
+                    log_flag=settings.is_data_manager_logging_enabled(),
+                )
+
+        # Save geometry content if provided, it is copied in chunks
+        if open_geometry_file:
+            with open_geometry_file() as geometry_file, open(cif_file_path, "wb") as f:
+                shutil.copyfileobj(geometry_file, f)
 
         # add the newly added experiment to the metadata list
-        self._experiments_metadata[experiment_uuid] = metadata
+        self._add_experiment_metadata(experiment_uuid, metadata)
+        self._update_metadata_manifest(data_path_mtime_ns, experiment_uuid, metadata)
 
         return experiment_uuid
 
-    def check_for_duplicate_experiment(self, new_csv_checksum: str):
+    def check_for_duplicate_experiment(self, new_csv_checksum: str, new_content_hash: str | None = None):
         """
-        Check if an experiment with the same checksum already exists.
+        Check if an experiment with the same checksum, or the same normalized content, already exists.
 
         Args:
             new_csv_checksum: Checksum of the new experiment CSV file.
+            new_content_hash: Normalized content hash of the new experiment CSV file, see calculate_content_hash.
+                              Experiments uploaded before the content hash was stored don't have one.
 
         Returns:
             bool: False if no duplicate found.
 
         Raises:
-            ValueError: If a duplicate experiment is detected.
-        """
-        for experiment_uuid, metadata in self._experiments_metadata.items():
-            existing_checksum = metadata.get("csv_checksum", "")
-            if existing_checksum == new_csv_checksum:
-                existing_name = metadata.get("experiment_name", "Unknown")
-                raise ValueError(
-                    f"DUPLICATE experiment data detected! "
-                    f"An experiment with identical CSV data already exists with UUID: {experiment_uuid}"
-                    f" and Name: {existing_name}."
-                )
+            ValueError: If a duplicate or near-duplicate experiment is detected.
+        """
+        self._refresh_experiments_metadata_if_due()
+        duplicates = self._experiments_by_checksum.get(new_csv_checksum)
+        if duplicates:
+            experiment_uuid = min(duplicates)
+            existing_name = self._experiments_metadata[experiment_uuid].get("experiment_name", "Unknown")
+            raise ValueError(
+                f"DUPLICATE experiment data detected! "
+                f"An experiment with identical CSV data already exists with UUID: {experiment_uuid}"
+                f" and Name: {existing_name}."
+            )
+
+        near_duplicates = self._experiments_by_content_hash.get(new_content_hash) if new_content_hash else None
+        if near_duplicates:
+            experiment_uuid = min(near_duplicates)
+            existing_name = self._experiments_metadata[experiment_uuid].get("experiment_name", "Unknown")
+            raise ValueError(
+                f"NEAR-DUPLICATE experiment data detected! "
+                f"An experiment with the same CSV data, ignoring the column order and whitespace, already exists "
+                f"with UUID: {experiment_uuid} and Name: {existing_name}."
+            )
         return False
 
     # ---------------------------
@@ -188,9 +284,8 @@ class DiskDataManager(BaseDataManager):
             experiment_dir = self.data_path / experiment_uuid
 
             # Remove directory and all contents
+            data_path_mtime_ns = metadata_manifest.get_data_path_mtime_ns(self.data_path)
             if experiment_dir.exists():
-                import shutil
-
                 deleted_exp_dir = self.data_path / "DELETED_EXP"
                 deleted_exp_dir.mkdir(exist_ok=True)
 
@@ -202,11 +297,15 @@ class DiskDataManager(BaseDataManager):
                 shutil.move(str(experiment_dir), str(target_path))
 
             # Remove from in-memory metadata
-            del self._experiments_metadata[experiment_uuid]
+            self._remove_experiment_metadata(experiment_uuid)
+            self._update_metadata_manifest(data_path_mtime_ns, experiment_uuid, None)
 
             # Remove from cache if it exists
-            if experiment_uuid in self._experiments_core_data_cache:
-                del self._experiments_core_data_cache[experiment_uuid]
+            self._experiments_core_data_cache.remove(experiment_uuid)
+
+            # Remove the cached alignment results of this experiment
+            if self._alignment_cache is not None:
+                self._alignment_cache.invalidate_experiment(experiment_uuid)
 
             return True
 
@@ -223,6 +322,7 @@ class DiskDataManager(BaseDataManager):
         Returns:
             list: List of experiment metadata dictionaries.
         """
+        self._refresh_experiments_metadata_if_due()
         return list(self._experiments_metadata.values())
 
     def get_all_lab_sequences(self):
@@ -232,6 +332,7 @@ class DiskDataManager(BaseDataManager):
         Returns:
             dict: Dictionary mapping experiment UUIDs to parent sequences.
         """
+        self._refresh_experiments_metadata_if_due()
         seq_data = {}
         # dictionary of "experiment UUID" and "experiment sequence" pairs
         # the key of the dictionary is the experiment UUID
@@ -239,6 +340,31 @@ class DiskDataManager(BaseDataManager):
             seq_data.update({experiment_uuid: metadata.get("parent_sequence", "")})
         return seq_data
 
+    def get_candidate_lab_sequences(self, query_sequence: str):
+        """
+        Get the parent sequences that share enough k-mers with the query to be worth aligning.
+
+        Args:
+            query_sequence: The query protein sequence.
+
+        Returns:
+            dict: Dictionary mapping experiment UUIDs to parent sequences, ordered by shared k-mers.
+        """
+        self._refresh_experiments_metadata_if_due()
+        candidates = self._kmer_index.rank_candidates(
+            query_sequence, min_shared_fraction=settings.get_kmer_min_shared_fraction()
+        )
+
+        utils.log_with_context(
+            f"[LOG] k-mer index kept {len(candidates)}/{len(self._experiments_metadata)} lab sequences",
+            log_flag=settings.is_data_manager_logging_enabled(),
+        )
+
+        return {
+            experiment_uuid: self._experiments_metadata[experiment_uuid].get("parent_sequence", "")
+            for experiment_uuid, _ in candidates
+        }
+
     # ---------------------------
     #    DATA RETRIEVAL: PER EXPERIMENT
     # ---------------------------
@@ -252,6 +378,7 @@ class DiskDataManager(BaseDataManager):
         Returns:
             dict | None: Metadata dictionary, or None if not found.
         """
+        self._refresh_experiments_metadata_if_due()
         return self._experiments_metadata.get(experiment_uuid, None)
 
     def get_experiment(self, experiment_uuid: str) -> Experiment | None:
@@ -268,22 +395,51 @@ class DiskDataManager(BaseDataManager):
             Exception: If loading from disk fails.
         """
         try:
-            exp = None
             # Check cache first
-            if experiment_uuid in self._experiments_core_data_cache:
-                return self._experiments_core_data_cache[experiment_uuid]
+            exp = self._experiments_core_data_cache.get(experiment_uuid)
+            if exp is not None:
+                return exp
 
             # Load from disk
             _, csv_file_path, cif_file_path = self._generate_file_paths_for_experiment(experiment_uuid)
-            exp = Experiment(experiment_data_file_path=csv_file_path, geometry_file_path=cif_file_path)
+            exp = Experiment(
+                experiment_data_file_path=csv_file_path,
+                geometry_file_path=cif_file_path,
+                load_derived_data=True,
+                load_core_data_file=settings.is_arrow_core_data_format(),
+                geometry_loader=functools.partial(self._load_geometry, experiment_uuid),
+            )
             # Cache the loaded experiment
-            if exp:
-                self._experiments_core_data_cache[experiment_uuid] = exp
+            if exp and not self._experiments_core_data_cache.put(experiment_uuid, exp):
+                utils.log_with_context(
+                    f"[LOG] Experiment {experiment_uuid} is larger than the experiment cache budgets and is not cached",
+                    log_flag=settings.is_data_manager_logging_enabled(),
+                )
 
             return exp
         except Exception as e:
             raise Exception(f"Error loading experiment {experiment_uuid} from disk: {e}")
 
+    def get_experiment_top_variants(self, experiment_uuid: str) -> pd.DataFrame | None:
+        """
+        Get the data of the top variants table of an experiment. The data is computed once and kept
+        by the cached experiment, within the tabular budget of the experiment cache.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            pd.DataFrame | None: The data, or None if the experiment doesn't exist.
+        """
+        exp = self.get_experiment(experiment_uuid)
+        if exp is None:
+            return None
+
+        if exp.top_variants_df is None:
+            exp.exp_get_top_variants_data()
+            self._experiments_core_data_cache.update_size(experiment_uuid)
+        return exp.top_variants_df
+
     def get_experiment_file_content(self, experiment_uuid: str) -> dict[str, bytes]:
         """
         Get experiment files content as bytes for a specific experiment.
@@ -319,6 +475,33 @@ class DiskDataManager(BaseDataManager):
     # ---------------------------
     #    DATA RETRIEVAL: MISC
     # ---------------------------
+    def get_alignment_cache(self):
+        """
+        Get the alignment result cache stored under the data path.
+
+        Returns:
+            AlignmentCache | None: The cache, or None if it is disabled in the config.
+        """
+        return self._alignment_cache
+
+    def get_experiment_cache_stats(self):
+        """
+        Get the metrics of the loaded experiments cache of this worker.
+
+        Returns:
+            dict: See ExperimentCache.get_stats.
+        """
+        return self._experiments_core_data_cache.get_stats()
+
+    def get_experiment_cache_residency(self):
+        """
+        Get the experiments and structures in the loaded experiments cache of this worker and the memory they use.
+
+        Returns:
+            dict: See ExperimentCache.get_residency.
+        """
+        return self._experiments_core_data_cache.get_residency()
+
     def get_assays(self):
         """
         Get the list of available assays.
@@ -338,42 +521,7 @@ class DiskDataManager(BaseDataManager):
         Returns:
             bytes: ZIP file content, or None if input list is empty.
         """
-        if not experiments_to_zip or len(experiments_to_zip) == 0:
-            return None
-
-        zip_buffer = io.BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zipf:
-            # Add metadata CSV to root of zip
-            # Use pandas to properly handle CSV escaping (commas, quotes, newlines in fields)
-            metadata_df = pd.DataFrame(experiments_to_zip)
-            csv_content = metadata_df.to_csv(index=False)
-            zipf.writestr(f"EnzEngDB_Experiments.csv", csv_content)
-
-            # Add experiment files directly from disk
-            for exp_data in experiments_to_zip:
-                experiment_id = exp_data.get("experiment_id")
-                if experiment_id:
-                    try:
-                        # get the file contents, bytes,...
-                        file_contents = self.get_experiment_file_content(experiment_id)
-
-                        # Add files to ZIP using content-based approach
-                        if "json" in file_contents:
-                            zipf.writestr(f"experiments/{experiment_id}/{experiment_id}.json", file_contents["json"])
-                        if "csv" in file_contents:
-                            zipf.writestr(f"experiments/{experiment_id}/{experiment_id}.csv", file_contents["csv"])
-                        if "cif" in file_contents:
-                            zipf.writestr(f"experiments/{experiment_id}/{experiment_id}.cif", file_contents["cif"])
-
-                    except Exception as e:
-                        raise Exception(f"Error adding files for experiment {experiment_id}: {e}")
-
-        # Get the ZIP data from memory buffer
-        zip_data = zip_buffer.getvalue()
-        zip_buffer.close()
-
-        return zip_data
+        return self._zip_experiments(experiments_to_zip)
 
     # ----------------------------
     #    PRIVATE METHODS
@@ -403,6 +551,23 @@ class DiskDataManager(BaseDataManager):
         if settings.is_data_modification_enabled() and not os.access(self.data_path, os.W_OK):
             raise PermissionError(f"No write permission to storage: {self.data_path}\n")
 
+    def _setup_alignment_cache(self):
+        """
+        Set up the alignment result cache under the data path if it is enabled in the config.
+        The cache is optional, if it can't be created the searches run without it.
+        """
+        self._alignment_cache = None
+        if settings.is_alignment_cache_enabled():
+            cache_file_path = self.data_path / self.alignment_cache_dir_name / self.alignment_cache_file_name
+            try:
+                cache_file_path.parent.mkdir(exist_ok=True)
+                self._alignment_cache = AlignmentCache(cache_file_path)
+            except Exception as e:
+                utils.log_with_context(
+                    f"[LOG] Alignment cache disabled, could not open {cache_file_path}: {e}",
+                    log_flag=settings.is_data_manager_logging_enabled(),
+                )
+
     def _load_assay_list(self):
         """
         Load the list of assays from the assay file.
@@ -423,56 +588,184 @@ class DiskDataManager(BaseDataManager):
 
         /{self.data_path}/
         ├── {uuid}/
-        │   ├── {uuid}.json           Metadata file for experiment with UUID
-        │   ├── {uuid}.csv            Experiment data in CSV format
-        │   └── {uuid}.cif            Geometry file for experiment
+        │   ├── {uuid}.json              Metadata file for experiment with UUID
+        │   ├── {uuid}.csv               Experiment data in CSV format
+        │   ├── {uuid}.derived.parquet   Derived data sidecar (optional)
+        │   ├── {uuid}.core.arrow        Columnar core data (optional, core-data-format: arrow)
+        │   └── {uuid}.cif               Geometry file for experiment
         ├── {uuid}/
         │   ├── {uuid}.json
         │   ├── {uuid}.csv
         │   └── {uuid}.cif
+        ├── .manifest/
+        │   └── experiments.json         Consolidated metadata of all experiments
         └── ...
+
+        The metadata is read from the consolidated manifest of the data directory if it is current.
+        Otherwise the experiment directories are scanned with a thread pool and the manifest is rewritten.
         """
 
         utils.log_with_context(
             f"[LOG] Loading UUID-based experiment metadata from: {self.data_path}...",
             log_flag=settings.is_data_manager_logging_enabled(),
         )
+        start_time = time.perf_counter()
+
+        # read before the metadata, so changes made while loading are picked up by the next refresh
+        self._metadata_generation = metadata_manifest.read_generation(self.data_path)
+        self._data_path_mtime_ns = metadata_manifest.get_data_path_mtime_ns(self.data_path)
+
+        experiments_metadata = metadata_manifest.read_manifest(self.data_path)
+        source = "manifest"
+        if experiments_metadata is None:
+            source = "directory scan"
+            experiments_metadata, errors = metadata_manifest.scan_experiments_metadata(self.data_path)
+            for experiment_uuid, e in errors.items():
+                utils.log_with_context(
+                    f"[LOG] Error loading metadata of {experiment_uuid}: {e}",
+                    log_flag=settings.is_data_manager_logging_enabled(),
+                )
 
-        # Find all JSON metadata files recursively in the data directory and subdirectories
-        json_files = self.data_path.rglob("*.json")
-
-        for json_file in json_files:
             try:
-                # Extract UUID from filename
-                experiment_uuid = json_file.stem
+                metadata_manifest.write_manifest(self.data_path, experiments_metadata, self._data_path_mtime_ns)
+            except Exception as e:
+                utils.log_with_context(
+                    f"[LOG] Could not write the metadata manifest of {self.data_path}: {e}",
+                    log_flag=settings.is_data_manager_logging_enabled(),
+                )
+
+        for experiment_uuid, metadata in experiments_metadata.items():
+            # add the metadata to memory
+            self._add_experiment_metadata(experiment_uuid, metadata)
+
+        utils.log_with_context(
+            f"[LOG] Successfully loaded {len(self._experiments_metadata)} experiments into memory from the {source} "
+            f"in {(time.perf_counter() - start_time) * 1000:.1f} ms",
+            log_flag=settings.is_data_manager_logging_enabled(),
+        )
+
+    def refresh_experiments_metadata(self, force=False):
+        """
+        Load the experiments added and drop the experiments removed by the other workers since the last refresh.
 
-                # Verify required files exist
-                _, csv_file, cif_file = self._generate_file_paths_for_experiment(experiment_uuid)
+        Only the experiment directories that appeared or disappeared are read, the change is detected with the
+        generation counter of the data directory and its modification time, see metadata_manifest.
 
-                # all files have to be present to load
-                if not csv_file.exists() or not cif_file.exists():
-                    utils.log_with_context(
-                        f"[LOG] Warning: CSV or CIF file missing for UUID {experiment_uuid}",
-                        log_flag=settings.is_data_manager_logging_enabled(),
-                    )
-                    continue
+        Args:
+            force: Compare the experiment directories with the metadata in memory even if nothing changed.
 
-                # load metadata from JSON file
-                with open(json_file, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
+        Returns:
+            tuple: (list of added experiment UUIDs, list of removed experiment UUIDs)
+        """
+        generation = metadata_manifest.read_generation(self.data_path)
+        data_path_mtime_ns = metadata_manifest.get_data_path_mtime_ns(self.data_path)
+        if not force and (generation, data_path_mtime_ns) == (self._metadata_generation, self._data_path_mtime_ns):
+            return [], []
 
-                # add the metadata to memory
-                self._experiments_metadata[experiment_uuid] = metadata
+        self._metadata_generation = generation
+        self._data_path_mtime_ns = data_path_mtime_ns
 
+        experiment_dirs = {Path(path).name: path for path in metadata_manifest.list_experiment_dirs(self.data_path)}
+
+        added = []
+        # directories of experiments that are still being uploaded are retried at the next refresh
+        for experiment_uuid in sorted(experiment_dirs.keys() - self._experiments_metadata.keys()):
+            try:
+                metadata = metadata_manifest.load_experiment_metadata(experiment_dirs[experiment_uuid])
             except Exception as e:
                 utils.log_with_context(
-                    f"[LOG] Error loading metadata from {json_file}: {e}",
+                    f"[LOG] Error loading metadata of {experiment_uuid}: {e}",
                     log_flag=settings.is_data_manager_logging_enabled(),
                 )
+                continue
 
-        utils.log_with_context(
-            f"[LOG] Successfully loaded {len(self._experiments_metadata)} experiments into memory",
-            log_flag=settings.is_data_manager_logging_enabled(),
+            if metadata is not None:
+                self._add_experiment_metadata(experiment_uuid, metadata)
+                added.append(experiment_uuid)
+
+        removed = sorted(self._experiments_metadata.keys() - experiment_dirs.keys())
+        for experiment_uuid in removed:
+            self._remove_experiment_metadata(experiment_uuid)
+            self._experiments_core_data_cache.remove(experiment_uuid)
+
+        if added or removed:
+            utils.log_with_context(
+                f"[LOG] Refreshed experiments metadata: {len(added)} added, {len(removed)} removed",
+                log_flag=settings.is_data_manager_logging_enabled(),
+            )
+
+        return added, removed
+
+    def _refresh_experiments_metadata_if_due(self):
+        """
+        Refresh the experiments metadata at most once per metadata-refresh-interval-seconds.
+        The refresh is an optimization only: errors are logged.
+        """
+        now = time.monotonic()
+        if now < self._next_metadata_refresh_check:
+            return
+        self._next_metadata_refresh_check = now + self._metadata_refresh_interval
+
+        try:
+            self.refresh_experiments_metadata()
+        except Exception as e:
+            utils.log_with_context(
+                f"[LOG] Could not refresh the experiments metadata: {e}",
+                log_flag=settings.is_data_manager_logging_enabled(),
+            )
+
+    def _add_experiment_metadata(self, experiment_uuid: str, metadata: dict):
+        """
+        Add the metadata of an experiment to memory and to the k-mer and duplicate check indexes.
+        """
+        self._experiments_metadata[experiment_uuid] = metadata
+        self._kmer_index.add(experiment_uuid, metadata.get("parent_sequence", ""))
+        for experiments_by_hash, key in [
+            (self._experiments_by_checksum, "csv_checksum"),
+            (self._experiments_by_content_hash, "csv_content_hash"),
+        ]:
+            if metadata.get(key):
+                experiments_by_hash[metadata[key]].add(experiment_uuid)
+
+    def _remove_experiment_metadata(self, experiment_uuid: str):
+        """
+        Remove the metadata of an experiment from memory and from the k-mer and duplicate check indexes.
+        """
+        metadata = self._experiments_metadata.pop(experiment_uuid)
+        self._kmer_index.remove(experiment_uuid)
+        for experiments_by_hash, key in [
+            (self._experiments_by_checksum, "csv_checksum"),
+            (self._experiments_by_content_hash, "csv_content_hash"),
+        ]:
+            experiments = experiments_by_hash.get(metadata.get(key))
+            if experiments is not None:
+                experiments.discard(experiment_uuid)
+                if not experiments:
+                    del experiments_by_hash[metadata[key]]
+
+    def _update_metadata_manifest(self, data_path_mtime_ns: int, experiment_uuid: str, metadata: dict | None):
+        """
+        Update the metadata manifest after an experiment directory was added or removed, see
+        metadata_manifest.update_manifest. The manifest is an optimization only: errors are logged.
+        """
+        try:
+            metadata_manifest.update_manifest(self.data_path, data_path_mtime_ns, experiment_uuid, metadata)
+        except Exception as e:
+            utils.log_with_context(
+                f"[LOG] Could not update the metadata manifest for {experiment_uuid}: {e}",
+                log_flag=settings.is_data_manager_logging_enabled(),
+            )
+
+    def _load_geometry(self, experiment_uuid: str) -> bytes:
+        """
+        Load the geometry bytes of an experiment through the structure cache.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+        """
+        _, _, cif_file_path = self._generate_file_paths_for_experiment(experiment_uuid)
+        return self._experiments_core_data_cache.get_geometry(
+            experiment_uuid, functools.partial(Experiment.read_geometry_file, cif_file_path)
         )
 
     def _create_experiment_directory(self, experiment_uuid: str) -> Path:
@@ -489,6 +782,46 @@ class DiskDataManager(BaseDataManager):
         experiment_dir.mkdir(parents=True, exist_ok=True)
         return experiment_dir
 
+    def _get_experiment_file_sizes(self, experiment_uuid: str) -> dict:
+        """
+        Get the sizes of the files of an experiment without reading them.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            dict: File types ('json', 'csv', 'cif') -> size in bytes. Empty if the experiment doesn't exist.
+        """
+        if experiment_uuid not in self._experiments_metadata:
+            return {}
+
+        file_paths = self._generate_file_paths_for_experiment(experiment_uuid)
+        return {
+            file_type: file_path.stat().st_size
+            for file_type, file_path in zip(["json", "csv", "cif"], file_paths)
+            if file_path.exists()
+        }
+
+    def _open_experiment_files(self, experiment_uuid: str) -> dict:
+        """
+        Get the files of an experiment as callables that open them, so they are streamed into a ZIP archive.
+
+        Args:
+            experiment_uuid: UUID of the experiment.
+
+        Returns:
+            dict: File types ('json', 'csv', 'cif') -> callable opening the file for reading in binary mode.
+        """
+        if experiment_uuid not in self._experiments_metadata:
+            return {}
+
+        file_paths = self._generate_file_paths_for_experiment(experiment_uuid)
+        return {
+            file_type: functools.partial(open, file_path, "rb")
+            for file_type, file_path in zip(["json", "csv", "cif"], file_paths)
+            if file_path.exists()
+        }
+
     def _generate_file_paths_for_experiment(self, experiment_uuid: str):
         """
         Generate file paths for an experiment without checking if they exist.
@@ -5,15 +5,19 @@ This module defines the Experiment class for loading and processing experiment d
 along with mutagenesis method enums and validation utilities.
 """
 
-import re
 from enum import StrEnum
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager import core_data, derived_data
 from levseq_dash.app.utils import u_protein_viewer, u_reaction, utils
 
+# columns of the valid mutations used by the sequence searches and the hot/cold spots
+valid_mutation_columns = [gs.c_smiles, gs.c_plate, gs.c_well, gs.c_substitutions, gs.c_fitness_value, gs.cc_ratio]
+
 
 class MutagenesisMethod(StrEnum):
     """Enum representing mutagenesis methods used in experiments."""
@@ -30,15 +34,20 @@ class Experiment:
 
     Attributes:
         data_df (pd.DataFrame): The "only necessary columns"  from experiment data loaded from the CSV file.
-        geometry_base64_bytes (bytes): The geometry file content in base64-encoded bytes.
+        geometry_base64_bytes (bytes): The geometry file content in base64-encoded bytes, read on first access.
         unique_smiles_in_data (list): A list of unique SMILES strings in the experiment data.
         plates (list): A list of unique plates in the experiment data.
+        derived_data_df (pd.DataFrame | None): The derived data read from the sidecar of the CSV file, if it is current.
+        top_variants_df (pd.DataFrame | None): The data of the top variants table, see exp_get_top_variants_data.
     """
 
     def __init__(
         self,
         experiment_data_file_path,
         geometry_file_path,
+        load_derived_data=False,
+        load_core_data_file=False,
+        geometry_loader=None,
     ):
         """
         Initialize an Experiment object from CSV and geometry files.
@@ -46,6 +55,12 @@ class Experiment:
         Args:
             experiment_data_file_path: Path to the experiment CSV file.
             geometry_file_path: Path to the geometry CIF file.
+            load_derived_data: Load the precomputed derived data from the sidecar of the CSV file.
+                               Without a current sidecar the derived data is computed when it is needed.
+            load_core_data_file: Load the core data from the memory-mapped core data file of the CSV file.
+                                 Without a current core data file the core data is read from the CSV file.
+            geometry_loader: Optional callable returning the geometry bytes, e.g. from a cache of structures.
+                             Without it the geometry file is read on the first access and kept by this object.
 
         Raises:
             ValueError: If either file path is invalid.
@@ -63,24 +78,133 @@ class Experiment:
             # read CSV file with only the required columns
             # Note: The sequence column is not read here for optimization purposes.
             # The parent sequence was extracted during the upload process.
+            self.data_df = None
+            if load_core_data_file:
+                self.data_df = core_data.read_core_data_file(experiment_data_file_path)
 
-            self.data_df = pd.read_csv(experiment_data_file_path, usecols=gs.experiment_core_data_list)
+            if self.data_df is None:
+                self.data_df = utils.read_experiment_core_data(experiment_data_file_path)
             if self.data_df.empty:
                 raise ValueError("Experiment data file is empty.")
 
-            # read the cif file as bytes
-            with open(geometry_file_path, "rb") as f:
-                self.geometry_base64_bytes = f.read()
-                if len(self.geometry_base64_bytes) == 0:
-                    raise ValueError("Geometry file is empty.")
+            # the cif file is read on the first access of geometry_base64_bytes, the bulk paths
+            # like the sequence searches only need the core data
+            self.geometry_file_path = Path(geometry_file_path)
+            self._geometry_loader = geometry_loader
+            self._geometry_base64_bytes = None
+            if self.geometry_file_path.stat().st_size == 0:
+                raise ValueError("Geometry file is empty.")
 
             # internal calculations that are metadata but are not stored with the files
             self.unique_smiles_in_data = list(self.data_df[gs.c_smiles].unique())
             self.plates = self.extract_plates_list(self.data_df)
 
+            # precomputed ratios, valid mutations, residue indices and single-site positions
+            self.derived_data_df = None
+            if load_derived_data:
+                self.derived_data_df = derived_data.read_derived_data_file(experiment_data_file_path)
+
+            self.top_variants_df = None
+
         except Exception as e:
             raise Exception(f"Error loading experiment data file: {e}")
 
+    @classmethod
+    def from_core_data(cls, data_df, geometry_loader):
+        """
+        Create an Experiment from core data that was not read from a CSV file, e.g. from a database.
+        The derived data is computed when it is needed.
+
+        Args:
+            data_df: Core data with the columns and dtypes of utils.read_experiment_core_data.
+            geometry_loader: Callable returning the geometry bytes.
+
+        Raises:
+            ValueError: If the core data is empty.
+        """
+        if data_df.empty:
+            raise ValueError("Experiment data is empty.")
+
+        experiment = cls.__new__(cls)
+        experiment.data_df = data_df
+        experiment.geometry_file_path = None
+        experiment._geometry_loader = geometry_loader
+        experiment._geometry_base64_bytes = None
+        experiment.unique_smiles_in_data = list(data_df[gs.c_smiles].unique())
+        experiment.plates = cls.extract_plates_list(data_df)
+        experiment.derived_data_df = None
+        experiment.top_variants_df = None
+        return experiment
+
+    @property
+    def geometry_base64_bytes(self):
+        """
+        The geometry file content in base64-encoded bytes, read on first access.
+
+        Raises:
+            ValueError: If the geometry file is empty.
+        """
+        if self._geometry_loader is not None:
+            return self._geometry_loader()
+
+        if self._geometry_base64_bytes is None:
+            self._geometry_base64_bytes = self.read_geometry_file(self.geometry_file_path)
+        return self._geometry_base64_bytes
+
+    @property
+    def is_geometry_loaded(self):
+        """Whether this object holds the geometry bytes, always False with a geometry_loader."""
+        return self._geometry_base64_bytes is not None
+
+    def exp_get_data_with_ratios(self):
+        """
+        Get the core data with the fitness ratios relative to the parent mean per SMILES and plate.
+
+        Returns:
+            pd.DataFrame: Core data with the columns added by calculate_group_mean_ratios_per_smiles_and_plate.
+        """
+        if self.derived_data_df is not None:
+            return self.derived_data_df.drop(columns=derived_data.derived_only_columns)
+
+        return utils.calculate_group_mean_ratios_per_smiles_and_plate(self.data_df)
+
+    def exp_get_top_variants_data(self):
+        """
+        Get the data of the top variants table of the experiment page: the core data with the fitness ratios,
+        without the intermediate columns of the ratio calculation.
+
+        The data is computed on the first call and kept by this object, so the callbacks of the experiment
+        page share it instead of rebuilding it on every interaction. Treat it as read-only.
+
+        Returns:
+            pd.DataFrame: Core data with the ratio columns.
+        """
+        if self.top_variants_df is None:
+            df = self.exp_get_data_with_ratios()
+            # drop unnecessary columns here.
+            columns_to_drop = ["min", "max", "min_group_ratio", "max_group_ratio", "mean"]
+            self.top_variants_df = df.drop(columns=[col for col in columns_to_drop if col in df.columns])
+
+        return self.top_variants_df
+
+    def exp_single_site_positions(self, smiles_string=None):
+        """
+        Get the residue positions of the single-site mutations of the experiment.
+
+        Args:
+            smiles_string: Optional SMILES string filter. If None, processes all data.
+
+        Returns:
+            list: Sorted list of unique residue positions, see utils.extract_single_site_mutations.
+        """
+        if self.derived_data_df is None:
+            return utils.extract_single_site_mutations(self.data_df, smiles_string)
+
+        df = self.derived_data_df
+        if smiles_string is not None:
+            df = df[df[gs.c_smiles] == smiles_string]
+        return sorted(df[gs.cc_single_site_position].dropna().astype(int).unique().tolist())
+
     def exp_get_processed_core_data_for_valid_mutation_extractions(self):
         """
         Clean and preprocess core data for sequence alignments and ratio calculations.
@@ -95,21 +219,16 @@ class Experiment:
             Exception: If experiment data is empty.
         """
         if not self.data_df.empty:
-            df = utils.calculate_group_mean_ratios_per_smiles_and_plate(self.data_df)
-
-            # drop some of the unused columns, we only need the columns below
-            columns_to_keep = [gs.c_smiles, gs.c_plate, gs.c_well, gs.c_substitutions, gs.c_fitness_value, gs.cc_ratio]
-            df = df.drop(columns=[col for col in df.columns if col not in columns_to_keep])
-
-            # remove anything from the mutations column with # or - and drop rows where column has NaN values
-            # Notes: square brackets [] mean "match either # or -"
-            # na=True ensures missing values are also considered invalid
-            # ~ (bitwise NOT) negates the condition
-            df = df[~df[gs.c_substitutions].str.contains(r"[#-]", na=True)]
-            # not loading the sequences anymore as they take up unnecessary space
-            # df = df[~df[gs.c_aa_sequence].str.contains(r"[#-]", na=True)]
-            # and drop rows where column 'F' has NaN values
-            df = df.dropna(subset=[gs.c_fitness_value])
+            if self.derived_data_df is not None:
+                df = self.derived_data_df
+                valid_mutation = df[gs.cc_valid_mutation]
+            else:
+                df = utils.calculate_group_mean_ratios_per_smiles_and_plate(self.data_df)
+                # rows with a valid mutation and fitness value
+                valid_mutation = derived_data.valid_mutation_mask(df)
+
+            # drop some of the unused columns, we only need the valid_mutation_columns
+            df = df[valid_mutation].drop(columns=[col for col in df.columns if col not in valid_mutation_columns])
 
             return df
         else:
@@ -135,31 +254,50 @@ class Experiment:
             if n > 0:
                 df = self.exp_get_processed_core_data_for_valid_mutation_extractions()
 
-                hot_n = pd.DataFrame()
-                cold_n = pd.DataFrame()
-                for smiles in self.unique_smiles_in_data:
-                    for plate_number in self.plates:
-                        # for this smiles number and this plate of the experiment sorted by fitness values...
-                        df_per_smiles_plate = df[
-                            (df[gs.c_smiles] == smiles) & (df[gs.c_plate] == plate_number)
-                        ].sort_values(by=gs.c_fitness_value, ascending=False)
+                # order the rows per smiles, then per plate, in the order they appear in the experiment,
+                # and by fitness value (highest first) within each smiles/plate group.
+                # rows without a smiles or a plate don't belong to any group
+                smiles_order = pd.Index(self.unique_smiles_in_data).get_indexer(df[gs.c_smiles])
+                plate_order = pd.Index(self.plates).get_indexer(df[gs.c_plate])
+                in_group = (
+                    (smiles_order >= 0)
+                    & (plate_order >= 0)
+                    & df[gs.c_smiles].notna().to_numpy()
+                    & df[gs.c_plate].notna().to_numpy()
+                )
+                df_in_group = df[in_group]
+                smiles_order = smiles_order[in_group]
+                plate_order = plate_order[in_group]
 
-                        # ... extract top/bottom N
-                        df_hot_n = df_per_smiles_plate.head(n)
-                        df_cold_n = df_per_smiles_plate.tail(n)
+                # lexsort is stable so rows with the same fitness value keep their order in the data
+                fitness = df_in_group[gs.c_fitness_value].to_numpy(dtype=float)
+                sorted_rows = np.lexsort((-fitness, plate_order, smiles_order))
 
-                        # ... concatenate to previous results
-                        hot_n = pd.concat([hot_n, df_hot_n])
-                        cold_n = pd.concat([cold_n, df_cold_n])
+                # extract top/bottom N of every smiles/plate group in one pass
+                groups = df_in_group.iloc[sorted_rows].groupby(
+                    [smiles_order[sorted_rows], plate_order[sorted_rows]], sort=False
+                )
+                hot_n = groups.head(n).copy()
+                cold_n = groups.tail(n).copy()
 
                 def extract_substitution_indices_per_smiles(df_in, new_column_name):
                     """
                     This is an internal python function used only below. The function extracts the substitution indices
                     of the dataframe input grouped by the smiles for te experiment
                     """
+                    if self.derived_data_df is not None:
+                        # the indices of each row were extracted in the derived data, the rows of df_in are its rows
+                        substitution_indices = self.derived_data_df.loc[df_in.index, gs.cc_substitution_indices]
+                        return (
+                            substitution_indices.groupby(df_in[gs.c_smiles], observed=True)
+                            .apply(lambda x: sorted(pd.unique(x.explode().dropna()).tolist(), key=int))
+                            .reset_index()
+                            .rename(columns={gs.cc_substitution_indices: new_column_name})
+                        )
+
                     df_result = (
                         # group by smiles
-                        df_in.groupby(gs.c_smiles)[gs.c_substitutions]
+                        df_in.groupby(gs.c_smiles, observed=True)[gs.c_substitutions]
                         # and extract the unique indices form the substitutions column
                         # ...sort it as well
                         .apply(
@@ -209,6 +347,23 @@ class Experiment:
         else:
             raise Exception("Experiment data is empty!")
 
+    @staticmethod
+    def read_geometry_file(geometry_file_path) -> bytes:
+        """
+        Read a geometry file as bytes.
+
+        Args:
+            geometry_file_path: Path to the geometry CIF file.
+
+        Raises:
+            ValueError: If the geometry file is empty.
+        """
+        with open(geometry_file_path, "rb") as f:
+            geometry_bytes = f.read()
+        if len(geometry_bytes) == 0:
+            raise ValueError("Geometry file is empty.")
+        return geometry_bytes
+
     @staticmethod
     def extract_plates_list(df):
         """
@@ -285,41 +440,53 @@ class Experiment:
 
         # each row of the csv file must be checked for valid smiles string
         # I want to notify the user which row has an error, so they can fix their experiment file
-        for index, row in df.iterrows():
-            smiles_string = str(row[gs.c_smiles])
-            if not smiles_string or pd.isnull(smiles_string) or smiles_string.strip() == "":
+        # a file only has a handful of distinct smiles, each one is parsed once
+        smiles_strings = df[gs.c_smiles].astype(str)
+        empty_smiles = smiles_strings.str.strip() == ""
+        valid_smiles_strings = [
+            smiles_string
+            for smiles_string in smiles_strings[~empty_smiles].unique()
+            if u_reaction.is_valid_smiles(smiles_string)
+        ]
+        invalid_smiles = empty_smiles | ~smiles_strings.isin(valid_smiles_strings)
+        if invalid_smiles.any():
+            position = int(np.argmax(invalid_smiles.to_numpy()))
+            index = df.index[position]
+            if empty_smiles.iloc[position]:
                 raise ValueError(f"Invalid SMILES string at row {index}. Value is null, NaN, or empty.")
-            valid = u_reaction.is_valid_smiles(smiles_string)
-            if not valid:
-                raise ValueError(f"Invalid SMILES string at row {index}. SMILES is:'{smiles_string}'")
+            raise ValueError(f"Invalid SMILES string at row {index}. SMILES is:'{smiles_strings.iloc[position]}'")
 
         # check that all wells follow standard 96-well plate format (A1-H12 or A01-H12)
         # Pattern: ^[A-H](0?[1-9]|1[0-2])$
         # ^ = start, [A-H] = letters A-H, (0?[1-9]|1[0-2]) = numbers 1-12 (with optional leading zero), $ = end
-        valid_well_pattern = re.compile(r"^[A-H](0?[1-9]|1[0-2])$")
-        for index, row in df.iterrows():
-            well = str(row[gs.c_well]).strip()
-
-            if not well or pd.isnull(well) or well == "":
+        wells = df[gs.c_well].astype(str).str.strip()
+        invalid_wells = ~wells.str.match(r"^[A-H](0?[1-9]|1[0-2])$")
+        if invalid_wells.any():
+            position = int(np.argmax(invalid_wells.to_numpy()))
+            index = df.index[position]
+            well = wells.iloc[position]
+            if well == "":
                 raise ValueError(f"Well value at row {index} is null, NaN, or empty.")
+            raise ValueError(
+                f"Well '{well}' at row {index} does not follow standard 96-well plate format. "
+                f"Expected format is letter A-H followed by number 1-12."
+            )
 
-            if not valid_well_pattern.match(well):
-                raise ValueError(
-                    f"Well '{well}' at row {index} does not follow standard 96-well plate format. "
-                    f"Expected format is letter A-H followed by number 1-12."
-                )
-
-        # check for unique wells within each smiles-plate group
-        for (smiles, plate), group in df.groupby([gs.c_smiles, gs.c_plate]):
-            duplicate_wells = group.duplicated(subset=[gs.c_well], keep=False)
-            if duplicate_wells.any():
-                duplicate_rows = group[duplicate_wells]
-                duplicate_wells_list = duplicate_rows[gs.c_well].unique().tolist()
-                duplicate_indices = duplicate_rows.index.tolist()
-                raise ValueError(
-                    f"Duplicate wells in (smiles={smiles}, plate='{plate}) combo. "
-                    f"Wells {duplicate_wells_list} in rows: {duplicate_indices}. "
-                )
+        # check for unique wells within each smiles-plate group,
+        # the rows without a smiles or plate are not in any group
+        in_group = df[gs.c_smiles].notna() & df[gs.c_plate].notna()
+        duplicate_wells = in_group & df.duplicated(subset=[gs.c_smiles, gs.c_plate, gs.c_well], keep=False)
+        if duplicate_wells.any():
+            # the first group with duplicates in the order of the groups
+            (smiles, plate), duplicate_rows = next(
+                iter(df[duplicate_wells].groupby([gs.c_smiles, gs.c_plate], observed=True))
+            )
+            duplicate_wells_list = duplicate_rows[gs.c_well].unique().tolist()
+            duplicate_indices = duplicate_rows.index.tolist()
+            raise ValueError(
+                f"Duplicate wells in (smiles={smiles}, plate='{plate}) combo. "
+                f"Wells {duplicate_wells_list} in rows: {duplicate_indices}. "
+            )
 
         # # Relaxing parent-smiles combo requirement
         # # check any smiles-plate column combo has a #PARENT# in its gs.c_substitution column
@@ -0,0 +1,211 @@
+"""
+In-memory cache of loaded experiments.
+
+This module provides the ExperimentCache class, which caches the Experiment objects (their tabular data)
+and the geometry files (structures) of the experiments in two LRU caches bounded by the memory they use
+rather than by their number, with hit/miss metrics. Structures are loaded lazily and cached separately,
+so the bulk paths that only need the tabular data, like the sequence searches, never read a CIF file
+and a few large structures can't push out the data of many experiments and vice versa.
+"""
+
+from collections import OrderedDict
+
+
+def get_experiment_tabular_size_in_bytes(experiment) -> int:
+    """
+    Returns the memory used by the core, derived and top variants data frames of an experiment.
+
+    Args:
+        experiment: Experiment object.
+    """
+    size = int(experiment.data_df.memory_usage(index=True, deep=True).sum())
+    for df in [experiment.derived_data_df, experiment.top_variants_df]:
+        if df is not None:
+            size += int(df.memory_usage(index=True, deep=True).sum())
+    return size
+
+
+class _SizedLRU:
+    """LRU mapping of experiment IDs to values bounded by the total size of the values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # experiment ID -> (value, size), least recently used first
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, experiment_id: str):
+        entry = self.entries.get(experiment_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(experiment_id)
+        return entry[0]
+
+    def put(self, experiment_id: str, value, size: int) -> bool:
+        if size > self.max_bytes:
+            return False
+
+        self.remove(experiment_id)
+        self.entries[experiment_id] = (value, size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            self.remove(next(iter(self.entries)))
+            self.evictions += 1
+
+        return True
+
+    def remove(self, experiment_id: str):
+        entry = self.entries.pop(experiment_id, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def get_stats(self, prefix: str) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            f"{prefix}_hits": self.hits,
+            f"{prefix}_misses": self.misses,
+            f"{prefix}_hit_rate": self.hits / lookups if lookups else 0.0,
+            f"{prefix}_evictions": self.evictions,
+            f"{prefix}_entries": len(self.entries),
+            f"{prefix}_bytes": self.current_bytes,
+            f"max_{prefix}_bytes": self.max_bytes,
+        }
+
+    def get_residency(self) -> list:
+        return [{"experiment_id": experiment_id, "bytes": size} for experiment_id, (_, size) in self.entries.items()]
+
+
+class ExperimentCache:
+    """
+    Cache of Experiment objects and of their structures, each bounded by its own memory budget.
+
+    The least recently used entries are evicted to stay within a budget. An entry that is larger than
+    its whole budget is not cached. The cache belongs to one process, each gunicorn worker has its own and
+    loads the experiments it uses again. With the "arrow" core data format a miss memory maps the core data file,
+    the operating system shares the pages of its numeric columns between the workers but not the string columns.
+
+    An entry is measured when it is cached and again by update_size, the cached experiments keep their core data
+    as it was loaded, see utils.calculate_group_mean_ratios_per_smiles_and_plate.
+    """
+
+    def __init__(self, max_tabular_bytes: int, max_structure_bytes: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_tabular_bytes: Memory budget of the data frames of the cached experiments.
+            max_structure_bytes: Memory budget of the cached geometry files.
+
+        Raises:
+            ValueError: If a budget is not a positive integer.
+        """
+        for name, max_bytes in [("tabular", max_tabular_bytes), ("structure", max_structure_bytes)]:
+            if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes < 1:
+                raise ValueError(
+                    f"Experiment cache {name} budget must be a positive number of bytes, got: '{max_bytes}'"
+                )
+
+        self._experiments = _SizedLRU(max_tabular_bytes)
+        self._structures = _SizedLRU(max_structure_bytes)
+
+    def __len__(self):
+        return len(self._experiments.entries)
+
+    def __contains__(self, experiment_id):
+        return experiment_id in self._experiments.entries
+
+    def get(self, experiment_id: str):
+        """
+        Get a cached experiment and count the hit or miss.
+
+        Returns:
+            Experiment | None: The cached experiment, or None on a miss.
+        """
+        return self._experiments.get(experiment_id)
+
+    def put(self, experiment_id: str, experiment) -> bool:
+        """
+        Cache an experiment, evicting the least recently used experiments to stay within the tabular budget.
+        The structure of the experiment is not loaded, see get_geometry.
+
+        Returns:
+            bool: False if the data of the experiment is larger than the whole budget and it was not cached.
+        """
+        return self._experiments.put(experiment_id, experiment, get_experiment_tabular_size_in_bytes(experiment))
+
+    def update_size(self, experiment_id: str) -> bool:
+        """
+        Measure a cached experiment again after it kept more data, e.g. its top variants table,
+        evicting the least recently used experiments to stay within the tabular budget.
+
+        Returns:
+            bool: False if the experiment is not cached, or if it no longer fits in the budget and was removed.
+        """
+        entry = self._experiments.entries.get(experiment_id)
+        if entry is None:
+            return False
+
+        experiment = entry[0]
+        if not self._experiments.put(experiment_id, experiment, get_experiment_tabular_size_in_bytes(experiment)):
+            self._experiments.remove(experiment_id)
+            return False
+        return True
+
+    def get_geometry(self, experiment_id: str, load_geometry) -> bytes:
+        """
+        Get the cached geometry bytes of an experiment, loading and caching them on a miss.
+
+        Args:
+            experiment_id: ID of the experiment.
+            load_geometry: Callable returning the geometry bytes of the experiment, called on a miss.
+
+        Returns:
+            bytes: The geometry bytes.
+        """
+        geometry_bytes = self._structures.get(experiment_id)
+        if geometry_bytes is None:
+            geometry_bytes = load_geometry()
+            self._structures.put(experiment_id, geometry_bytes, len(geometry_bytes))
+        return geometry_bytes
+
+    def remove(self, experiment_id: str):
+        """Remove an experiment and its structure from the cache if they are cached."""
+        self._experiments.remove(experiment_id)
+        self._structures.remove(experiment_id)
+
+    def clear(self):
+        """Remove all the experiments and structures from the cache, the metrics are kept."""
+        self._experiments.clear()
+        self._structures.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Returns the metrics of the cache.
+
+        Returns:
+            dict: For the "tabular" (experiments) and the "structure" caches: the number of hits, misses
+                  and evictions, the hit rate, the number of entries and the bytes they use out of the budget,
+                  e.g. "tabular_hits" or "max_structure_bytes".
+        """
+        return {**self._experiments.get_stats("tabular"), **self._structures.get_stats("structure")}
+
+    def get_residency(self) -> dict:
+        """
+        Returns the cached experiments and structures and the memory they use.
+
+        Returns:
+            dict: "tabular" and "structure" lists of {"experiment_id", "bytes"} dictionaries,
+                  least recently used first, i.e. in eviction order.
+        """
+        return {"tabular": self._experiments.get_residency(), "structure": self._structures.get_residency()}
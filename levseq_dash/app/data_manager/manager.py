@@ -40,7 +40,10 @@ def validate_deployment_configuration():
     elif settings.is_local_instance_mode():
         try:
             # call the getters to trigger validation
-            settings.get_data_path()
+            if settings.is_db_mode():
+                settings.get_database_path()
+            else:
+                settings.get_data_path()
             if settings.is_data_modification_enabled():
                 settings.get_five_letter_id_prefix()
         except ValueError as e:
@@ -71,17 +74,12 @@ def create_data_manager() -> BaseDataManager:
         from levseq_dash.app.data_manager.disk_manager import DiskDataManager
 
         return DiskDataManager()
-    # Other modes are not yet implemented
-    # You can implement the required data manager class in the future and add it here like this
-    # as shown in the "db" example below
-    # elif storage_mode == "db":
-    # from levseq_dash.app.data_manager.db_manager import DatabaseDataManager
-    # return DatabaseDataManager()
+    elif storage_mode == "db":
+        from levseq_dash.app.data_manager.db_manager import DatabaseDataManager
+
+        return DatabaseDataManager()
     else:
-        raise ValueError(
-            "CONFIGURATION ERROR: deployment-mode must be either 'public-playground' or 'local-instance'. "
-            f"Got: '{settings.get_deployment_mode()}'"
-        )
+        raise ValueError(f"CONFIGURATION ERROR: storage-mode must be either 'disk' or 'db'. Got: '{storage_mode}'")
 
 
 # Python will only run module-level code once per process, no matter how often Dash reloads pages or triggers callbacks
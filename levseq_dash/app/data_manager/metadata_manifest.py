@@ -0,0 +1,298 @@
+"""
+Consolidated manifest of the experiment metadata of a data directory.
+
+Loading the metadata of every experiment at startup opens each {uuid}.json file and checks that its CSV and
+CIF files exist, which is slow for every gunicorn worker on a network mounted data directory with thousands
+of experiments. The manifest stores the metadata of all loadable experiments in a single file, together
+with the modification time of the data directory when it was written. Adding or removing an experiment
+directory changes that time, so a manifest with another time is stale and the metadata is scanned again.
+
+The manifest is stored in its own subdirectory, .manifest/experiments.json, so rewriting it doesn't change the
+modification time of the data directory. Editing a metadata file in place doesn't change it either: delete
+the manifest after such edits.
+
+The subdirectory also holds a generation counter, .manifest/generation, incremented every time an experiment is
+added or removed by a worker. The other workers compare it, and the modification time of the data directory,
+with the values they last saw to refresh their metadata incrementally, see DiskDataManager.refresh_experiments_metadata.
+The counter is needed because an upload finishes writing its files after the experiment directory was created.
+
+The experiments uploaded before the normalized content hash of their CSV file (csv_content_hash) was stored in
+their metadata are not covered by the near-duplicate check. Their metadata files are updated with:
+
+    python -m levseq_dash.app.data_manager.metadata_manifest --data-path /path/to/data
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from levseq_dash.app.data_manager.base import BaseDataManager
+
+try:
+    import fcntl
+except ImportError:  # Windows, the manifest updates are not locked
+    fcntl = None
+
+# bump this version when the layout of the manifest changes, existing manifests then become stale
+MANIFEST_VERSION = 1
+
+manifest_dir_name = ".manifest"
+manifest_file_name = "experiments.json"
+generation_file_name = "generation"
+
+
+def get_manifest_file_path(data_path) -> Path:
+    """Returns the path of the manifest of a data directory."""
+    return Path(data_path) / manifest_dir_name / manifest_file_name
+
+
+def get_data_path_mtime_ns(data_path) -> int:
+    """Returns the modification time of a data directory, it changes when an experiment directory is added or removed"""
+    return Path(data_path).stat().st_mtime_ns
+
+
+def read_generation(data_path) -> int:
+    """Returns the generation counter of a data directory, 0 if no experiment was added or removed yet."""
+    try:
+        return int((Path(data_path) / manifest_dir_name / generation_file_name).read_text())
+    except (OSError, ValueError):
+        return 0
+
+
+def _read_manifest_file(data_path) -> dict | None:
+    try:
+        with open(get_manifest_file_path(data_path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def read_manifest(data_path) -> dict | None:
+    """
+    Read the experiment metadata from the manifest of a data directory.
+
+    Returns:
+        dict | None: Experiment UUID -> metadata, or None if the manifest is missing, stale or unreadable.
+    """
+    manifest = _read_manifest_file(data_path)
+    if manifest is None or manifest.get("data_path_mtime_ns") != get_data_path_mtime_ns(data_path):
+        return None
+    return manifest.get("experiments")
+
+
+def write_manifest(data_path, experiments_metadata: dict, data_path_mtime_ns: int):
+    """
+    Write the manifest of a data directory after a scan of its experiments.
+
+    Args:
+        data_path: Data directory with the UUID layout of DiskDataManager.
+        experiments_metadata: Experiment UUID -> metadata of all the loadable experiments of the directory.
+        data_path_mtime_ns: Modification time of the data directory before the scan, so a directory that
+                            changed during the scan leaves a stale manifest.
+    """
+    # creating the manifest directory changes the modification time of the data directory
+    manifest_dir_created = not get_manifest_file_path(data_path).parent.exists()
+    with _manifest_lock(data_path):
+        if manifest_dir_created:
+            data_path_mtime_ns = get_data_path_mtime_ns(data_path)
+        _write_manifest_file(data_path, experiments_metadata, data_path_mtime_ns)
+
+
+def update_manifest(data_path, data_path_mtime_ns_before: int, experiment_uuid: str, metadata: dict | None):
+    """
+    Add, replace or remove the metadata of one experiment in the manifest after its directory was changed.
+
+    The manifest is only updated if it was current before the change, i.e. if it still has the modification
+    time data_path_mtime_ns_before. A manifest that was already stale is removed, so it is scanned again
+    at the next startup. The generation counter is incremented in any case. The update is locked against
+    the other workers.
+
+    Args:
+        data_path: Data directory with the UUID layout of DiskDataManager.
+        data_path_mtime_ns_before: Modification time of the data directory before the experiment directory changed.
+        experiment_uuid: UUID of the experiment.
+        metadata: Metadata of the added experiment, or None if the experiment was removed.
+    """
+    with _manifest_lock(data_path):
+        _write_atomically(
+            Path(data_path) / manifest_dir_name / generation_file_name, str(read_generation(data_path) + 1)
+        )
+
+        manifest = _read_manifest_file(data_path)
+        if manifest is None:
+            return
+
+        if manifest.get("data_path_mtime_ns") != data_path_mtime_ns_before:
+            get_manifest_file_path(data_path).unlink(missing_ok=True)
+            return
+
+        experiments_metadata = manifest.get("experiments", {})
+        if metadata is None:
+            experiments_metadata.pop(experiment_uuid, None)
+        else:
+            experiments_metadata[experiment_uuid] = metadata
+        _write_manifest_file(data_path, experiments_metadata, get_data_path_mtime_ns(data_path))
+
+
+def load_experiment_metadata(experiment_dir) -> dict | None:
+    """
+    Load the metadata of an experiment directory with the {uuid}/{uuid}.json|csv|cif layout.
+
+    Returns:
+        dict | None: The metadata, or None if the directory is not a loadable experiment,
+                     i.e. any of its JSON, CSV or CIF files is missing.
+
+    Raises:
+        Exception: If the metadata file can't be read.
+    """
+    experiment_dir = Path(experiment_dir)
+    experiment_uuid = experiment_dir.name
+    json_file = experiment_dir / f"{experiment_uuid}.json"
+    csv_file = experiment_dir / f"{experiment_uuid}.csv"
+    cif_file = experiment_dir / f"{experiment_uuid}.cif"
+
+    # all files have to be present to load
+    if not json_file.exists() or not csv_file.exists() or not cif_file.exists():
+        return None
+
+    with open(json_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_experiment_dirs(data_path) -> list:
+    """
+    Returns the sorted paths of the subdirectories of a data directory that can hold an experiment.
+    A single directory listing, the files of the experiments are not checked, see load_experiment_metadata.
+    Hidden directories, e.g. the manifest directory or the alignment admission directory, are skipped.
+    """
+    return sorted(entry.path for entry in os.scandir(data_path) if entry.is_dir() and not entry.name.startswith("."))
+
+
+def _write_manifest_file(data_path, experiments_metadata: dict, data_path_mtime_ns: int):
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "data_path_mtime_ns": data_path_mtime_ns,
+        "experiments": experiments_metadata,
+    }
+    _write_atomically(get_manifest_file_path(data_path), json.dumps(manifest))
+
+
+def _write_atomically(file_path: Path, text: str):
+    # written to a temporary file first so a reader never sees a partially written file
+    temp_file_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    with open(temp_file_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_file_path, file_path)
+
+
+def scan_experiments_metadata(data_path, max_workers=None) -> tuple[dict, dict]:
+    """
+    Load the metadata of all the experiment directories of a data directory with a thread pool,
+    the files are mostly waited for rather than parsed.
+
+    Args:
+        data_path: Data directory with the UUID layout of DiskDataManager.
+        max_workers: Number of threads, see ThreadPoolExecutor.
+
+    Returns:
+        tuple: (experiment UUID -> metadata of the loadable experiments,
+                experiment UUID -> error of the experiments whose metadata could not be loaded).
+                The metadata is sorted by UUID.
+    """
+    experiment_dirs = list_experiment_dirs(data_path)
+
+    def load(experiment_dir):
+        try:
+            return load_experiment_metadata(experiment_dir), None
+        except Exception as e:
+            return None, e
+
+    experiments_metadata = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for experiment_dir, (metadata, error) in zip(experiment_dirs, executor.map(load, experiment_dirs)):
+            experiment_uuid = Path(experiment_dir).name
+            if error is not None:
+                errors[experiment_uuid] = error
+            elif metadata is not None:
+                experiments_metadata[experiment_uuid] = metadata
+
+    return experiments_metadata, errors
+
+
+@contextmanager
+def _manifest_lock(data_path):
+    lock_file_path = Path(data_path) / manifest_dir_name / "lock"
+    lock_file_path.parent.mkdir(exist_ok=True)
+    with open(lock_file_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def backfill_content_hashes(data_path) -> dict:
+    """
+    Add the normalized content hash of the CSV file to the metadata files of the experiments that don't have one.
+    The manifest is removed if a metadata file was updated, so it is scanned again at the next startup.
+
+    Args:
+        data_path: Data directory with the UUID layout of DiskDataManager.
+
+    Returns:
+        dict: Number of "written", "current" and "failed" experiments.
+    """
+    counts = {"written": 0, "current": 0, "failed": 0}
+
+    for experiment_dir in list_experiment_dirs(data_path):
+        experiment_dir = Path(experiment_dir)
+        experiment_uuid = experiment_dir.name
+        try:
+            # directories without experiment data, e.g. the DELETED_EXP folder, are skipped
+            metadata = load_experiment_metadata(experiment_dir)
+            if metadata is None:
+                continue
+
+            if metadata.get("csv_content_hash"):
+                counts["current"] += 1
+                continue
+
+            csv_bytes = (experiment_dir / f"{experiment_uuid}.csv").read_bytes()
+            metadata["csv_content_hash"] = BaseDataManager.calculate_content_hash(csv_bytes)
+            _write_atomically(experiment_dir / f"{experiment_uuid}.json", json.dumps(metadata, indent=4))
+            counts["written"] += 1
+        except Exception as e:
+            print(f"Experiment {experiment_uuid}: {e}")
+            counts["failed"] += 1
+
+    if counts["written"]:
+        with _manifest_lock(data_path):
+            get_manifest_file_path(data_path).unlink(missing_ok=True)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add the content hash to the metadata files of experiments.")
+    parser.add_argument("--data-path", required=True, type=Path, help="data directory of the disk data manager")
+    args = parser.parse_args()
+
+    if not args.data_path.is_dir():
+        parser.error(f"Data directory not found at {args.data_path}")
+
+    counts = backfill_content_hashes(args.data_path)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
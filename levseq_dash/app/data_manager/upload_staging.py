@@ -0,0 +1,343 @@
+"""
+Server-side staging area of uploaded experiment files.
+
+An uploaded experiment CSV file is decoded, parsed and checked once, by the upload callback. The CSV file written
+from the parsed data, as the data managers store it, what they store about it in the metadata (checksum,
+content hash, parent sequence and number of plates) and its parsed core data, in a Parquet file, are then staged
+under a random token. The browser only keeps the token. Submitting the experiment stores the staged CSV file as
+it is and builds the derived data and the variant rows from the staged core data, the file is not decoded or
+parsed again, see BaseDataManager.add_staged_experiment_from_ui.
+
+The uploaded files themselves are received in chunks, see the upload routes of main_app: create_file_upload
+starts an upload of a file with a known size, up to the max-upload-size-mb setting, and append_file_upload_chunk
+streams each chunk to a partial file.
+A chunk is only appended at the current size of the partial file, so an interrupted upload is resumed from the
+offset returned by get_file_upload_offset. The SHA256 checksum of the file is calculated while its chunks are
+appended, the memory used doesn't depend on the size of the file.
+
+The staging directory is the hidden .upload_staging directory next to the data, see
+settings.get_upload_staging_path, so it is shared by all the gunicorn workers. Only the user of the app can
+access it, an existing directory that other users can access is rejected.
+A staged file is removed when its experiment is submitted, or when another file is staged after it expired.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from levseq_dash.app.config import settings
+from levseq_dash.app.utils import utils
+
+try:
+    import fcntl
+except ImportError:  # Windows, the chunks of an upload are not locked
+    fcntl = None
+
+# staged files older than this are removed, e.g. when the upload form was left without submitting
+STAGING_MAX_AGE_SECONDS = 24 * 60 * 60
+
+# the tokens are posted back by the browser, only the tokens created by stage_experiment_file name a file
+_token_pattern = re.compile(r"^[0-9a-f]{32}$")
+
+# largest chunk accepted by the upload route, the chunks of assets/chunkedUpload.js are 4 MB
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+# size of the blocks a chunk is copied to its partial file in
+_copy_block_size = 64 * 1024
+
+# upload token -> (size of the partial file, SHA256 of its content) of the uploads whose chunks this process
+# appended, the chunks of an upload may be received by different gunicorn workers
+_upload_checksums = {}
+_upload_checksums_lock = threading.Lock()
+
+
+class FileUploadOffsetError(Exception):
+    """A chunk was sent for another offset than the number of bytes of the upload that were received."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"The upload continues at offset {offset}.")
+        self.offset = offset
+
+
+def get_staging_path() -> Path:
+    """Returns the staging directory, it is created if it doesn't exist.
+
+    Raises:
+        PermissionError: If the directory belongs to another user or other users can access it.
+    """
+    return utils.make_private_directory(settings.get_upload_staging_path())
+
+
+def _check_token(token):
+    if not isinstance(token, str) or not _token_pattern.match(token):
+        raise ValueError("Invalid upload token, please upload the experiment file again.")
+
+
+def _get_staged_file_paths(token) -> tuple[Path, Path, Path]:
+    _check_token(token)
+    staging_path = get_staging_path()
+    return staging_path / f"{token}.json", staging_path / f"{token}.csv", staging_path / f"{token}.parquet"
+
+
+def _get_file_upload_paths(token) -> tuple[Path, Path]:
+    _check_token(token)
+    staging_path = get_staging_path()
+    return staging_path / f"{token}.upload.json", staging_path / f"{token}.upload"
+
+
+def stage_experiment_file(csv_bytes: bytes, file_info: dict, core_data_df: pd.DataFrame) -> str:
+    """
+    Stage an uploaded experiment file until its experiment is submitted. The expired staged files are removed.
+
+    Args:
+        csv_bytes: CSV file written from the parsed data, see BaseDataManager.prepare_experiment_file.
+        file_info: Metadata of the file, see BaseDataManager.prepare_experiment_file.
+        core_data_df: Core data of the parsed data, see BaseDataManager.prepare_experiment_file.
+
+    Returns:
+        str: Token of the staged file.
+    """
+    remove_expired_staged_files()
+
+    token = uuid.uuid4().hex
+    json_file_path, csv_file_path, core_data_file_path = _get_staged_file_paths(token)
+    csv_file_path.write_bytes(csv_bytes)
+    pq.write_table(pa.Table.from_pandas(core_data_df, preserve_index=False), core_data_file_path)
+
+    # the info is written last and atomically, a staged file is complete once its info exists
+    temp_file_path = json_file_path.with_name(f"{json_file_path.name}.tmp")
+    temp_file_path.write_text(json.dumps(file_info), encoding="utf-8")
+    os.replace(temp_file_path, json_file_path)
+
+    return token
+
+
+def load_staged_experiment_file(token) -> tuple[dict, bytes, pd.DataFrame]:
+    """
+    Load a staged experiment file.
+
+    Args:
+        token: Token of the staged file.
+
+    Returns:
+        tuple: (metadata of the file, CSV file, core data), as they were passed to stage_experiment_file.
+
+    Raises:
+        ValueError: If the token is invalid or the staged file doesn't exist anymore.
+    """
+    json_file_path, csv_file_path, core_data_file_path = _get_staged_file_paths(token)
+    try:
+        file_info = json.loads(json_file_path.read_text(encoding="utf-8"))
+        csv_bytes = csv_file_path.read_bytes()
+        # the categories are restored from the pandas metadata of the file
+        core_data_df = pq.read_table(core_data_file_path).to_pandas()
+    except (OSError, ValueError, pa.ArrowException):
+        raise ValueError("The uploaded experiment file has expired, please upload it again.")
+
+    return file_info, csv_bytes, utils.set_core_data_categories(core_data_df)
+
+
+def discard_staged_experiment_file(token):
+    """Remove a staged experiment file, e.g. after its experiment was stored."""
+    for file_path in _get_staged_file_paths(token):
+        file_path.unlink(missing_ok=True)
+
+
+def remove_expired_staged_files(max_age_seconds: float = STAGING_MAX_AGE_SECONDS) -> int:
+    """
+    Remove the staged files that are older than max_age_seconds.
+
+    Returns:
+        int: Number of removed files.
+    """
+    expired_time = time.time() - max_age_seconds
+    removed_count = 0
+    for entry in os.scandir(get_staging_path()):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < expired_time:
+                os.unlink(entry.path)
+                removed_count += 1
+                with _upload_checksums_lock:
+                    _upload_checksums.pop(entry.name.split(".")[0], None)
+        except OSError:
+            # removed by another worker
+            pass
+
+    return removed_count
+
+
+def create_file_upload(filename: str, size: int) -> str:
+    """
+    Start the chunked upload of a file. The expired staged files are removed.
+
+    Args:
+        filename: Name of the uploaded file.
+        size: Size of the file in bytes.
+
+    Returns:
+        str: Token of the upload.
+
+    Raises:
+        ValueError: If the size is not a positive integer or is larger than the maximum upload size,
+                    see settings.get_max_upload_size_mb.
+    """
+    if isinstance(size, bool) or not isinstance(size, int) or size <= 0:
+        raise ValueError("The uploaded file is empty.")
+
+    max_upload_size_mb = settings.get_max_upload_size_mb()
+    if size > max_upload_size_mb * 1024 * 1024:
+        raise ValueError(f"The uploaded file is larger than the maximum upload size of {max_upload_size_mb} MB.")
+
+    remove_expired_staged_files()
+
+    token = uuid.uuid4().hex
+    info_file_path, upload_file_path = _get_file_upload_paths(token)
+    upload_file_path.touch()
+    info_file_path.write_text(json.dumps({"filename": str(filename), "size": size}), encoding="utf-8")
+
+    with _upload_checksums_lock:
+        _upload_checksums[token] = (0, hashlib.sha256())
+
+    return token
+
+
+def _read_file_upload_info(token) -> tuple[dict, Path]:
+    info_file_path, upload_file_path = _get_file_upload_paths(token)
+    try:
+        upload_info = json.loads(info_file_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        raise ValueError("The uploaded file has expired, please upload it again.")
+    return upload_info, upload_file_path
+
+
+def get_file_upload_offset(token) -> tuple[int, int]:
+    """
+    Returns the number of bytes of an upload that were received, the offset of its next chunk, and its size.
+
+    Raises:
+        ValueError: If the token is invalid or the upload doesn't exist.
+    """
+    upload_info, upload_file_path = _read_file_upload_info(token)
+    return upload_file_path.stat().st_size, upload_info["size"]
+
+
+def append_file_upload_chunk(token, offset: int, stream, chunk_size: int) -> int:
+    """
+    Append a chunk to an upload, the chunk is read from the stream in blocks.
+
+    Args:
+        token: Token of the upload.
+        offset: Offset of the chunk in the file, the number of bytes of the upload that were already received.
+        stream: Binary stream of the chunk, e.g. the stream of the request.
+        chunk_size: Size of the chunk in bytes.
+
+    Returns:
+        int: The offset of the next chunk, the size of the file once all its chunks were received.
+
+    Raises:
+        ValueError: If the upload doesn't exist, the chunk doesn't fit in the file or the stream ends early.
+        FileUploadOffsetError: If the offset is not the number of bytes that were received.
+    """
+    upload_info, upload_file_path = _read_file_upload_info(token)
+    if chunk_size <= 0 or offset + chunk_size > upload_info["size"]:
+        raise ValueError("The chunk doesn't fit in the uploaded file.")
+
+    with _file_upload_lock(upload_file_path), open(upload_file_path, "r+b") as f:
+        current_offset = f.seek(0, os.SEEK_END)
+        if current_offset != offset:
+            raise FileUploadOffsetError(current_offset)
+
+        with _upload_checksums_lock:
+            checksum_offset, checksum = _upload_checksums.pop(token, (None, None))
+        if checksum_offset != offset:
+            # the previous chunks were received by another process, the checksum is calculated at the end
+            checksum = None
+
+        remaining_size = chunk_size
+        try:
+            while remaining_size > 0:
+                block = stream.read(min(_copy_block_size, remaining_size))
+                if not block:
+                    raise ValueError("The chunk is incomplete.")
+                f.write(block)
+                if checksum is not None:
+                    checksum.update(block)
+                remaining_size -= len(block)
+        except BaseException:
+            # keep the chunks that were received completely, the client resumes after them
+            f.truncate(offset)
+            raise
+
+    if checksum is not None:
+        with _upload_checksums_lock:
+            _upload_checksums[token] = (offset + chunk_size, checksum)
+
+    return offset + chunk_size
+
+
+def get_completed_file_upload(token) -> tuple[Path, str, str]:
+    """
+    Get a file whose chunks were all received.
+
+    Args:
+        token: Token of the upload.
+
+    Returns:
+        tuple: (path of the file, name of the uploaded file, SHA256 checksum of the file)
+
+    Raises:
+        ValueError: If the token is invalid, the upload doesn't exist or is not complete.
+    """
+    upload_info, upload_file_path = _read_file_upload_info(token)
+    if upload_file_path.stat().st_size != upload_info["size"]:
+        raise ValueError("The file upload is not complete, please upload it again.")
+
+    with _upload_checksums_lock:
+        checksum_offset, checksum = _upload_checksums.get(token, (None, None))
+
+    if checksum_offset == upload_info["size"]:
+        checksum = checksum.copy()
+    else:
+        checksum = hashlib.sha256()
+        with open(upload_file_path, "rb") as f:
+            while block := f.read(_copy_block_size):
+                checksum.update(block)
+
+    return upload_file_path, upload_info["filename"], checksum.hexdigest()
+
+
+def discard_file_upload(token):
+    """Remove an uploaded file, e.g. after it was staged or stored."""
+    info_file_path, upload_file_path = _get_file_upload_paths(token)
+    with _upload_checksums_lock:
+        _upload_checksums.pop(token, None)
+    info_file_path.unlink(missing_ok=True)
+    upload_file_path.unlink(missing_ok=True)
+    _get_file_upload_lock_path(upload_file_path).unlink(missing_ok=True)
+
+
+def _get_file_upload_lock_path(upload_file_path: Path) -> Path:
+    return upload_file_path.with_name(f"{upload_file_path.name}.lock")
+
+
+@contextmanager
+def _file_upload_lock(upload_file_path: Path):
+    # the chunks of an upload can be received by several workers, e.g. a chunk that is sent again
+    with open(_get_file_upload_lock_path(upload_file_path), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,115 @@
+"""
+Streaming ZIP archives.
+
+zipfile writes an archive to an output that can't seek by adding a data descriptor after every file,
+so the archive can be sent while it is written. iter_zip hands out the bytes written by zipfile in chunks
+and reads the files of the archive in chunks, the memory it uses is bounded by the chunk size rather than
+by the size of the archive or of its files.
+
+The files are stored without compression, so the size of an archive only depends on the names and sizes of
+its files and zip_size computes it before the archive is written, e.g. for the Content-Length of a download.
+"""
+
+import zipfile
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+# size of the chunks read from the files and yielded by iter_zip
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# sizes of the records written by zipfile for a stored file without extra fields, see the ZIP specification
+_LOCAL_FILE_HEADER_SIZE = 30
+_DATA_DESCRIPTOR_SIZE = 16
+_CENTRAL_DIRECTORY_HEADER_SIZE = 46
+_END_OF_CENTRAL_DIRECTORY_SIZE = 22
+
+
+class _ZipOutput:
+    """Unseekable output that keeps the bytes written by zipfile until they are taken."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    @property
+    def buffered_size(self) -> int:
+        # not __len__, zipfile checks that its output is truthy
+        return len(self._buffer)
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # the offsets of the files in the central directory
+        return self._position
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_zip(
+    entries: Iterable[Tuple[str, Union[bytes, Callable]]], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Write a ZIP archive and yield its bytes in chunks while it is written.
+
+    Args:
+        entries: (name in the archive, content) pairs, the content is either bytes or a callable returning a
+                 binary file object, which is read in chunks and closed. The entries are consumed lazily.
+        chunk_size: Approximate size of the yielded chunks.
+
+    Returns:
+        Iterator[bytes]: The chunks of the archive, the last one ends with its central directory.
+    """
+    output = _ZipOutput()
+
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as zipf:
+        for name, content in entries:
+            with zipf.open(name, "w") as entry:
+                if isinstance(content, bytes):
+                    entry.write(content)
+                else:
+                    with content() as f:
+                        while chunk := f.read(chunk_size):
+                            entry.write(chunk)
+                            if output.buffered_size >= chunk_size:
+                                yield output.take()
+
+            if output.buffered_size >= chunk_size:
+                yield output.take()
+
+    yield output.take()
+
+
+def zip_size(entries: Iterable[Tuple[str, int]]) -> Optional[int]:
+    """
+    Compute the size of the ZIP archive iter_zip writes for files with these names and sizes.
+
+    Args:
+        entries: (name in the archive, size of the content in bytes) pairs, in the order of the archive.
+
+    Returns:
+        Optional[int]: Size of the archive in bytes, or None if it needs the ZIP64 extensions, whose records
+                       zipfile only adds once the files are written.
+    """
+    size = _END_OF_CENTRAL_DIRECTORY_SIZE
+    file_count = 0
+    for name, content_size in entries:
+        # zipfile encodes names that aren't ASCII as UTF-8
+        name_size = len(name.encode("utf-8"))
+        if content_size >= zipfile.ZIP64_LIMIT:
+            return None
+        size += _LOCAL_FILE_HEADER_SIZE + name_size + content_size + _DATA_DESCRIPTOR_SIZE
+        size += _CENTRAL_DIRECTORY_HEADER_SIZE + name_size
+        file_count += 1
+
+    if size >= zipfile.ZIP64_LIMIT or file_count >= zipfile.ZIP_FILECOUNT_LIMIT:
+        return None
+
+    return size
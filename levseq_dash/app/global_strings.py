@@ -110,6 +110,9 @@ seq_align_form_threshold_default = "0.8"
 seq_align_form_hot_cold = "# GoF/LoF Mutations to extract"
 seq_align_form_hot_cold_n = "2"
 seq_align_form_button_sequence_matching = "Find Matching Sequences"
+# progress of a search that runs as a background job
+search_progress_aligning = "Aligned {} / {} sequences"
+search_progress_gathering = "Gathered the data of {} / {} matches"
 seq_align_residues = "Gain-of-function (GoF) and Loss-of-function (LoF) Mutations"
 seq_align_visualize = "Visualize Selected Experiment"
 seg_align_results = "Matched Experiments"
@@ -183,6 +186,11 @@ cc_hot_and_cold_indices_per_smiles = "hot_and_cold_residue_indices_per_smiles"
 cc_exp_residue_per_smiles = "all_exp_residue_indices_per_smiles"
 cc_seq_alignment_mismatches = "seq_align_mismatch_indices"
 cc_hot_cold_type = "variant_type"
+cc_valid_mutation = "valid_mutation"
+cc_substitution_indices = "substitution_indices"
+cc_single_site_position = "single_site_position"
+# row index of the data in the tables with the infinite row model, used as the AG Grid row ID
+cc_row_id = "row_id"
 
 # -----------------------------
 # These strings follow the column headers in the csv file.
@@ -212,6 +220,9 @@ experiment_core_data_list = [
     c_fitness_value,
 ]
 
+# core data columns with few distinct values, kept as categories in memory
+experiment_core_data_categorical_list = [c_smiles, c_plate, c_well]
+
 # this is the data used for the experiment heatmap
 # dropdown gets populated with this data
 experiment_heatmap_properties_list = [
@@ -231,3 +242,13 @@ nav_explore_path = "/explore"
 nav_upload_path = "/upload"
 nav_about_path = "/about"
 nav_experiment_path = "/experiment"
+
+# -----------------------------
+# server endpoints
+# -----------------------------
+# streams the ZIP file of the experiments selected on the explore page
+experiments_zip_export_path = "/export/experiments.zip"
+# chunked upload of the experiment and structure files, also used by assets/chunkedUpload.js
+file_uploads_path = "/uploads"
+# alignment slots of the host and the number of alignment tasks that hold one or wait for one
+alignment_queue_metrics_path = "/metrics/alignment-queue"
@@ -1,12 +1,15 @@
-import base64
+import functools
+import tempfile
 import time
 from datetime import datetime
+from pathlib import Path
 
 import dash_bootstrap_components as dbc
 import dash_molstar
+import flask
 import numpy as np
 import pandas as pd
-from dash import Dash, Input, Output, State, ctx, dcc, html, no_update
+from dash import Dash, DiskcacheManager, Input, Output, State, ctx, dcc, html, no_update, set_props
 from dash.exceptions import PreventUpdate
 from dash_bootstrap_templates import load_figure_template
 from dash_molstar.utils import molstar_helper
@@ -25,12 +28,44 @@ from levseq_dash.app.components.layout import (
 )
 from levseq_dash.app.components.widgets import get_alert
 from levseq_dash.app.config import settings
+from levseq_dash.app.data_manager import upload_staging
 from levseq_dash.app.data_manager.base import BaseDataManager
 from levseq_dash.app.data_manager.experiment import Experiment
 from levseq_dash.app.data_manager.manager import singleton_data_mgr_instance
-from levseq_dash.app.sequence_aligner import bio_python_pairwise_aligner
+from levseq_dash.app.sequence_aligner import alignment_admission, bio_python_pairwise_aligner
 from levseq_dash.app.utils import u_protein_viewer, u_reaction, u_seq_alignment, utils
 
+
+class AlignerServiceDiskcacheManager(DiskcacheManager):
+    """DiskcacheManager whose jobs align in the persistent aligner pool of the gunicorn worker that started them.
+
+    A job runs in a process forked from the worker, so it would otherwise start an aligner pool of its own for
+    every search. The aligner service of the worker is started before the job is forked and the job submits its
+    chunks to the pool of the worker through it, see bio_python_pairwise_aligner.get_aligner_pool.
+    """
+
+    def call_job_fn(self, key, job_fn, args, context):
+        bio_python_pairwise_aligner.start_aligner_service()
+        return super().call_job_fn(key, job_fn, args, context)
+
+
+def get_background_callback_manager():
+    """Returns the manager of the background callbacks, None if background-jobs is disabled in config.yaml.
+
+    The jobs run in processes started by the gunicorn workers. Their progress and results are kept in a
+    disk cache in the temporary directory of the host, so any of the workers can answer the polls of a job.
+    """
+    if not settings.is_background_jobs_enabled():
+        return None
+
+    # part of dash[diskcache], only needed with background jobs
+    import diskcache
+
+    return AlignerServiceDiskcacheManager(diskcache.Cache(Path(tempfile.gettempdir()) / "levseq_dash_background_jobs"))
+
+
+background_callback_manager = get_background_callback_manager()
+
 # Initialize the app
 dbc_css = "https://cdn.jsdelivr.net/gh/AnnMarieW/dash-bootstrap-templates/dbc.min.css"
 app = Dash(
@@ -38,12 +73,22 @@ app = Dash(
     title=gs.web_title,
     suppress_callback_exceptions=True,
     external_stylesheets=[dbc.themes.FLATLY, dbc_css, dbc.icons.BOOTSTRAP, dbc.icons.FONT_AWESOME],
+    background_callback_manager=background_callback_manager,
 )
 
 # VERY important line of code for running with gunicorn
 # you run the 'server' not the 'app'. VS. you run the 'app' with uvicorn
 server = app.server
 
+
+def get_route_path(path):
+    """Returns the path of a Flask route of the server under the routes prefix of the app, like its Dash routes.
+
+    The pages request the route at dash.get_relative_path(path), which adds the requests prefix of the app.
+    """
+    return app.config.routes_pathname_prefix + path.lstrip("/")
+
+
 load_figure_template(gs.dbc_template_name)
 
 # app.server.config.update(SECRET_KEY=settings.load_config()["db-service"]["session_key"])
@@ -55,6 +100,7 @@ app.layout = dbc.Container(
             [html.Div([layout_bars.get_sidebar(), html.Div(id="id-page-content", className="content")])],
         ),
         # stores
+        # token of the uploaded experiment file, which is staged on the server
         dcc.Store(id="id-exp-upload-csv"),
         dcc.Store(id="id-exp-upload-structure"),
         dcc.Store(id="id-experiment-selected"),
@@ -188,7 +234,20 @@ def update_explore_page_buttons(selected_rows):
 
 
 @app.callback(
-    Output("id-download-all-experiments-zip", "data"),
+    Output("id-input-download-experiment-ids", "value"),
+    Input("id-table-all-experiments", "selectedRows"),
+    prevent_initial_call=True,
+)
+def update_download_experiment_ids(selected_rows):
+    """Stores the IDs of the selected experiments in the download form, comma separated."""
+    if not selected_rows:
+        return ""
+
+    return ",".join(row["experiment_id"] for row in selected_rows)
+
+
+@app.callback(
+    Output("id-alert-explore", "children", allow_duplicate=True),
     Input("id-button-download-all-experiments", "n_clicks"),
     State("id-table-all-experiments", "selectedRows"),  # Get the selected rows instead of all table data
     prevent_initial_call=True,
@@ -197,31 +256,131 @@ def update_explore_page_buttons(selected_rows):
     running=[(Output("id-button-download-all-experiments", "disabled"), True, False)],  # requires the latest Dash 2.16
 )
 def on_download_selected_experiments(n_clicks, selected_rows):
-    """Downloads selected experiments as a timestamped ZIP file.
+    """Reports the download of the selected experiments.
 
-    Packages all selected experiment data and returns a base64-encoded ZIP file
-    for download with a timestamp in the filename.
+    The button submits the download form, the ZIP file itself is streamed by export_experiments_zip.
+    For large selections the alert gives the number of experiments and the size of their files,
+    while the browser shows the progress of the download from the Content-Length of the response.
     """
     if not selected_rows:
         raise PreventUpdate
 
-    experiments_with_meta_data_dict = selected_rows if selected_rows else []
+    files_size = sum(
+        singleton_data_mgr_instance.get_experiment_files_size(row["experiment_id"]) for row in selected_rows
+    )
+
+    return get_alert(
+        f"Downloading {len(selected_rows)} experiment(s), {files_size / (1024 * 1024):.1f} MB.",
+        error=False,
+    )
 
-    if not experiments_with_meta_data_dict:
-        return None
 
-    zip_data = singleton_data_mgr_instance.get_experiments_zipped(experiments_with_meta_data_dict)
+@server.route(get_route_path(gs.experiments_zip_export_path), methods=["POST"])
+def export_experiments_zip():
+    """Streams the experiments posted by the download form as a timestamped ZIP file.
+
+    The archive is written while it is sent, so the memory used doesn't depend on the number of experiments.
+    Its size is computed beforehand and sent as the Content-Length, so the browser can show the progress.
+    The metadata of the experiments is looked up by their IDs rather than taken from the request.
+    """
+    experiment_ids = [
+        experiment_id for experiment_id in flask.request.form.get("experiment_ids", "").split(",") if experiment_id
+    ]
+    experiments_with_meta_data = [
+        metadata
+        for metadata in map(singleton_data_mgr_instance.get_experiment_metadata, dict.fromkeys(experiment_ids))
+        if metadata is not None
+    ]
+
+    if not experiments_with_meta_data:
+        flask.abort(404)
 
     # timestamp the file
     timestamp = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
     zip_filename = f"EnzEngDB_Experiments_{timestamp}.zip"
 
-    # dash dcc.Download component
-    zip_download_data = dict(
-        content=base64.b64encode(zip_data).decode(), filename=zip_filename, base64=True, type="application/zip"
+    headers = {"Content-Disposition": f'attachment; filename="{zip_filename}"'}
+    zip_size = singleton_data_mgr_instance.get_experiments_zip_size(experiments_with_meta_data)
+    if zip_size is not None:
+        headers["Content-Length"] = str(zip_size)
+
+    return flask.Response(
+        singleton_data_mgr_instance.iter_experiments_zipped(experiments_with_meta_data),
+        mimetype="application/zip",
+        headers=headers,
     )
 
-    return zip_download_data
+
+# -------------------------------
+#   Upload Page - chunked upload of the experiment and structure files, see assets/chunkedUpload.js
+# -------------------------------
+@server.route(get_route_path(gs.file_uploads_path), methods=["POST"])
+def start_file_upload():
+    """Starts the chunked upload of a file with the name and size posted as JSON and returns its upload ID."""
+    if not settings.is_data_modification_enabled():
+        flask.abort(403)
+
+    request_json = flask.request.get_json(silent=True) or {}
+    try:
+        upload_id = upload_staging.create_file_upload(request_json.get("filename", ""), request_json.get("size"))
+    except ValueError as e:
+        return flask.jsonify({"error": str(e)}), 400
+
+    return flask.jsonify({"upload_id": upload_id, "offset": 0}), 201
+
+
+@server.route(get_route_path(f"{gs.file_uploads_path}/<upload_id>"), methods=["GET"])
+def get_file_upload_status(upload_id):
+    """Returns the offset an interrupted upload is resumed from and the size of its file."""
+    try:
+        offset, size = upload_staging.get_file_upload_offset(upload_id)
+    except ValueError as e:
+        return flask.jsonify({"error": str(e)}), 404
+
+    return flask.jsonify({"offset": offset, "size": size})
+
+
+@server.route(get_route_path(f"{gs.file_uploads_path}/<upload_id>"), methods=["PATCH"])
+def receive_file_upload_chunk(upload_id):
+    """Appends the body of the request to an upload at the offset of its Upload-Offset header.
+
+    The chunk is streamed to the file of the upload. A chunk for another offset is rejected with
+    the offset the upload continues at, e.g. when a chunk is sent again after its response was lost.
+    """
+    if not settings.is_data_modification_enabled():
+        flask.abort(403)
+
+    offset = flask.request.headers.get("Upload-Offset", type=int)
+    chunk_size = flask.request.content_length
+    if offset is None or not chunk_size or chunk_size > upload_staging.MAX_CHUNK_SIZE:
+        max_chunk_size_mb = upload_staging.MAX_CHUNK_SIZE // (1024 * 1024)
+        return flask.jsonify(
+            {"error": f"A chunk needs an Upload-Offset and a size of at most {max_chunk_size_mb} MB."}
+        ), 400
+
+    try:
+        offset = upload_staging.append_file_upload_chunk(upload_id, offset, flask.request.stream, chunk_size)
+    except upload_staging.FileUploadOffsetError as e:
+        return flask.jsonify({"error": str(e), "offset": e.offset}), 409
+    except ValueError as e:
+        return flask.jsonify({"error": str(e)}), 400
+
+    return flask.jsonify({"offset": offset})
+
+
+# -------------------------------
+#   Host-wide alignment queue, see alignment_admission
+# -------------------------------
+@server.route(get_route_path(gs.alignment_queue_metrics_path), methods=["GET"])
+def get_alignment_queue_metrics():
+    """Returns the number of alignment slots of the host and of the alignment tasks that hold one or wait for one.
+
+    The route is not authenticated, so it is only served when alignment-queue-metrics is enabled in config.yaml.
+    """
+    if not settings.is_alignment_queue_metrics_enabled():
+        flask.abort(404)
+
+    return flask.jsonify(alignment_admission.get_alignment_queue_metrics(settings.get_max_concurrent_alignments()))
 
 
 # -------------------------------
@@ -336,33 +495,44 @@ def set_assay_list(assay_list):
     Output("id-button-upload-data-info", "children"),
     # Output("id-button-upload-data", "style"),
     Output("id-exp-upload-csv", "data"),
-    Input("id-button-upload-data", "contents"),
-    State("id-button-upload-data", "filename"),
-    State("id-button-upload-data", "last_modified"),
+    Input("id-upload-data-file", "data"),
 )
-def on_upload_experiment_file(dash_upload_string_contents, filename, last_modified):
+def on_upload_experiment_file(uploaded_file):
     """Validates and processes uploaded experiment CSV file.
 
+    The file was uploaded in chunks to the server, see assets/chunkedUpload.js, and is parsed from disk.
     Checks for duplicate experiments, runs sanity checks on the data, and displays
     file information (rows, columns, SMILES) if validation passes, or error alerts if not.
     """
-    if not dash_upload_string_contents:
+    if not uploaded_file:
         return "No file uploaded.", no_update
     else:
+        upload_id = uploaded_file.get("upload_id")
         try:
-            base64_encoded_string = utils.decode_dash_upload_data_to_base64_encoded_string(dash_upload_string_contents)
+            if uploaded_file.get("error"):
+                raise Exception(uploaded_file["error"])
 
-            # convert the bytes string into a data frame
-            df, csv_file_bytes = utils.decode_csv_file_base64_string_to_dataframe(base64_encoded_string)
+            # the checksum was calculated while the file was received
+            csv_file_path, filename, csv_checksum = upload_staging.get_completed_file_upload(upload_id)
 
-            # check if this experiment already exists in the db
-            # this will raise an exception if a duplicate is found
-            csv_checksum = BaseDataManager.calculate_file_checksum(csv_file_bytes)
-            singleton_data_mgr_instance.check_for_duplicate_experiment(csv_checksum)
+            # convert the file into a data frame, the file is only parsed here
+            df = utils.read_csv_file_to_dataframe(csv_file_path)
+
+            # check if this experiment, or the same data with reordered columns or other whitespace,
+            # already exists in the db. This will raise an exception if a duplicate is found
+            content_hash = BaseDataManager.calculate_dataframe_content_hash(df)
+            singleton_data_mgr_instance.check_for_duplicate_experiment(csv_checksum, content_hash)
 
             # sanity check will raise exceptions if any check is not passed
             checks_passed = Experiment.run_sanity_checks_on_experiment_file(df)
             if checks_passed:
+                # the checked file and its parsed core data stay on the server until the experiment
+                # is submitted, the browser only keeps its token
+                file_info, csv_bytes, core_data_df = BaseDataManager.prepare_experiment_file(
+                    df, csv_checksum, content_hash
+                )
+                staging_token = upload_staging.stage_experiment_file(csv_bytes, file_info, core_data_df)
+
                 rows, cols = df.shape
                 # checks have passed so we can extract this info
                 unique_smiles_in_data = ".".join(df[gs.c_smiles].unique().tolist())
@@ -392,7 +562,7 @@ def on_upload_experiment_file(dash_upload_string_contents, filename, last_modifi
                         ]
                     ),
                 ]
-                return info, base64_encoded_string
+                return info, staging_token
         except Exception as e:
             # a check did not pass
             info = [
@@ -406,26 +576,31 @@ def on_upload_experiment_file(dash_upload_string_contents, filename, last_modifi
                 class_name="user-alert-error",
             )
             return alert, no_update
+        finally:
+            # the uploaded file was staged or has to be uploaded again
+            if upload_id:
+                discard_file_upload(upload_id)
 
 
 @app.callback(
     Output("id-button-upload-structure-info", "children"),
     Output("id-exp-upload-structure", "data"),
-    Input("id-button-upload-structure", "contents"),
-    State("id-button-upload-structure", "filename"),
-    State("id-button-upload-structure", "last_modified"),
+    Input("id-upload-structure-file", "data"),
 )
-def on_upload_structure_file(dash_upload_string_contents, filename, last_modified):
+def on_upload_structure_file(uploaded_file):
     """Processes uploaded protein structure file (PDB/CIF).
 
-    Validates and stores the structure file for the experiment, displaying
-    the filename or error alerts.
+    The file was uploaded in chunks to the server and stays there until the experiment is submitted,
+    the store only keeps its upload ID. Displays the filename or error alerts.
     """
-    if not dash_upload_string_contents:
+    if not uploaded_file:
         return "No file uploaded.", no_update
     else:
         try:
-            base64_encoded_string = utils.decode_dash_upload_data_to_base64_encoded_string(dash_upload_string_contents)
+            if uploaded_file.get("error"):
+                raise Exception(uploaded_file["error"])
+
+            _, filename, _ = upload_staging.get_completed_file_upload(uploaded_file.get("upload_id"))
             info = [
                 html.Div(
                     [
@@ -434,12 +609,20 @@ def on_upload_structure_file(dash_upload_string_contents, filename, last_modifie
                     ]
                 ),
             ]
-            return info, base64_encoded_string
+            return info, uploaded_file["upload_id"]
         except Exception as e:
             alert = get_alert(f"Error: {e}")
             return alert, no_update
 
 
+def discard_file_upload(upload_id):
+    """Removes an uploaded file, an invalid upload ID posted by the browser is ignored."""
+    try:
+        upload_staging.discard_file_upload(upload_id)
+    except ValueError:
+        pass
+
+
 @app.callback(
     Output("id-input-substrate", "valid"),
     Output("id-input-substrate", "invalid"),
@@ -520,17 +703,20 @@ def on_submit_experiment(
     mutagenesis_method,
     experiment_doi,
     experiment_additional_info,
-    geometry_content_base64_encoded_string,
-    experiment_content_base64_encoded_string,
+    structure_upload_id,
+    experiment_staging_token,
 ):
     """Submits a new experiment to the database.
 
-    Creates a new experiment entry with all provided metadata and files,
-    then redirects to the experiment page on success or displays error alerts on failure.
+    Creates a new experiment entry with all provided metadata and files, the experiment file was staged
+    on the server by the upload, then redirects to the experiment page on success or displays error alerts on failure.
     """
     if n_clicks > 0 and ctx.triggered_id == "id-button-submit":
         try:
-            experiment_id = singleton_data_mgr_instance.add_experiment_from_ui(
+            # the structure file is uploaded in chunks to the server, the data manager copies it into place
+            geometry_file_path, _, _ = upload_staging.get_completed_file_upload(structure_upload_id)
+
+            experiment_id = singleton_data_mgr_instance.add_staged_experiment_from_ui(
                 experiment_name=experiment_name,
                 experiment_date=experiment_date,
                 substrate=substrate,
@@ -539,8 +725,8 @@ def on_submit_experiment(
                 mutagenesis_method=mutagenesis_method,
                 experiment_doi=experiment_doi,
                 experiment_additional_info=experiment_additional_info,
-                experiment_content_base64_string=experiment_content_base64_encoded_string,
-                geometry_content_base64_string=geometry_content_base64_encoded_string,
+                experiment_staging_token=experiment_staging_token,
+                geometry_file_path=geometry_file_path,
             )
 
             # you can verify the information here
@@ -550,6 +736,7 @@ def on_submit_experiment(
                 f"Experiment with UUID: {experiment_id} has been added successfully! Redirecting to experiment page..."
             )
             alert = get_alert(success, error=False)
+            discard_file_upload(structure_upload_id)
 
             return (
                 alert,
@@ -593,10 +780,65 @@ def redirect_to_experiment_page_after_upload(experiment_id):
         raise PreventUpdate
 
 
+# ----------------------------------------
+#   Sequence searches
+# ----------------------------------------
+# interval in seconds at which a background search shows the results gathered so far
+partial_results_interval_seconds = 1
+
+
+def search_callback(*dependencies, run_button_id, progress_div_id, progress_bar_id, **kwargs):
+    """Registers a sequence search callback, as a background callback if background-jobs is enabled.
+
+    The first argument of the callback is set_progress. A background search calls it with
+    (value, max, label) of the progress bar, which is shown while the search runs, and is cancelled
+    when the run button is clicked again. Otherwise the search runs in the request, set_progress is None
+    and the run button is disabled while the search runs.
+    """
+
+    def decorator(func):
+        if background_callback_manager is not None:
+            app.callback(
+                *dependencies,
+                background=True,
+                progress=[
+                    Output(progress_bar_id, "value"),
+                    Output(progress_bar_id, "max"),
+                    Output(progress_bar_id, "label"),
+                ],
+                progress_default=[0, 1, ""],
+                cancel=[Input(run_button_id, "n_clicks")],
+                running=[(Output(progress_div_id, "style"), vis.display_block, vis.display_none)],
+                **kwargs,
+            )(func)
+        else:
+            app.callback(
+                *dependencies,
+                running=[(Output(run_button_id, "disabled"), True, False)],  # requires the latest Dash 2.16
+                **kwargs,
+            )(functools.partial(func, None))
+        return func
+
+    return decorator
+
+
+def get_alignment_progress_callback(set_progress):
+    """Returns the progress_callback of get_alignments that shows how many sequences a search aligned."""
+    if set_progress is None:
+        return None
+
+    def show_alignment_progress(aligned_targets, total_targets):
+        set_progress(
+            (aligned_targets, total_targets, gs.search_progress_aligning.format(aligned_targets, total_targets))
+        )
+
+    return show_alignment_progress
+
+
 # ----------------------------------------
 #   Matching Sequences Dashboard related
 # ----------------------------------------
-@app.callback(
+@search_callback(
     Output("id-table-matched-sequences", "rowData"),
     Output("id-table-matched-sequences-exp-hot-cold-data", "rowData"),
     Output("id-div-matched-sequences-info", "children"),
@@ -610,13 +852,16 @@ def redirect_to_experiment_page_after_upload(experiment_id):
     State("id-input-query-sequence-threshold", "value"),
     State("id-input-num-hot-cold", "value"),
     prevent_initial_call=True,
-    running=[(Output("id-button-run-seq-matching", "disabled"), True, False)],  # requires the latest Dash 2.16
+    run_button_id="id-button-run-seq-matching",
+    progress_div_id="id-div-progress-seq-matching",
+    progress_bar_id="id-progress-seq-matching",
 )
-def on_load_matching_sequences(results_are_cleared, n_clicks, query_sequence, threshold, n_top_hot_cold):
+def on_load_matching_sequences(set_progress, results_are_cleared, n_clicks, query_sequence, threshold, n_top_hot_cold):
     """Performs sequence alignment and identifies matching sequences across all lab experiments.
 
     Aligns the query sequence against all lab sequences, identifies hot/cold spots,
-    and gathers fitness data per SMILES for each matched experiment.
+    and gathers fitness data per SMILES for each matched experiment. As a background job,
+    the progress and the matches gathered so far are shown while the search runs.
     """
     if ctx.triggered_id == "id-cleared-run-seq-matching" and results_are_cleared:
         try:
@@ -624,19 +869,29 @@ def on_load_matching_sequences(results_are_cleared, n_clicks, query_sequence, th
             if settings.is_sequence_alignment_profiling_enabled():
                 start_time = time.time()
 
-            # get all the lab sequences
-            all_lab_sequences = singleton_data_mgr_instance.get_all_lab_sequences()
+            # get the lab sequences to align: all of them, or only the candidates of the k-mer index
+            if settings.is_exhaustive_sequence_search_enabled():
+                lab_sequences = singleton_data_mgr_instance.get_all_lab_sequences()
+            else:
+                lab_sequences = singleton_data_mgr_instance.get_candidate_lab_sequences(query_sequence)
+                # no lab sequence shares enough k-mers with the query
+                if len(lab_sequences) == 0:
+                    raise Exception("Sequence alignment returned 0 matches.")
 
             if settings.is_sequence_alignment_profiling_enabled():
                 utils.log_with_context(
-                    f"[PROFILING] on_load_matching_sequences: get_all_lab_sequences() {time.time() - start_time} s",
+                    f"[PROFILING] on_load_matching_sequences: get lab sequences {time.time() - start_time} s",
                     log_flag=settings.is_sequence_alignment_profiling_enabled(),
                 )
                 start_time = time.time()
 
             # get the alignment and the base score
             lab_seq_match_data, base_score, warning_info = bio_python_pairwise_aligner.get_alignments(
-                query_sequence=query_sequence, threshold=float(threshold), targets=all_lab_sequences
+                query_sequence=query_sequence,
+                threshold=float(threshold),
+                targets=lab_sequences,
+                alignment_cache=singleton_data_mgr_instance.get_alignment_cache(),
+                progress_callback=get_alignment_progress_callback(set_progress),
             )
 
             if settings.is_sequence_alignment_profiling_enabled():
@@ -656,6 +911,7 @@ def on_load_matching_sequences(results_are_cleared, n_clicks, query_sequence, th
 
             # for each matching experiment pull out it's metadata
             hot_cold_row_data = pd.DataFrame()
+            last_partial_results_time = time.time()
             for i in range(len(lab_seq_match_data)):
                 # add experiment id
                 exp_id = lab_seq_match_data[i][gs.cc_experiment_id]
@@ -689,6 +945,15 @@ def on_load_matching_sequences(results_are_cleared, n_clicks, query_sequence, th
                 del exp
                 del hot_cold_spots_merged_df
 
+                # a background search shows the matches gathered so far
+                if (
+                    set_progress is not None
+                    and time.time() - last_partial_results_time >= partial_results_interval_seconds
+                ):
+                    set_progress((i + 1, n_matches, gs.search_progress_gathering.format(i + 1, n_matches)))
+                    set_props("id-table-matched-sequences", {"rowData": seq_match_row_data})
+                    last_partial_results_time = time.time()
+
             if settings.is_sequence_alignment_profiling_enabled():
                 utils.log_with_context(
                     f"[PROFILING] on_load_matching_sequences: finding gof/lof {time.time() - start_time} s",
@@ -715,7 +980,7 @@ def on_load_matching_sequences(results_are_cleared, n_clicks, query_sequence, th
             # put the exception message in an alert box
             # alert_message = exceptions.alert_message_from_exception(e)
             alert = get_alert(f"Error: {e}")
-            return no_update, no_update, no_update, no_update, False, no_update, alert
+            return no_update, no_update, no_update, vis.display_none, False, no_update, alert
     else:
         raise PreventUpdate
 
@@ -723,22 +988,27 @@ def on_load_matching_sequences(results_are_cleared, n_clicks, query_sequence, th
 @app.callback(
     Output("id-alert-seq-alignment", "children", allow_duplicate=True),
     Output("id-div-seq-alignment-results", "style", allow_duplicate=True),
+    Output("id-table-matched-sequences", "rowData", allow_duplicate=True),
+    Output("id-table-matched-sequences-exp-hot-cold-data", "rowData", allow_duplicate=True),
     Output("id-cleared-run-seq-matching", "data", allow_duplicate=True),
     Input("id-button-run-seq-matching", "n_clicks"),
-    State("id-cleared-run-seq-matching", "data"),
     prevent_initial_call=True,
 )
-def on_button_run_seq_matching(n_clicks, results_are_cleared):
+def on_button_run_seq_matching(n_clicks):
     """
     Upon id-button-run-seq-matching button click the previous
-    results and alerts (if any) are cleared and flag is set to recalculate
+    results and alerts (if any) are cleared and flag is set to recalculate.
+    A search that still runs as a background job is cancelled and runs again.
     """
-    if ctx.triggered_id == "id-button-run-seq-matching" and n_clicks > 0 and not results_are_cleared:
+    if ctx.triggered_id == "id-button-run-seq-matching" and n_clicks > 0:
         return (
             # clear everything
             [],  # clear alert if any
-            vis.display_none,  # clear seq_alignment page results
-            True,  # set clear to true
+            # a background search shows the matches while they are gathered
+            vis.display_block if settings.is_background_jobs_enabled() else vis.display_none,
+            [],  # clear the matches
+            [],  # clear the hot and cold spots of the matches
+            n_clicks,  # set clear to true, a new value also triggers the search when it was cancelled
         )
     else:
         raise PreventUpdate
@@ -903,9 +1173,8 @@ def redirect_to_experiment_page(n_clicks):
     Output("id-exp-listbox-store", "data"),
     # Output("id-temp-store-data", "data"),
     # -------------------------------
-    # Top variant table
+    # Top variant table, the rows are requested by the table, see on_request_top_variants_rows
     # -------------------------------
-    Output("id-table-exp-top-variants", "rowData"),
     Output("id-table-exp-top-variants", "columnDefs"),
     # -------------------------------
     # Protein viewer
@@ -1011,14 +1280,10 @@ def on_load_experiment_page(pathname, experiment_id):
 
         # in order to color the fitness ratio I have to calculate the mean of the parents per smiles per plate.
         # coloring only works if I add the column
-        df_filtered_with_ratio = utils.calculate_group_mean_ratios_per_smiles_and_plate(exp.data_df)
-        columnDefs_with_ratio = cd.get_top_variant_column_defs(df_filtered_with_ratio)
+        columnDefs_with_ratio = cd.get_top_variant_column_defs(exp.exp_get_data_with_ratios())
 
-        # drop unnecessary columns here.
-        columns_to_drop = ["min", "max", "min_group_ratio", "max_group_ratio", "mean"]
-        df_filtered_with_ratio = df_filtered_with_ratio.drop(
-            columns=[col for col in columns_to_drop if col in df_filtered_with_ratio.columns]
-        )
+        # the table data without the intermediate ratio columns, kept on the server for the plot callbacks
+        df_filtered_with_ratio = singleton_data_mgr_instance.get_experiment_top_variants(experiment_id)
 
         # set up the slider
         # Fallback if no ratio column exists or values are not valid
@@ -1064,7 +1329,7 @@ def on_load_experiment_page(pathname, experiment_id):
 
         if is_ssm_experiment:
             # Get available single-site mutation positions
-            list_ssm_positions = graphs.extract_single_site_mutations(exp.data_df, default_smiles)
+            list_ssm_positions = exp.exp_single_site_positions(default_smiles)
 
             # Create SSM plot if positions are available
             default_site = list_ssm_positions[0] if len(list_ssm_positions) > 0 else None
@@ -1111,7 +1376,6 @@ def on_load_experiment_page(pathname, experiment_id):
             # -------------------------------
             # Top variant table
             # -------------------------------
-            df_filtered_with_ratio.to_dict("records"),  # rowData
             columnDefs_with_ratio,
             # -------------------------------
             # Protein viewer
@@ -1180,13 +1444,43 @@ def on_load_experiment_page(pathname, experiment_id):
         raise PreventUpdate
 
 
-def check_early_return(rowData, store_data, plot_str, trigger_list):
+@app.callback(
+    Output("id-table-exp-top-variants", "getRowsResponse"),
+    Input("id-table-exp-top-variants", "getRowsRequest"),
+    State("id-experiment-selected", "data"),
+    prevent_initial_call=True,
+)
+def on_request_top_variants_rows(get_rows_request, experiment_id):
+    """Sends a block of rows of the Top Variants table, which uses the infinite row model.
+
+    The table data stays on the server, only the rows of the requested block are sent after the
+    filters and sorting of the table are applied to the data. A request that can't be applied, e.g. with
+    a filter type that is not supported, gets an empty block rather than an error.
+    """
+    if get_rows_request is None or experiment_id is None:
+        raise PreventUpdate
+
+    df = singleton_data_mgr_instance.get_experiment_top_variants(experiment_id)
+    if df is None:
+        raise PreventUpdate
+
+    try:
+        return utils.get_infinite_row_model_response(df, get_rows_request)
+    except ValueError as e:
+        utils.log_with_context(
+            f"[LOG] Top Variants rows request of experiment {experiment_id} can't be applied: {e}",
+            log_flag=settings.is_data_manager_logging_enabled(),
+        )
+        return {"rowData": [], "rowCount": 0}
+
+
+def check_early_return(experiment_id, store_data, plot_str, trigger_list):
     """Helper function to prevent unnecessary updates to plot callbacks.
 
-    Checks if data and store are initialized and if the callback was triggered
+    Checks if the experiment and store are initialized and if the callback was triggered
     by an actual user interaction rather than initial page load.
     """
-    if rowData is None:
+    if experiment_id is None:
         raise PreventUpdate
 
     # If store is None or doesn't have heatmap data, this means it's the initial load
@@ -1207,18 +1501,18 @@ def check_early_return(rowData, store_data, plot_str, trigger_list):
     Input("id-list-plates", "value"),
     Input("id-list-smiles", "value"),
     Input("id-list-properties", "value"),
-    State("id-table-exp-top-variants", "rowData"),
+    State("id-experiment-selected", "data"),
     State("id-exp-listbox-store", "data"),
     # State("id-store-heatmap-data", "data"),
     prevent_initial_call=True,
 )
-def update_heatmap(selected_plate, selected_smiles, selected_stat_property, rowData, store_data):
+def update_heatmap(selected_plate, selected_smiles, selected_stat_property, experiment_id, store_data):
     """Updates the experiment heatmap based on selected plate, SMILES, and statistical property.
 
     Only updates if values have actually changed from the previous selection.
     Disables SMILES dropdown when viewing statistics other than fitness.
     """
-    check_early_return(rowData, store_data, "heatmap", ["id-list-plates", "id-list-smiles", "id-list-properties"])
+    check_early_return(experiment_id, store_data, "heatmap", ["id-list-plates", "id-list-smiles", "id-list-properties"])
 
     # Check if values have actually changed from previous selection
     previous_heatmap_values = store_data.get("heatmap", {})
@@ -1231,7 +1525,7 @@ def update_heatmap(selected_plate, selected_smiles, selected_stat_property, rowD
     # Update store with new values
     store_data["heatmap"] = current_heatmap_values
 
-    df = pd.DataFrame(rowData)
+    df = singleton_data_mgr_instance.get_experiment_top_variants(experiment_id)
 
     show_smiles = selected_stat_property == gs.experiment_heatmap_properties_list[0]
 
@@ -1250,17 +1544,19 @@ def update_heatmap(selected_plate, selected_smiles, selected_stat_property, rowD
     Output("id-exp-listbox-store", "data", allow_duplicate=True),
     Input("id-list-plates-ranking-plot", "value"),
     Input("id-list-smiles-ranking-plot", "value"),
-    State("id-table-exp-top-variants", "rowData"),
+    State("id-experiment-selected", "data"),
     State("id-exp-listbox-store", "data"),
     # State("id-store-heatmap-data", "data"),
     prevent_initial_call=True,
 )
-def update_rank_plot(selected_plate, selected_smiles, rowData, store_data):
+def update_rank_plot(selected_plate, selected_smiles, experiment_id, store_data):
     """Updates the variant ranking plot based on selected plate and SMILES.
 
     Only updates if values have actually changed from the previous selection.
     """
-    check_early_return(rowData, store_data, "rank_plot", ["id-list-plates-ranking-plot", "id-list-smiles-ranking-plot"])
+    check_early_return(
+        experiment_id, store_data, "rank_plot", ["id-list-plates-ranking-plot", "id-list-smiles-ranking-plot"]
+    )
 
     # Check if values have actually changed from previous selection
     previous_rank_values = store_data.get("rank_plot", {})
@@ -1273,7 +1569,7 @@ def update_rank_plot(selected_plate, selected_smiles, rowData, store_data):
     # Update store with new values
     store_data["rank_plot"] = current_rank_values
 
-    df = pd.DataFrame(rowData)
+    df = singleton_data_mgr_instance.get_experiment_top_variants(experiment_id)
 
     rank_plot = graphs.creat_rank_plot(df, plate_number=selected_plate, smiles=selected_smiles)
 
@@ -1285,16 +1581,18 @@ def update_rank_plot(selected_plate, selected_smiles, rowData, store_data):
     Output("id-exp-listbox-store", "data", allow_duplicate=True),
     Input("id-list-ssm-residue-positions", "value"),
     Input("id-list-smiles-ssm-plot", "value"),
-    State("id-table-exp-top-variants", "rowData"),
+    State("id-experiment-selected", "data"),
     State("id-exp-listbox-store", "data"),
     prevent_initial_call=True,
 )
-def update_ssm_plot(selected_residue, selected_smiles, rowData, store_data):
+def update_ssm_plot(selected_residue, selected_smiles, experiment_id, store_data):
     """Updates the single-site mutagenesis (SSM) plot based on selected residue position and SMILES.
 
     Only updates if values have actually changed from the previous selection.
     """
-    check_early_return(rowData, store_data, "ssm_plot", ["id-list-ssm-residue-positions", "id-list-smiles-ssm-plot"])
+    check_early_return(
+        experiment_id, store_data, "ssm_plot", ["id-list-ssm-residue-positions", "id-list-smiles-ssm-plot"]
+    )
 
     # Check if values have actually changed from previous selection
     previous_ssm_values = store_data.get("ssm_plot", {})
@@ -1307,7 +1605,7 @@ def update_ssm_plot(selected_residue, selected_smiles, rowData, store_data):
     # Update store with new values
     store_data["ssm_plot"] = current_ssm_values
 
-    df = pd.DataFrame(rowData)
+    df = singleton_data_mgr_instance.get_experiment_top_variants(experiment_id)
 
     ssm_plot = graphs.create_ssm_plot(df=df, smiles_string=selected_smiles, residue_number=selected_residue)
 
@@ -1365,10 +1663,10 @@ def on_view_selected_residue_from_table(selected_rows):
     Input("id-switch-residue-view", "value"),
     Input("id-slider-ratio", "value"),
     Input("id-list-smiles-residue-highlight", "value"),
-    State("id-table-exp-top-variants", "rowData"),
+    State("id-experiment-selected", "data"),
     prevent_initial_call=True,
 )
-def on_view_all_residue(view, slider_value, selected_smiles, rowData):
+def on_view_all_residue(view, slider_value, selected_smiles, experiment_id):
     """
     This callback gets called when the user switches the 'view all residues' toggle switch.
     Make sure changes here are consistent with the callback 'on_view_selected_residue_from_table'
@@ -1380,7 +1678,7 @@ def on_view_all_residue(view, slider_value, selected_smiles, rowData):
     slider_disabled = True
     listbox_disabled = True
 
-    if view and rowData:
+    if view and experiment_id:
         # let's turn it on unless we have a reason turn it off
         slider_disabled = False
         listbox_disabled = False
@@ -1389,7 +1687,7 @@ def on_view_all_residue(view, slider_value, selected_smiles, rowData):
 
         # filter by smiles value
         if selected_smiles:
-            df = pd.DataFrame(rowData)
+            df = singleton_data_mgr_instance.get_experiment_top_variants(experiment_id)
             df_smiles = df[df[gs.c_smiles] == selected_smiles]
 
             # Check if the filtered df_smiles has meaningful ratio values
@@ -1473,9 +1771,12 @@ def on_view_all_residue(view, slider_value, selected_smiles, rowData):
     State("id-experiment-selected", "data"),
     # State("id-table-exp-top-variants", "rowData"),
     prevent_initial_call=True,
-    running=[(Output("id-button-run-seq-matching-exp", "disabled"), True, False)],  # requires the latest Dash 2.16
+    run_button_id="id-button-run-seq-matching-exp",
+    progress_div_id="id-div-progress-exp-related-variants",
+    progress_bar_id="id-progress-exp-related-variants",
 )
 def on_load_exp_related_variants(
+    set_progress,
     results_are_cleared,
     n_clicks,
     query_sequence,
@@ -1488,6 +1789,7 @@ def on_load_exp_related_variants(
 
     Performs sequence alignment to find matching experiments, then checks for variants
     at the specified lookup residue positions (gain-of-function or loss-of-function).
+    As a background job, the progress and the variants gathered so far are shown while the search runs.
     """
     if ctx.triggered_id == "id-cleared-run-exp-related-variants" and results_are_cleared:
         try:
@@ -1500,16 +1802,26 @@ def on_load_exp_related_variants(
             if settings.is_sequence_alignment_profiling_enabled():
                 start_time = time.time()
 
-            # get all the lab sequences
-            all_lab_sequences = singleton_data_mgr_instance.get_all_lab_sequences()
+            # get the lab sequences to align: all of them, or only the candidates of the k-mer index
+            if settings.is_exhaustive_sequence_search_enabled():
+                lab_sequences = singleton_data_mgr_instance.get_all_lab_sequences()
+            else:
+                lab_sequences = singleton_data_mgr_instance.get_candidate_lab_sequences(query_sequence)
+                # no lab sequence shares enough k-mers with the query
+                if len(lab_sequences) == 0:
+                    raise Exception("Sequence alignment returned 0 matches.")
 
             if settings.is_sequence_alignment_profiling_enabled():
-                print(f"[PROFILING] on_load_exp_related_variants: get_all_lab_sequences() {time.time() - start_time} s")
+                print(f"[PROFILING] on_load_exp_related_variants: get lab sequences {time.time() - start_time} s")
                 start_time = time.time()
 
             # get the alignment and the base score
             lab_seq_match_data, base_score, warning_info = bio_python_pairwise_aligner.get_alignments(
-                query_sequence=query_sequence, threshold=float(threshold), targets=all_lab_sequences
+                query_sequence=query_sequence,
+                threshold=float(threshold),
+                targets=lab_sequences,
+                alignment_cache=singleton_data_mgr_instance.get_alignment_cache(),
+                progress_callback=get_alignment_progress_callback(set_progress),
             )
 
             if settings.is_sequence_alignment_profiling_enabled():
@@ -1521,6 +1833,8 @@ def on_load_exp_related_variants(
 
             # gather final list of records data for table here
             exp_results_row_data = list(dict())
+            n_matches = len(lab_seq_match_data)
+            last_partial_results_time = time.time()
             for i in range(len(lab_seq_match_data)):
                 # get experiment id of the matched sequence
                 mathc_exp_id = lab_seq_match_data[i][gs.cc_experiment_id]
@@ -1530,18 +1844,26 @@ def on_load_exp_related_variants(
                     continue
 
                 # does my experiments variant show up in the other experiment
-                # get the experiment core data from the db
-                match_exp = singleton_data_mgr_instance.get_experiment(mathc_exp_id)
+                # the data manager looks the residues up, e.g. in the residue index of the database
+                match_exp_variants = singleton_data_mgr_instance.get_experiment_variants_at_residues(
+                    mathc_exp_id, lookup_residues_list
+                )
                 match_exp_meta_data = singleton_data_mgr_instance.get_experiment_metadata(mathc_exp_id)
-                exp_results_row_data = u_seq_alignment.search_and_gather_variant_info_for_matching_experiment(
-                    experiment=match_exp,
+                exp_results_row_data = u_seq_alignment.gather_variant_info_for_matching_experiment(
+                    df_exp_results=match_exp_variants,
                     experiment_meta_data=match_exp_meta_data,
-                    lookup_residues_list=lookup_residues_list,
                     seq_match_data=lab_seq_match_data[i],
                     exp_results_row_data=exp_results_row_data,
                 )
 
-                del match_exp
+                # a background search shows the variants gathered so far
+                if (
+                    set_progress is not None
+                    and time.time() - last_partial_results_time >= partial_results_interval_seconds
+                ):
+                    set_progress((i + 1, n_matches, gs.search_progress_gathering.format(i + 1, n_matches)))
+                    set_props("id-table-exp-related-variants", {"rowData": exp_results_row_data})
+                    last_partial_results_time = time.time()
 
             if settings.is_sequence_alignment_profiling_enabled():
                 print(f"[PROFILING] on_load_exp_related_variants: finding residues {time.time() - start_time} s")
@@ -1578,7 +1900,7 @@ def on_load_exp_related_variants(
 
         except Exception as e:
             alert = get_alert(f"Error: {e}")
-            return no_update, no_update, no_update, no_update, no_update, no_update, False, no_update, alert
+            return no_update, no_update, no_update, no_update, no_update, vis.display_none, False, no_update, alert
     else:
         raise PreventUpdate
 
@@ -1586,21 +1908,24 @@ def on_load_exp_related_variants(
 @app.callback(
     Output("id-alert-exp-related-variants", "children", allow_duplicate=True),
     Output("id-div-exp-related-variants", "style", allow_duplicate=True),
+    Output("id-table-exp-related-variants", "rowData", allow_duplicate=True),
     Output("id-cleared-run-exp-related-variants", "data", allow_duplicate=True),
     Input("id-button-run-seq-matching-exp", "n_clicks"),
-    State("id-cleared-run-exp-related-variants", "data"),
     prevent_initial_call=True,
 )
-def on_button_run_exp_related_variants(n_clicks, results_are_cleared):
+def on_button_run_exp_related_variants(n_clicks):
     """
     Upon id-button-run-seq-matching-exp button click the previous
-    results and alerts (if any) are cleared and flag is set to recalculate
+    results and alerts (if any) are cleared and flag is set to recalculate.
+    A search that still runs as a background job is cancelled and runs again.
     """
-    if ctx.triggered_id == "id-button-run-seq-matching-exp" and n_clicks > 0 and not results_are_cleared:
+    if ctx.triggered_id == "id-button-run-seq-matching-exp" and n_clicks > 0:
         return (  # clear everything
             [],  # clear alert if any
-            vis.display_none,  # seq_alignment page results
-            True,  # set clear to true
+            # a background search shows the variants while they are gathered
+            vis.display_block if settings.is_background_jobs_enabled() else vis.display_none,
+            [],  # clear the variants
+            n_clicks,  # set clear to true, a new value also triggers the search when it was cancelled
         )
     else:
         raise PreventUpdate
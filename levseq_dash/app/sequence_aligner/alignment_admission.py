@@ -0,0 +1,245 @@
+"""
+Host-wide admission control of the alignment tasks.
+
+Each gunicorn worker owns an aligner pool, see bio_python_pairwise_aligner.get_aligner_pool, with one process per
+CPU core by default. Concurrent searches in several workers would then align more chunks at the same time than
+the host has cores. A search only submits a chunk to its pool while it holds one of the max-concurrent-alignments
+slots of the host, and releases the slot when the chunk is done. The pool processes never wait for a slot, so a
+full pool doesn't sit on processes that poll. The slots are lock files in the admission directory, see
+settings.get_alignment_admission_path, locked with flock, so the slot of a process that died is released by the
+operating system.
+
+The searches waiting for a slot are queued in the order they started waiting: each one creates a ticket file and
+only the first tickets, as many as there are slots, try to take a slot. A search queues again for each of its
+chunks, behind the other searches that are already waiting, so concurrent searches take turns instead of the
+first one aligning all of its chunks before the others start.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from levseq_dash.app.config import settings
+from levseq_dash.app.utils import utils
+
+try:
+    import fcntl
+except ImportError:  # Windows, the alignments are not admitted host-wide
+    fcntl = None
+
+_ticket_suffix = ".ticket"
+
+# interval in seconds at which a waiting search checks the queue and the slots, the searches far back in the
+# queue check less often
+POLL_INTERVAL_SECONDS = 0.02
+_max_poll_intervals = 10
+
+
+def get_admission_path() -> Path:
+    """Returns the directory of the slots and the queue, it is created if it doesn't exist.
+
+    Raises:
+        PermissionError: If the directory belongs to another user or other users can access it.
+    """
+    return utils.make_private_directory(settings.get_alignment_admission_path())
+
+
+def _get_slot_file_path(admission_path: Path, slot: int) -> Path:
+    return admission_path / f"slot-{slot}.lock"
+
+
+def _is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process of another user
+        return True
+    return True
+
+
+def _get_waiting_tickets(admission_path: Path, until_ticket_name=None) -> list[str]:
+    """
+    Returns the tickets of the waiting searches in the order they started waiting, up to until_ticket_name.
+    The tickets of the processes that died while waiting are removed.
+    """
+    tickets = []
+    for ticket_name in sorted(name for name in os.listdir(admission_path) if name.endswith(_ticket_suffix)):
+        if ticket_name == until_ticket_name:
+            break
+        pid = int(ticket_name[: -len(_ticket_suffix)].split("-")[1])
+        if _is_process_alive(pid):
+            tickets.append(ticket_name)
+        else:
+            (admission_path / ticket_name).unlink(missing_ok=True)
+    return tickets
+
+
+def _try_lock_slot_file(admission_path: Path, max_concurrent_alignments: int):
+    """Returns the locked file of a free slot, None if all the slots are taken."""
+    for slot in range(max_concurrent_alignments):
+        slot_file = open(_get_slot_file_path(admission_path, slot), "a")
+        try:
+            fcntl.flock(slot_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return slot_file
+        except BlockingIOError:
+            slot_file.close()
+    return None
+
+
+class AlignmentSlot:
+    """A slot of the host, held until it is released, e.g. by a done callback of the future of a chunk."""
+
+    def __init__(self, slot_file=None):
+        # None for a slot of a queue without admission control
+        self._slot_file = slot_file
+
+    def release(self):
+        """Releases the slot, releasing it again does nothing."""
+        slot_file, self._slot_file = self._slot_file, None
+        if slot_file is not None:
+            fcntl.flock(slot_file, fcntl.LOCK_UN)
+            slot_file.close()
+
+
+class AlignmentQueue:
+    """
+    The place of a search in the host queue, from which it takes a slot for each of its chunks.
+
+    Used as a context manager, the ticket of the search is removed when it leaves the queue. Without fcntl,
+    with max_concurrent_alignments None or 0 or if the admission directory can't be created, every slot is
+    granted right away.
+    """
+
+    def __init__(self, max_concurrent_alignments):
+        """
+        Args:
+            max_concurrent_alignments: Number of slots of the host.
+        """
+        self.max_concurrent_alignments = max_concurrent_alignments
+        self.admission_path = None
+        self._ticket_path = None
+        # position in the queue at the last try, sets how long to wait before the next one
+        self._position = 0
+
+        if fcntl is not None and max_concurrent_alignments:
+            try:
+                self.admission_path = get_admission_path()
+            except OSError as e:
+                utils.log_with_context(
+                    f"[AlignmentQueue] Alignments are not admitted host-wide, "
+                    f"could not create {settings.get_alignment_admission_path()}: {e}",
+                    log_flag=settings.is_pairwise_aligner_logging_enabled(),
+                )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.leave()
+
+    def try_acquire_slot(self):
+        """
+        Takes a free slot if the search is at the front of the queue, otherwise it queues or keeps its place.
+
+        Returns:
+            AlignmentSlot | None: The slot, None if the search has to try again after poll_interval_seconds.
+        """
+        if self.admission_path is None:
+            return AlignmentSlot()
+
+        slot_file = None
+        if self._ticket_path is None:
+            # a free slot is only taken right away if no other search is waiting for one
+            if len(_get_waiting_tickets(self.admission_path)) == 0:
+                slot_file = _try_lock_slot_file(self.admission_path, self.max_concurrent_alignments)
+            if slot_file is None:
+                self._ticket_path = self.admission_path / f"{time.time_ns():020d}-{os.getpid()}{_ticket_suffix}"
+                self._ticket_path.touch()
+
+        if slot_file is None:
+            # the ticket could have been removed by a cleanup of the admission directory
+            self._ticket_path.touch()
+            self._position = len(_get_waiting_tickets(self.admission_path, until_ticket_name=self._ticket_path.name))
+            if self._position < self.max_concurrent_alignments:
+                slot_file = _try_lock_slot_file(self.admission_path, self.max_concurrent_alignments)
+            if slot_file is None:
+                return None
+
+        # the next chunk queues again, behind the searches waiting now
+        self.leave()
+        return AlignmentSlot(slot_file)
+
+    @property
+    def poll_interval_seconds(self) -> float:
+        """Seconds to wait before trying to take a slot again."""
+        return POLL_INTERVAL_SECONDS * min(
+            _max_poll_intervals, 1 + max(0, self._position - self.max_concurrent_alignments)
+        )
+
+    def leave(self):
+        """Removes the ticket of the search, if it is waiting."""
+        if self._ticket_path is not None:
+            self._ticket_path.unlink(missing_ok=True)
+            self._ticket_path = None
+        self._position = 0
+
+
+@contextmanager
+def alignment_slot(max_concurrent_alignments):
+    """
+    Waits for a slot of the host and holds it while the with block runs.
+
+    Args:
+        max_concurrent_alignments: Number of slots of the host. None or 0 runs the block without a slot.
+
+    Yields:
+        float: Seconds waited for the slot.
+    """
+    start_time = time.monotonic()
+    with AlignmentQueue(max_concurrent_alignments) as queue:
+        slot = queue.try_acquire_slot()
+        while slot is None:
+            time.sleep(queue.poll_interval_seconds)
+            slot = queue.try_acquire_slot()
+
+    try:
+        yield time.monotonic() - start_time if queue.admission_path is not None else 0.0
+    finally:
+        slot.release()
+
+
+def get_alignment_queue_metrics(max_concurrent_alignments: int) -> dict:
+    """
+    Returns the number of slots of the host and the number of chunks that hold one and of searches that wait
+    for one.
+
+    Args:
+        max_concurrent_alignments: Number of slots of the host.
+
+    Returns:
+        dict: "max_concurrent_alignments", "running_tasks" and "waiting_tasks".
+    """
+    running_tasks = 0
+    waiting_tasks = 0
+    if fcntl is not None:
+        admission_path = get_admission_path()
+        waiting_tasks = len(_get_waiting_tickets(admission_path))
+        for slot in range(max_concurrent_alignments):
+            slot_file_path = _get_slot_file_path(admission_path, slot)
+            if not slot_file_path.exists():
+                continue
+            with open(slot_file_path, "a") as slot_file:
+                try:
+                    fcntl.flock(slot_file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                    fcntl.flock(slot_file, fcntl.LOCK_UN)
+                except BlockingIOError:
+                    running_tasks += 1
+
+    return {
+        "max_concurrent_alignments": max_concurrent_alignments,
+        "running_tasks": running_tasks,
+        "waiting_tasks": waiting_tasks,
+    }
@@ -0,0 +1,147 @@
+"""
+Persistent alignment result cache.
+
+This module provides the AlignmentCache class, an SQLite file shared by all gunicorn workers that
+stores the raw alignment score of every (query, target) pair that was aligned, and the compact
+alignments of the targets that met the threshold of the search.
+Scores are stored raw so a later search with the same query can apply a different threshold at read time.
+"""
+
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+
+from levseq_dash.app.config import settings
+from levseq_dash.app.utils import utils
+
+
+def hash_sequence(sequence: str) -> str:
+    """Returns the SHA256 hex digest of a sanitized sequence."""
+    return hashlib.sha256(sequence.encode("utf-8")).hexdigest()
+
+
+class AlignmentCache:
+    """
+    SQLite-backed cache of alignment results.
+
+    Rows are keyed by the query hash, the target sequence hash, the aligner configuration hash and
+    the experiment ID. The experiment ID is part of the key so the rows of an experiment can be
+    invalidated when it is deleted.
+
+    Every method opens its own short-lived connection so the cache is safe to use from forked
+    gunicorn workers. The cache is an optimization only: errors are logged and behave like misses.
+    """
+
+    def __init__(self, cache_file_path):
+        """
+        Initialize the cache and create the table if it doesn't exist.
+
+        Args:
+            cache_file_path: Path of the SQLite file, e.g. under the data path.
+        """
+        self.cache_file_path = cache_file_path
+
+        with closing(self._connect()) as connection, connection:
+            # WAL lets readers in other workers proceed while one worker writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS alignment_results (
+                    query_hash TEXT NOT NULL,
+                    target_hash TEXT NOT NULL,
+                    aligner_hash TEXT NOT NULL,
+                    experiment_id TEXT NOT NULL,
+                    alignment_score REAL NOT NULL,
+                    compact_alignments TEXT,
+                    PRIMARY KEY (query_hash, aligner_hash, experiment_id, target_hash)
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_alignment_results_experiment ON alignment_results (experiment_id)"
+            )
+
+    def get_results(self, query_hash: str, aligner_hash: str, target_hashes: dict) -> dict:
+        """
+        Look up the cached results of a query for a set of targets.
+
+        Args:
+            query_hash: Hash of the sanitized query sequence.
+            aligner_hash: Hash of the aligner configuration.
+            target_hashes: Dictionary mapping experiment IDs to the hash of their sanitized sequence.
+
+        Returns:
+            dict: Experiment ID -> (alignment_score, compact_alignments) for the cached targets.
+                  compact_alignments is None if the target was below the threshold when it was aligned.
+        """
+        cached = {}
+        try:
+            with closing(self._connect()) as connection:
+                rows = connection.execute(
+                    "SELECT experiment_id, target_hash, alignment_score, compact_alignments "
+                    "FROM alignment_results WHERE query_hash = ? AND aligner_hash = ?",
+                    (query_hash, aligner_hash),
+                ).fetchall()
+        except sqlite3.Error as e:
+            self._log(f"[LOG] Alignment cache read failed: {e}")
+            return cached
+
+        for experiment_id, target_hash, alignment_score, compact_alignments in rows:
+            # a row is only valid while the experiment still has the same sequence
+            if target_hashes.get(experiment_id) == target_hash:
+                if compact_alignments is not None:
+                    compact_alignments = [tuple(values) for values in json.loads(compact_alignments)]
+                cached[experiment_id] = (alignment_score, compact_alignments)
+        return cached
+
+    def store_results(self, query_hash: str, aligner_hash: str, results: list):
+        """
+        Store alignment results, replacing existing rows for the same key.
+
+        Args:
+            query_hash: Hash of the sanitized query sequence.
+            aligner_hash: Hash of the aligner configuration.
+            results: List of (experiment_id, target_hash, alignment_score, compact_alignments) tuples.
+                     compact_alignments is None for targets that were only scored.
+        """
+        if not results:
+            return
+
+        rows = [
+            (
+                query_hash,
+                target_hash,
+                aligner_hash,
+                str(experiment_id),
+                alignment_score,
+                None if compact_alignments is None else json.dumps(compact_alignments),
+            )
+            for experiment_id, target_hash, alignment_score, compact_alignments in results
+        ]
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.executemany("INSERT OR REPLACE INTO alignment_results VALUES (?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            self._log(f"[LOG] Alignment cache write failed: {e}")
+
+    def invalidate_experiment(self, experiment_id: str):
+        """
+        Remove all cached results of an experiment.
+
+        Args:
+            experiment_id: ID of the experiment, e.g. when it is deleted.
+        """
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute("DELETE FROM alignment_results WHERE experiment_id = ?", (experiment_id,))
+        except sqlite3.Error as e:
+            self._log(f"[LOG] Alignment cache invalidation failed for {experiment_id}: {e}")
+
+    def _connect(self):
+        # the timeout makes a worker wait for another worker's write lock instead of failing
+        return sqlite3.connect(self.cache_file_path, timeout=10)
+
+    @staticmethod
+    def _log(msg):
+        utils.log_with_context(msg, log_flag=settings.is_pairwise_aligner_logging_enabled())
@@ -1,8 +1,20 @@
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import atexit
+import functools
+import hashlib
+import itertools
+import math
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Client, Listener
 
 from Bio.Align import PairwiseAligner, substitution_matrices
 
 from levseq_dash.app.config import settings
+from levseq_dash.app.sequence_aligner import alignment_admission
+from levseq_dash.app.sequence_aligner.alignment_cache import hash_sequence
 from levseq_dash.app.utils import utils
 
 
@@ -108,8 +120,365 @@ def inject_aligner():
     aligner = setup_aligner_blastp()
 
 
+# ---------------------
+# Persistent aligner pool
+# ---------------------
+# Creating a ProcessPoolExecutor on every search means every search pays the process startup and the
+# BLOSUM62 loading in inject_aligner. Instead, each gunicorn worker lazily creates one pool on its first
+# search and reuses it for all following searches (matching sequences and experiment related variants).
+_aligner_pool = None
+_aligner_pool_pid = None
+_aligner_pool_lock = threading.Lock()
+
+# A background job runs in a process forked from the gunicorn worker that started it, see main_app.
+# Rather than starting a pool of its own for every job, the job submits its chunks through the aligner
+# service of the worker, a Unix socket served by a thread of the worker, to the persistent pool of the worker.
+_aligner_service_listener = None
+# (socket address, authentication key), inherited by the forked jobs
+_aligner_service_address = None
+_aligner_service_pid = None
+_aligner_service_client = None
+_aligner_service_lock = threading.Lock()
+
+
+def _reset_aligner_locks_after_fork():
+    # another thread could have held a lock when this process was forked, it is never released in the child
+    global _aligner_pool_lock, _aligner_service_lock
+    _aligner_pool_lock = threading.Lock()
+    _aligner_service_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_aligner_locks_after_fork)
+
+
+def get_aligner_pool():
+    """Returns the persistent aligner pool of this process, creating it on first use.
+
+    The pool is recreated if one of its worker processes died (the executor is then broken and
+    refuses new work) or if it was inherited from a parent process through a fork, e.g. with
+    gunicorn --preload, as the worker processes of such a pool belong to the parent.
+    In a process forked from a process that runs the aligner service, e.g. a background job, the
+    client of the service is returned instead, so the chunks are aligned in the pool of the parent.
+
+    Returns:
+        ProcessPoolExecutor | AlignerServiceClient: Pool whose workers were initialized with inject_aligner
+    """
+    global _aligner_pool, _aligner_pool_pid
+
+    if _aligner_service_pid is not None and _aligner_service_pid != os.getpid():
+        aligner_service_client = _get_aligner_service_client()
+        if aligner_service_client is not None:
+            return aligner_service_client
+
+    with _aligner_pool_lock:
+        if _aligner_pool is not None:
+            if _aligner_pool_pid != os.getpid():
+                # the worker processes belong to the parent, just drop the reference
+                _aligner_pool = None
+            elif _aligner_pool._broken:
+                utils.log_with_context(
+                    f"[ProcessPoolExecutor] Aligner pool is broken ({_aligner_pool._broken}), restarting it.",
+                    log_flag=settings.is_pairwise_aligner_logging_enabled(),
+                )
+                _aligner_pool.shutdown(wait=False, cancel_futures=True)
+                _aligner_pool = None
+
+        if _aligner_pool is None:
+            # 0 means use the default max_workers of the ProcessPoolExecutor
+            max_workers = settings.get_aligner_pool_size() or None
+            _aligner_pool = ProcessPoolExecutor(initializer=inject_aligner, max_workers=max_workers)
+            _aligner_pool_pid = os.getpid()
+
+            utils.log_with_context(
+                f"[ProcessPoolExecutor] Started aligner pool with # Workers: {_aligner_pool._max_workers}",
+                log_flag=settings.is_pairwise_aligner_logging_enabled(),
+            )
+
+        return _aligner_pool
+
+
+def shutdown_aligner_pool(wait=True):
+    """Shuts down the persistent aligner pool of this process if there is one.
+
+    Registered with atexit so the worker processes are joined when the gunicorn worker exits.
+    The next call to get_aligner_pool will create a new pool.
+
+    Args:
+        wait: If True, block until the worker processes have exited
+    """
+    global _aligner_pool, _aligner_pool_pid
+
+    with _aligner_pool_lock:
+        if _aligner_pool is not None and _aligner_pool_pid == os.getpid():
+            _aligner_pool.shutdown(wait=wait, cancel_futures=True)
+        _aligner_pool = None
+        _aligner_pool_pid = None
+
+
+atexit.register(shutdown_aligner_pool)
+
+
+class AlignerServiceClient:
+    """Executor of a forked process that submits to the aligner pool of its parent, see start_aligner_service.
+
+    Like a ProcessPoolExecutor, submit returns a Future. A thread of the client receives the results of the
+    chunks from the service. If the connection is lost, the pending futures fail with BrokenProcessPool.
+    """
+
+    def __init__(self, address, authkey):
+        """
+        Args:
+            address: Address of the socket of the service.
+            authkey: Authentication key of the service.
+        """
+        self._connection = Client(address, family="AF_UNIX", authkey=authkey)
+        # the service answers with the number of workers of its pool
+        self._max_workers = self._connection.recv()
+        self._broken = False
+        self._pid = os.getpid()
+        self._futures = {}
+        self._request_ids = itertools.count()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._receive_results, name="aligner-service-client", daemon=True).start()
+
+    def submit(self, fn, *args):
+        future = Future()
+        with self._lock:
+            if self._broken:
+                raise BrokenProcessPool("The connection to the aligner service was lost.")
+            request_id = next(self._request_ids)
+            self._futures[request_id] = future
+            self._connection.send((request_id, fn, args))
+        return future
+
+    def _receive_results(self):
+        try:
+            while True:
+                request_id, result, exception = self._connection.recv()
+                with self._lock:
+                    future = self._futures.pop(request_id)
+                if exception is not None:
+                    future.set_exception(exception)
+                else:
+                    future.set_result(result)
+        except (EOFError, OSError):
+            with self._lock:
+                self._broken = True
+                futures, self._futures = self._futures, {}
+            for future in futures.values():
+                future.set_exception(BrokenProcessPool("The connection to the aligner service was lost."))
+
+
+def _get_aligner_service_client():
+    """Returns the client of the aligner service of the parent process, None if it can't connect."""
+    global _aligner_service_client
+
+    with _aligner_service_lock:
+        client = _aligner_service_client
+        # a client inherited through another fork shares the connection of the other process
+        if client is None or client._broken or client._pid != os.getpid():
+            try:
+                _aligner_service_client = AlignerServiceClient(*_aligner_service_address)
+            except Exception as e:
+                utils.log_with_context(
+                    f"[AlignerService] Could not connect to the aligner service of the parent process, "
+                    f"aligning in a pool of this process: {e}",
+                    log_flag=settings.is_pairwise_aligner_logging_enabled(),
+                )
+                _aligner_service_client = None
+        return _aligner_service_client
+
+
+def _send_aligner_service_result(connection, send_lock, futures, request_id, future):
+    futures.discard(future)
+    if future.cancelled():
+        return
+    exception = future.exception()
+    result = None if exception is not None else future.result()
+    try:
+        with send_lock:
+            connection.send((request_id, result, exception))
+    except (OSError, ValueError):
+        # the job finished or was cancelled
+        pass
+
+
+def _serve_aligner_service_connection(connection):
+    """Submits the chunks received from a forked process to the persistent pool and sends back their results."""
+    send_lock = threading.Lock()
+    futures = set()
+    try:
+        with send_lock:
+            connection.send(get_aligner_pool()._max_workers)
+        while True:
+            request_id, fn, args = connection.recv()
+            try:
+                # a broken pool is restarted by get_aligner_pool
+                future = get_aligner_pool().submit(fn, *args)
+            except Exception as e:
+                with send_lock:
+                    connection.send((request_id, None, e))
+                continue
+            futures.add(future)
+            future.add_done_callback(
+                functools.partial(_send_aligner_service_result, connection, send_lock, futures, request_id)
+            )
+    except (EOFError, OSError):
+        # the job finished or was cancelled, its chunks that didn't start are dropped
+        for future in list(futures):
+            future.cancel()
+    finally:
+        with send_lock:
+            connection.close()
+
+
+def _accept_aligner_service_connections(listener):
+    while True:
+        try:
+            connection = listener.accept()
+        except OSError:
+            # the listener was closed by stop_aligner_service
+            return
+        except Exception:
+            # e.g. a client with another authentication key
+            continue
+        threading.Thread(
+            target=_serve_aligner_service_connection, args=(connection,), name="aligner-service", daemon=True
+        ).start()
+
+
+def start_aligner_service():
+    """Starts the aligner service of this process, if it isn't running yet.
+
+    Called by a gunicorn worker before it forks a background job, the processes forked afterwards align
+    their chunks in the persistent pool of this process, see get_aligner_pool. The socket is in a private
+    temporary directory of this process and the forked processes inherit its random authentication key.
+    """
+    global _aligner_service_listener, _aligner_service_address, _aligner_service_pid
+
+    with _aligner_service_lock:
+        if _aligner_service_pid == os.getpid():
+            return
+
+        authkey = os.urandom(32)
+        _aligner_service_listener = Listener(family="AF_UNIX", authkey=authkey)
+        _aligner_service_address = (_aligner_service_listener.address, authkey)
+        _aligner_service_pid = os.getpid()
+        threading.Thread(
+            target=_accept_aligner_service_connections,
+            args=(_aligner_service_listener,),
+            name="aligner-service-listener",
+            daemon=True,
+        ).start()
+
+        utils.log_with_context(
+            f"[AlignerService] Started aligner service at {_aligner_service_listener.address}",
+            log_flag=settings.is_pairwise_aligner_logging_enabled(),
+        )
+
+
+def stop_aligner_service():
+    """Stops the aligner service of this process if there is one, the forked processes then use pools of their own."""
+    global _aligner_service_listener, _aligner_service_address, _aligner_service_pid
+
+    with _aligner_service_lock:
+        if _aligner_service_listener is not None and _aligner_service_pid == os.getpid():
+            _aligner_service_listener.close()
+        _aligner_service_listener = None
+        _aligner_service_address = None
+        _aligner_service_pid = None
+
+
+atexit.register(stop_aligner_service)
+
+
+# Order of the fields in the compact alignment tuples returned by the workers.
+# The workers don't echo back the experiment ID and the target sequence for every alignment,
+# get_alignments adds those back in from what it already has in memory.
+compact_alignment_fields = ("sequence_alignment", "alignment_score", "norm_score", "identities", "mismatches", "gaps")
+
+
+def align_target_compact(
+    aligner, target_exp_sequence, query_sequence, base_score, threshold, max_alignments_per_target=1
+):
+    """Aligns a target sequence against the query and returns the alignments meeting the threshold.
+
+    Args:
+        aligner: Configured PairwiseAligner
+        target_exp_sequence: Target protein sequence to align
+        query_sequence: Query protein sequence to align against
+        base_score: Base alignment score (query against itself) for normalization
+        threshold: Minimum normalized score threshold (0-1) to include in results
+        max_alignments_per_target: Maximum number of co-optimal alignments to return
+
+    Returns:
+        Tuple of (alignment_score, compact_alignments):
+            - alignment_score: Raw optimal alignment score, returned even if it is below the threshold
+            - compact_alignments: List of tuples ordered as compact_alignment_fields
+    """
+    # first pass: score only. aligner.score() runs the dynamic programming without the traceback,
+    # so it is much cheaper than building the alignments, counting them and rendering them as strings.
+    # All co-optimal alignments share this score, so if it is below the threshold none of them will pass
+    # and most targets in a search are dropped here.
+    alignment_score = aligner.score(target_exp_sequence, query_sequence)
+    norm_score_ratio = round(alignment_score / base_score, 4)
+    if norm_score_ratio < threshold:
+        return alignment_score, []
+
+    # second pass: full alignment with traceback for the targets that survived
+    alignments = aligner.align(target_exp_sequence, query_sequence)
+    results = []
+    # repetitive or gappy sequences can have a huge number of co-optimal alignments. aligner.align
+    # returns an iterator that builds them one at a time, so islice stops the enumeration at the
+    # cap without ever building the rest.
+    for alignment in itertools.islice(alignments, max_alignments_per_target):
+        # extract the stats
+        # https://biopython.org/docs/dev/Tutorial/chapter_align.html#subsec-slicing-indexing-alignment
+        # https://biopython.org/docs/dev/Tutorial/chapter_align.html#counting-identities-mismatches-and-gaps
+        counts = alignment.counts()
+
+        # convert the alignment object result into a string
+        alignment_str = alignment.__str__()
+
+        # normalize the score by the base score
+        norm_score_ratio = round(alignment.score / base_score, 4)
+
+        # only return the alignments that score above a threshold
+        if norm_score_ratio >= threshold:
+            results.append(
+                (
+                    alignment_str,
+                    alignment.score,
+                    norm_score_ratio,
+                    counts.identities,
+                    counts.mismatches,
+                    counts.gaps,
+                )
+            )
+    return alignment_score, results
+
+
+def expand_compact_alignments(target_exp_id, target_exp_sequence, compact_alignments):
+    """Converts compact alignment tuples of a target into the result dictionaries of get_alignments.
+
+    Args:
+        target_exp_id: Experiment ID of the target sequence
+        target_exp_sequence: Target protein sequence that was aligned
+        compact_alignments: List of tuples ordered as compact_alignment_fields
+
+    Returns:
+        List of result dictionaries, see parallel_function_align_target
+    """
+    return [
+        {"experiment_id": target_exp_id, "sequence": target_exp_sequence, **dict(zip(compact_alignment_fields, values))}
+        for values in compact_alignments
+    ]
+
+
 # Helper function for alignment
-def parallel_function_align_target(target_exp_id, target_exp_sequence, query_sequence, base_score, threshold):
+def parallel_function_align_target(
+    target_exp_id, target_exp_sequence, query_sequence, base_score, threshold, max_alignments_per_target=1
+):
     """Performs pairwise alignment of target sequence against query in parallel worker.
 
     Worker function for ProcessPoolExecutor that aligns a single target sequence
@@ -122,6 +491,7 @@ def parallel_function_align_target(target_exp_id, target_exp_sequence, query_seq
         query_sequence: Query protein sequence to align against
         base_score: Base alignment score (query against itself) for normalization
         threshold: Minimum normalized score threshold (0-1) to include in results
+        max_alignments_per_target: Maximum number of co-optimal alignments to return
 
     Returns:
         List of result dictionaries for alignments meeting threshold, each containing:
@@ -143,48 +513,174 @@ def parallel_function_align_target(target_exp_id, target_exp_sequence, query_seq
 
     aligner = globals().get("aligner", None)
 
-    alignments = aligner.align(target_exp_sequence, query_sequence)
-    results = []
-    for alignment in alignments:
-        # extract the stats
-        # https://biopython.org/docs/dev/Tutorial/chapter_align.html#subsec-slicing-indexing-alignment
-        # https://biopython.org/docs/dev/Tutorial/chapter_align.html#counting-identities-mismatches-and-gaps
-        counts = alignment.counts()
+    _, compact_alignments = align_target_compact(
+        aligner, target_exp_sequence, query_sequence, base_score, threshold, max_alignments_per_target
+    )
+    return expand_compact_alignments(target_exp_id, target_exp_sequence, compact_alignments)
 
-        # convert the alignment object result into a string
-        alignment_str = alignment.__str__()
 
-        # normalize the score by the base score
-        norm_score_ratio = round(alignment.score / base_score, 4)
+def parallel_function_align_chunk(chunk, query_sequence, base_score, threshold, max_alignments_per_target=1):
+    """Aligns a chunk of target sequences against the query in a parallel worker.
 
-        # only return the alignments that score above a threshold
-        if norm_score_ratio >= threshold:
-            results.append(
-                {
-                    "experiment_id": target_exp_id,
-                    "sequence": target_exp_sequence,
-                    "sequence_alignment": alignment_str,
-                    "alignment_score": alignment.score,
-                    "norm_score": norm_score_ratio,
-                    "identities": counts.identities,
-                    "mismatches": counts.mismatches,
-                    "gaps": counts.gaps,
-                }
+    Worker function for ProcessPoolExecutor. Dispatching chunks instead of single targets
+    means the query, base score and threshold are pickled once per chunk and not once per target.
+    Errors are caught per target so one bad sequence doesn't fail the rest of the chunk.
+    The chunk was submitted while holding one of the alignment slots of the host, see _align_admitted_chunks.
+
+    Args:
+        chunk: List of (target_exp_id, target_exp_sequence) pairs
+        query_sequence: Query protein sequence to align against
+        base_score: Base alignment score (query against itself) for normalization
+        threshold: Minimum normalized score threshold (0-1) to include in results
+        max_alignments_per_target: Maximum number of co-optimal alignments to return per target
+
+    Returns:
+        List of (target_exp_id, alignment_score, compact_alignments, error) tuples, one per target.
+        compact_alignments is a list of tuples ordered as compact_alignment_fields. If the alignment
+        raised, alignment_score and compact_alignments are None and error holds the message.
+    """
+    aligner = globals().get("aligner", None)
+
+    chunk_results = []
+    for target_exp_id, target_exp_sequence in chunk:
+        try:
+            alignment_score, compact_alignments = align_target_compact(
+                aligner, target_exp_sequence, query_sequence, base_score, threshold, max_alignments_per_target
             )
-    return results
+            chunk_results.append((target_exp_id, alignment_score, compact_alignments, None))
+        except Exception as e:
+            chunk_results.append((target_exp_id, None, None, str(e)))
+    return chunk_results
+
 
+def get_aligner_configuration_hash(aligner, max_alignments_per_target):
+    """Hashes everything that determines the alignment results other than the sequences.
 
-def get_alignments(query_sequence, threshold, targets: dict):
+    Used as part of the alignment cache key, so cached results are not reused after the scoring
+    (mode, gap scores, substitution matrix) or max_alignments_per_target changes.
+
+    Args:
+        aligner: Configured PairwiseAligner
+        max_alignments_per_target: Maximum number of co-optimal alignments reported per target
+
+    Returns:
+        str: SHA256 hex digest of the configuration
+    """
+    # str(aligner) lists the mode and all gap scores but only the memory address of the substitution matrix
+    configuration = [line for line in str(aligner).splitlines() if "substitution_matrix" not in line]
+    configuration.append(str(aligner.substitution_matrix))
+    configuration.append(f"max_alignments_per_target: {max_alignments_per_target}")
+    return hashlib.sha256("\n".join(configuration).encode("utf-8")).hexdigest()
+
+
+def get_chunk_size(n_targets, n_workers, chunks_per_worker=4):
+    """Calculates how many targets are dispatched to a worker at once.
+
+    Aims for a few chunks per worker: a single chunk per worker would leave workers idle when
+    the target lengths (and so the alignment times) are uneven, a chunk per target pays the
+    IPC overhead for every target.
+
+    Args:
+        n_targets: Number of target sequences to align
+        n_workers: Number of worker processes in the pool
+        chunks_per_worker: Number of chunks to aim for per worker
+
+    Returns:
+        int: Number of targets per chunk, at least 1
+    """
+    return max(1, math.ceil(n_targets / (max(1, n_workers) * chunks_per_worker)))
+
+
+def _align_admitted_chunks(targets, query_sequence_sanitized, base_score, threshold, max_alignments_per_target):
+    """Splits the targets into chunks and aligns them in the persistent aligner pool, as slots of the host allow.
+
+    A chunk is only submitted to the pool once this process holds one of the max-concurrent-alignments slots of
+    the host, see alignment_admission, and the slot is released when the chunk is done. So the pool processes
+    never wait for a slot, and the chunks done meanwhile are yielded while the search waits for the next slot.
+    A pool found broken when submitting is restarted once.
+
+    Yields:
+        Tuple of (future, chunk target IDs) for each chunk, as the chunks are done
+    """
+    executor = get_aligner_pool()
+    target_items = list(targets.items())
+    chunk_size = get_chunk_size(len(target_items), executor._max_workers)
+    chunks = [target_items[i : i + chunk_size] for i in range(0, len(target_items), chunk_size)]
+    max_concurrent_alignments = settings.get_max_concurrent_alignments()
+
+    if settings.is_pairwise_aligner_logging_enabled():
+        queue_metrics = alignment_admission.get_alignment_queue_metrics(max_concurrent_alignments)
+        utils.log_with_context(
+            f"[ProcessPoolExecutor] Dispatching {len(target_items)} targets in chunks of {chunk_size}, "
+            f"host alignment queue: {queue_metrics}",
+            log_flag=True,
+        )
+
+    pool_restarted = False
+    futures_to_chunks = {}
+    with alignment_admission.AlignmentQueue(max_concurrent_alignments) as alignment_queue:
+        while chunks or futures_to_chunks:
+            while chunks:
+                slot = alignment_queue.try_acquire_slot()
+                if slot is None:
+                    break
+                try:
+                    future = executor.submit(
+                        parallel_function_align_chunk,  # function to be executed in parallel
+                        chunks[0],
+                        query_sequence_sanitized,
+                        base_score,
+                        threshold,
+                        max_alignments_per_target,
+                    )
+                except BrokenProcessPool:
+                    slot.release()
+                    if pool_restarted:
+                        raise
+                    # a worker died since the pool was last used, retry with a restarted pool
+                    pool_restarted = True
+                    executor = get_aligner_pool()
+                    continue
+                # called right away if the future is already done
+                future.add_done_callback(lambda _, slot=slot: slot.release())
+                futures_to_chunks[future] = [target_exp_id for target_exp_id, _ in chunks.pop(0)]
+
+            # wait for a chunk to be done, or only until the next try for a slot if chunks are left
+            done, _ = wait(
+                futures_to_chunks,
+                timeout=alignment_queue.poll_interval_seconds if chunks else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                yield future, futures_to_chunks.pop(future)
+
+
+def get_alignments(
+    query_sequence,
+    threshold,
+    targets: dict,
+    max_alignments_per_target=None,
+    alignment_cache=None,
+    progress_callback=None,
+):
     """Performs parallel pairwise alignment of query sequence against multiple targets.
 
-    Sanitizes input sequences, calculates base score, then uses ProcessPoolExecutor
-    to align the query against all target sequences in parallel. Results are filtered
+    Sanitizes input sequences, calculates base score, then uses the persistent aligner pool
+    to align the query against all target sequences in parallel, dispatching the targets in chunks.
+    Targets with the same sanitized sequence are aligned once and the result is reported for each of them.
+    If an alignment cache is provided, targets with cached results for this query are not aligned again
+    and the raw scores of the newly aligned targets are stored in the cache. Results are filtered
     by normalized score threshold and sorted by score.
 
     Args:
         query_sequence: Query protein sequence to align against targets
         threshold: Minimum normalized score (0-1) for including results
         targets: Dictionary mapping experiment IDs to target protein sequences
+        max_alignments_per_target: Maximum number of co-optimal alignments reported per target.
+                                   Defaults to max-alignments-per-target in config.yaml
+        alignment_cache: Optional AlignmentCache shared between searches
+        progress_callback: Optional function called with (number of aligned targets, number of targets)
+                           after the cached results are read and after each aligned chunk
 
     Returns:
         Tuple of (results, base_score, warning_info):
@@ -205,6 +701,9 @@ def get_alignments(query_sequence, threshold, targets: dict):
     if len(targets) == 0:
         raise Exception("Target sequences is empty.")
 
+    if max_alignments_per_target is None:
+        max_alignments_per_target = settings.get_max_alignments_per_target()
+
     # Sanitize the query sequence
     query_sequence_sanitized = sanitize_protein_sequence(query_sequence)
 
@@ -230,69 +729,144 @@ def get_alignments(query_sequence, threshold, targets: dict):
     # ThreadPoolExecutor threads share the same interpreter and are limited by the GIL,
     # so only one thread runs Python code
     # ---------------------
-    # default max_workers is the min(32, os.cpu_count() + 4)
+    # the pool is persistent and sized by aligner-pool-size in config.yaml (see get_aligner_pool)
     # if you have N Gunicorn workers and each creates a ProcessPoolExecutor with M workers, you'll have N × M processes
-    # This can lead to resource contention
+    # only max-concurrent-alignments chunks are submitted at the same time, the others wait (see alignment_admission)
 
     # ---------------------
     results = []
     warning_info = ""
     failed_targets = []  # Track failed targets for markdown formatting
-    # create and configure the process pool
-    with ProcessPoolExecutor(initializer=inject_aligner, max_workers=None) as executor:
-        # use below for debugging purposes
+
+    # Process futures with exception handling
+    successful_results = 0
+    failed_results = 0
+
+    # ---------------------
+    # read the cached results first, the threshold is applied to the cached raw scores here
+    # ---------------------
+    targets_to_align = sanitized_targets
+    if alignment_cache is not None:
+        query_hash = hash_sequence(query_sequence_sanitized)
+        aligner_hash = get_aligner_configuration_hash(aligner, max_alignments_per_target)
+        target_hashes = {str(target_id): hash_sequence(target) for target_id, target in sanitized_targets.items()}
+        cached_results = alignment_cache.get_results(query_hash, aligner_hash, target_hashes)
+
+        targets_to_align = {}
+        for target_id, target_sequence in sanitized_targets.items():
+            alignment_score, compact_alignments = cached_results.get(str(target_id), (None, None))
+            if alignment_score is not None and round(alignment_score / base_score, 4) < threshold:
+                # below the threshold, nothing to report
+                successful_results += 1
+            elif compact_alignments is not None:
+                # the threshold applies to the score that all the cached co-optimal alignments share
+                results.extend(expand_compact_alignments(target_id, target_sequence, compact_alignments))
+                successful_results += 1
+            else:
+                # not cached or only the score is cached and the target now meets the threshold
+                targets_to_align[target_id] = target_sequence
+
         utils.log_with_context(
-            f"[ProcessPoolExecutor] Starting with  default# Workers: {executor._max_workers}",
+            f"[AlignmentCache] {len(sanitized_targets) - len(targets_to_align)}/{len(sanitized_targets)} "
+            f"targets served from the cache",
             log_flag=settings.is_pairwise_aligner_logging_enabled(),
         )
 
+    # ---------------------
+    # many experiments share the same parent sequence, align each unique sequence once
+    # the first experiment ID of a sequence stands for all of its experiments in the pool
+    # ---------------------
+    experiment_ids_per_sequence = defaultdict(list)
+    for target_id, target_sequence in targets_to_align.items():
+        experiment_ids_per_sequence[target_sequence].append(target_id)
+    unique_targets_to_align = {
+        target_ids[0]: target_sequence for target_sequence, target_ids in experiment_ids_per_sequence.items()
+    }
+
+    total_targets = len(sanitized_targets)
+    aligned_targets = total_targets - len(targets_to_align)
+    if progress_callback is not None:
+        progress_callback(aligned_targets, total_targets)
+
+    new_cache_entries = []
+    if len(unique_targets_to_align) != 0:
+        # the chunks are aligned in the persistent pool of this process
         # The Future object allows the running asynchronous task to be queried, canceled,
         # and for the results to be retrieved later once the task is done.
-        # Alternative implementation using as_completed for better exception handling
-        # and optional timeout support
-        futures_to_targets = {
-            executor.submit(
-                parallel_function_align_target,  # function to be executed in parallel
-                target_exp_id,
-                target_exp_sequence,
-                query_sequence_sanitized,
-                base_score,
-                threshold,
-            ): target_exp_id
-            for target_exp_id, target_exp_sequence in sanitized_targets.items()
-        }
-
-        # Process futures with exception handling
-        successful_results = 0
-        failed_results = 0
-
-        # timeout_seconds = 300  # 5 minutes per alignment
-        for future in as_completed(futures_to_targets):  # Add timeout=timeout_seconds if needed
-            target_id = futures_to_targets[future]
+        for future, chunk_target_ids in _align_admitted_chunks(
+            unique_targets_to_align,
+            query_sequence_sanitized,
+            base_score,
+            threshold,
+            max_alignments_per_target,
+        ):
+            if progress_callback is not None:
+                # a chunk counts for every experiment with one of its sequences, whether it failed or not
+                aligned_targets += sum(
+                    len(experiment_ids_per_sequence[unique_targets_to_align[chunk_target_id]])
+                    for chunk_target_id in chunk_target_ids
+                )
+                progress_callback(aligned_targets, total_targets)
+
             try:
-                result = future.result()
-                results.extend(result)
-                successful_results += 1
+                chunk_results = future.result()
             except Exception as e:
-                failed_results += 1
-                # Log the exception but continue processing other futures
-                failed_targets.append(f"{target_id[:10]}: {str(e)}")
-
-        # Log summary of processing results
-        total_targets = len(futures_to_targets)
-
-        # Format warning_info as markdown with bullets
-        warning_info = f"**Alignment Summary:** **{successful_results}/{total_targets}** alignments succeeded."
-        if failed_results > 0:
-            warning_info += f" **{failed_results}** sequences skipped due to errors:\n"
-            for failed_target in failed_targets:
-                warning_info += f"  - {failed_target}\n"
-
-        utils.log_with_context(
-            f"[ProcessPoolExecutor] {warning_info}\n[ProcessPoolExecutor] Done with all tasks",
-            log_flag=settings.is_pairwise_aligner_logging_enabled(),
+                # the whole chunk failed, e.g. a worker died and the pool is broken.
+                # get_aligner_pool restarts the pool on the next search
+                for chunk_target_id in chunk_target_ids:
+                    target_ids = experiment_ids_per_sequence[unique_targets_to_align[chunk_target_id]]
+                    failed_results += len(target_ids)
+                    failed_targets.extend(f"{target_id[:10]}: {str(e)}" for target_id in target_ids)
+                continue
+
+            for chunk_target_id, alignment_score, compact_alignments, error in chunk_results:
+                target_sequence = unique_targets_to_align[chunk_target_id]
+                # fan the result out to every experiment with this sequence
+                for target_id in experiment_ids_per_sequence[target_sequence]:
+                    if error is None:
+                        results.extend(expand_compact_alignments(target_id, target_sequence, compact_alignments))
+                        successful_results += 1
+                        # targets below the threshold only have their score cached
+                        new_cache_entries.append(
+                            (
+                                target_id,
+                                target_sequence,
+                                alignment_score,
+                                compact_alignments if compact_alignments else None,
+                            )
+                        )
+                    else:
+                        failed_results += 1
+                        # Log the exception but continue processing other targets
+                        failed_targets.append(f"{target_id[:10]}: {error}")
+
+    if alignment_cache is not None:
+        alignment_cache.store_results(
+            query_hash,
+            aligner_hash,
+            [
+                (target_id, hash_sequence(target_sequence), alignment_score, compact_alignments)
+                for target_id, target_sequence, alignment_score, compact_alignments in new_cache_entries
+            ],
         )
 
+    # Log summary of processing results
+    total_unique_sequences = len(set(sanitized_targets.values()))
+
+    # Format warning_info as markdown with bullets
+    warning_info = f"**Alignment Summary:** **{successful_results}/{total_targets}** alignments succeeded."
+    warning_info += f" **{total_unique_sequences}** unique sequences for **{total_targets}** experiments."
+    warning_info += f" At most **{max_alignments_per_target}** co-optimal alignment(s) reported per target."
+    if failed_results > 0:
+        warning_info += f" **{failed_results}** sequences skipped due to errors:\n"
+        for failed_target in failed_targets:
+            warning_info += f"  - {failed_target}\n"
+
+    utils.log_with_context(
+        f"[ProcessPoolExecutor] {warning_info}\n[ProcessPoolExecutor] Done with all tasks",
+        log_flag=settings.is_pairwise_aligner_logging_enabled(),
+    )
+
     # for sanity’s sake let's make sure its sorted
     results = sorted(results, key=lambda x: x["norm_score"], reverse=True)
     return results, base_score, warning_info
@@ -0,0 +1,125 @@
+"""
+k-mer inverted index over the lab parent sequences.
+
+This module provides the KmerIndex class, used to prune the targets of a sequence search before the
+full BLOSUM62 alignment. Sequences that are related enough to pass a typical alignment threshold share
+a large fraction of their short k-mers with the query, while unrelated sequences share very few.
+"""
+
+from collections import Counter, defaultdict
+
+from levseq_dash.app.sequence_aligner.bio_python_pairwise_aligner import sanitize_protein_sequence
+
+
+class KmerIndex:
+    """
+    Inverted index mapping each k-mer to the set of experiment IDs whose sequence contains it.
+
+    The index is built once from all the lab sequences and kept up to date with add and remove,
+    so a search only has to look up the k-mers of the query.
+    """
+
+    def __init__(self, k: int = 3):
+        """
+        Initialize an empty index.
+
+        Args:
+            k: Length of the k-mers.
+
+        Raises:
+            ValueError: If k is not a positive integer.
+        """
+        if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+            raise ValueError(f"k-mer size must be a positive integer, got: '{k}'")
+
+        self.k = k
+        # k-mer -> set of experiment IDs
+        self._postings = defaultdict(set)
+        # experiment ID -> set of k-mers, needed to remove an experiment from the postings
+        self._kmers_per_experiment = {}
+
+    def __len__(self):
+        return len(self._kmers_per_experiment)
+
+    def __contains__(self, experiment_id):
+        return experiment_id in self._kmers_per_experiment
+
+    def extract_kmers(self, sequence: str) -> set:
+        """
+        Extract the distinct k-mers of a sequence after sanitizing it.
+
+        Args:
+            sequence: Protein sequence.
+
+        Returns:
+            set: Distinct k-mers of the sequence. Empty if the sequence is shorter than k.
+        """
+        sequence = sanitize_protein_sequence(sequence).upper()
+        return {sequence[i : i + self.k] for i in range(len(sequence) - self.k + 1)}
+
+    def add(self, experiment_id: str, sequence: str):
+        """
+        Add or replace the sequence of an experiment.
+
+        Sequences that can't be sanitized or are shorter than k are not indexed; they are never candidates.
+
+        Args:
+            experiment_id: ID of the experiment.
+            sequence: Parent sequence of the experiment.
+        """
+        self.remove(experiment_id)
+        try:
+            kmers = self.extract_kmers(sequence)
+        except ValueError:
+            return
+
+        if not kmers:
+            return
+
+        self._kmers_per_experiment[experiment_id] = kmers
+        for kmer in kmers:
+            self._postings[kmer].add(experiment_id)
+
+    def remove(self, experiment_id: str):
+        """
+        Remove an experiment from the index if it is indexed.
+
+        Args:
+            experiment_id: ID of the experiment.
+        """
+        kmers = self._kmers_per_experiment.pop(experiment_id, None)
+        if kmers is None:
+            return
+
+        for kmer in kmers:
+            postings = self._postings[kmer]
+            postings.discard(experiment_id)
+            if not postings:
+                del self._postings[kmer]
+
+    def rank_candidates(self, query_sequence: str, min_shared_fraction: float = 0.0) -> list:
+        """
+        Rank the indexed experiments by the number of distinct k-mers they share with the query.
+
+        Args:
+            query_sequence: Query protein sequence.
+            min_shared_fraction: Minimum fraction (0-1) of the distinct query k-mers a sequence must
+                                 share to be returned as a candidate.
+
+        Returns:
+            list: (experiment_id, shared_fraction) tuples sorted by shared_fraction, highest first.
+        """
+        query_kmers = self.extract_kmers(query_sequence)
+        if not query_kmers:
+            return []
+
+        shared_counts = Counter()
+        for kmer in query_kmers:
+            shared_counts.update(self._postings.get(kmer, ()))
+
+        candidates = [
+            (experiment_id, shared_count / len(query_kmers))
+            for experiment_id, shared_count in shared_counts.items()
+            if shared_count / len(query_kmers) >= min_shared_fraction
+        ]
+        return sorted(candidates, key=lambda candidate: candidate[1], reverse=True)
@@ -3,6 +3,21 @@ import pytest
 from levseq_dash.app.sequence_aligner.bio_python_pairwise_aligner import setup_aligner_blastp
 
 
+@pytest.fixture(autouse=True)
+def alignment_admission_path(mocker, tmp_path):
+    """Keeps the slots and the queue of the searches of a test out of the data path."""
+    from levseq_dash.app.sequence_aligner import alignment_admission
+
+    admission_path = tmp_path / "alignment_admission"
+
+    def get_admission_path():
+        admission_path.mkdir(exist_ok=True)
+        return admission_path
+
+    mocker.patch.object(alignment_admission, "get_admission_path", side_effect=get_admission_path)
+    return admission_path
+
+
 @pytest.fixture
 def mock_pairwise_aligner(mocker):
     """
@@ -0,0 +1,182 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from levseq_dash.app.config import settings
+from levseq_dash.app.sequence_aligner import alignment_admission
+from levseq_dash.app.sequence_aligner.bio_python_pairwise_aligner import get_alignments
+
+
+@pytest.fixture
+def admission_path(alignment_admission_path):
+    alignment_admission_path.mkdir()
+    return alignment_admission_path
+
+
+def start_waiting_task(max_concurrent_alignments):
+    """Starts a thread that waits for a slot and holds it until the returned release event is set."""
+    admitted = threading.Event()
+    release = threading.Event()
+
+    def run():
+        with alignment_admission.alignment_slot(max_concurrent_alignments):
+            admitted.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, admitted, release
+
+
+def test_alignment_slot_cap(admission_path):
+    with alignment_admission.alignment_slot(2) as waited_seconds:
+        assert waited_seconds < 1
+        with alignment_admission.alignment_slot(2):
+            assert alignment_admission.get_alignment_queue_metrics(2) == {
+                "max_concurrent_alignments": 2,
+                "running_tasks": 2,
+                "waiting_tasks": 0,
+            }
+
+            # all the slots are taken, the third task waits in the queue
+            thread, admitted, release = start_waiting_task(2)
+            assert not admitted.wait(0.2)
+            assert alignment_admission.get_alignment_queue_metrics(2)["waiting_tasks"] == 1
+
+        # a slot was released
+        assert admitted.wait(5)
+        release.set()
+        thread.join()
+
+    assert alignment_admission.get_alignment_queue_metrics(2) == {
+        "max_concurrent_alignments": 2,
+        "running_tasks": 0,
+        "waiting_tasks": 0,
+    }
+
+
+def test_alignment_slot_fifo(admission_path):
+    # a task of a live process started waiting before
+    earlier_ticket = admission_path / f"{0:020d}-{os.getpid()}.ticket"
+    earlier_ticket.touch()
+
+    # the slot is free, but the task queues behind the earlier one
+    thread, admitted, release = start_waiting_task(1)
+    assert not admitted.wait(0.2)
+
+    earlier_ticket.unlink()
+    assert admitted.wait(5)
+    release.set()
+    thread.join()
+    assert list(admission_path.glob("*.ticket")) == []
+
+
+def test_alignment_slot_removes_tickets_of_dead_processes(admission_path):
+    process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    stale_ticket = admission_path / f"{0:020d}-{int(process.stdout)}.ticket"
+    stale_ticket.touch()
+
+    start_time = time.monotonic()
+    with alignment_admission.alignment_slot(1):
+        assert time.monotonic() - start_time < 1
+    assert not stale_ticket.exists()
+
+
+@pytest.mark.parametrize("max_concurrent_alignments", [None, 0])
+def test_alignment_slot_disabled(admission_path, max_concurrent_alignments):
+    with alignment_admission.alignment_slot(max_concurrent_alignments) as waited_seconds:
+        assert waited_seconds == 0
+    assert list(admission_path.iterdir()) == []
+
+
+def test_alignment_queue_without_admission_path(mocker):
+    mocker.patch.object(alignment_admission, "get_admission_path", side_effect=PermissionError("read-only"))
+
+    # the slots are granted right away
+    with alignment_admission.AlignmentQueue(1) as alignment_queue:
+        assert alignment_queue.try_acquire_slot() is not None
+        assert alignment_queue.try_acquire_slot() is not None
+
+
+def test_alignment_queue_requeues_for_each_slot(admission_path):
+    with alignment_admission.AlignmentQueue(2) as alignment_queue:
+        first_slot = alignment_queue.try_acquire_slot()
+        assert first_slot is not None
+
+        # two other searches started waiting, the search queues behind them for its next slot
+        other_tickets = [admission_path / f"{time.time_ns() + i:020d}-{os.getpid()}.ticket" for i in range(2)]
+        for other_ticket in other_tickets:
+            other_ticket.touch()
+        assert alignment_queue.try_acquire_slot() is None
+        assert len(list(admission_path.glob("*.ticket"))) == 3
+
+        for other_ticket in other_tickets:
+            other_ticket.unlink()
+        second_slot = alignment_queue.try_acquire_slot()
+        assert second_slot is not None
+        assert list(admission_path.glob("*.ticket")) == []
+
+        # all the slots are held
+        assert alignment_queue.try_acquire_slot() is None
+        first_slot.release()
+        first_slot.release()
+        assert alignment_queue.try_acquire_slot() is not None
+
+    assert list(admission_path.glob("*.ticket")) == []
+
+
+def test_get_admission_path(mocker, tmp_path):
+    # the autouse fixture mocks get_admission_path
+    mocker.stopall()
+    admission_path = tmp_path / "data" / ".alignment_admission"
+    mocker.patch.object(settings, "get_alignment_admission_path", return_value=admission_path)
+
+    assert alignment_admission.get_admission_path() == admission_path
+    assert admission_path.stat().st_mode & 0o777 == 0o700
+
+    # a directory other users could put tickets or slots in is not used, the searches run without admission
+    admission_path.chmod(0o777)
+    with pytest.raises(PermissionError):
+        alignment_admission.get_admission_path()
+    with alignment_admission.AlignmentQueue(1) as alignment_queue:
+        assert alignment_queue.admission_path is None
+
+
+def test_get_alignments_takes_the_slots_before_submitting(mocker, admission_path, target_sequences):
+    mocker.patch.object(settings, "get_max_concurrent_alignments", return_value=1)
+    query_sequence = target_sequences["seq_base"]
+    submitted_search = {}
+
+    def run():
+        submitted_search["results"] = get_alignments(query_sequence, 0, target_sequences)[0]
+
+    # the only slot of the host is held, the search waits in its process without submitting to its pool
+    with alignment_admission.alignment_slot(1):
+        thread = threading.Thread(target=run)
+        thread.start()
+        time.sleep(0.5)
+        assert thread.is_alive()
+        assert alignment_admission.get_alignment_queue_metrics(1)["waiting_tasks"] == 1
+
+    thread.join(60)
+    assert len(submitted_search["results"]) == len(target_sequences)
+
+    # the slot of the last chunk is released when it is done
+    assert alignment_admission.get_alignment_queue_metrics(1) == {
+        "max_concurrent_alignments": 1,
+        "running_tasks": 0,
+        "waiting_tasks": 0,
+    }
+
+
+def test_get_alignments_with_one_slot(mocker, target_sequences):
+    mocker.patch("levseq_dash.app.config.settings.get_max_concurrent_alignments", return_value=1)
+    query_sequence = target_sequences["seq_base"]
+    results, _, warning_info = get_alignments(query_sequence, 0, target_sequences)
+
+    assert len(results) == len(target_sequences)
+    assert f"**{len(target_sequences)}/{len(target_sequences)}**" in warning_info
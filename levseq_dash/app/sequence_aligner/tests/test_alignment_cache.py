@@ -0,0 +1,134 @@
+import pytest
+
+from levseq_dash.app.sequence_aligner import bio_python_pairwise_aligner
+from levseq_dash.app.sequence_aligner.alignment_cache import AlignmentCache, hash_sequence
+from levseq_dash.app.sequence_aligner.bio_python_pairwise_aligner import (
+    get_aligner_configuration_hash,
+    get_alignments,
+    setup_aligner_blastp,
+)
+
+
+@pytest.fixture
+def alignment_cache(tmp_path):
+    return AlignmentCache(tmp_path / "alignment_cache.sqlite3")
+
+
+def test_hash_sequence():
+    assert hash_sequence("AACTT") == hash_sequence("AACTT")
+    assert hash_sequence("AACTT") != hash_sequence("AACTA")
+
+
+def test_store_and_get_results(alignment_cache):
+    compact_alignments = [("alignment", 27.0, 1.0, 5, 0, 0)]
+    alignment_cache.store_results(
+        "query",
+        "aligner",
+        [("exp1", "target1", 27.0, compact_alignments), ("exp2", "target2", -5.0, None)],
+    )
+
+    cached = alignment_cache.get_results("query", "aligner", {"exp1": "target1", "exp2": "target2"})
+    assert cached == {"exp1": (27.0, compact_alignments), "exp2": (-5.0, None)}
+
+
+@pytest.mark.parametrize(
+    "query_hash, aligner_hash, target_hashes",
+    [
+        ("other_query", "aligner", {"exp1": "target1"}),
+        ("query", "other_aligner", {"exp1": "target1"}),
+        ("query", "aligner", {"exp1": "changed_target"}),
+        ("query", "aligner", {"exp2": "target1"}),
+    ],
+)
+def test_get_results_miss(alignment_cache, query_hash, aligner_hash, target_hashes):
+    alignment_cache.store_results("query", "aligner", [("exp1", "target1", 27.0, None)])
+    assert alignment_cache.get_results(query_hash, aligner_hash, target_hashes) == {}
+
+
+def test_invalidate_experiment(alignment_cache):
+    alignment_cache.store_results("query", "aligner", [("exp1", "target", 27.0, None), ("exp2", "target", 27.0, None)])
+    alignment_cache.invalidate_experiment("exp1")
+
+    cached = alignment_cache.get_results("query", "aligner", {"exp1": "target", "exp2": "target"})
+    assert list(cached.keys()) == ["exp2"]
+
+
+def test_cache_is_shared_between_instances(tmp_path):
+    AlignmentCache(tmp_path / "cache.sqlite3").store_results("query", "aligner", [("exp1", "target", 1.0, None)])
+    cached = AlignmentCache(tmp_path / "cache.sqlite3").get_results("query", "aligner", {"exp1": "target"})
+    assert cached == {"exp1": (1.0, None)}
+
+
+def test_read_errors_behave_like_misses(tmp_path):
+    cache = AlignmentCache(tmp_path / "cache.sqlite3")
+    (tmp_path / "cache.sqlite3").unlink()
+    (tmp_path / "cache.sqlite3").mkdir()
+    assert cache.get_results("query", "aligner", {"exp1": "target"}) == {}
+    # writes and invalidations don't raise either
+    cache.store_results("query", "aligner", [("exp1", "target", 1.0, None)])
+    cache.invalidate_experiment("exp1")
+
+
+def test_aligner_configuration_hash():
+    aligner = setup_aligner_blastp()
+    assert get_aligner_configuration_hash(aligner, 1) == get_aligner_configuration_hash(setup_aligner_blastp(), 1)
+    assert get_aligner_configuration_hash(aligner, 1) != get_aligner_configuration_hash(aligner, 2)
+
+    aligner.open_gap_score = -10
+    assert get_aligner_configuration_hash(aligner, 1) != get_aligner_configuration_hash(setup_aligner_blastp(), 1)
+
+
+def sort_key(result):
+    return result["experiment_id"], result["sequence_alignment"]
+
+
+def test_get_alignments_served_from_cache(alignment_cache, target_sequences, mocker):
+    query_sequence = target_sequences["seq_base"]
+    results, base_score, _ = get_alignments(query_sequence, 0.8, target_sequences, alignment_cache=alignment_cache)
+
+    # the second search doesn't need the pool at all
+    mocker.patch.object(bio_python_pairwise_aligner, "get_aligner_pool", side_effect=AssertionError("not cached"))
+    cached_results, cached_base_score, warning_info = get_alignments(
+        query_sequence, 0.8, target_sequences, alignment_cache=alignment_cache
+    )
+
+    assert cached_base_score == base_score
+    assert sorted(cached_results, key=sort_key) == sorted(results, key=sort_key)
+    assert f"**{len(target_sequences)}/{len(target_sequences)}**" in warning_info
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.9, 1.0])
+def test_get_alignments_threshold_applied_at_read_time(alignment_cache, target_sequences, threshold):
+    query_sequence = target_sequences["seq_base"]
+
+    # fill the cache with a different threshold
+    get_alignments(query_sequence, 0.8, target_sequences, alignment_cache=alignment_cache)
+
+    cached_results, _, _ = get_alignments(query_sequence, threshold, target_sequences, alignment_cache=alignment_cache)
+    expected, _, _ = get_alignments(query_sequence, threshold, target_sequences)
+
+    assert sorted(cached_results, key=sort_key) == sorted(expected, key=sort_key)
+
+
+def test_get_alignments_cache_keyed_by_target_sequence(alignment_cache):
+    get_alignments("AACTT", 0, {"exp1": "AACTT"}, alignment_cache=alignment_cache)
+
+    # the experiment now has a different sequence, the cached result must not be used
+    results, _, _ = get_alignments("AACTT", 0, {"exp1": "AATT"}, alignment_cache=alignment_cache)
+    assert results[0]["sequence"] == "AATT"
+    assert results[0]["gaps"] == 1
+
+
+def test_get_alignments_progress_callback_counts_cached_targets(alignment_cache, target_sequences):
+    query_sequence = target_sequences["seq_base"]
+    get_alignments(query_sequence, 0.8, target_sequences, alignment_cache=alignment_cache)
+
+    progress = []
+    get_alignments(
+        query_sequence,
+        0.8,
+        target_sequences,
+        alignment_cache=alignment_cache,
+        progress_callback=lambda *args: progress.append(args),
+    )
+    assert progress == [(len(target_sequences), len(target_sequences))]
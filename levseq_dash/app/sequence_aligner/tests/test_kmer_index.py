@@ -0,0 +1,74 @@
+import pytest
+
+from levseq_dash.app.sequence_aligner.bio_python_pairwise_aligner import get_alignments
+from levseq_dash.app.sequence_aligner.kmer_index import KmerIndex
+
+
+@pytest.mark.parametrize("k", [0, -1, "3", 2.5, True])
+def test_kmer_index_invalid_k(k):
+    with pytest.raises(ValueError, match="k-mer size"):
+        KmerIndex(k=k)
+
+
+def test_extract_kmers():
+    kmer_index = KmerIndex(k=3)
+    assert kmer_index.extract_kmers(" mktAA\n") == {"MKT", "KTA", "TAA"}
+    assert kmer_index.extract_kmers("MK") == set()
+
+
+def test_add_and_remove():
+    kmer_index = KmerIndex(k=3)
+    kmer_index.add("exp1", "MKTAA")
+    kmer_index.add("exp2", "MKTCC")
+    assert len(kmer_index) == 2
+    assert "exp1" in kmer_index
+
+    kmer_index.remove("exp1")
+    assert "exp1" not in kmer_index
+    assert kmer_index.rank_candidates("MKTAA") == [("exp2", 1 / 3)]
+
+    # removing an unknown experiment is a no-op
+    kmer_index.remove("unknown")
+    assert len(kmer_index) == 1
+
+
+def test_add_replaces_sequence():
+    kmer_index = KmerIndex(k=3)
+    kmer_index.add("exp1", "MKTAA")
+    kmer_index.add("exp1", "WWWWW")
+    assert kmer_index.rank_candidates("MKTAA") == []
+    assert kmer_index.rank_candidates("WWWW") == [("exp1", 1.0)]
+
+
+@pytest.mark.parametrize("sequence", ["", None, "   "])
+def test_add_skips_invalid_sequence(sequence):
+    kmer_index = KmerIndex(k=3)
+    kmer_index.add("exp1", sequence)
+    assert len(kmer_index) == 0
+
+
+def test_rank_candidates_order_and_cutoff():
+    kmer_index = KmerIndex(k=3)
+    kmer_index.add("identical", "MKTAYIAK")
+    kmer_index.add("half", "MKTAWWWW")
+    kmer_index.add("unrelated", "GGGGGGGG")
+
+    # query has 6 distinct k-mers, "half" shares MKT, KTA
+    assert kmer_index.rank_candidates("MKTAYIAK") == [("identical", 1.0), ("half", 2 / 6)]
+    assert kmer_index.rank_candidates("MKTAYIAK", min_shared_fraction=0.5) == [("identical", 1.0)]
+
+
+def test_rank_candidates_keeps_matches_above_threshold(target_sequence_dictionary):
+    """
+    Every lab sequence that passes the alignment threshold must survive the k-mer pruning
+    """
+    kmer_index = KmerIndex(k=3)
+    for experiment_id, sequence in target_sequence_dictionary.items():
+        kmer_index.add(experiment_id, sequence)
+
+    query = next(iter(target_sequence_dictionary.values()))
+    matches, _, _ = get_alignments(query_sequence=query, threshold=0.8, targets=target_sequence_dictionary)
+    candidates = {experiment_id for experiment_id, _ in kmer_index.rank_candidates(query, min_shared_fraction=0.2)}
+
+    assert len(matches) > 0
+    assert {match["experiment_id"] for match in matches} <= candidates
@@ -1,11 +1,22 @@
+import multiprocessing
+import os
+
 import pytest
 
+from levseq_dash.app.sequence_aligner import bio_python_pairwise_aligner
 from levseq_dash.app.sequence_aligner.bio_python_pairwise_aligner import (
+    align_target_compact,
+    get_aligner_pool,
     get_alignments,
+    get_chunk_size,
     inject_aligner,
+    parallel_function_align_chunk,
     parallel_function_align_target,
     sanitize_protein_sequence,
     setup_aligner_blastp,
+    shutdown_aligner_pool,
+    start_aligner_service,
+    stop_aligner_service,
 )
 
 
@@ -127,6 +138,141 @@ def test_parallel_function_align_target():
     assert results[0]["norm_score"] >= 0.5
 
 
+def test_parallel_function_align_chunk():
+    inject_aligner()
+
+    chunk = [("exact", "AACTT"), ("with_numbers", "AAC123TT"), ("far", "GGGG")]
+    chunk_results = parallel_function_align_chunk(chunk, "AACTT", 27, 0.5)
+
+    assert [target_id for target_id, _, _, _ in chunk_results] == ["exact", "with_numbers", "far"]
+
+    # compact results don't echo back the target sequence
+    _, alignment_score, compact_alignments, error = chunk_results[0]
+    assert error is None
+    assert alignment_score == 27
+    assert compact_alignments[0][1:] == (27, 1.0, 5, 0, 0)
+
+    # errors are reported per target without failing the chunk
+    _, alignment_score, compact_alignments, error = chunk_results[1]
+    assert alignment_score is None
+    assert compact_alignments is None
+    assert error
+
+    # below threshold, the score is still returned for the alignment cache
+    _, alignment_score, compact_alignments, error = chunk_results[2]
+    assert alignment_score is not None
+    assert compact_alignments == []
+    assert error is None
+
+
+def test_parallel_function_align_target_matches_chunk():
+    inject_aligner()
+    results = parallel_function_align_target("test_id", "AATT", "AACTT", 27, 0)
+    ((_, _, compact_alignments, _),) = parallel_function_align_chunk([("test_id", "AATT")], "AACTT", 27, 0)
+    assert len(results) == len(compact_alignments)
+    assert results[0]["sequence"] == "AATT"
+    assert results[0]["sequence_alignment"] == compact_alignments[0][0]
+
+
+def test_align_target_compact_skips_traceback_below_threshold(mocker):
+    aligner = setup_aligner_blastp()
+    base_score = aligner.score("AACTT", "AACTT")
+
+    spy = mocker.spy(aligner, "align")
+    alignment_score, compact_alignments = align_target_compact(aligner, "GGGG", "AACTT", base_score, 0.8)
+    assert alignment_score == aligner.score("GGGG", "AACTT")
+    assert compact_alignments == []
+    spy.assert_not_called()
+
+    _, results = align_target_compact(aligner, "AACTT", "AACTT", base_score, 0.8)
+    spy.assert_called_once()
+    assert results[0][1:3] == (base_score, 1.0)
+
+
+@pytest.mark.parametrize("max_alignments_per_target", [1, 2, 3])
+def test_align_target_compact_bounded_co_optimal_alignments(max_alignments_per_target):
+    aligner = setup_aligner_blastp()
+    # a repetitive target has several co-optimal alignments against the query
+    assert len(aligner.align("AAAAAAAA", "AAAAAAA")) > 3
+
+    _, results = align_target_compact(aligner, "AAAAAAAA", "AAAAAAA", 28, 0, max_alignments_per_target)
+    assert len(results) == max_alignments_per_target
+
+
+def test_align_target_compact_enumeration_is_lazy(mocker):
+    aligner = setup_aligner_blastp()
+    first_alignment = aligner.align("AAAAAAAA", "AAAAAAA")[0]
+
+    def alignments_generator():
+        yield first_alignment
+        raise AssertionError("enumerated past max_alignments_per_target")
+
+    mocker.patch.object(aligner, "align", return_value=alignments_generator())
+    _, results = align_target_compact(aligner, "AAAAAAAA", "AAAAAAA", 28, 0, 1)
+    assert len(results) == 1
+
+
+def test_get_alignments_max_alignments_per_target():
+    results, _, warning_info = get_alignments("AAAAAAA", 0, {"target": "AAAAAAAA"}, max_alignments_per_target=2)
+    assert len(results) == 2
+    assert "At most **2** co-optimal alignment(s) reported per target." in warning_info
+
+
+def test_get_alignments_max_alignments_per_target_from_settings(mocker):
+    mocker.patch(
+        "levseq_dash.app.sequence_aligner.bio_python_pairwise_aligner.settings.get_max_alignments_per_target",
+        return_value=1,
+    )
+    results, _, warning_info = get_alignments("AAAAAAA", 0, {"target": "AAAAAAAA"})
+    assert len(results) == 1
+    assert "At most **1** co-optimal" in warning_info
+
+
+@pytest.mark.parametrize("threshold", [0, 0.5, 0.8, 0.95, 1.0])
+def test_get_alignments_prefilter_keeps_results(target_sequences, threshold):
+    query_sequence = target_sequences["seq_base"]
+    results, base_score, _ = get_alignments(query_sequence, threshold, target_sequences)
+    all_results, _, _ = get_alignments(query_sequence, 0, target_sequences)
+
+    def sort_key(result):
+        return result["experiment_id"], result["sequence_alignment"]
+
+    # the score-only pass drops the same targets the threshold used to drop after the traceback
+    expected = [r for r in all_results if r["norm_score"] >= threshold]
+    assert sorted(results, key=sort_key) == sorted(expected, key=sort_key)
+
+
+@pytest.mark.parametrize(
+    "n_targets, n_workers, expected",
+    [
+        (0, 4, 1),
+        (1, 4, 1),
+        (16, 4, 1),
+        (17, 4, 2),
+        (1000, 8, 32),
+        (1000, 0, 250),
+    ],
+)
+def test_get_chunk_size(n_targets, n_workers, expected):
+    assert get_chunk_size(n_targets, n_workers) == expected
+
+
+def test_get_alignments_chunked_matches_per_target(target_sequences):
+    query_sequence = target_sequences["seq_base"]
+    results, base_score, warning_info = get_alignments(query_sequence, 0, target_sequences)
+
+    inject_aligner()
+    expected = []
+    for target_id, target_sequence in target_sequences.items():
+        expected.extend(parallel_function_align_target(target_id, target_sequence, query_sequence, base_score, 0))
+
+    def sort_key(result):
+        return result["experiment_id"], result["sequence_alignment"]
+
+    assert sorted(results, key=sort_key) == sorted(expected, key=sort_key)
+    assert f"**{len(target_sequences)}/{len(target_sequences)}**" in warning_info
+
+
 def test_get_alignments_with_problematic_sequence():
     targets = {
         "good": "AACTT",
@@ -136,3 +282,124 @@ def test_get_alignments_with_problematic_sequence():
     results, base_score, warning_info = get_alignments("AACTT", 0, targets)
 
     assert "errors" in warning_info
+
+
+def test_get_alignments_deduplicates_identical_sequences(mocker, target_sequences):
+    from levseq_dash.app.sequence_aligner import bio_python_pairwise_aligner
+
+    spy = mocker.spy(bio_python_pairwise_aligner, "_align_admitted_chunks")
+    query_sequence = target_sequences["seq_base"]
+    targets = {
+        "exp1": target_sequences["seq_base"],
+        "exp2": f" {target_sequences['seq_base']}\n",  # same sequence once sanitized
+        "exp3": target_sequences["seq_half_seq"],
+    }
+    results, _, warning_info = get_alignments(query_sequence, 0, targets)
+
+    # only the unique sequences are sent to the pool
+    assert len(spy.call_args.args[0]) == 2
+
+    results_per_experiment = {result["experiment_id"]: result for result in results}
+    assert set(results_per_experiment) == {"exp1", "exp2", "exp3"}
+    exp1_result = {k: v for k, v in results_per_experiment["exp1"].items() if k != "experiment_id"}
+    exp2_result = {k: v for k, v in results_per_experiment["exp2"].items() if k != "experiment_id"}
+    assert exp1_result == exp2_result
+    assert "**3/3** alignments succeeded" in warning_info
+    assert "**2** unique sequences for **3** experiments" in warning_info
+
+
+def test_get_alignments_duplicate_problematic_sequence():
+    targets = {"good": "AACTT", "bad1": "AAC123TT", "bad2": "AAC123TT"}
+
+    results, _, warning_info = get_alignments("AACTT", 0, targets)
+
+    assert {result["experiment_id"] for result in results} == {"good"}
+    assert "**2** sequences skipped due to errors" in warning_info
+    assert "bad1" in warning_info and "bad2" in warning_info
+
+
+def test_aligner_pool_is_reused_across_searches():
+    get_alignments("AACTT", 0, {"target": "AATT"})
+    pool = get_aligner_pool()
+    get_alignments("AACTT", 0, {"target": "AATT"})
+    assert get_aligner_pool() is pool
+
+
+def test_aligner_pool_restarts_after_worker_died():
+    pool = get_aligner_pool()
+    # kill a worker process, the executor is then broken and refuses new work
+    with pytest.raises(Exception):
+        pool.submit(os._exit, 1).result()
+
+    new_pool = get_aligner_pool()
+    assert new_pool is not pool
+
+    results, _, warning_info = get_alignments("AACTT", 0, {"target": "AACTT"})
+    assert results[0]["identities"] == 5
+    assert "errors" not in warning_info
+
+
+def test_shutdown_aligner_pool():
+    pool = get_aligner_pool()
+    shutdown_aligner_pool()
+    assert get_aligner_pool() is not pool
+
+    # a shutdown pool doesn't stop the next search from running
+    shutdown_aligner_pool()
+    results, _, _ = get_alignments("AACTT", 0, {"target": "AACTT"})
+    assert len(results) >= 1
+
+
+def test_get_alignments_progress_callback(target_sequences):
+    query_sequence = target_sequences["seq_base"]
+    # two experiments share a sequence, it is aligned once and counts for both
+    targets = {**target_sequences, "duplicate": target_sequences["seq_base"]}
+    progress = []
+    get_alignments(query_sequence, 0, targets, progress_callback=lambda *args: progress.append(args))
+
+    assert progress[0] == (0, len(targets))
+    assert progress[-1] == (len(targets), len(targets))
+    assert all(total == len(targets) for _, total in progress)
+    assert [aligned for aligned, _ in progress] == sorted(aligned for aligned, _ in progress)
+
+
+def run_search_in_forked_process(result_queue):
+    results, _, warning_info = get_alignments("AACTT", 0, {"target": "AACTT"})
+    # whether this process started a pool of its own
+    result_queue.put((results[0]["identities"], warning_info, bio_python_pairwise_aligner._aligner_pool is not None))
+
+
+def test_forked_search_aligns_in_the_pool_of_the_aligner_service():
+    """A process forked after the aligner service started, like a background job, uses the pool of its parent."""
+    shutdown_aligner_pool()
+    start_aligner_service()
+    try:
+        fork_context = multiprocessing.get_context("fork")
+        result_queue = fork_context.Queue()
+        process = fork_context.Process(target=run_search_in_forked_process, args=(result_queue,))
+        process.start()
+        identities, warning_info, started_own_pool = result_queue.get(timeout=60)
+        process.join(10)
+    finally:
+        stop_aligner_service()
+
+    assert identities == 5
+    assert "errors" not in warning_info
+    assert not started_own_pool
+    # the chunks of the forked process were aligned in the pool of this process
+    assert bio_python_pairwise_aligner._aligner_pool is not None
+
+
+def test_forked_search_without_the_aligner_service(mocker):
+    """A forked process aligns in a pool of its own if it can't connect to the aligner service."""
+    start_aligner_service()
+    mocker.patch.object(bio_python_pairwise_aligner, "_aligner_service_pid", -1)
+    mocker.patch.object(bio_python_pairwise_aligner, "_aligner_service_address", ("/nonexistent/socket", b"key"))
+    try:
+        results, _, warning_info = get_alignments("AACTT", 0, {"target": "AACTT"})
+    finally:
+        mocker.stopall()
+        stop_aligner_service()
+
+    assert results[0]["identities"] == 5
+    assert "errors" not in warning_info
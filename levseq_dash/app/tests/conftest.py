@@ -12,6 +12,21 @@ def load_config_mock_string():
     return "levseq_dash.app.config.settings.load_config"
 
 
+@pytest.fixture(autouse=True)
+def alignment_admission_path(mocker, tmp_path):
+    """Keeps the slots and the queue of the searches of a test out of the data path."""
+    from levseq_dash.app.sequence_aligner import alignment_admission
+
+    admission_path = tmp_path / "alignment_admission"
+
+    def get_admission_path():
+        admission_path.mkdir(exist_ok=True)
+        return admission_path
+
+    mocker.patch.object(alignment_admission, "get_admission_path", side_effect=get_admission_path)
+    return admission_path
+
+
 @pytest.fixture(scope="session")
 def package_root():
     return Path(__file__).resolve().parent.parent.parent
@@ -117,6 +132,49 @@ def disk_manager_from_temp_data(mocker, tmp_path, load_config_mock_string):
     return DiskDataManager()
 
 
+@pytest.fixture(scope="function")
+def disk_manager_from_temp_data_with_alignment_cache(mocker, tmp_path, load_config_mock_string):
+    mock = mocker.patch(load_config_mock_string)
+    mock.return_value = {
+        "deployment-mode": "local-instance",
+        "storage-mode": "disk",
+        "disk": {"five-letter-id-prefix": "MYLAB", "enable-data-modification": True, "local-data-path": str(tmp_path)},
+        "sequence-alignment": {"alignment-cache": True},
+    }
+
+    from levseq_dash.app.data_manager.disk_manager import DiskDataManager
+
+    return DiskDataManager()
+
+
+@pytest.fixture(scope="function")
+def db_manager_from_test_data(mocker, tmp_path, test_data_path, load_config_mock_string):
+    """Database data manager with the test experiments migrated into a temporary database"""
+    from levseq_dash.app.data_manager.db_manager import DatabaseDataManager, migrate_disk_data
+
+    database_path = tmp_path / "levseq.sqlite3"
+    migrate_disk_data(test_data_path, database_path)
+
+    mock = mocker.patch(load_config_mock_string)
+    mock.return_value = {
+        "deployment-mode": "local-instance",
+        "storage-mode": "db",
+        "disk": {"five-letter-id-prefix": "MYLAB", "enable-data-modification": True},
+        "db": {"database-path": str(database_path)},
+    }
+
+    return DatabaseDataManager()
+
+
+@pytest.fixture
+def upload_staging_path(mocker, tmp_path):
+    """Stages the uploaded experiment files in a temporary directory instead of the one of the host"""
+    staging_path = tmp_path / "upload_staging"
+    staging_path.mkdir()
+    mocker.patch("levseq_dash.app.data_manager.upload_staging.get_staging_path", return_value=staging_path)
+    return staging_path
+
+
 @pytest.fixture
 def mock_load_config(mocker):
     """Fixture for mocking load_config"""
@@ -137,6 +195,13 @@ def mock_get_logging_settings(mocker):
     return mock
 
 
+@pytest.fixture
+def mock_get_sequence_alignment_settings(mocker):
+    """Fixture for mocking get_sequence_alignment_settings"""
+    mock = mocker.patch("levseq_dash.app.config.settings.get_sequence_alignment_settings")
+    return mock
+
+
 @pytest.fixture
 def mock_get_deployment_mode(mocker):
     mock = mocker.patch("levseq_dash.app.config.settings.get_deployment_mode")
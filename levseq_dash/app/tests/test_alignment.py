@@ -154,14 +154,16 @@ def test_search_for_variants_in_experiment_data(residue_list, count, experiment_
         (["42", "90", "173", "123"], 58),
     ],
 )
-def test_search_and_gather_variant_info_for_matching_experiment(
+def test_gather_variant_info_for_matching_experiment(
     residue_list, count, experiment_ep_pcr, experiment_ep_pcr_metadata, seq_align_data
 ):
+    df_exp_results = u_seq_alignment.lookup_residues_in_experiment_data(
+        experiment_ep_pcr.exp_get_processed_core_data_for_valid_mutation_extractions(), residue_list
+    )
     exp_results_row_data = list(dict())
-    exp_results_row_data = u_seq_alignment.search_and_gather_variant_info_for_matching_experiment(
-        experiment_ep_pcr,
+    exp_results_row_data = u_seq_alignment.gather_variant_info_for_matching_experiment(
+        df_exp_results,
         experiment_ep_pcr_metadata,
-        residue_list,
         seq_align_data,
         exp_results_row_data,
     )
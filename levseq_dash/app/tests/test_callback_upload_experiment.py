@@ -1,44 +1,45 @@
-import base64
 import os
 import time
 from contextvars import copy_context
 
+import pandas as pd
 import pytest
+from dash import no_update
 from dash._callback_context import context_value
 from dash._utils import AttributeDict
 
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager import upload_staging
+from levseq_dash.app.data_manager.base import BaseDataManager
 from levseq_dash.app.data_manager.experiment import MutagenesisMethod
+from levseq_dash.app.utils import utils
 
 IN_GITHUB_ACTIONS = os.getenv("GITHUB_ACTIONS") == "true"
 
 TIME_RESULTS = []
 
 
-def run_callback_on_upload_experiment_file(dash_upload_string_contents, filename, last_modified):
+def run_callback_on_upload_experiment_file(uploaded_file):
     """Helper function to run the upload experiment file callback in isolation."""
     from levseq_dash.app.main_app import on_upload_experiment_file
 
     # Set up callback context
-    context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-button-upload-data.contents"}]}))
+    context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-upload-data-file.data"}]}))
 
     # Execute the callback
-    result = on_upload_experiment_file(
-        dash_upload_string_contents=dash_upload_string_contents, filename=filename, last_modified=last_modified
-    )
+    result = on_upload_experiment_file(uploaded_file=uploaded_file)
     return result
 
 
-def run_callback_on_upload_structure_file(dash_upload_string_contents, filename, last_modified):
+def run_callback_on_upload_structure_file(uploaded_file):
     """Helper function to run the upload structure file callback in isolation."""
     from levseq_dash.app.main_app import on_upload_structure_file
 
     # Set up callback context
-    context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-button-upload-structure.contents"}]}))
+    context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-upload-structure-file.data"}]}))
 
     # Execute the callback
-    result = on_upload_structure_file(
-        dash_upload_string_contents=dash_upload_string_contents, filename=filename, last_modified=last_modified
-    )
+    result = on_upload_structure_file(uploaded_file=uploaded_file)
     return result
 
 
@@ -52,8 +53,8 @@ def run_callback_on_submit_experiment(
     mutagenesis_method,
     experiment_doi,
     additional_info,
-    geometry_content_base64_encoded_string,
-    experiment_content_base64_encoded_string,
+    structure_upload_id,
+    experiment_staging_token,
 ):
     """Helper function to run the on_submit_experiment callback in isolation."""
     from levseq_dash.app.main_app import on_submit_experiment
@@ -76,106 +77,194 @@ def run_callback_on_submit_experiment(
         mutagenesis_method=mutagenesis_method,
         experiment_doi=experiment_doi,
         experiment_additional_info=additional_info,
-        geometry_content_base64_encoded_string=geometry_content_base64_encoded_string,
-        experiment_content_base64_encoded_string=experiment_content_base64_encoded_string,
+        structure_upload_id=structure_upload_id,
+        experiment_staging_token=experiment_staging_token,
     )
     return result
 
 
-def read_file_for_upload(path_exp_ep_data):
-    csv_file_path = path_exp_ep_data[0]
-    cif_file_path = path_exp_ep_data[1]
+def upload_file_in_chunks(file_path, chunk_size=64 * 1024):
+    """Uploads a file in chunks as assets/chunkedUpload.js does and returns the data the store is set to."""
+    from levseq_dash.app.main_app import server
 
-    with open(csv_file_path, "rb") as f:
-        csv_content = f.read()
-    with open(cif_file_path, "rb") as f:
-        cif_content = f.read()
+    file_bytes = file_path.read_bytes()
+    client = server.test_client()
+    response = client.post(gs.file_uploads_path, json={"filename": file_path.name, "size": len(file_bytes)})
+    assert response.status_code == 201
+    upload_id = response.get_json()["upload_id"]
 
-    # Create the dash upload format: "data:text/csv;base64,{base64_content}"
-    csv_base64 = base64.b64encode(csv_content).decode("utf-8")
-    cif_base64 = base64.b64encode(cif_content).decode("utf-8")
+    for offset in range(0, len(file_bytes), chunk_size):
+        response = client.patch(
+            f"{gs.file_uploads_path}/{upload_id}",
+            data=file_bytes[offset : offset + chunk_size],
+            headers={"Upload-Offset": str(offset)},
+        )
+        assert response.status_code == 200
+    assert response.get_json()["offset"] == len(file_bytes)
 
-    return [csv_base64, cif_base64]
+    return {"upload_id": upload_id, "filename": file_path.name}
 
 
-def test_callback_on_upload_experiment_file_alert(mocker, path_exp_ep_data, tmp_path, load_config_mock_string):
-    """Test the on_upload_experiment_file callback with timing."""
-    import dash_bootstrap_components as dbc
+def upload_experiment(path_exp_ep_data, experiment_name="Test Experiment"):
+    """Uploads the experiment and structure files and submits the experiment, returns the callback result."""
+    ctx = copy_context()
+    _, staging_token = ctx.run(run_callback_on_upload_experiment_file, upload_file_in_chunks(path_exp_ep_data[0]))
+    ctx = copy_context()
+    _, structure_upload_id = ctx.run(run_callback_on_upload_structure_file, upload_file_in_chunks(path_exp_ep_data[1]))
 
-    # Mock the data manager configuration
-    mock = mocker.patch(load_config_mock_string)
-    mock.return_value = {
-        "deployment-mode": "local-instance",
-        "storage-mode": "disk",
-        "disk": {"local-data-path": str(tmp_path)},
-    }
+    ctx = copy_context()
+    return ctx.run(
+        run_callback_on_submit_experiment,
+        1,  # n_clicks (> 0 to trigger submission)
+        experiment_name,
+        "2024-01-01",
+        "CC(C)CC1=CC=C(C=C1)C(C)C(=O)O",
+        "C1=CC=C(C=C1)C=O",
+        "Fluorescence Assay",
+        MutagenesisMethod.epPCR,
+        "10.5281/zenodo.15203754",
+        "This is a test experiment for testing.",
+        structure_upload_id,
+        staging_token,
+    )
 
-    base64_contents = read_file_for_upload(path_exp_ep_data)
-    dash_upload_contents_incorrect = f"{base64_contents[0]}"
 
-    # Time the upload callback execution
+@pytest.mark.parametrize(
+    "uploaded_file",
+    [
+        {"filename": "experiment.csv", "error": "The upload failed (500)."},
+        {"upload_id": "not-an-upload", "filename": "experiment.csv"},
+        {"upload_id": "0" * 32, "filename": "experiment.csv"},
+    ],
+)
+def test_callback_on_upload_experiment_file_alert(disk_manager_from_temp_data, upload_staging_path, uploaded_file):
+    """A failed or unknown upload shows an alert."""
+    import dash_bootstrap_components as dbc
+
     ctx = copy_context()
-    result = ctx.run(run_callback_on_upload_experiment_file, dash_upload_contents_incorrect, "random test name", "time")
+    result = ctx.run(run_callback_on_upload_experiment_file, uploaded_file)
 
     assert result is not None
     assert isinstance(result[0], dbc.Alert)
+    assert result[1] is no_update
 
 
-def test_callback_on_upload_experiment_file(mocker, path_exp_ep_data, disk_manager_from_temp_data):
+def test_callback_on_upload_experiment_file(mocker, path_exp_ep_data, disk_manager_from_temp_data, upload_staging_path):
     """Test the on_upload_experiment_file callback with timing."""
 
     mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_temp_data)
 
-    base64_contents = read_file_for_upload(path_exp_ep_data)
-    dash_upload_contents = f"data:text/csv;base64,{base64_contents[0]}"
+    uploaded_file = upload_file_in_chunks(path_exp_ep_data[0])
 
     # Time the upload callback execution
     ctx = copy_context()
     start_time = time.time()
-    result = ctx.run(run_callback_on_upload_experiment_file, dash_upload_contents, "filename", "time")
+    result = ctx.run(run_callback_on_upload_experiment_file, uploaded_file)
     execution_time = time.time() - start_time
 
     # Verify the callback succeeded
     assert result is not None
-    assert len(result) == 2  # Should return (info, base64_encoded_string)
-    assert result[1] is not None  # base64_encoded_string should not be None
+    assert len(result) == 2  # Should return (info, staging_token)
+    # the file is staged on the server, the browser only keeps its token
+    file_info, csv_bytes, core_data_df = upload_staging.load_staged_experiment_file(result[1])
+    assert file_info["csv_checksum"] == BaseDataManager.calculate_file_checksum(path_exp_ep_data[0].read_bytes())
+    assert file_info["plates_count"] > 0
+    assert csv_bytes == pd.read_csv(path_exp_ep_data[0]).to_csv(index=False).encode("utf-8")
+    pd.testing.assert_frame_equal(core_data_df, utils.read_experiment_core_data(path_exp_ep_data[0]))
+    # the uploaded file itself is removed once it is staged
+    assert sorted(path.suffix for path in upload_staging_path.iterdir()) == [".csv", ".json", ".parquet"]
 
     TIME_RESULTS.append((f"on_upload_experiment_file", execution_time))
 
 
+def test_callback_on_upload_experiment_file_parses_once(
+    mocker, path_exp_ep_data, disk_manager_from_temp_data, upload_staging_path
+):
+    """The uploaded file is only parsed by the upload callback, not again for its content hash or at submit."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_temp_data)
+    read_csv_spy = mocker.spy(pd, "read_csv")
+
+    ctx = copy_context()
+    _, staging_token = ctx.run(run_callback_on_upload_experiment_file, upload_file_in_chunks(path_exp_ep_data[0]))
+    assert read_csv_spy.call_count == 1
+
+    ctx = copy_context()
+    _, structure_upload_id = ctx.run(run_callback_on_upload_structure_file, upload_file_in_chunks(path_exp_ep_data[1]))
+    ctx = copy_context()
+    result = ctx.run(
+        run_callback_on_submit_experiment,
+        1,
+        "Staged Experiment",
+        "2024-01-01",
+        "CCO",
+        "CCO",
+        "Fluorescence Assay",
+        MutagenesisMethod.epPCR,
+        "",
+        "",
+        structure_upload_id,
+        staging_token,
+    )
+
+    # the derived data is written from the staged core data
+    assert read_csv_spy.call_count == 1
+
+    experiment_id = result[3]
+    assert disk_manager_from_temp_data.get_experiment_metadata(experiment_id)["experiment_name"] == "Staged Experiment"
+    exp = disk_manager_from_temp_data.get_experiment(experiment_id)
+    assert exp.geometry_base64_bytes == path_exp_ep_data[1].read_bytes()
+    # the staged and uploaded files are removed once the experiment is added
+    assert list(upload_staging_path.iterdir()) == []
+
+
+def test_on_submit_experiment_with_expired_staging_token(
+    mocker, path_exp_ep_data, disk_manager_from_temp_data, upload_staging_path
+):
+    """Submitting with a token whose staged file doesn't exist shows an error and doesn't redirect."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_temp_data)
+    structure_upload_id = upload_file_in_chunks(path_exp_ep_data[1])["upload_id"]
+
+    ctx = copy_context()
+    result = ctx.run(
+        run_callback_on_submit_experiment,
+        1,
+        "name",
+        "2024-01-01",
+        "CCO",
+        "CCO",
+        "assay",
+        "epPCR",
+        "",
+        "",
+        structure_upload_id,
+        "0" * 32,
+    )
+    assert "has expired" in str(result[0])
+    assert result[3] is no_update
+
+
 def test_callback_on_upload_experiment_file_empty(path_exp_ep_data, tmp_path):
     """Test the on_upload_experiment_file callback with timing."""
     ctx = copy_context()
-    result = ctx.run(run_callback_on_upload_experiment_file, None, "randon", "time")
+    result = ctx.run(run_callback_on_upload_experiment_file, None)
     assert result is not None
 
 
-def test_callback_on_upload_structure_file(mocker, path_exp_ep_data, tmp_path, load_config_mock_string):
+def test_callback_on_upload_structure_file(path_exp_ep_data, disk_manager_from_temp_data, upload_staging_path):
     """Test the on_upload_structure_file callback with timing."""
-
-    # Mock the data manager configuration
-    mock = mocker.patch(load_config_mock_string)
-    mock.return_value = {
-        "deployment-mode": "local-instance",
-        "storage-mode": "disk",
-        "disk": {"local-data-path": str(tmp_path)},
-    }
-
-    # Read the test CIF file and encode it for upload
-    base64_contents = read_file_for_upload(path_exp_ep_data)
-    cif_base64 = base64_contents[1]
-    dash_upload_contents = f"data:application/octet-stream;base64,{cif_base64}"
+    uploaded_file = upload_file_in_chunks(path_exp_ep_data[1])
 
     # Time the upload callback execution
     ctx = copy_context()
     start_time = time.time()
-    result = ctx.run(run_callback_on_upload_structure_file, dash_upload_contents, "filename", "last_modified")
+    result = ctx.run(run_callback_on_upload_structure_file, uploaded_file)
     execution_time = time.time() - start_time
 
     # Verify the callback succeeded
     assert result is not None
-    assert len(result) == 2  # Should return (info, base64_encoded_string)
-    assert result[1] is not None  # base64_encoded_string should not be None
+    assert len(result) == 2  # Should return (info, upload_id)
+    # the structure file stays on the server until the experiment is submitted
+    assert result[1] == uploaded_file["upload_id"]
 
     # Verify the info contains the filename
     info = result[0]
@@ -188,71 +277,78 @@ def test_callback_on_upload_structure_file(mocker, path_exp_ep_data, tmp_path, l
 def test_callback_on_upload_structure_file_empty(mocker, path_exp_ep_data, tmp_path):
     """Test the on_upload_experiment_file callback with timing."""
     ctx = copy_context()
-    result = ctx.run(run_callback_on_upload_structure_file, None, "randon", "time")
+    result = ctx.run(run_callback_on_upload_structure_file, None)
     assert result is not None
 
 
-def test_callback_on_upload_structure_file_alert(mocker, path_exp_ep_data, tmp_path, load_config_mock_string):
-    """Test the on_upload_structure_file callback with timing."""
+def test_callback_on_upload_structure_file_alert(upload_staging_path):
+    """A failed upload of the structure file shows an alert."""
     import dash_bootstrap_components as dbc
 
-    # Mock the data manager configuration
-    mock = mocker.patch(load_config_mock_string)
-    mock.return_value = {
-        "deployment-mode": "local-instance",
-        "storage-mode": "disk",
-        "disk": {"local-data-path": str(tmp_path)},
-    }
-
-    # Read the test CIF file and encode it for upload
-    base64_contents = read_file_for_upload(path_exp_ep_data)
-    cif_base64 = base64_contents[1]
-    dash_upload_contents_with_error = f"{cif_base64}"
-
-    # Time the upload callback execution
     ctx = copy_context()
-    result = ctx.run(
-        run_callback_on_upload_structure_file, dash_upload_contents_with_error, "filename", "last_modified"
-    )
+    result = ctx.run(run_callback_on_upload_structure_file, {"filename": "structure.cif", "error": "failed"})
     assert result is not None
     assert isinstance(result[0], dbc.Alert)
 
 
-def test_on_submit_experiment_performance(mocker, path_exp_ep_data, disk_manager_from_temp_data):
+def test_file_upload_routes(path_exp_ep_data, disk_manager_from_temp_data, upload_staging_path):
+    """A chunk is only appended at the offset the upload continues at, which is returned for resuming it."""
+    from levseq_dash.app.main_app import server
+
+    client = server.test_client()
+    file_bytes = path_exp_ep_data[1].read_bytes()
+    upload_id = client.post(
+        gs.file_uploads_path, json={"filename": "structure.cif", "size": len(file_bytes)}
+    ).get_json()["upload_id"]
+    upload_path = f"{gs.file_uploads_path}/{upload_id}"
+
+    response = client.patch(upload_path, data=file_bytes[:1000], headers={"Upload-Offset": "0"})
+    assert response.get_json() == {"offset": 1000}
+
+    # the response of the first chunk was lost, the chunk is sent again
+    response = client.patch(upload_path, data=file_bytes[:1000], headers={"Upload-Offset": "0"})
+    assert response.status_code == 409
+    assert response.get_json()["offset"] == 1000
+
+    assert client.get(upload_path).get_json() == {"offset": 1000, "size": len(file_bytes)}
+    response = client.patch(upload_path, data=file_bytes[1000:], headers={"Upload-Offset": "1000"})
+    assert response.get_json() == {"offset": len(file_bytes)}
+
+    _, filename, checksum = upload_staging.get_completed_file_upload(upload_id)
+    assert filename == "structure.cif"
+    assert checksum == BaseDataManager.calculate_file_checksum(file_bytes)
+
+    # chunks past the end of the file, without an offset, and unknown uploads
+    assert client.patch(upload_path, data=b"x", headers={"Upload-Offset": str(len(file_bytes))}).status_code == 400
+    assert client.patch(upload_path, data=b"x").status_code == 400
+    assert client.get(f"{gs.file_uploads_path}/{'0' * 32}").status_code == 404
+    assert client.post(gs.file_uploads_path, json={"filename": "empty.csv", "size": 0}).status_code == 400
+    response = client.post(gs.file_uploads_path, json={"filename": "large.csv", "size": 10**12})
+    assert response.status_code == 400
+    assert "maximum upload size" in response.get_json()["error"]
+
+
+def test_file_upload_routes_without_data_modification(mock_load_config_from_test_data_path, upload_staging_path):
+    from levseq_dash.app.main_app import server
+
+    client = server.test_client()
+    assert client.post(gs.file_uploads_path, json={"filename": "experiment.csv", "size": 10}).status_code == 403
+    assert (
+        client.patch(f"{gs.file_uploads_path}/{'0' * 32}", data=b"x", headers={"Upload-Offset": "0"}).status_code == 403
+    )
+
+
+def test_on_submit_experiment_performance(mocker, path_exp_ep_data, disk_manager_from_temp_data, upload_staging_path):
     """Test on_submit_experiment functionality with timing."""
 
     # Mock the singleton data manager to use our temp data manager
     mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_temp_data)
 
-    base64_contents = read_file_for_upload(path_exp_ep_data)
-
-    # Set up experiment parameters
     experiment_name = "Test Experiment"
-    experiment_date = "2024-01-01"
-    substrate = "CC(C)CC1=CC=C(C=C1)C(C)C(=O)O"
-    product = "C1=CC=C(C=C1)C=O"
-    assay = "Fluorescence Assay"
-    mutagenesis_method = MutagenesisMethod.epPCR
-    experiment_doi = "10.5281/zenodo.15203754"
-    additional_info = "This is a test experiment for testing."
-
-    # Time the on_submit_experiment execution
-    ctx = copy_context()
+
+    # Time the upload and the on_submit_experiment execution
     start_time = time.time()
-    result = ctx.run(
-        run_callback_on_submit_experiment,
-        1,  # n_clicks (> 0 to trigger submission)
-        experiment_name,
-        experiment_date,
-        substrate,
-        product,
-        assay,
-        mutagenesis_method,
-        experiment_doi,
-        additional_info,
-        base64_contents[1],  # geometry (CIF)
-        base64_contents[0],  # experiment CSV
-    )
+    result = upload_experiment(path_exp_ep_data, experiment_name=experiment_name)
     execution_time = time.time() - start_time
 
     # Verify the callback succeeded
@@ -1,3 +1,4 @@
+import time
 from contextvars import copy_context
 
 import pytest
@@ -7,7 +8,8 @@ from dash._utils import AttributeDict
 from dash.exceptions import PreventUpdate
 
 from levseq_dash.app import global_strings as gs
-from levseq_dash.app.components import graphs
+from levseq_dash.app.components import vis
+from levseq_dash.app.utils import utils
 
 
 def run_callback_route_page(pathname):
@@ -167,8 +169,9 @@ def run_callback_on_download_selected_experiments(selected_rows):
     return on_download_selected_experiments(n_clicks=1, selected_rows=selected_rows)
 
 
-def test_callback_on_download_selected_experiments(disk_manager_from_test_data):
-    """Test downloading selected experiments."""
+def test_callback_on_download_selected_experiments(mocker, disk_manager_from_test_data):
+    """Test that downloading selected experiments reports their number and size."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
     selected_rows = [
         {
             "experiment_id": "flatten_ep_processed_xy_cas",
@@ -178,10 +181,9 @@ def test_callback_on_download_selected_experiments(disk_manager_from_test_data):
     ctx = copy_context()
     output = ctx.run(run_callback_on_download_selected_experiments, selected_rows)
 
-    assert output is not None
-    assert output["content"] is not None
-    assert "EnzEngDB_Experiments_" in output["filename"]
-    assert output["filename"].endswith(".zip")
+    files_size = disk_manager_from_test_data.get_experiment_files_size("flatten_ep_processed_xy_cas")
+    assert files_size > 0
+    assert output.children == f"Downloading 1 experiment(s), {files_size / (1024 * 1024):.1f} MB."
 
 
 @pytest.mark.parametrize(
@@ -198,6 +200,80 @@ def test_callback_on_download_selected_experiments_no_selection(disk_manager_fro
         ctx.run(run_callback_on_download_selected_experiments, selected_rows)
 
 
+@pytest.mark.parametrize(
+    "selected_rows, expected",
+    [
+        (None, ""),
+        ([{"experiment_id": "a"}], "a"),
+        ([{"experiment_id": "a"}, {"experiment_id": "b"}], "a,b"),
+    ],
+)
+def test_callback_update_download_experiment_ids(selected_rows, expected, mock_load_config_from_test_data_path):
+    from levseq_dash.app.main_app import update_download_experiment_ids
+
+    assert update_download_experiment_ids(selected_rows) == expected
+
+
+def test_export_experiments_zip(mocker, disk_manager_from_test_data):
+    """Test that the export endpoint streams the ZIP file of the posted experiments."""
+    import io
+    import zipfile
+
+    from levseq_dash.app.main_app import server
+
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
+    experiment_id = "flatten_ep_processed_xy_cas"
+
+    response = server.test_client().post(
+        gs.experiments_zip_export_path, data={"experiment_ids": f"{experiment_id},unknown,{experiment_id}"}
+    )
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "application/zip"
+    assert 'filename="EnzEngDB_Experiments_' in response.headers["Content-Disposition"]
+    # the browser shows the progress of the download from the computed size of the archive
+    assert response.content_length == len(response.data)
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zipf:
+        assert zipf.namelist() == [
+            "EnzEngDB_Experiments.csv",
+            f"experiments/{experiment_id}/{experiment_id}.json",
+            f"experiments/{experiment_id}/{experiment_id}.csv",
+            f"experiments/{experiment_id}/{experiment_id}.cif",
+        ]
+
+
+@pytest.mark.parametrize("experiment_ids", ["", "unknown"])
+def test_export_experiments_zip_not_found(mocker, disk_manager_from_test_data, experiment_ids):
+    from levseq_dash.app.main_app import server
+
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
+
+    response = server.test_client().post(gs.experiments_zip_export_path, data={"experiment_ids": experiment_ids})
+    assert response.status_code == 404
+
+
+def test_get_alignment_queue_metrics(mocker):
+    from levseq_dash.app.main_app import server
+    from levseq_dash.app.sequence_aligner import alignment_admission
+
+    mocker.patch("levseq_dash.app.config.settings.is_alignment_queue_metrics_enabled", return_value=True)
+    mocker.patch("levseq_dash.app.config.settings.get_max_concurrent_alignments", return_value=2)
+
+    with alignment_admission.alignment_slot(2):
+        response = server.test_client().get(gs.alignment_queue_metrics_path)
+    assert response.get_json() == {"max_concurrent_alignments": 2, "running_tasks": 1, "waiting_tasks": 0}
+
+
+def test_get_alignment_queue_metrics_disabled(mocker):
+    from levseq_dash.app.main_app import server
+
+    mocker.patch("levseq_dash.app.config.settings.is_alignment_queue_metrics_enabled", return_value=False)
+
+    response = server.test_client().get(gs.alignment_queue_metrics_path)
+    assert response.status_code == 404
+
+
 # ------------------------------------------------
 def run_callback_redirect_to_experiment_page_after_upload(experiment_id):
     from levseq_dash.app.main_app import redirect_to_experiment_page_after_upload
@@ -228,27 +304,38 @@ def test_callback_redirect_to_experiment_page_after_upload_none(disk_manager_fro
 
 
 # ------------------------------------------------
-def run_callback_on_button_run_seq_matching(results_are_cleared):
+def run_callback_on_button_run_seq_matching(n_clicks):
     from levseq_dash.app.main_app import on_button_run_seq_matching
 
     context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-button-run-seq-matching.n_clicks"}]}))
-    return on_button_run_seq_matching(n_clicks=1, results_are_cleared=results_are_cleared)
+    return on_button_run_seq_matching(n_clicks=n_clicks)
 
 
-def test_callback_on_button_run_seq_matching(mock_load_config_from_test_data_path):
+@pytest.mark.parametrize("background_jobs, results_style", [(False, vis.display_none), (True, vis.display_block)])
+def test_callback_on_button_run_seq_matching(
+    mocker, mock_load_config_from_test_data_path, background_jobs, results_style
+):
     """Test on_button_run_seq_matching callback."""
+    mocker.patch("levseq_dash.app.config.settings.is_background_jobs_enabled", return_value=background_jobs)
     ctx = copy_context()
-    output = ctx.run(run_callback_on_button_run_seq_matching, False)
-    assert len(output) == 3
+    output = ctx.run(run_callback_on_button_run_seq_matching, 1)
+    assert len(output) == 5
     assert output[0] == []  # Clear alert
-    assert output[2] is True  # Set flag to true
+    # a background search shows the matches while they are gathered
+    assert output[1] == results_style
+    assert output[2] == [] and output[3] == []  # Clear the results
+    assert output[4] == 1  # Set flag to true
+
+    # clicking again while a background search runs, before the flag was reset, runs the search again
+    output = ctx.run(run_callback_on_button_run_seq_matching, 2)
+    assert output[4] == 2
 
 
-def test_callback_on_button_run_seq_matching_already_cleared(mock_load_config_from_test_data_path):
-    """Test on_button_run_seq_matching when already cleared."""
+def test_callback_on_button_run_seq_matching_not_clicked(mock_load_config_from_test_data_path):
+    """Test on_button_run_seq_matching when the button was not clicked."""
     ctx = copy_context()
     with pytest.raises(PreventUpdate):
-        ctx.run(run_callback_on_button_run_seq_matching, True)
+        ctx.run(run_callback_on_button_run_seq_matching, 0)
 
 
 # ------------------------------------------------
@@ -347,7 +434,76 @@ def test_callback_toggle_sidebar_collapse(mock_load_config_from_test_data_path,
 
 
 # ------------------------------------------------
-def run_callback_update_heatmap(selected_plate, selected_smiles, selected_stat_property, rowData, store_data):
+def run_callback_on_request_top_variants_rows(get_rows_request, experiment_id):
+    from levseq_dash.app.main_app import on_request_top_variants_rows
+
+    context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-table-exp-top-variants.getRowsRequest"}]}))
+    return on_request_top_variants_rows(get_rows_request=get_rows_request, experiment_id=experiment_id)
+
+
+def test_callback_on_request_top_variants_rows(mocker, disk_manager_from_test_data):
+    """Test on_request_top_variants_rows sends one filtered and sorted block of rows."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
+    experiment_id = "flatten_ep_processed_xy_cas"
+    get_rows_request = {
+        "startRow": 0,
+        "endRow": 100,
+        "sortModel": [{"colId": gs.c_fitness_value, "sort": "desc"}],
+        "filterModel": {gs.c_substitutions: {"filterType": "text", "type": "notEqual", "filter": gs.hashtag_parent}},
+    }
+
+    ctx = copy_context()
+    output = ctx.run(run_callback_on_request_top_variants_rows, get_rows_request, experiment_id)
+
+    df = disk_manager_from_test_data.get_experiment_top_variants(experiment_id)
+    expected = df[df[gs.c_substitutions] != gs.hashtag_parent]
+    assert output["rowCount"] == len(expected)
+    assert len(output["rowData"]) == 100
+    assert output["rowData"][0][gs.c_fitness_value] == expected[gs.c_fitness_value].max()
+    assert all(row[gs.c_substitutions] != gs.hashtag_parent for row in output["rowData"])
+
+
+@pytest.mark.parametrize(
+    "filter_model",
+    [
+        {gs.c_substitutions: {"filterType": "text", "type": "regex", "filter": "A"}},
+        {gs.c_substitutions: {"filterType": "set", "values": ["A"]}},
+        {"unknown": {"filterType": "text", "type": "equals", "filter": "A"}},
+    ],
+)
+def test_callback_on_request_top_variants_rows_unsupported_filter(mocker, disk_manager_from_test_data, filter_model):
+    """Test on_request_top_variants_rows sends an empty block for a filter it can't apply."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
+    log_spy = mocker.spy(utils, "log_with_context")
+    get_rows_request = {"startRow": 0, "endRow": 100, "filterModel": filter_model}
+
+    ctx = copy_context()
+    output = ctx.run(run_callback_on_request_top_variants_rows, get_rows_request, "flatten_ep_processed_xy_cas")
+
+    assert output == {"rowData": [], "rowCount": 0}
+    # the request is logged with the data manager logging
+    assert "can't be applied" in log_spy.call_args.args[0]
+
+
+@pytest.mark.parametrize(
+    "get_rows_request, experiment_id",
+    [
+        (None, "flatten_ep_processed_xy_cas"),
+        ({"startRow": 0, "endRow": 100}, None),
+    ],
+)
+def test_callback_on_request_top_variants_rows_prevent_update(
+    mocker, disk_manager_from_test_data, get_rows_request, experiment_id
+):
+    """Test on_request_top_variants_rows without a request or an experiment."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
+    ctx = copy_context()
+    with pytest.raises(PreventUpdate):
+        ctx.run(run_callback_on_request_top_variants_rows, get_rows_request, experiment_id)
+
+
+# ------------------------------------------------
+def run_callback_update_heatmap(selected_plate, selected_smiles, selected_stat_property, experiment_id, store_data):
     from levseq_dash.app.main_app import update_heatmap
 
     context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-list-plates.value"}]}))
@@ -355,7 +511,7 @@ def run_callback_update_heatmap(selected_plate, selected_smiles, selected_stat_p
         selected_plate=selected_plate,
         selected_smiles=selected_smiles,
         selected_stat_property=selected_stat_property,
-        rowData=rowData,
+        experiment_id=experiment_id,
         store_data=store_data,
     )
 
@@ -368,10 +524,9 @@ def run_callback_update_heatmap(selected_plate, selected_smiles, selected_stat_p
         (1, 0, 0),  # different plate selected
     ],
 )
-def test_callback_update_heatmap(disk_manager_from_test_data, experiment_ep_pcr, plate, smiles, sel_property):
+def test_callback_update_heatmap(mocker, disk_manager_from_test_data, experiment_ep_pcr, plate, smiles, sel_property):
     """Test update_heatmap callback."""
-
-    rowData = experiment_ep_pcr.data_df.to_dict("records")
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
     store_data = {
         "heatmap": {
             "plate": experiment_ep_pcr.plates[0],
@@ -390,7 +545,7 @@ def test_callback_update_heatmap(disk_manager_from_test_data, experiment_ep_pcr,
         new_plate,
         new_smiles,
         new_property,
-        rowData,
+        "flatten_ep_processed_xy_cas",
         store_data,
     )
     assert len(output) == 4
@@ -400,12 +555,15 @@ def test_callback_update_heatmap(disk_manager_from_test_data, experiment_ep_pcr,
 
 
 # ------------------------------------------------
-def run_callback_update_rank_plot(selected_plate, selected_smiles, rowData, store_data):
+def run_callback_update_rank_plot(selected_plate, selected_smiles, experiment_id, store_data):
     from levseq_dash.app.main_app import update_rank_plot
 
     context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-list-plates-ranking-plot.value"}]}))
     return update_rank_plot(
-        selected_plate=selected_plate, selected_smiles=selected_smiles, rowData=rowData, store_data=store_data
+        selected_plate=selected_plate,
+        selected_smiles=selected_smiles,
+        experiment_id=experiment_id,
+        store_data=store_data,
     )
 
 
@@ -413,9 +571,9 @@ def run_callback_update_rank_plot(selected_plate, selected_smiles, rowData, stor
     "plate, smiles",
     [(0, 1), (1, 0), (1, 1)],
 )
-def test_callback_update_rank_plot(disk_manager_from_test_data, experiment_ep_pcr, plate, smiles):
+def test_callback_update_rank_plot(mocker, disk_manager_from_test_data, experiment_ep_pcr, plate, smiles):
     """Test update_rank_plot callback."""
-    rowData = experiment_ep_pcr.data_df.to_dict("records")
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
 
     store_data = {
         "rank_plot": {
@@ -428,7 +586,7 @@ def test_callback_update_rank_plot(disk_manager_from_test_data, experiment_ep_pc
     new_smiles = experiment_ep_pcr.unique_smiles_in_data[smiles]
 
     ctx = copy_context()
-    output = ctx.run(run_callback_update_rank_plot, new_plate, new_smiles, rowData, store_data)
+    output = ctx.run(run_callback_update_rank_plot, new_plate, new_smiles, "flatten_ep_processed_xy_cas", store_data)
 
     assert len(output) == 2
     assert output[0] is not None  # Figure
@@ -437,12 +595,15 @@ def test_callback_update_rank_plot(disk_manager_from_test_data, experiment_ep_pc
 
 
 # ------------------------------------------------
-def run_callback_update_ssm_plot(selected_residue, selected_smiles, rowData, store_data):
+def run_callback_update_ssm_plot(selected_residue, selected_smiles, experiment_id, store_data):
     from levseq_dash.app.main_app import update_ssm_plot
 
     context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-list-ssm-residue-positions.value"}]}))
     return update_ssm_plot(
-        selected_residue=selected_residue, selected_smiles=selected_smiles, rowData=rowData, store_data=store_data
+        selected_residue=selected_residue,
+        selected_smiles=selected_smiles,
+        experiment_id=experiment_id,
+        store_data=store_data,
     )
 
 
@@ -450,13 +611,13 @@ def run_callback_update_ssm_plot(selected_residue, selected_smiles, rowData, sto
     "residue",
     [1, 2, 3, 4],
 )
-def test_callback_update_ssm_plot(disk_manager_from_test_data, experiment_ssm, residue):
+def test_callback_update_ssm_plot(mocker, disk_manager_from_test_data, experiment_ssm, residue):
     """Test update_ssm_plot callback."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
 
     df = experiment_ssm.data_df
-    rowData = df.to_dict("records")
 
-    list_ssm_positions = graphs.extract_single_site_mutations(df)
+    list_ssm_positions = utils.extract_single_site_mutations(df)
 
     store_data = {"ssm_plot": {"residue": list_ssm_positions[0], "smiles": experiment_ssm.unique_smiles_in_data[0]}}
 
@@ -464,7 +625,11 @@ def test_callback_update_ssm_plot(disk_manager_from_test_data, experiment_ssm, r
 
     ctx = copy_context()
     output = ctx.run(
-        run_callback_update_ssm_plot, new_residue, experiment_ssm.unique_smiles_in_data[0], rowData, store_data
+        run_callback_update_ssm_plot,
+        new_residue,
+        experiment_ssm.unique_smiles_in_data[0],
+        "flatten_ssm_processed_xy_cas",
+        store_data,
     )
 
     assert len(output) == 2
@@ -474,11 +639,14 @@ def test_callback_update_ssm_plot(disk_manager_from_test_data, experiment_ssm, r
 
 
 # ------------------------------------------------
-def run_callback_on_load_matching_sequences(query_sequence, threshold, n_top_hot_cold):
+def run_callback_on_load_matching_sequences(query_sequence, threshold, n_top_hot_cold, set_progress=None):
     from levseq_dash.app.main_app import on_load_matching_sequences
 
-    context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-cleared-run-seq-matching.data"}]}))
+    context_value.set(
+        AttributeDict(**{"triggered_inputs": [{"prop_id": "id-cleared-run-seq-matching.data"}], "updated_props": {}})
+    )
     return on_load_matching_sequences(
+        set_progress=set_progress,
         results_are_cleared=True,
         n_clicks=1,
         query_sequence=query_sequence,
@@ -501,6 +669,89 @@ def test_callback_on_load_matching_sequences(disk_manager_from_app_data):
     # assert len(output[1]) == 240
 
 
+def test_callback_on_load_matching_sequences_kmer_candidates(mocker, disk_manager_from_app_data):
+    exhaustive_output = copy_context().run(
+        run_callback_on_load_matching_sequences,
+        gs.seq_align_form_input_sequence_default,
+        0.8,
+        5,
+    )
+
+    mocker.patch("levseq_dash.app.config.settings.is_exhaustive_sequence_search_enabled", return_value=False)
+    spy = mocker.spy(disk_manager_from_app_data.__class__, "get_candidate_lab_sequences")
+    candidates_output = copy_context().run(
+        run_callback_on_load_matching_sequences,
+        gs.seq_align_form_input_sequence_default,
+        0.8,
+        5,
+    )
+
+    assert spy.call_count == 1
+    assert len(exhaustive_output[0]) > 0
+    # pruning the lab sequences with the k-mer index must not lose any match
+    assert len(candidates_output[0]) == len(exhaustive_output[0])
+    assert {row[gs.cc_experiment_id] for row in candidates_output[0]} == {
+        row[gs.cc_experiment_id] for row in exhaustive_output[0]
+    }
+
+
+def test_callback_on_load_matching_sequences_background_progress(mocker, disk_manager_from_app_data):
+    """A background search reports the aligned sequences and shows the matches gathered so far."""
+    mocker.patch("levseq_dash.app.main_app.partial_results_interval_seconds", 0)
+    set_progress = mocker.Mock()
+
+    def run_search():
+        output = run_callback_on_load_matching_sequences(gs.seq_align_form_input_sequence_default, 0.8, 5, set_progress)
+        return output, context_value.get().updated_props
+
+    output, updated_props = copy_context().run(run_search)
+
+    n_matches = len({row[gs.cc_experiment_id] for row in output[0]})
+    progress = [call.args[0] for call in set_progress.call_args_list]
+    alignment_progress = [p for p in progress if p[2] == gs.search_progress_aligning.format(p[0], p[1])]
+    assert alignment_progress[0][0] == 0
+    assert alignment_progress[-1][0] == alignment_progress[-1][1]
+    assert progress[-1] == (n_matches, n_matches, gs.search_progress_gathering.format(n_matches, n_matches))
+    # the last partial results are all the matches
+    assert updated_props["id-table-matched-sequences"]["rowData"] == output[0]
+
+
+def test_callback_on_load_matching_sequences_background_job(tmp_path, disk_manager_from_app_data):
+    """A search run through the background manager aligns in the persistent aligner pool of the worker."""
+    diskcache = pytest.importorskip("diskcache")
+    pytest.importorskip("multiprocess")
+    pytest.importorskip("psutil")
+    from levseq_dash.app.main_app import AlignerServiceDiskcacheManager, on_load_matching_sequences
+    from levseq_dash.app.sequence_aligner import bio_python_pairwise_aligner
+
+    bio_python_pairwise_aligner.shutdown_aligner_pool()
+    manager = AlignerServiceDiskcacheManager(diskcache.Cache(tmp_path / "background_jobs"))
+    job_fn = manager.make_job_fn(on_load_matching_sequences, progress=True)
+    callback_args = {
+        "results_are_cleared": True,
+        "n_clicks": 1,
+        "query_sequence": gs.seq_align_form_input_sequence_default,
+        "threshold": 0.8,
+        "n_top_hot_cold": 5,
+    }
+    context = {"triggered_inputs": [{"prop_id": "id-cleared-run-seq-matching.data"}]}
+
+    try:
+        job = manager.call_job_fn("search-result", job_fn, callback_args, context)
+        for _ in range(600):
+            if manager.result_ready("search-result"):
+                break
+            time.sleep(0.1)
+        output = manager.get_result("search-result", job)
+    finally:
+        bio_python_pairwise_aligner.stop_aligner_service()
+
+    assert len(output) == 7
+    assert len(output[0]) > 0
+    # the job submitted its chunks to the pool of this process instead of starting one of its own
+    assert bio_python_pairwise_aligner._aligner_pool is not None
+
+
 # ------------------------------------------------
 def run_callback_display_default_selected_matching_sequences(data):
     from levseq_dash.app.main_app import display_default_selected_matching_sequences
@@ -564,11 +815,18 @@ def test_callback_display_selected_matching_sequences_none(mock_load_config_from
 
 
 # ------------------------------------------------
-def run_callback_on_load_exp_related_variants(query_sequence, threshold, lookup_residues, experiment_id):
+def run_callback_on_load_exp_related_variants(
+    query_sequence, threshold, lookup_residues, experiment_id, set_progress=None
+):
     from levseq_dash.app.main_app import on_load_exp_related_variants
 
-    context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-cleared-run-exp-related-variants.data"}]}))
+    context_value.set(
+        AttributeDict(
+            **{"triggered_inputs": [{"prop_id": "id-cleared-run-exp-related-variants.data"}], "updated_props": {}}
+        )
+    )
     return on_load_exp_related_variants(
+        set_progress=set_progress,
         results_are_cleared=True,
         n_clicks=1,
         query_sequence=query_sequence,
@@ -606,12 +864,28 @@ def test_callback_on_load_exp_related_variants(disk_manager_from_app_data, mocke
     assert output[6] is False  # cleared flag reset
 
 
+def test_callback_on_load_exp_related_variants_error_hides_results(disk_manager_from_app_data, mocker):
+    """A failed search hides the results, a background search showed them while it ran."""
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_app_data)
+    set_progress = mocker.Mock()
+
+    output = copy_context().run(
+        run_callback_on_load_exp_related_variants, "ACDEFGHIKL", 0.8, None, "experiment", set_progress
+    )
+    assert output[5] == vis.display_none
+    assert output[6] is False
+    assert output[8] is not None  # alert
+    set_progress.assert_not_called()
+
+
 # ------------------------------------------------
-def run_callback_on_view_all_residue(view, slider_value, selected_smiles, rowData):
+def run_callback_on_view_all_residue(view, slider_value, selected_smiles, experiment_id):
     from levseq_dash.app.main_app import on_view_all_residue
 
     context_value.set(AttributeDict(**{"triggered_inputs": [{"prop_id": "id-switch-residue-view.value"}]}))
-    return on_view_all_residue(view=view, slider_value=slider_value, selected_smiles=selected_smiles, rowData=rowData)
+    return on_view_all_residue(
+        view=view, slider_value=slider_value, selected_smiles=selected_smiles, experiment_id=experiment_id
+    )
 
 
 @pytest.mark.parametrize(
@@ -622,19 +896,26 @@ def run_callback_on_view_all_residue(view, slider_value, selected_smiles, rowDat
         (False, [0.5, 1.5], 0),
     ],
 )
-def test_callback_on_view_all_residue(disk_manager_from_test_data, experiment_ep_pcr, view, slider_value, smiles_idx):
+def test_callback_on_view_all_residue(
+    mocker, disk_manager_from_test_data, experiment_ep_pcr, view, slider_value, smiles_idx
+):
     """Test on_view_all_residue callback with valid inputs."""
-    rowData = experiment_ep_pcr.data_df.to_dict("records")
+    mocker.patch("levseq_dash.app.main_app.singleton_data_mgr_instance", disk_manager_from_test_data)
     selected_smiles = experiment_ep_pcr.unique_smiles_in_data[smiles_idx]
 
     ctx = copy_context()
-    output = ctx.run(run_callback_on_view_all_residue, view, slider_value, selected_smiles, rowData)
+    output = ctx.run(
+        run_callback_on_view_all_residue, view, slider_value, selected_smiles, "flatten_ep_processed_xy_cas"
+    )
 
     if view:
         # slider is enabled
         assert len(output) == 5
-        # on view all residues all the independent residues should be gathered in the list
-        assert len(output[0]["targets"][0]["residue_numbers"]) == 179
+        # on view all residues the independent residues of the variants within the ratio range are gathered
+        df = experiment_ep_pcr.exp_get_top_variants_data()
+        df = df[(df[gs.c_smiles] == selected_smiles) & df[gs.cc_ratio].between(*slider_value)]
+        residues = df[gs.c_substitutions].apply(utils.extract_all_indices).explode().dropna().unique()
+        assert len(output[0]["targets"][0]["residue_numbers"]) == len(residues)
     else:
         assert output[2] is not None  # slider_disabled
         assert output[3] is not None  # listbox_disabled
@@ -3,7 +3,8 @@ import dash_bootstrap_components as dbc
 import dash_molstar
 import numpy as np
 import pandas as pd
-from dash import dcc, html
+import pytest
+from dash import Dash, _get_paths, dcc, html
 
 from levseq_dash.app import global_strings as gs
 from levseq_dash.app.components import column_definitions as cd
@@ -20,6 +21,23 @@ from levseq_dash.app.components.layout import (
 from levseq_dash.app.utils import utils
 
 
+@pytest.fixture
+def app_with_url_prefix():
+    """A Dash app under a URL prefix, the layouts build the URLs of the Flask routes with dash.get_relative_path."""
+    config = _get_paths.CONFIG
+    yield Dash(__name__, url_base_pathname="/levseq/")
+    _get_paths.CONFIG = config
+
+
+def find_components(component, predicate):
+    found = [component] if predicate(component) else []
+    children = getattr(component, "children", None)
+    for child in children if isinstance(children, list) else [children]:
+        if child is not None and hasattr(child, "to_plotly_json"):
+            found += find_components(child, predicate)
+    return found
+
+
 def test_get_label():
     assert isinstance(widgets.get_label_fixed_for_form("random_string"), dbc.Label)
 
@@ -64,10 +82,16 @@ def test_get_protein_viewer():
     assert viewer.id == "id-viewer"  # Check ID
 
 
-def test_get_form():
+def test_get_form(app_with_url_prefix):
     assert isinstance(layout_upload.get_form(), dbc.Form)
 
 
+def test_upload_layout_uses_the_url_prefix(app_with_url_prefix):
+    upload_buttons = find_components(layout_upload.get_form(), lambda c: hasattr(c, "data-chunked-upload"))
+    assert len(upload_buttons) == 2
+    assert {getattr(button, "data-upload-url") for button in upload_buttons} == {"/levseq/uploads"}
+
+
 def test_get_navar():
     assert isinstance(layout_bars.get_navbar(), html.Div)
 
@@ -172,9 +196,13 @@ def test_about_page_layout():
     assert isinstance(layout_about.get_layout(), html.Div)
 
 
-def test_explore_layout():
+def test_explore_layout(app_with_url_prefix):
     """Test if the about page layout is correctly generated."""
-    assert isinstance(layout_explore.get_layout(), html.Div)
+    layout = layout_explore.get_layout()
+    assert isinstance(layout, html.Div)
+
+    forms = find_components(layout, lambda c: isinstance(c, html.Form))
+    assert [form.action for form in forms] == ["/levseq" + gs.experiments_zip_export_path]
 
 
 def test_data_bars_group_mean_colorscale_null_ratio_column():
@@ -0,0 +1,146 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager import core_data
+from levseq_dash.app.data_manager.experiment import Experiment, MutagenesisMethod
+from levseq_dash.app.utils import utils
+
+
+@pytest.fixture
+def experiment_files_copy(tmp_path, request):
+    """Copy of the csv and cif test files of an experiment in a UUID style directory"""
+    csv_path, cif_path, json_path = request.getfixturevalue(request.param)
+    experiment_dir = tmp_path / csv_path.stem
+    experiment_dir.mkdir()
+    for path in (csv_path, cif_path, json_path):
+        shutil.copy(path, experiment_dir / path.name)
+    return experiment_dir / csv_path.name, experiment_dir / cif_path.name
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data", "path_exp_ssm_data"], indirect=True)
+def test_core_data_matches_csv(experiment_files_copy):
+    csv_path, cif_path = experiment_files_copy
+    core_data.write_core_data_file(csv_path)
+
+    from_csv = Experiment(experiment_data_file_path=csv_path, geometry_file_path=cif_path)
+    from_core_data = Experiment(
+        experiment_data_file_path=csv_path, geometry_file_path=cif_path, load_core_data_file=True
+    )
+
+    pd.testing.assert_frame_equal(from_core_data.data_df, from_csv.data_df)
+    assert from_core_data.unique_smiles_in_data == from_csv.unique_smiles_in_data
+    assert from_core_data.plates == from_csv.plates
+    pd.testing.assert_frame_equal(from_core_data.exp_hot_cold_spots(3)[0], from_csv.exp_hot_cold_spots(3)[0])
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_core_data_file_layout(experiment_files_copy):
+    csv_path, _ = experiment_files_copy
+    file_path = core_data.write_core_data_file(csv_path)
+
+    with pa.memory_map(str(file_path)) as source:
+        schema = pa.ipc.open_file(source).schema
+
+    assert sorted(schema.names) == sorted(gs.experiment_core_data_list)
+    for column in core_data.categorical_columns:
+        assert pa.types.is_dictionary(schema.field(column).type)
+    assert pa.types.is_floating(schema.field(gs.c_fitness_value).type)
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_stale_core_data_falls_back_to_csv(experiment_files_copy):
+    csv_path, cif_path = experiment_files_copy
+    assert core_data.read_core_data_file(csv_path) is None
+
+    core_data.write_core_data_file(csv_path)
+    assert core_data.is_core_data_file_current(csv_path)
+
+    # the csv changed after the core data file was written
+    df = pd.read_csv(csv_path)
+    df.loc[0, gs.c_fitness_value] = 123456.0
+    df.to_csv(csv_path, index=False)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert not core_data.is_core_data_file_current(csv_path)
+    assert core_data.read_core_data_file(csv_path) is None
+    exp = Experiment(experiment_data_file_path=csv_path, geometry_file_path=cif_path, load_core_data_file=True)
+    assert exp.data_df.loc[0, gs.c_fitness_value] == 123456.0
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_unreadable_core_data_is_ignored(experiment_files_copy):
+    csv_path, _ = experiment_files_copy
+    core_data.get_core_data_file_path(csv_path).write_bytes(b"not an arrow file")
+    assert not core_data.is_core_data_file_current(csv_path)
+    assert core_data.read_core_data_file(csv_path) is None
+
+
+def test_backfill_core_data(tmp_path, path_exp_ep_data, path_exp_ssm_data):
+    for csv_path, cif_path, _ in (path_exp_ep_data, path_exp_ssm_data):
+        experiment_uuid = csv_path.stem
+        (tmp_path / experiment_uuid).mkdir()
+        for path in (csv_path, cif_path):
+            shutil.copy(path, tmp_path / experiment_uuid / path.name)
+        (tmp_path / experiment_uuid / f"{experiment_uuid}.json").write_text("{}")
+
+    assert core_data.backfill_core_data(tmp_path) == {"written": 2, "current": 0, "failed": 0}
+    assert core_data.backfill_core_data(tmp_path) == {"written": 0, "current": 2, "failed": 0}
+    assert core_data.backfill_core_data(tmp_path, force=True) == {"written": 2, "current": 0, "failed": 0}
+
+
+@pytest.mark.parametrize("core_data_format", ["csv", "arrow"])
+def test_disk_manager_core_data_format(
+    mocker, disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes, core_data_format
+):
+    mocker.patch("levseq_dash.app.config.settings.get_core_data_format", return_value=core_data_format)
+    read_core_data_file = mocker.spy(core_data, "read_core_data_file")
+
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    exp_id = disk_manager_from_temp_data.add_experiment_from_ui(
+        experiment_name="core data",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_content_base64_string=csv_base64_string,
+        geometry_content_base64_string=cif_base64_string,
+    )
+    csv_path = disk_manager_from_temp_data.data_path / exp_id / f"{exp_id}.csv"
+    assert core_data.get_core_data_file_path(csv_path).exists() == (core_data_format == "arrow")
+
+    exp = disk_manager_from_temp_data.get_experiment(exp_id)
+    assert read_core_data_file.call_count == (1 if core_data_format == "arrow" else 0)
+    pd.testing.assert_frame_equal(exp.data_df, utils.read_experiment_core_data(csv_path))
+
+    # downloads are still the csv file
+    assert disk_manager_from_temp_data.get_experiment_file_content(exp_id)["csv"] == csv_path.read_bytes()
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_core_data_numeric_columns_are_memory_mapped(experiment_files_copy):
+    csv_path, _ = experiment_files_copy
+    core_data.write_core_data_file(csv_path)
+    data_df = core_data.read_core_data_file(csv_path)
+
+    # views of the memory-mapped file are read-only, columns with nulls are copied
+    assert not data_df[gs.c_alignment_count].to_numpy().flags.writeable
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_core_data_categorical_columns_stay_categories(experiment_files_copy):
+    csv_path, _ = experiment_files_copy
+    core_data.write_core_data_file(csv_path)
+    data_df = core_data.read_core_data_file(csv_path)
+
+    for column in core_data.categorical_columns:
+        assert isinstance(data_df[column].dtype, pd.CategoricalDtype)
+        assert data_df[column].cat.categories.equals(utils.read_experiment_core_data(csv_path)[column].cat.categories)
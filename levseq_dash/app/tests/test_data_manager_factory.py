@@ -102,3 +102,29 @@ def test_validate_deployment_configuration_invalid_deployment_mode(mocker, load_
 
     with pytest.raises(ValueError):
         validate_deployment_configuration()
+
+
+def test_validate_deployment_configuration_local_instance_db_mode(mocker, load_config_mock_string, monkeypatch):
+    """Test local-instance mode with the db storage mode requires a database path instead of a data path."""
+    monkeypatch.delenv("DATABASE_PATH", raising=False)
+    mock = mocker.patch(load_config_mock_string)
+    mock.return_value = {
+        "deployment-mode": "local-instance",
+        "storage-mode": "db",
+        "db": {"database-path": "/some/valid/levseq.sqlite3"},
+    }
+
+    # Should not raise any exception
+    validate_deployment_configuration()
+
+    mock.return_value["db"] = {}
+    with pytest.raises(ValueError, match="database path"):
+        validate_deployment_configuration()
+
+
+def test_create_data_manager_invalid_storage_mode(mock_load_config_storage_mode_error):
+    """Test invalid storage mode."""
+    from levseq_dash.app.data_manager.manager import create_data_manager
+
+    with pytest.raises(ValueError, match="storage-mode must be either 'disk' or 'db'"):
+        create_data_manager()
@@ -0,0 +1,310 @@
+import base64
+import io
+import json
+import sqlite3
+import zipfile
+
+import pandas as pd
+import pytest
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager import db_manager, upload_staging
+from levseq_dash.app.data_manager.base import BaseDataManager
+from levseq_dash.app.data_manager.db_manager import DatabaseDataManager
+from levseq_dash.app.data_manager.experiment import Experiment, MutagenesisMethod
+from levseq_dash.app.data_manager.metadata_manifest import scan_experiments_metadata
+from levseq_dash.app.utils import utils
+
+experiment_ids = ["flatten_ep_processed_xy_cas", "flatten_ssm_processed_xy_cas"]
+
+
+def add_test_experiment(manager, experiment_ssm_cvv_cif_bytes):
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    return manager.add_experiment_from_ui(
+        experiment_name="database",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_content_base64_string=csv_base64_string,
+        geometry_content_base64_string=cif_base64_string,
+    )
+
+
+def test_migrate_disk_data(tmp_path, test_data_path):
+    database_path = tmp_path / "levseq.sqlite3"
+    assert db_manager.migrate_disk_data(test_data_path, database_path) == {
+        "migrated": 2,
+        "existing": 0,
+        "failed": 0,
+        "errors": {},
+    }
+    # an interrupted migration can be run again
+    assert db_manager.migrate_disk_data(test_data_path, database_path) == {
+        "migrated": 0,
+        "existing": 2,
+        "failed": 0,
+        "errors": {},
+    }
+
+
+def test_migrate_disk_data_reports_broken_experiments(tmp_path):
+    data_path = tmp_path / "data"
+    (data_path / "broken").mkdir(parents=True)
+    for suffix in (".json", ".cif"):
+        (data_path / "broken" / f"broken{suffix}").write_text("{}")
+    (data_path / "broken" / "broken.csv").write_text("not,the,experiment,columns\n")
+
+    counts = db_manager.migrate_disk_data(data_path, tmp_path / "levseq.sqlite3")
+    assert {key: counts[key] for key in ("migrated", "existing", "failed")} == {
+        "migrated": 0,
+        "existing": 0,
+        "failed": 1,
+    }
+    # the CLI prints the errors with the counts
+    assert list(counts["errors"]) == ["broken"]
+    assert counts["errors"]["broken"]
+
+
+def test_metadata_and_sequences_match_the_data_directory(db_manager_from_test_data, test_data_path):
+    experiments_metadata, _ = scan_experiments_metadata(test_data_path)
+
+    assert db_manager_from_test_data.get_all_lab_experiments_with_meta_data() == list(experiments_metadata.values())
+    assert db_manager_from_test_data.get_all_lab_sequences() == {
+        experiment_id: metadata["parent_sequence"] for experiment_id, metadata in experiments_metadata.items()
+    }
+    for experiment_id in experiment_ids:
+        assert db_manager_from_test_data.get_experiment_metadata(experiment_id) == experiments_metadata[experiment_id]
+    assert db_manager_from_test_data.get_experiment_metadata("unknown") is None
+
+
+@pytest.mark.parametrize("experiment_index", [0, 1])
+def test_get_experiment_matches_the_csv_file(
+    db_manager_from_test_data, path_exp_ep_data, path_exp_ssm_data, experiment_index
+):
+    csv_path, cif_path, _ = [path_exp_ep_data, path_exp_ssm_data][experiment_index]
+    expected = Experiment(experiment_data_file_path=csv_path, geometry_file_path=cif_path)
+
+    exp = db_manager_from_test_data.get_experiment(experiment_ids[experiment_index])
+
+    pd.testing.assert_frame_equal(exp.data_df, expected.data_df[gs.experiment_core_data_list])
+    assert exp.plates == expected.plates
+    assert exp.unique_smiles_in_data == expected.unique_smiles_in_data
+    assert exp.geometry_base64_bytes == cif_path.read_bytes()
+    pd.testing.assert_frame_equal(exp.exp_hot_cold_spots(3)[1], expected.exp_hot_cold_spots(3)[1])
+
+    # cached
+    assert db_manager_from_test_data.get_experiment(experiment_ids[experiment_index]) is exp
+
+
+def test_get_experiment_nonexistent(db_manager_from_test_data):
+    assert db_manager_from_test_data.get_experiment("unknown") is None
+
+
+def test_get_experiment_top_variants(db_manager_from_test_data):
+    df = db_manager_from_test_data.get_experiment_top_variants(experiment_ids[0])
+    assert df is db_manager_from_test_data.get_experiment(experiment_ids[0]).top_variants_df
+    assert gs.cc_ratio in df.columns
+    assert db_manager_from_test_data.get_experiment_top_variants("unknown") is None
+
+
+def test_check_for_duplicate_experiment(db_manager_from_test_data, test_data_path):
+    assert db_manager_from_test_data.check_for_duplicate_experiment("not-a-checksum") is False
+
+    checksum = db_manager_from_test_data.get_experiment_metadata(experiment_ids[0])["csv_checksum"]
+    with pytest.raises(ValueError, match="DUPLICATE experiment data detected"):
+        db_manager_from_test_data.check_for_duplicate_experiment(checksum)
+
+
+def test_check_for_duplicate_experiment_near_duplicate(db_manager_from_test_data, path_exp_ep_data):
+    csv_df = pd.read_csv(path_exp_ep_data[0])
+    csv_bytes = csv_df[csv_df.columns[::-1]].to_csv(index=False).encode("utf-8")
+    content_hash = BaseDataManager.calculate_content_hash(csv_bytes)
+
+    with pytest.raises(ValueError, match=f"NEAR-DUPLICATE experiment data detected!.*{experiment_ids[0]}"):
+        db_manager_from_test_data.check_for_duplicate_experiment("not-a-checksum", content_hash)
+
+
+def test_duplicate_check_uses_the_checksum_index(db_manager_from_test_data):
+    with sqlite3.connect(db_manager_from_test_data.database_path) as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT experiment_id FROM experiments WHERE csv_checksum = ?", ("x",)
+        ).fetchall()
+    assert "idx_experiments_csv_checksum" in str(plan)
+
+
+def test_add_get_and_delete_experiment(db_manager_from_test_data, experiment_ssm_cvv_cif_bytes, path_exp_ssm_data):
+    exp_id = add_test_experiment(db_manager_from_test_data, experiment_ssm_cvv_cif_bytes)
+    assert exp_id.startswith("MYLAB-")
+
+    metadata = db_manager_from_test_data.get_experiment_metadata(exp_id)
+    assert metadata["experiment_name"] == "database"
+    assert metadata["plates_count"] == 4
+    assert len(db_manager_from_test_data.get_all_lab_experiments_with_meta_data()) == 3
+
+    exp = db_manager_from_test_data.get_experiment(exp_id)
+    assert exp.geometry_base64_bytes == path_exp_ssm_data[1].read_bytes()
+
+    file_content = db_manager_from_test_data.get_experiment_file_content(exp_id)
+    assert json.loads(file_content["json"]) == metadata
+    assert file_content["cif"] == path_exp_ssm_data[1].read_bytes()
+
+    assert db_manager_from_test_data.delete_experiment(exp_id) is True
+    assert db_manager_from_test_data.get_experiment_metadata(exp_id) is None
+    assert db_manager_from_test_data.get_experiment(exp_id) is None
+    assert db_manager_from_test_data.get_experiment_file_content(exp_id) == {}
+    assert db_manager_from_test_data.delete_experiment(exp_id) is False
+
+
+def test_add_staged_experiment(db_manager_from_test_data, experiment_ssm_cvv_cif_bytes, upload_staging_path, tmp_path):
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    df, csv_file_bytes = utils.decode_csv_file_base64_string_to_dataframe(csv_base64_string)
+    file_info, csv_bytes, core_data_df = BaseDataManager.prepare_experiment_file(
+        df,
+        BaseDataManager.calculate_file_checksum(csv_file_bytes),
+        BaseDataManager.calculate_dataframe_content_hash(df),
+    )
+    token = upload_staging.stage_experiment_file(csv_bytes, file_info, core_data_df)
+    geometry_file_path = tmp_path / "structure.cif"
+    geometry_file_path.write_bytes(base64.b64decode(cif_base64_string))
+
+    exp_id = db_manager_from_test_data.add_staged_experiment_from_ui(
+        experiment_name="staged",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_staging_token=token,
+        geometry_file_path=geometry_file_path,
+    )
+
+    metadata = db_manager_from_test_data.get_experiment_metadata(exp_id)
+    assert metadata["csv_checksum"] == BaseDataManager.calculate_file_checksum(csv_file_bytes)
+    assert metadata["csv_content_hash"] == BaseDataManager.calculate_content_hash(csv_file_bytes)
+    file_content = db_manager_from_test_data.get_experiment_file_content(exp_id)
+    assert file_content["csv"] == csv_bytes
+    assert file_content["cif"] == geometry_file_path.read_bytes()
+    assert list(upload_staging_path.iterdir()) == []
+
+    # the variant rows are inserted from the staged core data, as they are read from the CSV file
+    with sqlite3.connect(db_manager_from_test_data.database_path) as connection:
+        pd.testing.assert_frame_equal(
+            db_manager.read_variants(connection, exp_id),
+            utils.set_core_data_categories(
+                pd.read_csv(io.BytesIO(csv_bytes), usecols=gs.experiment_core_data_list)[gs.experiment_core_data_list]
+            ),
+        )
+
+
+@pytest.mark.parametrize("residues", [["59"], ["33", "123"], ["42", "90", "173", "123"], ["59", "59"], ["x"], []])
+@pytest.mark.parametrize("experiment_id", experiment_ids)
+def test_get_experiment_variants_at_residues_matches_the_scan(db_manager_from_test_data, experiment_id, residues):
+    variants = db_manager_from_test_data.get_experiment_variants_at_residues(experiment_id, residues)
+    # the default of the base class scans the data of the experiment
+    expected = BaseDataManager.get_experiment_variants_at_residues(db_manager_from_test_data, experiment_id, residues)
+
+    assert variants.to_dict(orient="records") == expected.to_dict(orient="records")
+
+
+def test_get_experiment_variants_at_residues_reads_the_residue_index(db_manager_from_test_data, mocker):
+    read_variants = mocker.spy(db_manager, "read_variants")
+    variants = db_manager_from_test_data.get_experiment_variants_at_residues(experiment_ids[1], ["59"])
+
+    assert not variants.empty
+    assert variants[gs.c_substitutions].str.contains(r"(?<!\d)59(?!\d)").all()
+    # the experiment is not loaded
+    read_variants.assert_not_called()
+    assert db_manager_from_test_data.get_experiment_variants_at_residues("unknown", ["59"]).empty
+
+
+def test_experiment_cache_follows_other_workers(db_manager_from_test_data, experiment_ssm_cvv_cif_bytes):
+    other_worker = DatabaseDataManager()
+    exp_id = add_test_experiment(other_worker, experiment_ssm_cvv_cif_bytes)
+    assert db_manager_from_test_data.get_experiment(exp_id) is not None
+    assert exp_id in db_manager_from_test_data._experiments_core_data_cache
+
+    # another worker deletes the experiment, this worker doesn't serve it from its cache anymore
+    other_worker.delete_experiment(exp_id)
+    assert db_manager_from_test_data.get_experiment(exp_id) is None
+    assert exp_id not in db_manager_from_test_data._experiments_core_data_cache
+
+
+def test_candidate_lab_sequences_follow_other_workers(db_manager_from_test_data, experiment_ssm_cvv_cif_bytes):
+    sequence = db_manager_from_test_data.get_all_lab_sequences()[experiment_ids[1]]
+    assert experiment_ids[1] in db_manager_from_test_data.get_candidate_lab_sequences(sequence)
+
+    # another worker adds and deletes an experiment
+    other_worker = DatabaseDataManager()
+    exp_id = add_test_experiment(other_worker, experiment_ssm_cvv_cif_bytes)
+    assert db_manager_from_test_data.get_candidate_lab_sequences(sequence)[exp_id] == sequence
+
+    other_worker.delete_experiment(exp_id)
+    assert exp_id not in db_manager_from_test_data.get_candidate_lab_sequences(sequence)
+
+
+def test_get_experiments_zipped(db_manager_from_test_data):
+    experiments = db_manager_from_test_data.get_all_lab_experiments_with_meta_data()
+    zip_data = db_manager_from_test_data.get_experiments_zipped(experiments)
+
+    with zipfile.ZipFile(io.BytesIO(zip_data)) as zipf:
+        names = zipf.namelist()
+    assert "EnzEngDB_Experiments.csv" in names
+    for experiment_id in experiment_ids:
+        for suffix in (".json", ".csv", ".cif"):
+            assert f"experiments/{experiment_id}/{experiment_id}{suffix}" in names
+
+    assert db_manager_from_test_data.get_experiments_zipped([]) is None
+
+
+def test_iter_experiments_zipped_reads_the_blobs(db_manager_from_test_data, path_exp_ssm_data):
+    experiments = db_manager_from_test_data.get_all_lab_experiments_with_meta_data()
+    zip_data = b"".join(db_manager_from_test_data.iter_experiments_zipped(experiments))
+    assert db_manager_from_test_data.get_experiments_zip_size(experiments) == len(zip_data)
+
+    with zipfile.ZipFile(io.BytesIO(zip_data)) as zipf:
+        cif_name = f"experiments/{experiment_ids[1]}/{experiment_ids[1]}.cif"
+        assert zipf.read(cif_name) == path_exp_ssm_data[1].read_bytes()
+
+    file_content = db_manager_from_test_data.get_experiment_file_content(experiment_ids[1])
+    expected_size = sum(len(content) for content in file_content.values())
+    assert db_manager_from_test_data.get_experiment_files_size(experiment_ids[1]) == expected_size
+    assert db_manager_from_test_data.get_experiment_files_size("unknown") == 0
+
+
+def test_alignment_cache_in_the_database(mocker, db_manager_from_test_data):
+    assert db_manager_from_test_data.get_alignment_cache() is None
+
+    mocker.patch("levseq_dash.app.config.settings.is_alignment_cache_enabled", return_value=True)
+    manager = DatabaseDataManager()
+    assert manager.get_alignment_cache().cache_file_path == manager.database_path
+
+
+def test_missing_database_in_read_only_mode(mocker, tmp_path, load_config_mock_string):
+    mock = mocker.patch(load_config_mock_string)
+    mock.return_value = {
+        "deployment-mode": "local-instance",
+        "storage-mode": "db",
+        "db": {"database-path": str(tmp_path / "missing.sqlite3")},
+    }
+    with pytest.raises(FileNotFoundError):
+        DatabaseDataManager()
+
+
+def test_unsupported_schema_version(db_manager_from_test_data):
+    with sqlite3.connect(db_manager_from_test_data.database_path) as connection:
+        connection.execute(f"PRAGMA user_version = {db_manager.SCHEMA_VERSION + 1}")
+
+    with pytest.raises(ValueError, match="schema version"):
+        DatabaseDataManager()
+
+
+def test_create_data_manager_in_db_mode(db_manager_from_test_data):
+    from levseq_dash.app.data_manager.manager import create_data_manager
+
+    assert isinstance(create_data_manager(), DatabaseDataManager)
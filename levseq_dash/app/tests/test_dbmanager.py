@@ -128,6 +128,33 @@ def test_check_for_duplicate_experiment_duplicate(disk_manager_from_test_data):
         disk_manager_from_test_data.check_for_duplicate_experiment(existing_checksum)
 
 
+def reorder_csv_columns(csv_base64_string):
+    """Returns the CSV file with its columns reversed and spaces after the separators"""
+    import base64
+    import io
+
+    df = pd.read_csv(io.BytesIO(base64.b64decode(csv_base64_string)))
+    return df[df.columns[::-1]].to_csv(index=False).replace(",", ", ").encode("utf-8")
+
+
+def test_check_for_duplicate_experiment_near_duplicate(disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes):
+    """Test that a CSV file with reordered columns and whitespace is detected as a near-duplicate."""
+    from levseq_dash.app.data_manager.base import BaseDataManager
+
+    exp_id = add_test_experiment(disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes)
+    csv_bytes = reorder_csv_columns(experiment_ssm_cvv_cif_bytes[0])
+    checksum = BaseDataManager.calculate_file_checksum(csv_bytes)
+    content_hash = BaseDataManager.calculate_content_hash(csv_bytes)
+    assert disk_manager_from_temp_data.get_experiment_metadata(exp_id)["csv_content_hash"] == content_hash
+
+    with pytest.raises(ValueError, match=f"NEAR-DUPLICATE experiment data detected!.*{exp_id}"):
+        disk_manager_from_temp_data.check_for_duplicate_experiment(checksum, content_hash)
+
+    # the indexes follow the deletion
+    disk_manager_from_temp_data.delete_experiment(exp_id)
+    assert disk_manager_from_temp_data.check_for_duplicate_experiment(checksum, content_hash) is False
+
+
 def test_delete_experiment_nonexistent(disk_manager_from_test_data):
     """Test delete_experiment returns False for nonexistent ID."""
     result = disk_manager_from_test_data.delete_experiment("nonexistent-id")
@@ -259,10 +286,10 @@ def test_get_experiments_zipped_with_error(disk_manager_from_test_data, mocker):
     """Test get_experiments_zipped handles file read errors."""
     exp_list = [{"experiment_id": "flatten_ep_processed_xy_cas"}]
 
-    # Mock get_experiment_file_content to raise exception
+    # Mock _open_experiment_files to raise exception
     mocker.patch.object(
         disk_manager_from_test_data,
-        "get_experiment_file_content",
+        "_open_experiment_files",
         side_effect=Exception("File read error"),
     )
 
@@ -270,6 +297,45 @@ def test_get_experiments_zipped_with_error(disk_manager_from_test_data, mocker):
         disk_manager_from_test_data.get_experiments_zipped(exp_list)
 
 
+def test_iter_experiments_zipped_streams_the_files(mocker, disk_manager_from_test_data):
+    """Test that the ZIP file is yielded in chunks with the same content as get_experiments_zipped."""
+    import functools
+    import io
+    import zipfile
+
+    from levseq_dash.app.data_manager import zip_stream
+
+    mocker.patch.object(zip_stream, "iter_zip", functools.partial(zip_stream.iter_zip, chunk_size=64 * 1024))
+    mocker.patch.object(
+        disk_manager_from_test_data, "get_experiment_file_content", side_effect=Exception("files are not read at once")
+    )
+    exp_list = disk_manager_from_test_data.get_all_lab_experiments_with_meta_data()
+
+    chunks = list(disk_manager_from_test_data.iter_experiments_zipped(exp_list))
+
+    assert len(chunks) > 1
+    assert max(len(chunk) for chunk in chunks) < 2 * 64 * 1024
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zipf:
+        assert zipf.testzip() is None
+        for exp in exp_list:
+            json_path, csv_path, cif_path = disk_manager_from_test_data._generate_file_paths_for_experiment(
+                exp["experiment_id"]
+            )
+            assert zipf.read(f"experiments/{exp['experiment_id']}/{cif_path.name}") == cif_path.read_bytes()
+
+    assert list(disk_manager_from_test_data.iter_experiments_zipped([])) == []
+
+
+def test_get_experiments_zip_size(disk_manager_from_test_data):
+    """Test that the size of the ZIP file is computed without writing it."""
+    exp_list = disk_manager_from_test_data.get_all_lab_experiments_with_meta_data()
+
+    zip_data = disk_manager_from_test_data.get_experiments_zipped(exp_list)
+
+    assert disk_manager_from_test_data.get_experiments_zip_size(exp_list) == len(zip_data)
+    assert disk_manager_from_test_data.get_experiments_zip_size([]) is None
+
+
 def test_get_experiment_uses_cache(mocker, disk_manager_from_test_data):
     """Test that get_experiment uses cache on second call."""
     experiment_id = "flatten_ssm_processed_xy_cas"
@@ -295,3 +361,304 @@ def test_get_experiment_uses_cache(mocker, disk_manager_from_test_data):
 
     # cache should have two entries now
     assert len(disk_manager_from_test_data._experiments_core_data_cache) == 2
+
+    stats = disk_manager_from_test_data.get_experiment_cache_stats()
+    assert stats["tabular_hits"] == 1
+    assert stats["tabular_misses"] == 2
+    assert stats["tabular_entries"] == 2
+
+
+def test_get_experiment_cache_evicts_by_budget(disk_manager_from_test_data):
+    """Test that the experiment cache stays within its memory budgets."""
+    from levseq_dash.app.data_manager.experiment_cache import ExperimentCache, get_experiment_tabular_size_in_bytes
+
+    experiment_ids = ["flatten_ssm_processed_xy_cas", "flatten_ep_processed_xy_cas"]
+    sizes = [
+        get_experiment_tabular_size_in_bytes(disk_manager_from_test_data.get_experiment(i)) for i in experiment_ids
+    ]
+
+    # room for the data of either experiment, but not for both
+    disk_manager_from_test_data._experiments_core_data_cache = ExperimentCache(
+        max_tabular_bytes=max(sizes), max_structure_bytes=100 * 1024 * 1024
+    )
+    for experiment_id in experiment_ids:
+        disk_manager_from_test_data.get_experiment(experiment_id)
+
+    stats = disk_manager_from_test_data.get_experiment_cache_stats()
+    assert stats["tabular_entries"] == 1
+    assert stats["tabular_evictions"] == 1
+    assert stats["tabular_bytes"] == sizes[1] <= stats["max_tabular_bytes"]
+
+    residency = disk_manager_from_test_data.get_experiment_cache_residency()
+    assert [entry["experiment_id"] for entry in residency["tabular"]] == [experiment_ids[1]]
+
+
+def test_get_experiment_loads_geometry_lazily(mocker, disk_manager_from_test_data):
+    """Test that the geometry file is only read when it is accessed, and only once."""
+    from levseq_dash.app.data_manager.experiment import Experiment
+
+    read_geometry_file = mocker.spy(Experiment, "read_geometry_file")
+    experiment_id = "flatten_ep_processed_xy_cas"
+
+    exp = disk_manager_from_test_data.get_experiment(experiment_id)
+    exp.exp_hot_cold_spots(1)
+    read_geometry_file.assert_not_called()
+    assert disk_manager_from_test_data.get_experiment_cache_residency()["structure"] == []
+
+    geometry_bytes = exp.geometry_base64_bytes
+    assert geometry_bytes == disk_manager_from_test_data.get_experiment_file_content(experiment_id)["cif"]
+    assert disk_manager_from_test_data.get_experiment(experiment_id).geometry_base64_bytes is geometry_bytes
+    read_geometry_file.assert_called_once()
+
+    # the structure is cached separately, not by the experiment object
+    assert not exp.is_geometry_loaded
+    residency = disk_manager_from_test_data.get_experiment_cache_residency()
+    assert residency["structure"] == [{"experiment_id": experiment_id, "bytes": len(geometry_bytes)}]
+
+    disk_manager_from_test_data._experiments_core_data_cache.remove(experiment_id)
+    assert disk_manager_from_test_data.get_experiment_cache_stats()["structure_entries"] == 0
+
+
+def test_get_experiment_top_variants_is_kept_by_the_cache(disk_manager_from_test_data):
+    """Test that the top variants data is computed once and counted in the experiment cache budget."""
+    experiment_id = "flatten_ep_processed_xy_cas"
+    exp = disk_manager_from_test_data.get_experiment(experiment_id)
+    size_before = disk_manager_from_test_data.get_experiment_cache_stats()["tabular_bytes"]
+
+    df = disk_manager_from_test_data.get_experiment_top_variants(experiment_id)
+
+    assert df is exp.top_variants_df
+    assert disk_manager_from_test_data.get_experiment_top_variants(experiment_id) is df
+    assert disk_manager_from_test_data.get_experiment_cache_stats()["tabular_bytes"] > size_before
+
+
+def test_alignment_cache_disabled_by_default(disk_manager_from_temp_data):
+    assert disk_manager_from_temp_data.get_alignment_cache() is None
+
+
+def test_alignment_cache_under_data_path(disk_manager_from_temp_data_with_alignment_cache):
+    manager = disk_manager_from_temp_data_with_alignment_cache
+    cache = manager.get_alignment_cache()
+    assert cache is not None
+    assert cache.cache_file_path == (
+        manager.data_path / manager.alignment_cache_dir_name / manager.alignment_cache_file_name
+    )
+    assert cache.cache_file_path.exists()
+
+
+def test_alignment_cache_keeps_the_manifest_current(disk_manager_from_temp_data_with_alignment_cache):
+    from levseq_dash.app.data_manager import metadata_manifest
+
+    manager = disk_manager_from_temp_data_with_alignment_cache
+    cache = manager.get_alignment_cache()
+    assert metadata_manifest.read_manifest(manager.data_path) is not None
+
+    # the -wal and -shm files of the cache are created and removed outside of the data path itself
+    cache.store_results("query", "aligner", [("experiment", "target", 10.0, None)])
+    assert cache.get_results("query", "aligner", {"experiment": "target"}) == {"experiment": (10.0, None)}
+
+    assert metadata_manifest.read_manifest(manager.data_path) is not None
+
+
+def test_alignment_cache_unavailable(mocker, disk_manager_from_temp_data):
+    mocker.patch("levseq_dash.app.config.settings.is_alignment_cache_enabled", return_value=True)
+    mocker.patch(
+        "levseq_dash.app.data_manager.disk_manager.AlignmentCache", side_effect=Exception("read-only file system")
+    )
+    disk_manager_from_temp_data._setup_alignment_cache()
+    assert disk_manager_from_temp_data.get_alignment_cache() is None
+
+
+def test_delete_experiment_invalidates_alignment_cache(
+    disk_manager_from_temp_data_with_alignment_cache, experiment_ssm_cvv_cif_bytes
+):
+    manager = disk_manager_from_temp_data_with_alignment_cache
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    exp_id = manager.add_experiment_from_ui(
+        experiment_name="cached",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_content_base64_string=csv_base64_string,
+        geometry_content_base64_string=cif_base64_string,
+    )
+
+    cache = manager.get_alignment_cache()
+    cache.store_results("query", "aligner", [(exp_id, "target", 1.0, None), ("other", "target", 1.0, None)])
+
+    assert manager.delete_experiment(exp_id) is True
+    assert cache.get_results("query", "aligner", {exp_id: "target", "other": "target"}) == {"other": (1.0, None)}
+
+
+def test_candidate_lab_sequences_from_loaded_experiments(disk_manager_from_test_data):
+    all_lab_sequences = disk_manager_from_test_data.get_all_lab_sequences()
+    experiment_id, sequence = next(iter(all_lab_sequences.items()))
+
+    candidates = disk_manager_from_test_data.get_candidate_lab_sequences(sequence)
+    assert candidates[experiment_id] == sequence
+    # the identical sequence shares all of its k-mers and is ranked first
+    assert candidates[next(iter(candidates))] == sequence
+    assert set(candidates) <= set(all_lab_sequences)
+
+
+def test_candidate_lab_sequences_unrelated_query(mocker, disk_manager_from_test_data):
+    mocker.patch("levseq_dash.app.config.settings.get_kmer_min_shared_fraction", return_value=0.5)
+    assert disk_manager_from_test_data.get_candidate_lab_sequences("WWWWWWWWWWWW") == {}
+
+
+def test_candidate_lab_sequences_follow_add_and_delete(disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes):
+    manager = disk_manager_from_temp_data
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    exp_id = manager.add_experiment_from_ui(
+        experiment_name="indexed",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_content_base64_string=csv_base64_string,
+        geometry_content_base64_string=cif_base64_string,
+    )
+    parent_sequence = manager.get_experiment_metadata(exp_id)["parent_sequence"]
+    assert exp_id in manager.get_candidate_lab_sequences(parent_sequence)
+
+    assert manager.delete_experiment(exp_id) is True
+    assert exp_id not in manager.get_candidate_lab_sequences(parent_sequence)
+
+
+def test_metadata_is_loaded_from_the_manifest(mocker, disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes):
+    """Test that the metadata manifest is written at startup, updated on add/delete and read by the next worker."""
+    from levseq_dash.app.data_manager import metadata_manifest
+    from levseq_dash.app.data_manager.disk_manager import DiskDataManager
+
+    data_path = disk_manager_from_temp_data.data_path
+    assert metadata_manifest.read_manifest(data_path) == {}
+
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    exp_id = disk_manager_from_temp_data.add_experiment_from_ui(
+        experiment_name="manifest",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_content_base64_string=csv_base64_string,
+        geometry_content_base64_string=cif_base64_string,
+    )
+    assert list(metadata_manifest.read_manifest(data_path)) == [exp_id]
+
+    scan = mocker.spy(metadata_manifest, "scan_experiments_metadata")
+    new_worker = DiskDataManager()
+    scan.assert_not_called()
+    assert new_worker.get_experiment_metadata(exp_id) == disk_manager_from_temp_data.get_experiment_metadata(exp_id)
+    assert exp_id in new_worker.get_all_lab_sequences()
+
+    disk_manager_from_temp_data.delete_experiment(exp_id)
+    assert metadata_manifest.read_manifest(data_path) == {}
+    assert DiskDataManager().get_experiment_metadata(exp_id) is None
+    scan.assert_not_called()
+
+
+def test_stale_manifest_falls_back_to_scan(mocker, disk_manager_from_test_data):
+    """Test that a stale manifest is ignored and rewritten by the directory scan."""
+    from levseq_dash.app.data_manager import metadata_manifest
+    from levseq_dash.app.data_manager.disk_manager import DiskDataManager
+
+    data_path = disk_manager_from_test_data.data_path
+    metadata_manifest.write_manifest(data_path, {}, metadata_manifest.get_data_path_mtime_ns(data_path) - 1)
+
+    scan = mocker.spy(metadata_manifest, "scan_experiments_metadata")
+    manager = DiskDataManager()
+    scan.assert_called_once()
+    assert (
+        manager.get_all_lab_experiments_with_meta_data()
+        == disk_manager_from_test_data.get_all_lab_experiments_with_meta_data()
+    )
+    assert metadata_manifest.read_manifest(data_path) is not None
+
+
+def add_test_experiment(disk_manager, experiment_ssm_cvv_cif_bytes):
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    return disk_manager.add_experiment_from_ui(
+        experiment_name="refresh",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_content_base64_string=csv_base64_string,
+        geometry_content_base64_string=cif_base64_string,
+    )
+
+
+def test_experiments_added_and_removed_by_another_worker(
+    mocker, disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes
+):
+    """Test that a worker picks up the experiments added and removed by another worker."""
+    from levseq_dash.app.data_manager import metadata_manifest
+    from levseq_dash.app.data_manager.disk_manager import DiskDataManager
+
+    mocker.patch("levseq_dash.app.config.settings.get_metadata_refresh_interval_seconds", return_value=0)
+    worker_a = disk_manager_from_temp_data
+    worker_b = DiskDataManager()
+
+    exp_id = add_test_experiment(worker_a, experiment_ssm_cvv_cif_bytes)
+    scan = mocker.spy(metadata_manifest, "scan_experiments_metadata")
+    load_experiment_metadata = mocker.spy(metadata_manifest, "load_experiment_metadata")
+
+    assert worker_b.get_experiment_metadata(exp_id) == worker_a.get_experiment_metadata(exp_id)
+    assert exp_id in worker_b.get_all_lab_sequences()
+    assert exp_id in worker_b.get_candidate_lab_sequences(worker_a.get_experiment_metadata(exp_id)["parent_sequence"])
+    # only the new experiment directory was read
+    scan.assert_not_called()
+    load_experiment_metadata.assert_called_once()
+
+    # nothing changed, nothing is read
+    assert worker_b.refresh_experiments_metadata() == ([], [])
+
+    worker_b.get_experiment(exp_id)
+    worker_a.delete_experiment(exp_id)
+    assert worker_b.get_all_lab_experiments_with_meta_data() == []
+    assert exp_id not in worker_b._experiments_core_data_cache
+    assert worker_b.get_candidate_lab_sequences("MKTAYIAKQR") == {}
+
+
+def test_refresh_experiments_metadata_is_throttled(mocker, disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes):
+    """Test that the other workers' changes are checked at most once per refresh interval."""
+    from levseq_dash.app.data_manager.disk_manager import DiskDataManager
+
+    mocker.patch("levseq_dash.app.config.settings.get_metadata_refresh_interval_seconds", return_value=3600)
+    worker_b = DiskDataManager()
+    assert worker_b.get_all_lab_experiments_with_meta_data() == []
+
+    exp_id = add_test_experiment(disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes)
+    assert worker_b.get_experiment_metadata(exp_id) is None
+
+    assert worker_b.refresh_experiments_metadata() == ([exp_id], [])
+    assert worker_b.get_experiment_metadata(exp_id) is not None
+
+
+def test_refresh_retries_incomplete_experiment_directory(disk_manager_from_temp_data):
+    """Test that an experiment directory whose files are still being written is loaded by a later refresh."""
+    data_path = disk_manager_from_temp_data.data_path
+    experiment_dir = data_path / "MYLAB-incomplete"
+    experiment_dir.mkdir()
+    (experiment_dir / "MYLAB-incomplete.json").write_text('{"parent_sequence": "MKTAYIAKQR"}')
+
+    assert disk_manager_from_temp_data.refresh_experiments_metadata() == ([], [])
+
+    for suffix in (".csv", ".cif"):
+        (experiment_dir / f"MYLAB-incomplete{suffix}").write_text("x")
+    # writing the files doesn't change the data directory, the uploading worker bumps the generation
+    assert disk_manager_from_temp_data.refresh_experiments_metadata() == ([], [])
+    assert disk_manager_from_temp_data.refresh_experiments_metadata(force=True) == (["MYLAB-incomplete"], [])
@@ -0,0 +1,127 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager import derived_data
+from levseq_dash.app.data_manager.experiment import Experiment
+
+
+@pytest.fixture
+def experiment_files_copy(tmp_path, request):
+    """Copy of the csv and cif test files of an experiment in a UUID style directory"""
+    csv_path, cif_path, json_path = request.getfixturevalue(request.param)
+    experiment_dir = tmp_path / csv_path.stem
+    experiment_dir.mkdir()
+    for path in (csv_path, cif_path, json_path):
+        shutil.copy(path, experiment_dir / path.name)
+    return experiment_dir / csv_path.name, experiment_dir / cif_path.name
+
+
+def load_experiments(csv_path, cif_path):
+    computed = Experiment(experiment_data_file_path=csv_path, geometry_file_path=cif_path)
+    precomputed = Experiment(experiment_data_file_path=csv_path, geometry_file_path=cif_path, load_derived_data=True)
+    return computed, precomputed
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data", "path_exp_ssm_data"], indirect=True)
+def test_derived_data_matches_computed_data(experiment_files_copy):
+    csv_path, cif_path = experiment_files_copy
+    derived_data.write_derived_data_file(csv_path)
+    computed, precomputed = load_experiments(csv_path, cif_path)
+
+    assert computed.derived_data_df is None
+    assert precomputed.derived_data_df is not None
+
+    pd.testing.assert_frame_equal(precomputed.exp_get_data_with_ratios(), computed.exp_get_data_with_ratios())
+    pd.testing.assert_frame_equal(
+        precomputed.exp_get_processed_core_data_for_valid_mutation_extractions(),
+        computed.exp_get_processed_core_data_for_valid_mutation_extractions(),
+    )
+    for n in [1, 5]:
+        precomputed_spots, precomputed_per_smiles = precomputed.exp_hot_cold_spots(n)
+        computed_spots, computed_per_smiles = computed.exp_hot_cold_spots(n)
+        pd.testing.assert_frame_equal(precomputed_spots, computed_spots)
+        pd.testing.assert_frame_equal(precomputed_per_smiles, computed_per_smiles)
+
+    for smiles in [None, *computed.unique_smiles_in_data]:
+        assert precomputed.exp_single_site_positions(smiles) == computed.exp_single_site_positions(smiles)
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ssm_data"], indirect=True)
+def test_derived_data_single_site_positions(experiment_files_copy):
+    csv_path, cif_path = experiment_files_copy
+    derived_data.write_derived_data_file(csv_path)
+    _, precomputed = load_experiments(csv_path, cif_path)
+    assert len(precomputed.exp_single_site_positions()) > 0
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_stale_derived_data_is_ignored(experiment_files_copy):
+    csv_path, cif_path = experiment_files_copy
+    assert derived_data.read_derived_data_file(csv_path) is None
+
+    derived_data.write_derived_data_file(csv_path)
+    assert derived_data.is_derived_data_file_current(csv_path)
+
+    # the csv changed after the sidecar was written
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not derived_data.is_derived_data_file_current(csv_path)
+    assert derived_data.read_derived_data_file(csv_path) is None
+    _, precomputed = load_experiments(csv_path, cif_path)
+    assert precomputed.derived_data_df is None
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_derived_data_version_change_is_stale(mocker, experiment_files_copy):
+    csv_path, _ = experiment_files_copy
+    derived_data.write_derived_data_file(csv_path)
+    mocker.patch.object(derived_data, "DERIVED_DATA_VERSION", derived_data.DERIVED_DATA_VERSION + 1)
+    assert not derived_data.is_derived_data_file_current(csv_path)
+
+
+@pytest.mark.parametrize("experiment_files_copy", ["path_exp_ep_data"], indirect=True)
+def test_unreadable_derived_data_is_ignored(experiment_files_copy):
+    csv_path, _ = experiment_files_copy
+    derived_data.get_derived_data_file_path(csv_path).write_bytes(b"not a parquet file")
+    assert derived_data.read_derived_data_file(csv_path) is None
+
+
+def test_backfill_derived_data(tmp_path, path_exp_ep_data, path_exp_ssm_data):
+    for csv_path, cif_path, _ in (path_exp_ep_data, path_exp_ssm_data):
+        experiment_uuid = csv_path.stem
+        (tmp_path / experiment_uuid).mkdir()
+        for path in (csv_path, cif_path):
+            shutil.copy(path, tmp_path / experiment_uuid / path.name)
+        (tmp_path / experiment_uuid / f"{experiment_uuid}.json").write_text("{}")
+
+    assert derived_data.backfill_derived_data(tmp_path) == {"written": 2, "current": 0, "failed": 0}
+    assert derived_data.backfill_derived_data(tmp_path) == {"written": 0, "current": 2, "failed": 0}
+    assert derived_data.backfill_derived_data(tmp_path, force=True) == {"written": 2, "current": 0, "failed": 0}
+
+
+def test_disk_manager_writes_and_loads_derived_data(disk_manager_from_temp_data, experiment_ssm_cvv_cif_bytes):
+    from levseq_dash.app.data_manager.experiment import MutagenesisMethod
+
+    csv_base64_string, cif_base64_string = experiment_ssm_cvv_cif_bytes
+    exp_id = disk_manager_from_temp_data.add_experiment_from_ui(
+        experiment_name="derived",
+        experiment_date="2025-01-01",
+        substrate="CCO",
+        product="CCO",
+        assay="UV-Vis",
+        mutagenesis_method=MutagenesisMethod.SSM,
+        experiment_doi="",
+        experiment_additional_info="",
+        experiment_content_base64_string=csv_base64_string,
+        geometry_content_base64_string=cif_base64_string,
+    )
+    csv_path = disk_manager_from_temp_data.data_path / exp_id / f"{exp_id}.csv"
+    assert derived_data.is_derived_data_file_current(csv_path)
+
+    exp = disk_manager_from_temp_data.get_experiment(exp_id)
+    assert exp.derived_data_df is not None
+    assert gs.cc_ratio in exp.exp_get_data_with_ratios().columns
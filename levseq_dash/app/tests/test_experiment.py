@@ -4,6 +4,7 @@ import pytest
 
 from levseq_dash.app import global_strings as gs
 from levseq_dash.app.data_manager.experiment import Experiment, MutagenesisMethod
+from levseq_dash.app.utils import u_reaction
 
 
 @pytest.mark.parametrize(
@@ -425,6 +426,56 @@ def test_experiment_empty_geometry_file(tmp_path, path_exp_ep_data):
         )
 
 
+def test_experiment_geometry_is_loaded_on_first_access(mocker, path_exp_ep_data):
+    """Test that the geometry file is not read until geometry_base64_bytes is accessed."""
+    read_geometry_file = mocker.spy(Experiment, "read_geometry_file")
+    experiment = Experiment(experiment_data_file_path=path_exp_ep_data[0], geometry_file_path=path_exp_ep_data[1])
+
+    assert not experiment.is_geometry_loaded
+    read_geometry_file.assert_not_called()
+
+    assert experiment.geometry_base64_bytes == path_exp_ep_data[1].read_bytes()
+    assert experiment.is_geometry_loaded
+    assert experiment.geometry_base64_bytes is experiment.geometry_base64_bytes
+    read_geometry_file.assert_called_once()
+
+
+def test_experiment_geometry_loader(mocker, path_exp_ep_data):
+    """Test that the geometry bytes come from the geometry_loader when one is given."""
+    geometry_loader = mocker.Mock(return_value=b"cif content")
+    experiment = Experiment(
+        experiment_data_file_path=path_exp_ep_data[0],
+        geometry_file_path=path_exp_ep_data[1],
+        geometry_loader=geometry_loader,
+    )
+
+    geometry_loader.assert_not_called()
+    assert experiment.geometry_base64_bytes == b"cif content"
+    assert not experiment.is_geometry_loaded
+
+
+def test_exp_get_top_variants_data_is_computed_once(mocker, path_exp_ep_data):
+    """Test that the top variants data is the ratio data without the intermediate columns, computed once."""
+    experiment = Experiment(experiment_data_file_path=path_exp_ep_data[0], geometry_file_path=path_exp_ep_data[1])
+    exp_get_data_with_ratios = mocker.spy(experiment, "exp_get_data_with_ratios")
+    assert experiment.top_variants_df is None
+
+    df = experiment.exp_get_top_variants_data()
+
+    assert gs.cc_ratio in df.columns
+    assert not {"min", "max", "min_group_ratio", "max_group_ratio", "mean"} & set(df.columns)
+    assert len(df) == len(experiment.data_df)
+    assert experiment.exp_get_top_variants_data() is df
+    exp_get_data_with_ratios.assert_called_once()
+
+
+def test_read_geometry_file_empty(tmp_path):
+    empty_cif = tmp_path / "empty.cif"
+    empty_cif.write_text("")
+    with pytest.raises(ValueError, match="Geometry file is empty."):
+        Experiment.read_geometry_file(empty_cif)
+
+
 def test_exp_hot_cold_spots_with_empty_df(experiment_ep_pcr, mocker):
     """Test exp_hot_cold_spots when data_df is empty."""
     # Mock the data_df to be empty
@@ -487,3 +538,64 @@ def test_sanity_check_duplicate_wells():
 
     with pytest.raises(ValueError, match="Duplicate wells in"):
         Experiment.run_sanity_checks_on_experiment_file(df)
+
+
+def get_sanity_check_df(smiles, wells, plates=None):
+    rows = len(smiles)
+    return pd.DataFrame(
+        {
+            gs.c_smiles: smiles,
+            gs.c_plate: plates if plates is not None else ["plate1"] * rows,
+            gs.c_well: wells,
+            gs.c_alignment_count: [1] * rows,
+            gs.c_substitutions: [gs.hashtag_parent] + ["A123B"] * (rows - 1),
+            gs.c_alignment_probability: [1.0] * rows,
+            gs.c_aa_sequence: ["MAVPGY"] * rows,
+            gs.c_fitness_value: [100.0] * rows,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "df, message",
+    [
+        (
+            get_sanity_check_df(["CCO", "CCO", " ", "not_a_smiles"], ["A1", "A2", "A3", "A4"]),
+            "Invalid SMILES string at row 2. Value is null, NaN, or empty.",
+        ),
+        (
+            get_sanity_check_df(["CCO", "not_a_smiles", ""], ["A1", "A2", "A3"]),
+            "Invalid SMILES string at row 1. SMILES is:'not_a_smiles'",
+        ),
+        (
+            get_sanity_check_df(["CCO", "CCO", "CCO"], ["A1", " A2 ", ""]),
+            "Well value at row 2 is null, NaN, or empty.",
+        ),
+        (
+            get_sanity_check_df(["CCO", "CCO", "CCO"], ["A01", "I1", "A13"]),
+            "Well 'I1' at row 1 does not follow standard 96-well plate format. "
+            "Expected format is letter A-H followed by number 1-12.",
+        ),
+        (
+            get_sanity_check_df(
+                ["CCO", "CO", "CO", "CCO", "CO"], ["A1", "B1", "B1", "A1", "B1"], ["p2", "p1", "p1", "p2", "p1"]
+            ),
+            "Duplicate wells in (smiles=CCO, plate='p2) combo. Wells ['A1'] in rows: [0, 3]. ",
+        ),
+    ],
+)
+def test_sanity_check_error_messages(df, message):
+    """The first invalid row of the file is reported."""
+    with pytest.raises(ValueError) as e:
+        Experiment.run_sanity_checks_on_experiment_file(df)
+    assert str(e.value) == message
+
+
+def test_sanity_check_parses_each_smiles_once(mocker):
+    """Each distinct SMILES string of the file is validated once."""
+    spy = mocker.spy(u_reaction, "is_valid_smiles")
+    wells = [f"{row}{column}" for row in "ABCDEFGH" for column in range(1, 13)]
+    df = get_sanity_check_df(["CCO"] * 96 + ["CO"] * 96, wells * 2)
+
+    assert Experiment.run_sanity_checks_on_experiment_file(df) is True
+    assert sorted(call.args[0] for call in spy.call_args_list) == ["CCO", "CO"]
@@ -0,0 +1,152 @@
+import pandas as pd
+import pytest
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager.experiment_cache import ExperimentCache, get_experiment_tabular_size_in_bytes
+
+MB = 1024 * 1024
+
+
+@pytest.mark.parametrize("max_bytes", [0, -1, 1.5, "100", True])
+def test_experiment_cache_invalid_budget(max_bytes):
+    with pytest.raises(ValueError, match="tabular budget"):
+        ExperimentCache(max_tabular_bytes=max_bytes, max_structure_bytes=MB)
+    with pytest.raises(ValueError, match="structure budget"):
+        ExperimentCache(max_tabular_bytes=MB, max_structure_bytes=max_bytes)
+
+
+def test_experiment_tabular_size_in_bytes(experiment_ep_pcr):
+    assert get_experiment_tabular_size_in_bytes(experiment_ep_pcr) >= (
+        experiment_ep_pcr.data_df.memory_usage(deep=True).sum()
+    )
+
+
+def test_experiment_cache_hits_and_misses(experiment_ep_pcr):
+    cache = ExperimentCache(max_tabular_bytes=100 * MB, max_structure_bytes=100 * MB)
+    assert cache.get("ep") is None
+
+    assert cache.put("ep", experiment_ep_pcr)
+    assert "ep" in cache
+    assert cache.get("ep") is experiment_ep_pcr
+
+    stats = cache.get_stats()
+    assert stats["tabular_hits"] == 1
+    assert stats["tabular_misses"] == 1
+    assert stats["tabular_hit_rate"] == 0.5
+    assert stats["tabular_entries"] == 1
+    assert stats["tabular_bytes"] == get_experiment_tabular_size_in_bytes(experiment_ep_pcr)
+    assert stats["tabular_evictions"] == 0
+    assert stats["structure_entries"] == 0
+
+    # caching the same experiment again doesn't count it twice
+    cache.put("ep", experiment_ep_pcr)
+    assert cache.get_stats()["tabular_bytes"] == stats["tabular_bytes"]
+
+
+def test_experiment_cache_geometry_is_loaded_once(mocker):
+    cache = ExperimentCache(max_tabular_bytes=MB, max_structure_bytes=MB)
+    load_geometry = mocker.Mock(return_value=b"cif content")
+
+    assert cache.get_geometry("ep", load_geometry) == b"cif content"
+    assert cache.get_geometry("ep", load_geometry) == b"cif content"
+    load_geometry.assert_called_once()
+
+    stats = cache.get_stats()
+    assert stats["structure_hits"] == 1
+    assert stats["structure_misses"] == 1
+    assert stats["structure_bytes"] == len(b"cif content")
+
+    cache.remove("ep")
+    cache.remove("unknown")
+    assert cache.get_stats()["structure_bytes"] == 0
+
+
+def test_experiment_cache_evicts_by_tabular_budget(experiment_ep_pcr, experiment_ssm):
+    sizes = [
+        get_experiment_tabular_size_in_bytes(experiment_ep_pcr),
+        get_experiment_tabular_size_in_bytes(experiment_ssm),
+    ]
+
+    # room for either experiment, but not for both
+    cache = ExperimentCache(max_tabular_bytes=max(sizes), max_structure_bytes=MB)
+    cache.put("ep", experiment_ep_pcr)
+    cache.put("ssm", experiment_ssm)
+
+    assert "ep" not in cache
+    assert "ssm" in cache
+    stats = cache.get_stats()
+    assert stats["tabular_evictions"] == 1
+    assert stats["tabular_bytes"] == sizes[1] <= stats["max_tabular_bytes"]
+
+
+def test_experiment_cache_evicts_structures_independently(experiment_ep_pcr):
+    cache = ExperimentCache(max_tabular_bytes=100 * MB, max_structure_bytes=15)
+    cache.put("ep", experiment_ep_pcr)
+    cache.get_geometry("a", lambda: b"0123456789")
+    cache.get_geometry("b", lambda: b"0123456789")
+
+    # too large for the budget, returned but not cached
+    assert cache.get_geometry("c", lambda: b"0123456789abcdef") == b"0123456789abcdef"
+
+    residency = cache.get_residency()
+    assert residency["structure"] == [{"experiment_id": "b", "bytes": 10}]
+    assert [entry["experiment_id"] for entry in residency["tabular"]] == ["ep"]
+    assert cache.get_stats()["structure_evictions"] == 1
+
+
+def test_experiment_cache_residency_is_in_eviction_order(experiment_ep_pcr, experiment_ssm):
+    cache = ExperimentCache(max_tabular_bytes=100 * MB, max_structure_bytes=100 * MB)
+    cache.put("ep", experiment_ep_pcr)
+    cache.put("ssm", experiment_ssm)
+    cache.get("ep")
+
+    residency = cache.get_residency()["tabular"]
+    assert [entry["experiment_id"] for entry in residency] == ["ssm", "ep"]
+    assert residency[1]["bytes"] == get_experiment_tabular_size_in_bytes(experiment_ep_pcr)
+
+
+def test_experiment_cache_skips_experiment_larger_than_budget(experiment_ep_pcr):
+    cache = ExperimentCache(max_tabular_bytes=1024, max_structure_bytes=MB)
+    assert not cache.put("ep", experiment_ep_pcr)
+    assert len(cache) == 0
+
+
+def test_experiment_cache_update_size(path_exp_ep_data):
+    from levseq_dash.app.data_manager.experiment import Experiment
+
+    experiment = Experiment(experiment_data_file_path=path_exp_ep_data[0], geometry_file_path=path_exp_ep_data[1])
+    cache = ExperimentCache(max_tabular_bytes=100 * MB, max_structure_bytes=MB)
+    assert not cache.update_size("ep")
+
+    cache.put("ep", experiment)
+    size_before = cache.get_stats()["tabular_bytes"]
+    experiment.exp_get_top_variants_data()
+    assert cache.update_size("ep")
+    assert cache.get_stats()["tabular_bytes"] == get_experiment_tabular_size_in_bytes(experiment) > size_before
+
+    # an experiment that no longer fits in the budget is removed
+    small_cache = ExperimentCache(max_tabular_bytes=size_before + 1, max_structure_bytes=MB)
+    experiment.top_variants_df = None
+    small_cache.put("ep", experiment)
+    experiment.exp_get_top_variants_data()
+    assert not small_cache.update_size("ep")
+    assert "ep" not in small_cache
+
+
+def test_experiment_cache_size_is_unchanged_by_the_ratio_calculation(path_exp_ep_data):
+    from levseq_dash.app.data_manager.experiment import Experiment
+
+    experiment = Experiment(experiment_data_file_path=path_exp_ep_data[0], geometry_file_path=path_exp_ep_data[1])
+    # fitness values the ratio calculation converts, e.g. trace amounts
+    experiment.data_df[gs.c_fitness_value] = experiment.data_df[gs.c_fitness_value].astype(object)
+    experiment.data_df.loc[0, gs.c_fitness_value] = "trac"
+    data_df = experiment.data_df.copy()
+
+    cache = ExperimentCache(max_tabular_bytes=100 * MB, max_structure_bytes=MB)
+    cache.put("ep", experiment)
+    experiment.exp_get_data_with_ratios()
+    experiment.exp_get_processed_core_data_for_valid_mutation_extractions()
+
+    # the core data of the cached experiment is not modified, so its measured size stays right
+    pd.testing.assert_frame_equal(experiment.data_df, data_df)
+    assert cache.get_stats()["tabular_bytes"] == get_experiment_tabular_size_in_bytes(experiment)
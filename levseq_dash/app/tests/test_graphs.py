@@ -3,6 +3,7 @@ import pytest
 
 from levseq_dash.app import global_strings as gs
 from levseq_dash.app.components import graphs
+from levseq_dash.app.utils import utils
 
 
 @pytest.mark.parametrize(
@@ -309,7 +310,7 @@ def test_filter_single_site_mutations_smiles_none():
     )
 
     # When smiles_string is None, should process all SMILES
-    result = graphs.filter_single_site_mutations(df, smiles_string=None, residue_number=45)
+    result = utils.filter_single_site_mutations(df, smiles_string=None, residue_number=45)
 
     # Should find the A45S mutation regardless of SMILES
     assert len(result) == 1
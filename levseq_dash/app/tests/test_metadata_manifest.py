@@ -0,0 +1,151 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from levseq_dash.app.data_manager import metadata_manifest
+
+
+@pytest.fixture
+def data_path(tmp_path, path_exp_ep_data, path_exp_ssm_data):
+    """Data directory with the two test experiments in the UUID layout"""
+    data_path = tmp_path / "data"
+    data_path.mkdir()
+    for csv_path, cif_path, json_path in (path_exp_ep_data, path_exp_ssm_data):
+        experiment_dir = data_path / csv_path.stem
+        experiment_dir.mkdir()
+        for path in (csv_path, cif_path, json_path):
+            shutil.copy(path, experiment_dir / path.name)
+    return data_path
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_scan_experiments_metadata(data_path):
+    # a directory without the csv file and a directory that is not an experiment are skipped
+    (data_path / "incomplete").mkdir()
+    (data_path / "incomplete" / "incomplete.json").write_text("{}")
+    (data_path / "DELETED_EXP").mkdir()
+    # unreadable metadata is reported
+    (data_path / "broken").mkdir()
+    for suffix in (".csv", ".cif"):
+        (data_path / "broken" / f"broken{suffix}").write_text("x")
+    (data_path / "broken" / "broken.json").write_text("{not json")
+
+    experiments_metadata, errors = metadata_manifest.scan_experiments_metadata(data_path, max_workers=2)
+
+    assert list(experiments_metadata) == ["flatten_ep_processed_xy_cas", "flatten_ssm_processed_xy_cas"]
+    assert experiments_metadata["flatten_ep_processed_xy_cas"] == json.loads(
+        (data_path / "flatten_ep_processed_xy_cas" / "flatten_ep_processed_xy_cas.json").read_text()
+    )
+    assert list(errors) == ["broken"]
+
+
+def test_manifest_roundtrip_and_staleness(data_path):
+    assert metadata_manifest.read_manifest(data_path) is None
+
+    mtime = metadata_manifest.get_data_path_mtime_ns(data_path)
+    experiments_metadata, _ = metadata_manifest.scan_experiments_metadata(data_path)
+    metadata_manifest.write_manifest(data_path, experiments_metadata, mtime)
+    assert metadata_manifest.read_manifest(data_path) == experiments_metadata
+
+    # rewriting the manifest doesn't make it stale
+    metadata_manifest.write_manifest(
+        data_path, experiments_metadata, metadata_manifest.get_data_path_mtime_ns(data_path)
+    )
+    assert metadata_manifest.read_manifest(data_path) == experiments_metadata
+
+    # an experiment directory was added or removed
+    bump_mtime(data_path)
+    assert metadata_manifest.read_manifest(data_path) is None
+
+
+def test_manifest_version_change_is_stale(mocker, data_path):
+    metadata_manifest.write_manifest(data_path, {}, metadata_manifest.get_data_path_mtime_ns(data_path))
+    mocker.patch.object(metadata_manifest, "MANIFEST_VERSION", metadata_manifest.MANIFEST_VERSION + 1)
+    assert metadata_manifest.read_manifest(data_path) is None
+
+
+def test_unreadable_manifest_is_ignored(data_path):
+    manifest_file_path = metadata_manifest.get_manifest_file_path(data_path)
+    manifest_file_path.parent.mkdir()
+    manifest_file_path.write_text("{not json")
+    assert metadata_manifest.read_manifest(data_path) is None
+
+
+def test_update_manifest(data_path):
+    experiments_metadata, _ = metadata_manifest.scan_experiments_metadata(data_path)
+    metadata_manifest.write_manifest(
+        data_path, experiments_metadata, metadata_manifest.get_data_path_mtime_ns(data_path)
+    )
+
+    mtime_before = metadata_manifest.get_data_path_mtime_ns(data_path)
+    (data_path / "new").mkdir()
+    bump_mtime(data_path)
+    metadata_manifest.update_manifest(data_path, mtime_before, "new", {"experiment_id": "new"})
+    assert metadata_manifest.read_manifest(data_path)["new"] == {"experiment_id": "new"}
+
+    mtime_before = metadata_manifest.get_data_path_mtime_ns(data_path)
+    bump_mtime(data_path)
+    metadata_manifest.update_manifest(data_path, mtime_before, "new", None)
+    assert list(metadata_manifest.read_manifest(data_path)) == list(experiments_metadata)
+
+
+def test_update_stale_manifest_removes_it(data_path):
+    metadata_manifest.write_manifest(data_path, {}, metadata_manifest.get_data_path_mtime_ns(data_path))
+
+    # the directory changed without updating the manifest, e.g. an experiment was copied in by hand
+    bump_mtime(data_path)
+    mtime_before = metadata_manifest.get_data_path_mtime_ns(data_path)
+    bump_mtime(data_path)
+    metadata_manifest.update_manifest(data_path, mtime_before, "new", {"experiment_id": "new"})
+
+    assert not metadata_manifest.get_manifest_file_path(data_path).exists()
+    # without a manifest there is nothing to update
+    metadata_manifest.update_manifest(data_path, mtime_before, "new", {"experiment_id": "new"})
+    assert not metadata_manifest.get_manifest_file_path(data_path).exists()
+
+
+def test_update_manifest_increments_the_generation(data_path):
+    assert metadata_manifest.read_generation(data_path) == 0
+
+    # the generation is incremented with or without a manifest
+    mtime = metadata_manifest.get_data_path_mtime_ns(data_path)
+    metadata_manifest.update_manifest(data_path, mtime, "new-experiment", {"name": "new"})
+    assert metadata_manifest.read_generation(data_path) == 1
+
+    metadata_manifest.write_manifest(data_path, {}, metadata_manifest.get_data_path_mtime_ns(data_path))
+    metadata_manifest.update_manifest(
+        data_path, metadata_manifest.get_data_path_mtime_ns(data_path), "new-experiment", None
+    )
+    assert metadata_manifest.read_generation(data_path) == 2
+
+
+def test_list_experiment_dirs(data_path):
+    # files and hidden directories, e.g. the manifest directory, are skipped
+    (data_path / "notes.txt").write_text("x")
+    (data_path / ".alignment_admission").mkdir()
+    metadata_manifest.write_manifest(data_path, {}, metadata_manifest.get_data_path_mtime_ns(data_path))
+
+    assert [os.path.basename(path) for path in metadata_manifest.list_experiment_dirs(data_path)] == [
+        "flatten_ep_processed_xy_cas",
+        "flatten_ssm_processed_xy_cas",
+    ]
+
+
+def test_backfill_content_hashes(data_path):
+    experiment_dir = data_path / "flatten_ep_processed_xy_cas"
+    metadata_manifest.write_manifest(data_path, {}, metadata_manifest.get_data_path_mtime_ns(data_path))
+
+    assert metadata_manifest.backfill_content_hashes(data_path) == {"written": 2, "current": 0, "failed": 0}
+    metadata = json.loads((experiment_dir / "flatten_ep_processed_xy_cas.json").read_text())
+    csv_bytes = (experiment_dir / "flatten_ep_processed_xy_cas.csv").read_bytes()
+    assert metadata["csv_content_hash"] == metadata_manifest.BaseDataManager.calculate_content_hash(csv_bytes)
+    # the metadata files changed in place, the manifest is scanned again
+    assert not metadata_manifest.get_manifest_file_path(data_path).exists()
+
+    assert metadata_manifest.backfill_content_hashes(data_path) == {"written": 0, "current": 2, "failed": 0}
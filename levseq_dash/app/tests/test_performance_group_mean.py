@@ -46,7 +46,7 @@ def calculate_group_mean_ratios_per_smiles_and_plate_optm(df):
     # if a prent has 0 fitness value that group combo is ignored
     parent_mean = (
         df[(df[gs.c_substitutions] == "#PARENT#") & (df[value_col] > 0)]
-        .groupby(group_cols, sort=False)[value_col]  # sort=False saves time
+        .groupby(group_cols, sort=False, observed=True)[value_col]  # sort=False saves time
         .mean()
         .reset_index()
         .rename(columns={value_col: "mean"})
@@ -68,7 +68,9 @@ def calculate_group_mean_ratios_per_smiles_and_plate_optm(df):
 
     # Compute min/max in single agg call, then merge
     group_stats_ratio = (
-        df.groupby(group_cols, sort=False)[gs.cc_ratio].agg(min_group_ratio="min", max_group_ratio="max").reset_index()
+        df.groupby(group_cols, sort=False, observed=True)[gs.cc_ratio]
+        .agg(min_group_ratio="min", max_group_ratio="max")
+        .reset_index()
     )
 
     # Single merge for both min and max
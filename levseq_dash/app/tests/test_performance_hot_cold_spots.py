@@ -0,0 +1,90 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager.experiment import Experiment
+
+TIME_HOT_COLD_SPOTS = []
+IN_GITHUB_ACTIONS = os.getenv("GITHUB_ACTIONS") == "true"
+
+
+def exp_hot_cold_spots_loop(experiment, n, sort_kind="quicksort"):
+    """
+    Previous implementation of Experiment.exp_hot_cold_spots, looping over every (smiles, plate) pair.
+    It is kept here as the reference for the vectorized version. Only the hot/cold spots are compared,
+    the per-smiles indices are computed from them with the same code.
+
+    The previous implementation sorted with the default quicksort, which doesn't keep the order of
+    rows with the same fitness value. The vectorized version keeps it, like sort_kind="stable".
+    """
+    df = experiment.exp_get_processed_core_data_for_valid_mutation_extractions()
+
+    hot_n = pd.DataFrame()
+    cold_n = pd.DataFrame()
+    for smiles in experiment.unique_smiles_in_data:
+        for plate_number in experiment.plates:
+            df_per_smiles_plate = df[(df[gs.c_smiles] == smiles) & (df[gs.c_plate] == plate_number)].sort_values(
+                by=gs.c_fitness_value, ascending=False, kind=sort_kind
+            )
+            hot_n = pd.concat([hot_n, df_per_smiles_plate.head(n)])
+            cold_n = pd.concat([cold_n, df_per_smiles_plate.tail(n)])
+
+    hot_n[gs.cc_hot_cold_type] = gs.seg_align_hot
+    cold_n[gs.cc_hot_cold_type] = gs.seg_align_cold
+    return pd.concat([hot_n, cold_n], ignore_index=True)
+
+
+def compare_and_time(experiment, label, n):
+    start_time = time.time()
+    expected_legacy = exp_hot_cold_spots_loop(experiment, n)
+    execution_time_loop = time.time() - start_time
+
+    expected = exp_hot_cold_spots_loop(experiment, n, sort_kind="stable")
+
+    start_time = time.time()
+    hot_cold_spots_merged_df, hot_cold_residue_per_smiles = experiment.exp_hot_cold_spots(n)
+    execution_time = time.time() - start_time
+
+    pd.testing.assert_frame_equal(hot_cold_spots_merged_df, expected)
+    # only the order of rows with the same fitness value can differ from the previous implementation
+    pd.testing.assert_series_equal(
+        hot_cold_spots_merged_df[gs.c_fitness_value], expected_legacy[gs.c_fitness_value], check_index=False
+    )
+    assert gs.cc_hot_indices_per_smiles in hot_cold_residue_per_smiles.columns
+
+    TIME_HOT_COLD_SPOTS.append((label, len(experiment.data_df), execution_time_loop, execution_time))
+
+
+@pytest.mark.skipif(IN_GITHUB_ACTIONS, reason="Skipping test on Github")
+@pytest.mark.parametrize("n", [1, 5])
+def test_exp_hot_cold_spots_on_all_real_data_files(disk_manager_from_app_data, n):
+    for exp_meta in disk_manager_from_app_data.get_all_lab_experiments_with_meta_data():
+        experiment_id = exp_meta["experiment_id"]
+        experiment = disk_manager_from_app_data.get_experiment(experiment_id)
+        compare_and_time(experiment, f"{experiment_id[:40]} n={n}", n)
+
+
+@pytest.mark.skipif(IN_GITHUB_ACTIONS, reason="Skipping test on Github")
+@pytest.mark.parametrize("num_plates", [10, 100, 500])
+def test_exp_hot_cold_spots_on_simulated_data(tmp_path, path_exp_ep_data, num_plates):
+    from levseq_dash.app.tests.mutation_simulator import generate_temp_test_experiment_files
+
+    csv_path, experiment_id = generate_temp_test_experiment_files(tmp_path, path_exp_ep_data[0], num_plates=num_plates)
+    cif_path = os.path.join(os.path.dirname(csv_path), f"{experiment_id}.cif")
+    experiment = Experiment(experiment_data_file_path=csv_path, geometry_file_path=cif_path)
+    compare_and_time(experiment, f"RND {num_plates} plates n=5", 5)
+
+
+@pytest.mark.skipif(IN_GITHUB_ACTIONS, reason="Skipping test on Github")
+def test_print_timing_hot_cold_spots_summary():
+    """Print a summary of all timing results from the performance tests."""
+    print("\n\n" + "=" * 100)
+    print("HOT/COLD SPOTS PERFORMANCE TEST RESULTS")
+    print("=" * 100)
+    print("\n{:<50} {:>8} {:>15} {:>15}".format("File", "Rows", "Loop (ms)", "Vectorized (ms)"))
+    print("-" * 100)
+    for label, row_count, duration_loop, duration in TIME_HOT_COLD_SPOTS:
+        print(f"{label:<50} {row_count:>8} {duration_loop * 1000:>15.2f} {duration * 1000:>15.2f}")
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from unittest import mock
 
@@ -247,6 +248,155 @@ def test_is_pairwise_aligner_logging_enabled(mock_get_logging_settings):
     assert settings.is_pairwise_aligner_logging_enabled() is False
 
 
+def test_get_sequence_alignment_settings(mock_load_config):
+    """Test get_sequence_alignment_settings function"""
+    mock_load_config.return_value = {"sequence-alignment": {"aligner-pool-size": 4}}
+    assert settings.get_sequence_alignment_settings() == {"aligner-pool-size": 4}
+
+    mock_load_config.return_value = {}
+    assert settings.get_sequence_alignment_settings() == {}
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"aligner-pool-size": 4}, 4),
+        ({"aligner-pool-size": 0}, 0),
+        ({"aligner-pool-size": None}, 0),
+        ({}, 0),
+    ],
+)
+def test_get_aligner_pool_size(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test get_aligner_pool_size function"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.get_aligner_pool_size() == expected
+
+
+@pytest.mark.parametrize("pool_size", [-1, "4", 2.5, True])
+def test_get_aligner_pool_size_invalid(mock_get_sequence_alignment_settings, pool_size):
+    """Test get_aligner_pool_size rejects invalid values"""
+    mock_get_sequence_alignment_settings.return_value = {"aligner-pool-size": pool_size}
+    with pytest.raises(ValueError, match="aligner-pool-size"):
+        settings.get_aligner_pool_size()
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"max-alignments-per-target": 5}, 5),
+        ({"max-alignments-per-target": 1}, 1),
+        ({}, 1),
+    ],
+)
+def test_get_max_alignments_per_target(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test get_max_alignments_per_target function"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.get_max_alignments_per_target() == expected
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"max-concurrent-alignments": 4}, 4),
+        ({"max-concurrent-alignments": 0}, os.cpu_count()),
+        ({"max-concurrent-alignments": None}, os.cpu_count()),
+        ({}, os.cpu_count()),
+    ],
+)
+def test_get_max_concurrent_alignments(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test get_max_concurrent_alignments defaults to one per CPU core"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.get_max_concurrent_alignments() == expected
+
+
+@pytest.mark.parametrize("max_concurrent", [-1, "2", True, 1.5])
+def test_get_max_concurrent_alignments_invalid(mock_get_sequence_alignment_settings, max_concurrent):
+    """Test get_max_concurrent_alignments rejects invalid values"""
+    mock_get_sequence_alignment_settings.return_value = {"max-concurrent-alignments": max_concurrent}
+    with pytest.raises(ValueError, match="max-concurrent-alignments"):
+        settings.get_max_concurrent_alignments()
+
+
+@pytest.mark.parametrize("max_alignments", [0, -1, None, "2", True])
+def test_get_max_alignments_per_target_invalid(mock_get_sequence_alignment_settings, max_alignments):
+    """Test get_max_alignments_per_target rejects invalid values"""
+    mock_get_sequence_alignment_settings.return_value = {"max-alignments-per-target": max_alignments}
+    with pytest.raises(ValueError, match="max-alignments-per-target"):
+        settings.get_max_alignments_per_target()
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"background-jobs": False}, False),
+        ({"background-jobs": True}, True),
+        ({}, False),
+    ],
+)
+def test_is_background_jobs_enabled(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test is_background_jobs_enabled function"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.is_background_jobs_enabled() == expected
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"exhaustive-search": False}, False),
+        ({"exhaustive-search": True}, True),
+        ({}, True),
+    ],
+)
+def test_is_exhaustive_sequence_search_enabled(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test is_exhaustive_sequence_search_enabled function"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.is_exhaustive_sequence_search_enabled() == expected
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"kmer-size": 4}, 4),
+        ({}, 3),
+    ],
+)
+def test_get_kmer_size(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test get_kmer_size function"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.get_kmer_size() == expected
+
+
+@pytest.mark.parametrize("kmer_size", [0, -1, None, "3", True])
+def test_get_kmer_size_invalid(mock_get_sequence_alignment_settings, kmer_size):
+    """Test get_kmer_size rejects invalid values"""
+    mock_get_sequence_alignment_settings.return_value = {"kmer-size": kmer_size}
+    with pytest.raises(ValueError, match="kmer-size"):
+        settings.get_kmer_size()
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"kmer-min-shared-fraction": 0.5}, 0.5),
+        ({"kmer-min-shared-fraction": 0}, 0),
+        ({"kmer-min-shared-fraction": 1}, 1),
+        ({}, 0.2),
+    ],
+)
+def test_get_kmer_min_shared_fraction(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test get_kmer_min_shared_fraction function"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.get_kmer_min_shared_fraction() == expected
+
+
+@pytest.mark.parametrize("min_shared_fraction", [-0.1, 1.5, None, "0.2", True])
+def test_get_kmer_min_shared_fraction_invalid(mock_get_sequence_alignment_settings, min_shared_fraction):
+    """Test get_kmer_min_shared_fraction rejects invalid values"""
+    mock_get_sequence_alignment_settings.return_value = {"kmer-min-shared-fraction": min_shared_fraction}
+    with pytest.raises(ValueError, match="kmer-min-shared-fraction"):
+        settings.get_kmer_min_shared_fraction()
+
+
 @mock.patch.dict("os.environ", {"FIVE_LETTER_ID_PREFIX": "MYLAB"})
 def test_environment_variable_takes_precedence_over_config(mock_load_config, mock_is_data_modification_enabled):
     """Test that environment variable takes precedence over config file"""
@@ -294,6 +444,98 @@ def test_environment_variable_validation_error(mock_is_data_modification_enabled
         settings.get_five_letter_id_prefix()
 
 
+# Tests for get_database_path function
+@mock.patch.dict("os.environ", {"DATABASE_PATH": "/custom/levseq.sqlite3"})
+def test_get_database_path_with_env_variable(mock_load_config):
+    """Test that DATABASE_PATH environment variable takes precedence"""
+    mock_load_config.return_value = {"db": {"database-path": "/other/levseq.sqlite3"}}
+    assert settings.get_database_path() == Path("/custom/levseq.sqlite3").resolve()
+
+
+@mock.patch.dict("os.environ", {}, clear=True)
+@pytest.mark.parametrize(
+    "database_path, expected",
+    [
+        ("/absolute/levseq.sqlite3", Path("/absolute/levseq.sqlite3").resolve()),
+        ("db/levseq.sqlite3", (settings.package_app_path / "db/levseq.sqlite3").resolve()),
+    ],
+)
+def test_get_database_path(mock_load_config, database_path, expected):
+    """Test absolute and relative database paths"""
+    mock_load_config.return_value = {"db": {"database-path": database_path}}
+    assert settings.get_database_path() == expected
+
+
+@mock.patch.dict("os.environ", {}, clear=True)
+def test_get_database_path_not_configured(mock_load_config):
+    """Test that a missing database path raises an error"""
+    mock_load_config.return_value = {"db": {}}
+    with pytest.raises(ValueError, match="database-path"):
+        settings.get_database_path()
+
+
+# Tests for get_alignment_admission_path function
+@mock.patch.dict("os.environ", {}, clear=True)
+@pytest.mark.parametrize(
+    "config, expected",
+    [
+        (
+            {"sequence-alignment": {"admission-path": "/absolute/admission"}},
+            Path("/absolute/admission").resolve(),
+        ),
+        (
+            {"sequence-alignment": {"admission-path": "admission"}},
+            (settings.package_app_path / "admission").resolve(),
+        ),
+        (
+            {"storage-mode": "db", "db": {"database-path": "/db/levseq.sqlite3"}},
+            Path("/db/levseq.sqlite3").resolve().parent / ".alignment_admission",
+        ),
+        (
+            {"deployment-mode": "local-instance", "disk": {"local-data-path": "/data"}},
+            Path("/data").resolve() / ".alignment_admission",
+        ),
+    ],
+)
+def test_get_alignment_admission_path(mock_load_config, config, expected):
+    """Test the admission path setting and its defaults next to the data"""
+    mock_load_config.return_value = config
+    assert settings.get_alignment_admission_path() == expected
+
+
+@mock.patch.dict("os.environ", {}, clear=True)
+@pytest.mark.parametrize(
+    "config, expected",
+    [
+        (
+            {"storage-mode": "db", "db": {"database-path": "/db/levseq.sqlite3"}},
+            Path("/db/levseq.sqlite3").resolve().parent / ".upload_staging",
+        ),
+        (
+            {"deployment-mode": "local-instance", "disk": {"local-data-path": "/data"}},
+            Path("/data").resolve() / ".upload_staging",
+        ),
+    ],
+)
+def test_get_upload_staging_path(mock_load_config, config, expected):
+    """Test the upload staging directory is next to the data"""
+    mock_load_config.return_value = config
+    assert settings.get_upload_staging_path() == expected
+
+
+@pytest.mark.parametrize(
+    "alignment_settings, expected",
+    [
+        ({"alignment-queue-metrics": True}, True),
+        ({}, False),
+    ],
+)
+def test_is_alignment_queue_metrics_enabled(mock_get_sequence_alignment_settings, alignment_settings, expected):
+    """Test is_alignment_queue_metrics_enabled function"""
+    mock_get_sequence_alignment_settings.return_value = alignment_settings
+    assert settings.is_alignment_queue_metrics_enabled() == expected
+
+
 # Tests for get_data_path function
 @mock.patch.dict("os.environ", {"DATA_PATH": "/custom/data/path"})
 def test_get_data_path_with_env_variable(mock_is_local_instance_mode):
@@ -374,3 +616,89 @@ def test_get_data_path_env_overrides_playground(mock_is_local_instance_mode):
     result = settings.get_data_path()
     expected_path = (settings.package_app_path / "data").resolve()
     assert result == expected_path
+
+
+@pytest.mark.parametrize(
+    "disk_settings, expected",
+    [
+        ({"core-data-format": "arrow"}, "arrow"),
+        ({"core-data-format": "csv"}, "csv"),
+        ({}, "csv"),
+    ],
+)
+def test_get_core_data_format(mock_get_disk_settings, disk_settings, expected):
+    """Test get_core_data_format function"""
+    mock_get_disk_settings.return_value = disk_settings
+    assert settings.get_core_data_format() == expected
+    assert settings.is_arrow_core_data_format() == (expected == "arrow")
+
+
+@pytest.mark.parametrize("core_data_format", ["parquet", "", None, "ARROW"])
+def test_get_core_data_format_invalid(mock_get_disk_settings, core_data_format):
+    """Test get_core_data_format rejects invalid values"""
+    mock_get_disk_settings.return_value = {"core-data-format": core_data_format}
+    with pytest.raises(ValueError, match="core-data-format"):
+        settings.get_core_data_format()
+
+
+@pytest.mark.parametrize(
+    "disk_settings, expected",
+    [
+        ({"experiment-cache-tabular-mb": 64, "experiment-cache-structure-mb": 32}, (64, 32)),
+        ({"experiment-cache-tabular-mb": 0.5}, (0.5, 128)),
+        ({}, (128, 128)),
+    ],
+)
+def test_get_experiment_cache_budgets(mock_get_disk_settings, disk_settings, expected):
+    """Test get_experiment_cache_tabular_mb and get_experiment_cache_structure_mb functions"""
+    mock_get_disk_settings.return_value = disk_settings
+    assert (settings.get_experiment_cache_tabular_mb(), settings.get_experiment_cache_structure_mb()) == expected
+
+
+@pytest.mark.parametrize("cache_size_mb", [0, -1, None, "256", True])
+def test_get_experiment_cache_budgets_invalid(mock_get_disk_settings, cache_size_mb):
+    """Test the experiment cache budget getters reject invalid values"""
+    mock_get_disk_settings.return_value = {
+        "experiment-cache-tabular-mb": cache_size_mb,
+        "experiment-cache-structure-mb": cache_size_mb,
+    }
+    with pytest.raises(ValueError, match="experiment-cache-tabular-mb"):
+        settings.get_experiment_cache_tabular_mb()
+    with pytest.raises(ValueError, match="experiment-cache-structure-mb"):
+        settings.get_experiment_cache_structure_mb()
+
+
+@pytest.mark.parametrize("disk_settings, expected", [({"max-upload-size-mb": 1024}, 1024), ({}, 256)])
+def test_get_max_upload_size_mb(mock_get_disk_settings, disk_settings, expected):
+    mock_get_disk_settings.return_value = disk_settings
+    assert settings.get_max_upload_size_mb() == expected
+
+
+@pytest.mark.parametrize("max_upload_size_mb", [0, -1, None, "256", True])
+def test_get_max_upload_size_mb_invalid(mock_get_disk_settings, max_upload_size_mb):
+    mock_get_disk_settings.return_value = {"max-upload-size-mb": max_upload_size_mb}
+    with pytest.raises(ValueError, match="max-upload-size-mb"):
+        settings.get_max_upload_size_mb()
+
+
+@pytest.mark.parametrize(
+    "disk_settings, expected",
+    [
+        ({"metadata-refresh-interval-seconds": 10}, 10),
+        ({"metadata-refresh-interval-seconds": 0}, 0),
+        ({"metadata-refresh-interval-seconds": 0.5}, 0.5),
+        ({}, 2),
+    ],
+)
+def test_get_metadata_refresh_interval_seconds(mock_get_disk_settings, disk_settings, expected):
+    """Test get_metadata_refresh_interval_seconds function"""
+    mock_get_disk_settings.return_value = disk_settings
+    assert settings.get_metadata_refresh_interval_seconds() == expected
+
+
+@pytest.mark.parametrize("interval", [-1, None, "2", True])
+def test_get_metadata_refresh_interval_seconds_invalid(mock_get_disk_settings, interval):
+    """Test get_metadata_refresh_interval_seconds rejects invalid values"""
+    mock_get_disk_settings.return_value = {"metadata-refresh-interval-seconds": interval}
+    with pytest.raises(ValueError, match="metadata-refresh-interval-seconds"):
+        settings.get_metadata_refresh_interval_seconds()
@@ -0,0 +1,161 @@
+import hashlib
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from levseq_dash.app import global_strings as gs
+from levseq_dash.app.data_manager import upload_staging
+from levseq_dash.app.utils import utils
+
+
+@pytest.fixture
+def core_data_df():
+    return utils.set_core_data_categories(
+        pd.DataFrame(
+            {
+                gs.c_smiles: ["CCO", "CCO"],
+                gs.c_plate: ["plate_1", "plate_1"],
+                gs.c_well: ["A1", "A2"],
+                gs.c_substitutions: ["#PARENT#", "A45S"],
+                gs.c_fitness_value: [1.0, np.nan],
+            }
+        )
+    )
+
+
+def test_get_staging_path(mocker, tmp_path):
+    staging_path = tmp_path / "data" / ".upload_staging"
+    mocker.patch("levseq_dash.app.config.settings.get_upload_staging_path", return_value=staging_path)
+
+    assert upload_staging.get_staging_path() == staging_path
+    assert staging_path.stat().st_mode & 0o777 == 0o700
+
+    # a staging directory other users can access, e.g. created beforehand, is not used
+    staging_path.chmod(0o755)
+    with pytest.raises(PermissionError):
+        upload_staging.get_staging_path()
+
+
+def test_stage_load_and_discard(upload_staging_path, core_data_df):
+    file_info = {"csv_checksum": "checksum", "plates_count": 2}
+    token = upload_staging.stage_experiment_file(b"a,b\n1,2\n", file_info, core_data_df)
+
+    loaded_file_info, csv_bytes, loaded_core_data_df = upload_staging.load_staged_experiment_file(token)
+    assert (loaded_file_info, csv_bytes) == (file_info, b"a,b\n1,2\n")
+    pd.testing.assert_frame_equal(loaded_core_data_df, core_data_df)
+    assert sorted(path.name for path in upload_staging_path.iterdir()) == [
+        f"{token}.csv",
+        f"{token}.json",
+        f"{token}.parquet",
+    ]
+
+    upload_staging.discard_staged_experiment_file(token)
+    assert list(upload_staging_path.iterdir()) == []
+    with pytest.raises(ValueError, match="has expired"):
+        upload_staging.load_staged_experiment_file(token)
+
+
+@pytest.mark.parametrize("token", [None, "", "../experiments", "0" * 31, "G" * 32])
+def test_invalid_token(upload_staging_path, token):
+    with pytest.raises(ValueError, match="Invalid upload token"):
+        upload_staging.load_staged_experiment_file(token)
+
+
+def test_expired_files_are_removed(upload_staging_path, core_data_df):
+    expired_token = upload_staging.stage_experiment_file(b"expired", {}, core_data_df)
+    expired_time = time.time() - upload_staging.STAGING_MAX_AGE_SECONDS - 1
+    for path in upload_staging_path.iterdir():
+        os.utime(path, (expired_time, expired_time))
+
+    # staging another file removes the expired ones
+    token = upload_staging.stage_experiment_file(b"current", {}, core_data_df)
+    with pytest.raises(ValueError, match="has expired"):
+        upload_staging.load_staged_experiment_file(expired_token)
+    assert upload_staging.load_staged_experiment_file(token)[:2] == ({}, b"current")
+    assert upload_staging.remove_expired_staged_files() == 0
+
+
+def upload_in_chunks(file_bytes, chunk_size):
+    token = upload_staging.create_file_upload("experiment.csv", len(file_bytes))
+    for offset in range(0, len(file_bytes), chunk_size):
+        chunk = file_bytes[offset : offset + chunk_size]
+        assert upload_staging.append_file_upload_chunk(token, offset, io.BytesIO(chunk), len(chunk)) == offset + len(
+            chunk
+        )
+    return token
+
+
+@pytest.mark.parametrize("chunk_size", [1000, 64 * 1024 + 1, 10**7])
+def test_file_upload_chunks(upload_staging_path, path_exp_ep_data, chunk_size):
+    file_bytes = path_exp_ep_data[0].read_bytes()
+    token = upload_in_chunks(file_bytes, chunk_size)
+
+    assert upload_staging.get_file_upload_offset(token) == (len(file_bytes), len(file_bytes))
+    file_path, filename, checksum = upload_staging.get_completed_file_upload(token)
+    assert file_path.read_bytes() == file_bytes
+    assert filename == "experiment.csv"
+    assert checksum == hashlib.sha256(file_bytes).hexdigest()
+
+    upload_staging.discard_file_upload(token)
+    assert list(upload_staging_path.iterdir()) == []
+    with pytest.raises(ValueError, match="has expired"):
+        upload_staging.get_completed_file_upload(token)
+
+
+def test_file_upload_larger_than_the_maximum_upload_size(mocker, upload_staging_path):
+    mocker.patch("levseq_dash.app.config.settings.get_max_upload_size_mb", return_value=1)
+
+    with pytest.raises(ValueError, match="maximum upload size of 1 MB"):
+        upload_staging.create_file_upload("experiment.csv", 1024 * 1024 + 1)
+    assert list(upload_staging_path.iterdir()) == []
+
+    token = upload_staging.create_file_upload("experiment.csv", 1024 * 1024)
+    assert upload_staging.get_file_upload_offset(token) == (0, 1024 * 1024)
+
+
+def test_file_upload_checksum_of_another_process(upload_staging_path, path_exp_ep_data):
+    """The checksum is calculated from the file if its chunks were appended by another process."""
+    file_bytes = path_exp_ep_data[0].read_bytes()
+    token = upload_staging.create_file_upload("experiment.csv", len(file_bytes))
+    upload_staging.append_file_upload_chunk(token, 0, io.BytesIO(file_bytes[:1000]), 1000)
+
+    upload_staging._upload_checksums.clear()
+    upload_staging.append_file_upload_chunk(token, 1000, io.BytesIO(file_bytes[1000:]), len(file_bytes) - 1000)
+
+    assert token not in upload_staging._upload_checksums
+    assert upload_staging.get_completed_file_upload(token)[2] == hashlib.sha256(file_bytes).hexdigest()
+
+
+def test_file_upload_chunk_errors(upload_staging_path):
+    token = upload_staging.create_file_upload("experiment.csv", 100)
+
+    # chunks at another offset than the received bytes
+    with pytest.raises(upload_staging.FileUploadOffsetError) as e:
+        upload_staging.append_file_upload_chunk(token, 10, io.BytesIO(b"x" * 10), 10)
+    assert e.value.offset == 0
+
+    # chunks past the end of the file
+    with pytest.raises(ValueError, match="doesn't fit"):
+        upload_staging.append_file_upload_chunk(token, 0, io.BytesIO(b"x" * 101), 101)
+
+    # an interrupted chunk is removed, the upload is resumed after the previous chunk
+    upload_staging.append_file_upload_chunk(token, 0, io.BytesIO(b"x" * 40), 40)
+    with pytest.raises(ValueError, match="incomplete"):
+        upload_staging.append_file_upload_chunk(token, 40, io.BytesIO(b"x" * 30), 60)
+    assert upload_staging.get_file_upload_offset(token) == (40, 100)
+
+    with pytest.raises(ValueError, match="not complete"):
+        upload_staging.get_completed_file_upload(token)
+
+    upload_staging.append_file_upload_chunk(token, 40, io.BytesIO(b"y" * 60), 60)
+    assert upload_staging.get_completed_file_upload(token)[2] == hashlib.sha256(b"x" * 40 + b"y" * 60).hexdigest()
+
+
+@pytest.mark.parametrize("size", [0, -1, "10", None, True])
+def test_create_file_upload_invalid_size(upload_staging_path, size):
+    with pytest.raises(ValueError, match="empty"):
+        upload_staging.create_file_upload("experiment.csv", size)
@@ -1,5 +1,6 @@
 import base64
 import hashlib
+import os
 from unittest import mock
 from unittest.mock import patch
 
@@ -53,7 +54,7 @@ def test_calculate_group_mean(experiment_ep_pcr, smiles, plate, mean):
     assert (plate_per_smiles_data_per["mean"].dropna() == mean).all()
 
     # ratio must be increasing. this ensures the ranking was done within group
-    plate_per_smiles_data_per.fillna(0)
+    plate_per_smiles_data_per.fillna({gs.cc_ratio: 0})
     plate_per_smiles_data_per = plate_per_smiles_data_per.sort_values(by=gs.cc_ratio, ascending=True)
     assert plate_per_smiles_data_per[gs.cc_ratio].dropna().is_monotonic_increasing
 
@@ -193,6 +194,136 @@ def test_returns_none_when_data_is_none():
     assert result is None
 
 
+@pytest.fixture
+def top_variants_rows_df():
+    return pd.DataFrame(
+        {
+            gs.c_substitutions: ["#PARENT#", "K99R", "A59L_K99R", None, "a59v"],
+            gs.c_fitness_value: [1.0, 5.0, 3.0, 2.0, None],
+        }
+    )
+
+
+def get_rows(df, filter_model=None, sort_model=None, start_row=0, end_row=100):
+    request = {"startRow": start_row, "endRow": end_row, "filterModel": filter_model, "sortModel": sort_model}
+    return utils.get_infinite_row_model_response(df, request)
+
+
+def test_get_infinite_row_model_response_all_rows(top_variants_rows_df):
+    response = get_rows(top_variants_rows_df)
+    assert response["rowCount"] == 5
+    assert [row[gs.cc_row_id] for row in response["rowData"]] == [0, 1, 2, 3, 4]
+    assert response["rowData"][1] == {gs.cc_row_id: 1, gs.c_substitutions: "K99R", gs.c_fitness_value: 5.0}
+
+
+def test_get_infinite_row_model_response_block(top_variants_rows_df):
+    response = get_rows(top_variants_rows_df, start_row=2, end_row=4)
+    assert response["rowCount"] == 5
+    assert [row[gs.cc_row_id] for row in response["rowData"]] == [2, 3]
+
+
+@pytest.mark.parametrize(
+    "column_filter, expected_row_ids",
+    [
+        ({"filterType": "text", "type": "contains", "filter": "A59"}, [2, 4]),
+        ({"filterType": "text", "type": "notContains", "filter": "a59"}, [0, 1, 3]),
+        ({"filterType": "text", "type": "equals", "filter": "k99r"}, [1]),
+        ({"filterType": "text", "type": "notEqual", "filter": "#PARENT#"}, [1, 2, 3, 4]),
+        ({"filterType": "text", "type": "startsWith", "filter": "a59"}, [2, 4]),
+        ({"filterType": "text", "type": "endsWith", "filter": "K99R"}, [1, 2]),
+        ({"filterType": "text", "type": "blank"}, [3]),
+        ({"filterType": "text", "type": "notBlank"}, [0, 1, 2, 4]),
+        (
+            {
+                "filterType": "text",
+                "operator": "OR",
+                "conditions": [
+                    {"filterType": "text", "type": "equals", "filter": "#PARENT#"},
+                    {"filterType": "text", "type": "equals", "filter": "K99R"},
+                ],
+            },
+            [0, 1],
+        ),
+        (
+            {
+                "filterType": "text",
+                "operator": "AND",
+                "conditions": [
+                    {"filterType": "text", "type": "contains", "filter": "K99R"},
+                    {"filterType": "text", "type": "contains", "filter": "A59"},
+                ],
+            },
+            [2],
+        ),
+    ],
+)
+def test_get_infinite_row_model_response_text_filter(top_variants_rows_df, column_filter, expected_row_ids):
+    response = get_rows(top_variants_rows_df, filter_model={gs.c_substitutions: column_filter})
+    assert response["rowCount"] == len(expected_row_ids)
+    assert [row[gs.cc_row_id] for row in response["rowData"]] == expected_row_ids
+
+
+@pytest.mark.parametrize(
+    "column_filter, expected_row_ids",
+    [
+        ({"filterType": "number", "type": "equals", "filter": 3}, [2]),
+        ({"filterType": "number", "type": "notEqual", "filter": 3}, [0, 1, 3]),
+        ({"filterType": "number", "type": "lessThan", "filter": 3}, [0, 3]),
+        ({"filterType": "number", "type": "lessThanOrEqual", "filter": 3}, [0, 2, 3]),
+        ({"filterType": "number", "type": "greaterThan", "filter": 2}, [1, 2]),
+        ({"filterType": "number", "type": "greaterThanOrEqual", "filter": 2}, [1, 2, 3]),
+        ({"filterType": "number", "type": "inRange", "filter": 1, "filterTo": 5}, [2, 3]),
+        ({"filterType": "number", "type": "blank"}, [4]),
+    ],
+)
+def test_get_infinite_row_model_response_number_filter(top_variants_rows_df, column_filter, expected_row_ids):
+    response = get_rows(top_variants_rows_df, filter_model={gs.c_fitness_value: column_filter})
+    assert [row[gs.cc_row_id] for row in response["rowData"]] == expected_row_ids
+
+
+def test_get_infinite_row_model_response_filters_of_several_columns(top_variants_rows_df):
+    filter_model = {
+        gs.c_substitutions: {"filterType": "text", "type": "contains", "filter": "99"},
+        gs.c_fitness_value: {"filterType": "number", "type": "lessThan", "filter": 4},
+    }
+    response = get_rows(top_variants_rows_df, filter_model=filter_model)
+    assert [row[gs.cc_row_id] for row in response["rowData"]] == [2]
+
+
+def test_get_infinite_row_model_response_sort(top_variants_rows_df):
+    response = get_rows(top_variants_rows_df, sort_model=[{"colId": gs.c_fitness_value, "sort": "desc"}])
+    # the blank values are last
+    assert [row[gs.cc_row_id] for row in response["rowData"]] == [1, 2, 3, 0, 4]
+
+    # the rows are filtered before they are sorted and paged
+    response = get_rows(
+        top_variants_rows_df,
+        filter_model={gs.c_fitness_value: {"filterType": "number", "type": "notBlank"}},
+        sort_model=[{"colId": gs.c_fitness_value, "sort": "asc"}],
+        start_row=1,
+        end_row=3,
+    )
+    assert response["rowCount"] == 4
+    assert [row[gs.cc_row_id] for row in response["rowData"]] == [3, 2]
+
+
+def test_get_infinite_row_model_response_unsupported_filter(top_variants_rows_df):
+    with pytest.raises(ValueError, match="Unsupported text filter type"):
+        get_rows(top_variants_rows_df, filter_model={gs.c_substitutions: {"filterType": "text", "type": "regex"}})
+
+
+@pytest.mark.parametrize(
+    "filter_model, sort_model",
+    [
+        ({"unknown": {"filterType": "text", "type": "equals", "filter": "A"}}, None),
+        (None, [{"colId": "unknown", "sort": "asc"}]),
+    ],
+)
+def test_get_infinite_row_model_response_unknown_column(top_variants_rows_df, filter_model, sort_model):
+    with pytest.raises(ValueError, match="Unknown columns"):
+        get_rows(top_variants_rows_df, filter_model=filter_model, sort_model=sort_model)
+
+
 @pytest.mark.parametrize(
     "input_str, expected",
     [
@@ -669,3 +800,50 @@ def test_calculate_group_mean_simple_case():
     expected_ratios_group3 = [1.0, 2.0, 4.0, 6.0]  # fitness/50
     actual_ratios_group3 = group3[gs.cc_ratio].tolist()
     assert expected_ratios_group3 == actual_ratios_group3
+
+
+def test_content_hash_ignores_column_order_and_whitespace():
+    """Test that reordered columns and whitespace don't change the content hash"""
+    content_hash = BaseDataManager.calculate_content_hash(b"id,amino_acid_substitutions,fitness\n1,K99R,1.5\n")
+
+    assert BaseDataManager.calculate_content_hash(b"fitness, id ,amino_acid_substitutions\n1.5,1, K99R \n") == (
+        content_hash
+    )
+    assert BaseDataManager.calculate_content_hash(b"id,amino_acid_substitutions,fitness\n1,K99A,1.5\n") != (
+        content_hash
+    )
+
+
+def test_content_hash_empty_bytes_raises_error():
+    """Test that empty bytes raises ValueError"""
+    with pytest.raises(ValueError):
+        BaseDataManager.calculate_content_hash(b"")
+
+
+def test_make_private_directory(tmp_path):
+    path = utils.make_private_directory(tmp_path / "data" / ".private")
+    assert path.is_dir()
+    assert path.stat().st_mode & 0o777 == 0o700
+    # an existing private directory is accepted
+    assert utils.make_private_directory(path) == path
+
+
+def test_make_private_directory_rejects_a_shared_directory(tmp_path):
+    shared_path = tmp_path / "shared"
+    shared_path.mkdir()
+    shared_path.chmod(0o777)
+    with pytest.raises(PermissionError, match="other users"):
+        utils.make_private_directory(shared_path)
+
+
+def test_make_private_directory_rejects_a_symlink(tmp_path):
+    (tmp_path / "target").mkdir(mode=0o700)
+    (tmp_path / "link").symlink_to(tmp_path / "target")
+    with pytest.raises(PermissionError, match="not a directory"):
+        utils.make_private_directory(tmp_path / "link")
+
+
+def test_make_private_directory_rejects_another_owner(mocker, tmp_path):
+    mocker.patch("os.getuid", return_value=os.getuid() + 1)
+    with pytest.raises(PermissionError, match="another user"):
+        utils.make_private_directory(tmp_path / "private")
@@ -158,19 +158,18 @@ def lookup_residues_in_experiment_data(df_experiment_data, lookup_residues_list:
     return df_exp_results
 
 
-def search_and_gather_variant_info_for_matching_experiment(
-    experiment, experiment_meta_data, lookup_residues_list, seq_match_data, exp_results_row_data
+def gather_variant_info_for_matching_experiment(
+    df_exp_results, experiment_meta_data, seq_match_data, exp_results_row_data
 ):
-    """Searches a matching experiment for variants at specified residue positions and compiles results.
+    """Compiles the variants of a matching experiment at the lookup residue positions into table rows.
 
-    Processes an experiment to find variants with mutations at the lookup residue positions,
-    then combines this data with sequence alignment information and experiment metadata for
-    the related variants table display.
+    Combines the variants found in a matching experiment at the lookup residue positions, see
+    BaseDataManager.get_experiment_variants_at_residues, with sequence alignment information and
+    experiment metadata for the related variants table display.
 
     Args:
-        experiment: Experiment object to search for variants
+        df_exp_results: DataFrame of the variants of the experiment at the lookup residue positions
         experiment_meta_data: Dictionary containing experiment metadata
-        lookup_residues_list: List of residue indices to search for in the experiment
         seq_match_data: Dictionary of sequence alignment data from the aligner
         exp_results_row_data: List accumulating results across all matching experiments
 
@@ -178,15 +177,8 @@ def search_and_gather_variant_info_for_matching_experiment(
         Updated exp_results_row_data list with new rows appended for variants found
         in this experiment at the specified residue positions
     """
-    # # preprocess the data for residue extraction
-    df_match_exp = experiment.exp_get_processed_core_data_for_valid_mutation_extractions()
-
-    df_exp_results = lookup_residues_in_experiment_data(
-        df_experiment_data=df_match_exp, lookup_residues_list=lookup_residues_list
-    )
-
     # add the experiment id to the data columns
-    df_exp_results[gs.cc_experiment_id] = experiment_meta_data[gs.cc_experiment_id]
+    df_exp_results = df_exp_results.assign(**{gs.cc_experiment_id: experiment_meta_data[gs.cc_experiment_id]})
 
     # convert the df do a list of records
     dict_list = df_exp_results.to_dict(orient="records")
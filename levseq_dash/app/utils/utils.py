@@ -3,8 +3,10 @@ import inspect
 import io
 import os
 import re
+import stat
 import threading
 from datetime import datetime
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -126,6 +128,141 @@ def decode_csv_file_base64_string_to_dataframe(base64_encoded_string):
     return df, base64_encoded_bytes
 
 
+def read_csv_file_to_dataframe(file_path):
+    """Reads an uploaded CSV file into a pandas DataFrame.
+
+    Used for the files uploaded in chunks, which are parsed from disk instead of
+    being decoded from a base64 string in memory first.
+
+    Args:
+        file_path: Path of the uploaded CSV file
+
+    Returns:
+        DataFrame: Parsed CSV data
+
+    Raises:
+        Exception: If content is not valid UTF-8
+    """
+    try:
+        return pd.read_csv(file_path, encoding="utf-8")
+    except UnicodeDecodeError:
+        raise Exception("The content is not a valid UTF-8 string.")
+
+
+def read_experiment_core_data(csv_file):
+    """Reads the core data columns of an experiment CSV file.
+
+    The smiles, plate and well columns repeat a few values over all the rows and are
+    converted to categories, after the CSV reader inferred their values.
+
+    Args:
+        csv_file: Path or binary stream of the experiment CSV file
+
+    Returns:
+        DataFrame: The columns of gs.experiment_core_data_list
+    """
+    data_df = pd.read_csv(csv_file, usecols=gs.experiment_core_data_list)
+    return set_core_data_categories(data_df)
+
+
+def set_core_data_categories(data_df):
+    """Converts the columns of gs.experiment_core_data_categorical_list of the core data to categories, in place."""
+    for column in gs.experiment_core_data_categorical_list:
+        if data_df[column].dtype != "category":
+            data_df[column] = data_df[column].astype("category")
+    return data_df
+
+
+def get_single_site_mutation_pattern(residue_number=None):
+    """
+    Generate regex pattern for matching single-site mutations.
+
+    Args:
+        residue_number: Specific residue position (e.g., 45). If None, matches any position.
+
+    Returns:
+        str: Regex pattern for single-site mutation matching.
+    """
+    if residue_number is not None:
+        # Pattern for specific residue: A45S, A45*, etc.
+        return rf"^[A-Z*]\s*{residue_number}\s*[A-Z*]$"
+    else:
+        # Pattern for any single-site mutation: A45S, D123F, etc.
+        return r"^[A-Z*]\s*\d+\s*[A-Z*]$"
+
+
+def filter_single_site_mutations(df, smiles_string=None, residue_number=None, include_parent=False):
+    """
+    Filter dataframe for single-site mutations with optional filters.
+
+    Args:
+        df: DataFrame containing mutation data.
+        smiles_string: Optional SMILES filter.
+        residue_number: Optional specific residue position filter.
+        include_parent: Whether to include parent entries (default: False).
+
+    Returns:
+        pd.DataFrame: Filtered dataframe with single-site mutations.
+    """
+    # Filter by smiles string if provided
+    if smiles_string is not None:
+        filtered_df = df[df[gs.c_smiles] == smiles_string].copy()
+    else:
+        filtered_df = df.copy()
+
+    # Get the appropriate mutation pattern
+    mutation_pattern = get_single_site_mutation_pattern(residue_number)
+
+    # Filter for single-site mutations
+    single_site_mask = filtered_df[gs.c_substitutions].str.match(mutation_pattern, na=False)
+
+    if include_parent:
+        # Include parent entries
+        parent_mask = filtered_df[gs.c_substitutions] == gs.hashtag_parent
+        final_mask = single_site_mask | parent_mask
+    else:
+        final_mask = single_site_mask
+
+    final = filtered_df[final_mask]
+    return final
+
+
+def extract_single_site_mutations(df, smiles_string=None):
+    """
+    Extract all single-site mutation positions from a dataframe.
+
+    Args:
+        df: DataFrame containing mutation data.
+        smiles_string: Optional SMILES string filter. If None, processes all data.
+
+    Returns:
+        list: Sorted list of unique residue positions (e.g., [45, 67, 123]).
+    """
+
+    # Use shared filtering function for single-site mutations (any residue number, no parent entries)
+    filtered_df = filter_single_site_mutations(df, smiles_string=smiles_string, include_parent=False)
+
+    if filtered_df.empty:
+        return []
+
+    # Extract residue numbers from mutation strings using the shared pattern
+    residue_numbers = set()
+    single_mutations = filtered_df[gs.c_substitutions].dropna()
+
+    # Use the same pattern as filtering, but add capture group for residue number
+    base_pattern = get_single_site_mutation_pattern()  # Gets pattern for any residue
+    residue_capture_pattern = base_pattern.replace(r"\d+", r"(\d+)")  # Capture the residue number
+
+    for mutation in single_mutations:
+        # Extract residue number using the shared pattern logic
+        match = re.search(residue_capture_pattern, str(mutation))
+        if match:
+            residue_numbers.add(int(match.group(1)))
+
+    # Return sorted list of unique residue positions
+    return sorted(list(residue_numbers))
+
+
 def calculate_group_mean_ratios_per_smiles_and_plate(df):
     """Calculates fitness ratios relative to parent mean for each SMILES/plate group.
 
@@ -172,13 +309,15 @@ def calculate_group_mean_ratios_per_smiles_and_plate(df):
         # No NaN values, just fill with 0
         numeric_vals = numeric_vals.fillna(0)
 
+    # set the column on a shallow copy, the input, e.g. the core data of a cached experiment, is not modified
+    df = df.copy(deep=False)
     df[value_col] = numeric_vals
 
     # Compute mean ONLY for rows where parent_col == parent_value, per group and that the parent is not 0
     # if a prent has 0 fitness value that group combo is ignored
     parent_mean = (
         df[(df[gs.c_substitutions] == "#PARENT#") & (df[value_col] > 0)]
-        .groupby(group_cols, sort=False)[value_col]  # sort=False saves time
+        .groupby(group_cols, sort=False, observed=True)[value_col]  # sort=False saves time
         .mean()
         .reset_index()
         .rename(columns={value_col: "mean"})
@@ -200,7 +339,9 @@ def calculate_group_mean_ratios_per_smiles_and_plate(df):
     df[gs.cc_ratio] = np.where(valid_mask, (df[value_col] / df["mean"]).round(3), np.nan)
 
     group_stats_ratio = (
-        df.groupby(group_cols, sort=False)[gs.cc_ratio].agg(min_group_ratio="min", max_group_ratio="max").reset_index()
+        df.groupby(group_cols, sort=False, observed=True)[gs.cc_ratio]
+        .agg(min_group_ratio="min", max_group_ratio="max")
+        .reset_index()
     )
 
     # merge ratio and min max of the ratio values into the data
@@ -323,6 +464,145 @@ def select_first_row_of_data(data):
     return None
 
 
+def _ag_grid_column_filter_mask(series, column_filter):
+    """Returns the boolean mask of the values of a column that pass an AG Grid text or number column filter.
+
+    Follows the client side filters: text filters are case-insensitive and blank values only pass the
+    "notEqual", "notContains" and "blank" text filters and the "blank" number filter.
+    """
+    # two conditions combined with AND or OR
+    if "conditions" in column_filter:
+        masks = [_ag_grid_column_filter_mask(series, condition) for condition in column_filter["conditions"]]
+        if column_filter.get("operator") == "OR":
+            return np.logical_or.reduce(masks)
+        return np.logical_and.reduce(masks)
+
+    filter_type = column_filter.get("type")
+    is_blank = series.isna() | (series.astype(str).str.strip() == "")
+    if filter_type == "blank":
+        return is_blank
+    if filter_type == "notBlank":
+        return ~is_blank
+
+    if column_filter.get("filterType") == "number":
+        values = pd.to_numeric(series, errors="coerce")
+        filter_value = column_filter.get("filter")
+        if filter_type == "equals":
+            mask = values == filter_value
+        elif filter_type == "notEqual":
+            mask = values != filter_value
+        elif filter_type == "lessThan":
+            mask = values < filter_value
+        elif filter_type == "lessThanOrEqual":
+            mask = values <= filter_value
+        elif filter_type == "greaterThan":
+            mask = values > filter_value
+        elif filter_type == "greaterThanOrEqual":
+            mask = values >= filter_value
+        elif filter_type == "inRange":
+            mask = (values > filter_value) & (values < column_filter.get("filterTo"))
+        else:
+            raise ValueError(f"Unsupported number filter type: {filter_type}")
+        return mask & values.notna()
+
+    values = series.astype(str).str.lower()
+    filter_value = str(column_filter.get("filter", "")).lower()
+    if filter_type == "equals":
+        mask = values == filter_value
+    elif filter_type == "notEqual":
+        mask = values != filter_value
+    elif filter_type == "contains":
+        mask = values.str.contains(filter_value, regex=False)
+    elif filter_type == "notContains":
+        mask = ~values.str.contains(filter_value, regex=False)
+    elif filter_type == "startsWith":
+        mask = values.str.startswith(filter_value)
+    elif filter_type == "endsWith":
+        mask = values.str.endswith(filter_value)
+    else:
+        raise ValueError(f"Unsupported text filter type: {filter_type}")
+
+    if filter_type in ["notEqual", "notContains"]:
+        return mask | is_blank
+    return mask & ~is_blank
+
+
+def get_infinite_row_model_response(df, get_rows_request):
+    """Filters, sorts and pages a DataFrame for an AG Grid table with the infinite row model.
+
+    The table only receives the rows of the requested block instead of all the data,
+    the filtering and sorting of the table are done here with pandas.
+
+    Args:
+        df: DataFrame with the data of the table, it is not modified.
+        get_rows_request: The "getRowsRequest" of the table with the startRow, endRow,
+            sortModel and filterModel of the requested block.
+
+    Returns:
+        Dict with the "rowData" records of the block and the "rowCount" of the filtered data,
+        the "getRowsResponse" of the table. The records have the row index of the data in the
+        gs.cc_row_id column.
+
+    Raises:
+        ValueError: If the request has a filter type that is not supported or a column that is not in the data.
+    """
+    filter_model = get_rows_request.get("filterModel") or {}
+    sort_model = get_rows_request.get("sortModel") or []
+    unknown_columns = set(filter_model).union(sort["colId"] for sort in sort_model).difference(df.columns)
+    if unknown_columns:
+        raise ValueError(f"Unknown columns: {sorted(unknown_columns)}")
+
+    if filter_model:
+        mask = np.logical_and.reduce(
+            [_ag_grid_column_filter_mask(df[column], column_filter) for column, column_filter in filter_model.items()]
+        )
+        df = df[mask]
+
+    if sort_model:
+        df = df.sort_values(
+            by=[sort["colId"] for sort in sort_model],
+            ascending=[sort["sort"] == "asc" for sort in sort_model],
+            kind="stable",
+        )
+
+    start_row = get_rows_request.get("startRow", 0)
+    end_row = get_rows_request.get("endRow", start_row + 100)
+    block = df.iloc[start_row:end_row].rename_axis(gs.cc_row_id).reset_index()
+
+    return {"rowData": block.to_dict("records"), "rowCount": len(df)}
+
+
+def make_private_directory(path) -> Path:
+    """Creates a directory that only the user of this process can access, or checks that an existing one is.
+
+    The directory holds files other local users must not read or replace, e.g. the staged uploads, so
+    a directory that already existed, e.g. created by another user beforehand, is checked as well.
+
+    Args:
+        path: Path of the directory, its missing parents are created.
+
+    Returns:
+        Path: The path of the directory.
+
+    Raises:
+        PermissionError: If the path is a symlink or not a directory, belongs to another user or other
+                         users have access to it.
+    """
+    path = Path(path)
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    path_stat = path.lstat()
+    if not stat.S_ISDIR(path_stat.st_mode):
+        raise PermissionError(f"{path} is not a directory.")
+    # owners and permission bits are not checked on Windows
+    if hasattr(os, "getuid"):
+        if path_stat.st_uid != os.getuid():
+            raise PermissionError(f"{path} belongs to another user.")
+        if stat.S_IMODE(path_stat.st_mode) & 0o077:
+            raise PermissionError(f"{path} can be accessed by other users, its mode has to be 0700.")
+    return path
+
+
 def log_with_context(msg, log_flag):
     """Logs a message with process, thread, and function context information.
 